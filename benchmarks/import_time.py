@@ -0,0 +1,109 @@
+"""
+Cold-start benchmark: how long "import vidmeta" takes in a fresh interpreter.
+
+Each run starts a new Python process with -X importtime and reads the cumulative import time
+of every module from its stderr. The median of the runs is written to a JSON file, together
+with the heavy modules (OpenCV, NumPy, Tesseract, Tk, Pillow) that were imported, so results
+can be tracked over time and compared against a saved baseline.
+
+Usage (from the repository root):
+    python -m benchmarks.import_time [--runs 10] [--output results.json] [--baseline old.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Modules vidmeta should only import when they are used
+HEAVY_MODULES = ("cv2", "numpy", "pytesseract", "tkinter", "PIL")
+
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = os.path.join(REPOSITORY_DIR, "benchmarks", "results", "import_time.json")
+
+
+def parse_importtime(stderr) -> dict:
+    """
+    Parse the output of python -X importtime.
+
+    Returns:
+        Dict of top-level and nested module name to cumulative import time in microseconds
+    """
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        columns = line[len("import time:"):].split("|")
+        # The header line has the column names instead of numbers
+        if len(columns) != 3 or not columns[1].strip().isdigit():
+            continue
+        times[columns[2].strip()] = int(columns[1])
+    return times
+
+
+def measure_import(module="vidmeta"):
+    """
+    Import a module in a fresh interpreter.
+
+    Returns:
+        Tuple of (per module import times in microseconds, wall clock seconds of the whole process)
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=REPOSITORY_DIR, check=True
+    )
+    return parse_importtime(result.stderr), time.perf_counter() - start
+
+
+def run_benchmark(module="vidmeta", runs=10) -> dict:
+    """Measure the import time of a module over several runs and return the summary."""
+    import_us = []
+    process_seconds = []
+    heavy = set()
+    for _ in range(runs):
+        times, seconds = measure_import(module)
+        import_us.append(times[module])
+        process_seconds.append(seconds)
+        heavy.update(name for name in HEAVY_MODULES if name in times)
+    return {
+        "module": module,
+        "python": sys.version.split()[0],
+        "runs": runs,
+        "import_ms": statistics.median(import_us) / 1000,
+        "import_ms_min": min(import_us) / 1000,
+        "process_ms": statistics.median(process_seconds) * 1000,
+        "heavy_modules_imported": sorted(heavy),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the cold-start import time of vidmeta.")
+    parser.add_argument("--module", default="vidmeta", help="Module to import")
+    parser.add_argument("--runs", type=int, default=10, help="Number of fresh interpreters to start")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON file to write the results to")
+    parser.add_argument("--baseline", help="Earlier results to compare against")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.module, args.runs)
+    print(f"import {results['module']}: {results['import_ms']:.1f} ms median "
+          f"({results['import_ms_min']:.1f} ms min), whole process {results['process_ms']:.1f} ms")
+    if results["heavy_modules_imported"]:
+        print(f"Heavy modules imported: {', '.join(results['heavy_modules_imported'])}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        change = (results["import_ms"] - baseline["import_ms"]) / baseline["import_ms"] * 100
+        print(f"Baseline: {baseline['import_ms']:.1f} ms ({change:+.0f}%)")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""
+Accuracy and latency of the OCR strategies on a corpus of labelled timestamp images.
+
+A corpus is a directory of ROI images (the timestamp region of a frame) with a labels.csv
+that holds the overlay text of every image:
+
+    image,timestamp
+    synthetic_0000.png,13/06/2025 13:28:42:285
+
+Real snapshots can be added by hand; --generate adds ROIs cut from synthetic clock videos
+(see benchmarks.synthetic_video). Every strategy is run on every image in a pool of worker
+processes, and per strategy the accuracy, mean and p95 latency and Tesseract calls per correct
+timestamp are reported. Strategies on the Pareto front (no other strategy is both at least as
+accurate and at least as fast) are marked. With thresholds or a baseline the harness exits
+with status 1 when accuracy or latency regresses, so it can gate CI.
+
+Usage (from the repository root):
+    python -m benchmarks.ocr_corpus --generate 60
+    python -m benchmarks.ocr_corpus [--strategies cascade "method 2"] [--baseline old.json --min-accuracy 0.9]
+"""
+import argparse
+import concurrent.futures
+import csv
+import datetime
+import json
+import os
+import sys
+import tempfile
+import time
+
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CORPUS = os.path.join(REPOSITORY_DIR, "benchmarks", "corpus")
+DEFAULT_OUTPUT = os.path.join(REPOSITORY_DIR, "benchmarks", "results", "ocr_corpus.json")
+LABELS_FILE = "labels.csv"
+
+# Format of the labels, which is the camera overlay format
+LABEL_FORMAT = "%d/%m/%Y %H:%M:%S:%f"
+
+
+def get_strategies() -> dict:
+    """
+    Return the OCR strategies by name, as keyword arguments of extract_timestamp_from_frame.
+
+    "cascade" is what vidmeta runs on every frame, "tesseract" the same without the digit model,
+    "method N" a single preprocessing method with PSM 7, "relaxed" only the fallback on the
+    grayscale ROI and "profile NAME" the OCRStrategy of an OCR_PROFILES profile.
+    """
+    from vidmeta import OCR_PROFILES, PREPROCESSING_METHODS
+
+    strategies = {"cascade": {}, "tesseract": {"digit_model": False}}
+    for i in range(len(PREPROCESSING_METHODS)):
+        strategies[f"method {i}"] = {"methods": [i], "relaxed": False}
+    strategies["relaxed"] = {"methods": [], "relaxed": True}
+    for profile in OCR_PROFILES:
+        strategies[f"profile {profile}"] = {"strategy": profile}
+    return strategies
+
+
+def load_corpus(directory) -> list:
+    """
+    Read the labels of a corpus.
+
+    Returns:
+        List of (image path, overlay datetime) tuples, in labels.csv order
+    """
+    labels_path = os.path.join(directory, LABELS_FILE)
+    if not os.path.exists(labels_path):
+        raise FileNotFoundError(f"No {LABELS_FILE} in corpus directory: {directory}")
+    with open(labels_path, newline="") as f:
+        return [
+            (os.path.join(directory, row["image"]), datetime.datetime.strptime(row["timestamp"], LABEL_FORMAT))
+            for row in csv.DictReader(f)
+        ]
+
+
+def generate_corpus(directory, count=60, noise_levels=(0.0, 4.0, 8.0), width=1280, height=720, seed=0) -> list:
+    """
+    Add ROI images cut from synthetic clock videos to a corpus.
+
+    The images are spread evenly over one video per noise level. Earlier synthetic images are
+    replaced; hand-labelled images in the corpus are kept.
+
+    Returns:
+        List of the image names that were written
+    """
+    import cv2
+
+    from benchmarks.synthetic_video import format_camera_timestamp, generate_timestamp_video
+    from vidmeta import calculate_timestamp_roi
+
+    os.makedirs(directory, exist_ok=True)
+    labels_path = os.path.join(directory, LABELS_FILE)
+    labels = {}
+    if os.path.exists(labels_path):
+        with open(labels_path, newline="") as f:
+            labels = {row["image"]: row["timestamp"] for row in csv.DictReader(f)}
+    for name in [name for name in labels if name.startswith("synthetic_")]:
+        del labels[name]
+        if os.path.exists(os.path.join(directory, name)):
+            os.remove(os.path.join(directory, name))
+
+    roi_x, roi_y, roi_width, roi_height = calculate_timestamp_roi(width, height)
+    per_video = -(-count // len(noise_levels))
+    written = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for video_number, noise in enumerate(noise_levels):
+            video_path = os.path.join(temp_dir, f"clock_{video_number}.avi")
+            # Every seventh frame is used, so the milliseconds and seconds cover all digits
+            times = generate_timestamp_video(
+                video_path, frame_count=per_video * 7, width=width, height=height, noise=noise, seed=seed + video_number
+            )
+            capture = cv2.VideoCapture(video_path)
+            for frame_number, timestamp in enumerate(times):
+                ok, frame = capture.read()
+                if not ok or len(written) >= count:
+                    break
+                if frame_number % 7:
+                    continue
+                name = f"synthetic_{len(written):04d}.png"
+                cv2.imwrite(os.path.join(directory, name), frame[roi_y:roi_y+roi_height, roi_x:roi_x+roi_width])
+                labels[name] = format_camera_timestamp(timestamp)
+                written.append(name)
+            capture.release()
+
+    with open(labels_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["image", "timestamp"])
+        writer.writerows(sorted(labels.items()))
+    return written
+
+
+def _silence_worker():
+    # vidmeta reports every OCR attempt on stdout
+    sys.stdout = open(os.devnull, "w")
+
+
+def run_strategy(strategy_name, strategy, image_path, label):
+    """
+    Read one corpus image with one strategy.
+
+    Returns:
+        Tuple of (strategy name, image path, whether the timestamp is correct, seconds, Tesseract calls)
+    """
+    import cv2
+
+    import vidmeta
+
+    image = cv2.imread(image_path)
+    if image is None:
+        raise OSError(f"Could not read corpus image: {image_path}")
+    def tesseract_calls():
+        return sum(
+            count for key, count in vidmeta.OCR_ATTEMPTS.values.items()
+            if ("stage", "dnn") not in key and dict(key).get("method") not in ("digits", "template")
+        )
+
+    calls_before = tesseract_calls()
+    start = time.perf_counter()
+    extracted_time, _ = vidmeta.extract_timestamp_from_frame(image, 0, 0, image.shape[1], image.shape[0], **strategy)
+    seconds = time.perf_counter() - start
+    calls = tesseract_calls() - calls_before
+    # The overlay only shows milliseconds
+    correct = extracted_time is not None and extracted_time.replace(
+        microsecond=extracted_time.microsecond // 1000 * 1000
+    ) == label
+    return strategy_name, image_path, correct, seconds, calls
+
+
+def summarize_strategy(name, outcomes) -> dict:
+    """Summarize the (correct, seconds, calls) outcomes of one strategy."""
+    from vidmeta_trace import percentile
+
+    latencies_ms = sorted(seconds * 1000 for _, seconds, _ in outcomes)
+    correct = sum(1 for is_correct, _, _ in outcomes if is_correct)
+    calls = sum(calls for _, _, calls in outcomes)
+    return {
+        "strategy": name,
+        "images": len(outcomes),
+        "correct": correct,
+        "accuracy": correct / len(outcomes) if outcomes else 0.0,
+        "mean_ms": sum(latencies_ms) / len(latencies_ms) if latencies_ms else 0.0,
+        "p95_ms": percentile(latencies_ms, 0.95) or 0.0,
+        "ocr_calls": calls,
+        "calls_per_success": calls / correct if correct else None,
+    }
+
+
+def pareto_front(rows) -> set:
+    """
+    Return the names of the strategies no other strategy dominates.
+
+    A strategy dominates another when it is at least as accurate and at least as fast (mean
+    latency), and strictly better in one of the two.
+    """
+    front = set()
+    for row in rows:
+        dominated = any(
+            other["accuracy"] >= row["accuracy"] and other["mean_ms"] <= row["mean_ms"]
+            and (other["accuracy"] > row["accuracy"] or other["mean_ms"] < row["mean_ms"])
+            for other in rows if other is not row
+        )
+        if not dominated:
+            front.add(row["strategy"])
+    return front
+
+
+def run_corpus(corpus, strategies, workers=None) -> list:
+    """
+    Run every strategy on every corpus image in worker processes.
+
+    Args:
+        corpus: List of (image path, label) tuples from load_corpus
+        strategies: Dict of strategy name to extract_timestamp_from_frame keyword arguments
+        workers: Number of worker processes (default: one per CPU)
+
+    Returns:
+        List of per strategy summaries, with "pareto" set, most accurate first
+    """
+    outcomes = {name: [] for name in strategies}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_silence_worker) as executor:
+        futures = [
+            executor.submit(run_strategy, name, strategy, image_path, label)
+            for name, strategy in strategies.items()
+            for image_path, label in corpus
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            name, _, correct, seconds, calls = future.result()
+            outcomes[name].append((correct, seconds, calls))
+
+    rows = [summarize_strategy(name, results) for name, results in outcomes.items()]
+    front = pareto_front(rows)
+    for row in rows:
+        row["pareto"] = row["strategy"] in front
+    rows.sort(key=lambda row: (-row["accuracy"], row["mean_ms"]))
+    return rows
+
+
+def format_report(rows) -> str:
+    """Format the strategy summaries as a table; * marks the Pareto front."""
+    width = max([len("Strategy")] + [len(row["strategy"]) for row in rows])
+    lines = [f"  {'Strategy':<{width}}  {'Accuracy':>8}  {'Mean ms':>9}  {'p95 ms':>9}  {'Calls/success':>13}"]
+    for row in rows:
+        calls = "-" if row["calls_per_success"] is None else f"{row['calls_per_success']:.2f}"
+        lines.append(
+            f"{'*' if row['pareto'] else ' '} {row['strategy']:<{width}}  {row['accuracy']:>8.1%}  "
+            f"{row['mean_ms']:>9.1f}  {row['p95_ms']:>9.1f}  {calls:>13}"
+        )
+    return "\n".join(lines)
+
+
+def check_thresholds(rows, gated=("cascade",), min_accuracy=None, max_p95_ms=None, baseline=None,
+                     max_accuracy_drop=0.0, max_latency_increase=0.25) -> list:
+    """
+    Compare the results against fixed thresholds and an earlier run.
+
+    Args:
+        rows: Strategy summaries from run_corpus
+        gated: Strategies the fixed thresholds apply to
+        min_accuracy: Lowest accepted accuracy (0-1)
+        max_p95_ms: Highest accepted p95 latency
+        baseline: Strategy summaries of an earlier run; every strategy in both runs is compared
+        max_accuracy_drop: Largest accepted accuracy drop against the baseline (0-1)
+        max_latency_increase: Largest accepted relative increase of the mean latency against
+            the baseline (0.25 = 25% slower)
+
+    Returns:
+        List of failure messages, empty if everything passed
+    """
+    failures = []
+    by_name = {row["strategy"]: row for row in rows}
+    for name in gated:
+        row = by_name.get(name)
+        if row is None:
+            continue
+        if min_accuracy is not None and row["accuracy"] < min_accuracy:
+            failures.append(f"{name}: accuracy {row['accuracy']:.1%} is below {min_accuracy:.1%}")
+        if max_p95_ms is not None and row["p95_ms"] > max_p95_ms:
+            failures.append(f"{name}: p95 latency {row['p95_ms']:.1f} ms is above {max_p95_ms:.1f} ms")
+    for old in baseline or ():
+        row = by_name.get(old["strategy"])
+        if row is None:
+            continue
+        if row["accuracy"] < old["accuracy"] - max_accuracy_drop:
+            failures.append(
+                f"{row['strategy']}: accuracy dropped from {old['accuracy']:.1%} to {row['accuracy']:.1%}"
+            )
+        if old["mean_ms"] > 0 and row["mean_ms"] > old["mean_ms"] * (1 + max_latency_increase):
+            failures.append(
+                f"{row['strategy']}: mean latency rose from {old['mean_ms']:.1f} ms to {row['mean_ms']:.1f} ms"
+            )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure OCR accuracy and latency on a labelled corpus.")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Corpus directory with labels.csv")
+    parser.add_argument("--generate", type=int, metavar="COUNT",
+                        help="First add COUNT synthetic images to the corpus (replacing earlier synthetic images)")
+    parser.add_argument("--strategies", nargs="+", help="Strategies to run (default: all)")
+    parser.add_argument("--workers", type=int, help="Number of worker processes (default: one per CPU)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON file to write the results to")
+    parser.add_argument("--baseline", help="Earlier results to compare against")
+    parser.add_argument("--gate", nargs="+", default=["cascade"],
+                        help="Strategies --min-accuracy and --max-p95-ms apply to (default: cascade)")
+    parser.add_argument("--min-accuracy", type=float, help="Fail if a gated strategy is less accurate (0-1)")
+    parser.add_argument("--max-p95-ms", type=float, help="Fail if a gated strategy has a higher p95 latency")
+    parser.add_argument("--max-accuracy-drop", type=float, default=0.0,
+                        help="Fail if a strategy loses more accuracy against the baseline (default: 0)")
+    parser.add_argument("--max-latency-increase", type=float, default=0.25,
+                        help="Fail if a strategy's mean latency rises more than this fraction over the baseline "
+                             "(default: 0.25)")
+    args = parser.parse_args()
+
+    if args.generate:
+        written = generate_corpus(args.corpus, args.generate)
+        print(f"Added {len(written)} synthetic images to {args.corpus}")
+
+    corpus = load_corpus(args.corpus)
+    strategies = get_strategies()
+    if args.strategies:
+        unknown = [name for name in args.strategies if name not in strategies]
+        if unknown:
+            parser.error(f"Unknown strategies: {', '.join(unknown)}. Expected one of: {', '.join(strategies)}")
+        strategies = {name: strategies[name] for name in args.strategies}
+
+    print(f"Running {len(strategies)} strategies on {len(corpus)} images")
+    rows = run_corpus(corpus, strategies, args.workers)
+    print(format_report(rows))
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({"corpus": os.path.abspath(args.corpus), "images": len(corpus), "strategies": rows}, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["strategies"]
+    failures = check_thresholds(
+        rows, args.gate, args.min_accuracy, args.max_p95_ms, baseline, args.max_accuracy_drop,
+        args.max_latency_increase
+    )
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
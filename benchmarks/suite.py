@@ -0,0 +1,300 @@
+"""
+Throughput benchmarks on synthetic videos with a burned-in camera clock.
+
+A video is generated with benchmarks.synthetic_video and then used to benchmark:
+
+- extract_timestamp: extract_timestamp_from_frame on a sample of frames
+- process_video_file: headless processing of the whole video
+- find_matching_timestamps: locating a start and end time, without and with the sidecar index
+- extract_video_snippet: cutting the located range with FFmpeg (skipped without FFmpeg)
+
+Each benchmark runs in a fresh process, so its peak RSS is its own. Frames/s, OCR calls/s
+and peak RSS are written to a JSON file that can be compared across versions.
+
+Usage (from the repository root):
+    python -m benchmarks.suite [--frames 250] [--width 1280 --height 720] [--output results.json]
+"""
+import argparse
+import concurrent.futures
+import contextlib
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; psutil is used there if installed
+    resource = None
+
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = os.path.join(REPOSITORY_DIR, "benchmarks", "results", "benchmarks.json")
+
+BENCHMARKS = ("extract_timestamp", "process_video_file", "find_matching_timestamps", "extract_video_snippet")
+
+
+def peak_rss_mb() -> float | None:
+    """Return the peak resident set size of this process in MiB, or None if it cannot be measured."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+    try:
+        import psutil
+    except ImportError:
+        return None
+    memory = psutil.Process().memory_info()
+    return getattr(memory, "peak_wset", memory.rss) / 1024 / 1024
+
+
+class OCRCallCounter:
+    """Count the Tesseract calls made while the counter is active."""
+
+    FUNCTIONS = ("image_to_string", "image_to_data")
+
+    def __init__(self):
+        self.calls = 0
+        self._originals = {}
+
+    def __enter__(self):
+        import pytesseract
+
+        for name in self.FUNCTIONS:
+            original = getattr(pytesseract, name)
+            self._originals[name] = original
+
+            def counted(*args, _original=original, **kwargs):
+                self.calls += 1
+                return _original(*args, **kwargs)
+
+            setattr(pytesseract, name, counted)
+        return self
+
+    def __exit__(self, *exc_info):
+        import pytesseract
+
+        for name, original in self._originals.items():
+            setattr(pytesseract, name, original)
+
+
+def truncate_to_milliseconds(timestamp):
+    """Drop the sub-millisecond part of a time, which the overlay does not show."""
+    return timestamp.replace(microsecond=timestamp.microsecond // 1000 * 1000)
+
+
+def bench_extract_timestamp(video_path, truth, settings):
+    import cv2
+    from vidmeta import calculate_timestamp_roi, extract_timestamp_from_frame
+
+    sample_count = min(settings["ocr_frames"], len(truth))
+    step = max(1, len(truth) // sample_count)
+    frame_numbers = list(range(0, len(truth), step))[:sample_count]
+
+    capture = cv2.VideoCapture(video_path)
+    frames = []
+    for frame_number in frame_numbers:
+        capture.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        ok, frame = capture.read()
+        if ok:
+            frames.append((frame_number, frame))
+    capture.release()
+
+    correct = 0
+    with OCRCallCounter() as counter:
+        start = time.perf_counter()
+        for frame_number, frame in frames:
+            roi = calculate_timestamp_roi(frame.shape[1], frame.shape[0])
+            extracted_time, _ = extract_timestamp_from_frame(frame, *roi)
+            if extracted_time == truncate_to_milliseconds(truth[frame_number]):
+                correct += 1
+        seconds = time.perf_counter() - start
+    return {
+        "frames": len(frames),
+        "seconds": seconds,
+        "frames_per_s": len(frames) / seconds,
+        "ocr_calls": counter.calls,
+        "ocr_calls_per_s": counter.calls / seconds,
+        "ocr_calls_per_frame": counter.calls / max(1, len(frames)),
+        "accuracy": correct / max(1, len(frames)),
+    }
+
+
+def bench_process_video_file(video_path, truth, settings):
+    from vidmeta import process_video_file
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        local_path = os.path.join(temp_dir, "video" + os.path.splitext(video_path)[1])
+        shutil.copyfile(video_path, local_path)
+        with OCRCallCounter() as counter:
+            start = time.perf_counter()
+            success = process_video_file(local_path, skip_extended_video=True, headless=True)
+            seconds = time.perf_counter() - start
+    return {
+        "success": success,
+        "frames": len(truth),
+        "seconds": seconds,
+        "frames_per_s": len(truth) / seconds,
+        "ocr_calls": counter.calls,
+        "ocr_calls_per_s": counter.calls / seconds,
+    }
+
+
+def bench_find_matching_timestamps(video_path, truth, settings):
+    from vidmeta import find_matching_timestamps_in_video, get_timestamp_index_path
+
+    target_start = truncate_to_milliseconds(truth[len(truth) // 4])
+    target_end = truncate_to_milliseconds(truth[3 * len(truth) // 4])
+    results = {"frames": len(truth)}
+    # The first lookup builds the sidecar index, the second one uses it
+    get_timestamp_index_path(video_path).unlink(missing_ok=True)
+    for run in ("cold", "warm"):
+        with OCRCallCounter() as counter:
+            start = time.perf_counter()
+            start_position, end_position, success = find_matching_timestamps_in_video(
+                video_path, target_start, target_end
+            )
+            seconds = time.perf_counter() - start
+        results[run] = {
+            "success": success,
+            "seconds": seconds,
+            "frames_per_s": len(truth) / seconds,
+            "ocr_calls": counter.calls,
+            "ocr_calls_per_s": counter.calls / seconds,
+        }
+    get_timestamp_index_path(video_path).unlink(missing_ok=True)
+    return results
+
+
+def bench_extract_video_snippet(video_path, truth, settings):
+    from vidmeta import extract_video_snippet, find_tool
+
+    if find_tool("ffmpeg") is None:
+        return {"skipped": "ffmpeg not found"}
+    start_index, end_index = len(truth) // 4, 3 * len(truth) // 4
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = os.path.join(temp_dir, "snippet" + os.path.splitext(video_path)[1])
+        start = time.perf_counter()
+        success, error = extract_video_snippet(
+            video_path, output_path, truth[start_index], truth[end_index], reference_time=truth[0],
+            cut_mode=settings["cut_mode"]
+        )
+        seconds = time.perf_counter() - start
+    frames = end_index - start_index
+    return {
+        "success": success,
+        "error": error,
+        "cut_mode": settings["cut_mode"],
+        "frames": frames,
+        "seconds": seconds,
+        "frames_per_s": frames / seconds,
+    }
+
+
+def run_benchmark(name, video_path, truth, settings):
+    """Run one benchmark in the current process and add its peak RSS to the results."""
+    benchmark = globals()[f"bench_{name}"]
+    if settings["verbose"]:
+        results = benchmark(video_path, truth, settings)
+    else:
+        # vidmeta reports every step on stdout
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            results = benchmark(video_path, truth, settings)
+    results["peak_rss_mb"] = peak_rss_mb()
+    return results
+
+
+def get_version_info() -> dict:
+    """Describe the code and environment the benchmarks ran with."""
+    import cv2
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=REPOSITORY_DIR, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_suite(settings, names=BENCHMARKS) -> dict:
+    """Generate the synthetic video and run the benchmarks, each in a fresh process."""
+    from benchmarks.synthetic_video import generate_timestamp_video
+
+    results = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "version": get_version_info(),
+        "video": {key: settings[key] for key in ("frames", "width", "height", "fps", "gop", "noise", "container")},
+        "benchmarks": {},
+    }
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video_path = os.path.join(temp_dir, f"synthetic.{settings['container']}")
+        start = time.perf_counter()
+        truth = generate_timestamp_video(
+            video_path, frame_count=settings["frames"], width=settings["width"], height=settings["height"],
+            fps=settings["fps"], gop=settings["gop"], noise=settings["noise"]
+        )
+        print(f"Generated {len(truth)} frames in {time.perf_counter() - start:.1f} s: {video_path}")
+
+        context = multiprocessing.get_context("spawn")
+        for name in names:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(run_benchmark, name, video_path, truth, settings).result()
+            results["benchmarks"][name] = result
+            print(f"{name}: {format_result(result)}")
+    return results
+
+
+def format_result(result) -> str:
+    """Summarize the results of one benchmark on one line."""
+    if "skipped" in result:
+        return f"skipped ({result['skipped']})"
+    runs = [(run, result[run]) for run in ("cold", "warm") if run in result] or [(None, result)]
+    parts = []
+    for run, values in runs:
+        text = f"{values['frames_per_s']:.1f} frames/s"
+        if "ocr_calls_per_s" in values:
+            text += f", {values['ocr_calls_per_s']:.1f} OCR calls/s"
+        parts.append(f"{run}: {text}" if run else text)
+    peak = result.get("peak_rss_mb")
+    return "; ".join(parts) + (f", peak RSS {peak:.0f} MiB" if peak is not None else "")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vidmeta on a synthetic video with a burned-in clock.")
+    parser.add_argument("--frames", type=int, default=250, help="Number of frames in the video")
+    parser.add_argument("--width", type=int, default=1280, help="Frame width")
+    parser.add_argument("--height", type=int, default=720, help="Frame height")
+    parser.add_argument("--fps", type=float, default=25.0, help="Frame rate")
+    parser.add_argument("--gop", type=int, default=12, help="Keyframe interval of MP4 videos")
+    parser.add_argument("--noise", type=float, default=2.0, help="Sensor noise in gray levels")
+    parser.add_argument("--container", choices=("avi", "mp4"), default="avi", help="Video container")
+    parser.add_argument("--ocr-frames", type=int, default=10, help="Frames read by the extract_timestamp benchmark")
+    parser.add_argument("--cut-mode", default="copy", help="Cut mode of the extract_video_snippet benchmark")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="Run only these benchmarks")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON file to write the results to")
+    parser.add_argument("--verbose", action="store_true", help="Show the output of vidmeta")
+    args = parser.parse_args()
+
+    settings = vars(args)
+    results = run_suite(settings, args.only or BENCHMARKS)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2, default=str)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Generator for synthetic videos with a burned-in camera clock.
+
+The clock is drawn in the top right corner in the camera's format (DD/MM/YYYY HH:MM:SS:ZZZ),
+white on a moving textured background. Resolution, frame rate, GOP length, sensor noise,
+dropped frames and clock drift can be set; the same arguments always produce the same video,
+and the overlay time of every written frame is returned as the ground truth.
+"""
+import datetime
+import os
+
+import cv2
+import numpy as np
+
+from vidmeta import calculate_timestamp_roi
+
+# Default start of the overlay clock
+DEFAULT_START_TIME = datetime.datetime(2025, 6, 13, 13, 28, 42, 285000)
+
+# Codec written for each container
+FOURCC_BY_EXTENSION = {".avi": "MJPG", ".mp4": "mp4v"}
+
+
+def format_camera_timestamp(timestamp) -> str:
+    """Format a time like the camera overlay: DD/MM/YYYY HH:MM:SS:ZZZ."""
+    return timestamp.strftime("%d/%m/%Y %H:%M:%S:") + f"{timestamp.microsecond // 1000:03d}"
+
+
+def overlay_clock_times(frame_count, fps=25.0, start_time=DEFAULT_START_TIME, dropped_frames=(), drift_ppm=0.0):
+    """
+    Return the overlay clock time of every frame that ends up in the video.
+
+    Args:
+        frame_count: Number of frames written to the video
+        fps: Frame rate of the camera
+        start_time: Overlay time of the first camera frame
+        dropped_frames: Camera frame numbers that are missing from the video; the clock keeps
+            running, so the overlay jumps ahead after each of them
+        drift_ppm: How much faster (positive) or slower the overlay clock runs than the
+            frame rate, in parts per million
+
+    Returns:
+        List of datetimes, one per written frame
+    """
+    dropped = set(dropped_frames)
+    seconds_per_frame = (1.0 + drift_ppm / 1e6) / fps
+    times = []
+    camera_frame = 0
+    while len(times) < frame_count:
+        if camera_frame not in dropped:
+            times.append(start_time + datetime.timedelta(seconds=camera_frame * seconds_per_frame))
+        camera_frame += 1
+    return times
+
+
+def draw_clock(frame, timestamp):
+    """Draw the overlay clock right aligned in the timestamp region of a frame."""
+    height, width = frame.shape[:2]
+    roi_x, roi_y, roi_width, roi_height = calculate_timestamp_roi(width, height)
+    text = format_camera_timestamp(timestamp)
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    thickness = max(1, height // 360)
+    # Fill most of the region width, like the overlays of the cameras we record with
+    scale = 0.9 * roi_width / cv2.getTextSize(text, font, 1.0, thickness)[0][0]
+    (text_width, text_height), _ = cv2.getTextSize(text, font, scale, thickness)
+    origin = (roi_x + roi_width - text_width - roi_width // 40, roi_y + roi_height // 2 + text_height // 2)
+    cv2.putText(frame, text, origin, font, scale, (255, 255, 255), thickness, cv2.LINE_AA)
+
+
+def generate_timestamp_video(path, frame_count=250, width=1280, height=720, fps=25.0, start_time=DEFAULT_START_TIME,
+                             gop=12, noise=0.0, dropped_frames=(), drift_ppm=0.0, seed=0):
+    """
+    Write a video with a running overlay clock.
+
+    Args:
+        path: Output path; .avi files are Motion JPEG, .mp4 files MPEG-4 Part 2
+        frame_count: Number of frames to write
+        width: Frame width in pixels
+        height: Frame height in pixels
+        fps: Frame rate
+        start_time: Overlay time of the first frame
+        gop: Keyframe interval in frames, passed to FFmpeg as a writer option; OpenCV builds that
+            ignore writer options keep the codec default of 12 (Motion JPEG frames are all keyframes)
+        noise: Standard deviation of the Gaussian sensor noise, in gray levels
+        dropped_frames: Camera frame numbers left out of the video (see overlay_clock_times)
+        drift_ppm: Clock drift of the overlay in parts per million
+        seed: Seed of the noise, so the same arguments give the same video
+
+    Returns:
+        List of the overlay datetimes of the written frames
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FOURCC_BY_EXTENSION:
+        raise ValueError(f"Unsupported container '{extension}'. Expected one of: {', '.join(FOURCC_BY_EXTENSION)}")
+
+    # OpenCV passes encoder options to FFmpeg through the environment when the writer is opened
+    previous_options = os.environ.get("OPENCV_FFMPEG_WRITER_OPTIONS")
+    if gop:
+        os.environ["OPENCV_FFMPEG_WRITER_OPTIONS"] = f"g;{gop}"
+    try:
+        writer = cv2.VideoWriter(
+            path, cv2.CAP_FFMPEG, cv2.VideoWriter_fourcc(*FOURCC_BY_EXTENSION[extension]), fps, (width, height)
+        )
+    finally:
+        if previous_options is None:
+            os.environ.pop("OPENCV_FFMPEG_WRITER_OPTIONS", None)
+        else:
+            os.environ["OPENCV_FFMPEG_WRITER_OPTIONS"] = previous_options
+    if not writer.isOpened():
+        raise OSError(f"Could not create video: {path}")
+
+    # Diagonal stripes that scroll one column per frame give the encoder real motion; every
+    # frame is a window into one precomputed texture
+    period = 144
+    rng = np.random.default_rng(seed)
+    diagonals = np.arange(height)[:, None] + np.arange(width + period)[None, :]
+    texture = (96 + 64 * np.sin(2 * np.pi * (diagonals % period) / period)).astype(np.float32)
+
+    times = overlay_clock_times(frame_count, fps, start_time, dropped_frames, drift_ppm)
+    try:
+        for frame_number, timestamp in enumerate(times):
+            offset = frame_number % period
+            background = texture[:, offset:offset + width]
+            if noise:
+                background = background + rng.normal(0.0, noise, background.shape).astype(np.float32)
+            gray = np.clip(background, 0, 255).astype(np.uint8)
+            frame = cv2.merge([gray, (gray * 0.8).astype(np.uint8), (gray * 0.6).astype(np.uint8)])
+            draw_clock(frame, timestamp)
+            writer.write(frame)
+    finally:
+        writer.release()
+    return times
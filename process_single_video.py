@@ -6,19 +6,21 @@ This script provides a simplified interface for processing a single video file
 using the functionality from the main vidmeta.py script.
 
 Usage:
-    python process_single_video.py [--skip-extended-video] [<video_file_path>]
+    python process_single_video.py [--skip-extended-video] [--headless] [--verify] [--ocr-profile PROFILE]
+                                   [<video_file_path>]
 
 If no video_file_path is provided, a file browser will open to select the video file.
+With --headless, no window is opened and the reference time is read from the first frame.
 """
 
 import argparse
 import os
-import tkinter as tk
-from tkinter import filedialog
 from pathlib import Path
 
 # Import the necessary function from the main script
-from vidmeta import process_video_file
+import vidmeta_metrics
+import vidmeta_trace
+from vidmeta import OCR_PROFILES, process_video_file, verify_frame_times
 
 def main():
     """
@@ -29,13 +31,36 @@ def main():
     parser.add_argument('video_path', nargs='?', help='Path to the video file to process (optional)')
     parser.add_argument('--skip-extended-video', action='store_true', 
                         help='Skip the extended video processing portion')
+    parser.add_argument('--headless', action='store_true',
+                        help='Run without a display: read the reference time from the first frame '
+                             'instead of showing the video (requires video_path)')
+    parser.add_argument('--verify', action='store_true',
+                        help='Afterwards read the timestamp overlay of every frame and check frame_times.txt '
+                             'against it, reporting mismatches, dropped and duplicated frames '
+                             '(saved to frame_times_verification.json)')
+    parser.add_argument('--ocr-profile', choices=list(OCR_PROFILES),
+                        help='OCR speed/accuracy profile used by --verify (default: the full OCR cascade)')
+    parser.add_argument('--trace', metavar='FILE',
+                        help='Save a Chrome trace of the time spent in each stage and print a summary')
+    parser.add_argument('--metrics', metavar='FILE',
+                        help='Save OCR metrics after the run (Prometheus textfile if FILE ends in .prom, else JSON)')
 
     # Parse arguments
     args = parser.parse_args()
 
-    # Create a Tkinter root window (hidden)
-    root = tk.Tk()
-    root.withdraw()
+    if args.headless and not args.video_path:
+        parser.error("--headless requires video_path")
+
+    if args.trace:
+        vidmeta_trace.enable()
+
+    # Create a Tkinter root window (hidden); tkinter is only imported when a window is needed
+    root = None
+    if not args.headless:
+        import tkinter as tk
+        from tkinter import filedialog
+        root = tk.Tk()
+        root.withdraw()
 
     # Get video path from command line or file browser
     video_path = args.video_path
@@ -61,7 +86,8 @@ def main():
         success = process_video_file(
             video_path, 
             root=root, 
-            skip_extended_video=args.skip_extended_video
+            skip_extended_video=args.skip_extended_video,
+            headless=args.headless
         )
 
         if success:
@@ -69,6 +95,12 @@ def main():
             # Get the output path (same directory as the video file)
             output_path = Path(video_path).parent / "frame_times.txt"
             print(f"Timestamp chart saved to: {output_path}")
+            if args.verify:
+                report = verify_frame_times(
+                    video_path, output_path, report_path=output_path.with_name("frame_times_verification.json"),
+                    ocr_profile=args.ocr_profile
+                )
+                return 0 if report and report["ok"] else 1
             return 0
         else:
             print(f"Failed to process video file: {video_path}")
@@ -78,7 +110,13 @@ def main():
         return 1
     finally:
         # Ensure the application terminates properly
-        root.destroy()
+        if root is not None:
+            root.destroy()
+        if args.trace:
+            vidmeta_trace.export_chrome_trace(args.trace)
+            vidmeta_trace.print_summary()
+        if args.metrics:
+            vidmeta_metrics.export(args.metrics)
 
 if __name__ == "__main__":
     exit_code = main()
@@ -0,0 +1,137 @@
+import datetime
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+import vidmeta
+from benchmarks.synthetic_video import DEFAULT_START_TIME, draw_clock, format_camera_timestamp
+from test_ocr_metrics import FakeTesseract
+from vidmeta import (
+    DIGIT_CELL_SIZE, binarize_roi, calculate_timestamp_roi, extract_character_cells,
+    get_digit_recognizer
+)
+
+
+def make_frame(width, height, timestamp=DEFAULT_START_TIME):
+    frame = np.full((height, width, 3), 60, dtype=np.uint8)
+    draw_clock(frame, timestamp)
+    return frame
+
+
+def get_roi(frame):
+    x, y, width, height = calculate_timestamp_roi(frame.shape[1], frame.shape[0])
+    return frame[y:y + height, x:x + width]
+
+
+def test_character_cells():
+    """Test that every character of the overlay becomes one cell and the space is found."""
+    cells, spaces = extract_character_cells(binarize_roi(get_roi(make_frame(1280, 720))))
+    assert cells.shape == (22, *DIGIT_CELL_SIZE)
+    assert spaces == [10]
+    # White ink on black, and no cell is empty
+    assert cells.reshape(22, -1).max(axis=1).min() == 255
+    assert np.mean(cells) < 128
+    print("PASS: Character cells")
+
+
+def test_reads_generator_overlays():
+    """Test that the shipped model reads the generator's clock at several resolutions."""
+    recognizer = get_digit_recognizer()
+    assert recognizer is not None, "models/timestamp_digits.onnx is missing; run train_digit_model.py"
+    for width, height in ((640, 360), (1280, 720), (1920, 1080)):
+        for milliseconds in (0, 40, 123456, 7654321):
+            timestamp = DEFAULT_START_TIME + datetime.timedelta(milliseconds=milliseconds)
+            text, confidence = recognizer.read(get_roi(make_frame(width, height, timestamp)))
+            assert text == format_camera_timestamp(timestamp), (width, text)
+            assert confidence > vidmeta.DIGIT_MIN_CONFIDENCE
+    print("PASS: Generator overlays read")
+
+
+def test_low_text_is_upscaled_or_skipped(monkeypatch):
+    """Test that small overlays are scaled up before they are read, and text too low to read is not classified."""
+    recognizer = get_digit_recognizer()
+    text, confidence = recognizer.read(get_roi(make_frame(480, 270)))
+    assert text == "13/06/2025 13:28:42:285" and confidence > vidmeta.DIGIT_MIN_CONFIDENCE
+
+    classified = []
+    classify = vidmeta.DigitRecognizer.classify
+    monkeypatch.setattr(vidmeta.DigitRecognizer, "classify",
+                        lambda self, cells: classified.append(len(cells)) or classify(self, cells))
+    assert recognizer.read(get_roi(make_frame(320, 240))) == ("", 0.0)
+    assert sum(classified) == 0
+    print("PASS: Low text upscaled or skipped")
+
+
+def test_confident_reading_skips_tesseract(monkeypatch):
+    """Test that extract_timestamp_from_frame returns a confident reading without Tesseract."""
+    tesseract = FakeTesseract("")
+    monkeypatch.setattr(vidmeta, "pytesseract", tesseract)
+    frame = make_frame(1280, 720)
+    attempt = {}
+    timestamp, text = vidmeta.extract_timestamp_from_frame(frame, *calculate_timestamp_roi(1280, 720),
+                                                           last_attempt=attempt)
+    assert timestamp == DEFAULT_START_TIME
+    assert text == "13/06/2025 13:28:42:285"
+    assert attempt["method"] == "digits" and attempt["confidence"] > 0.9
+    assert tesseract.calls == 0
+
+    # Without the digit model the cascade runs
+    vidmeta.extract_timestamp_from_frame(frame, *calculate_timestamp_roi(1280, 720), digit_model=False)
+    assert tesseract.calls > 0
+    print("PASS: Confident reading skips Tesseract")
+
+
+def test_unsure_reading_falls_back_to_tesseract(monkeypatch):
+    """Test that a reading below the confidence threshold goes on to Tesseract."""
+    unsure = SimpleNamespace(read=lambda roi: ("13/06/2025 13:28:42:285", 0.5))
+    monkeypatch.setattr(vidmeta, "get_digit_recognizer", lambda: unsure)
+    tesseract = FakeTesseract("13/06/2025 13:28:42:325")
+    monkeypatch.setattr(vidmeta, "pytesseract", tesseract)
+    timestamp, text = vidmeta.extract_timestamp_from_frame(make_frame(1280, 720),
+                                                           *calculate_timestamp_roi(1280, 720))
+    assert text == "13/06/2025 13:28:42:325"
+    assert tesseract.calls == 1
+    print("PASS: Unsure reading falls back to Tesseract")
+
+
+def test_batched_classification_throughput():
+    """Test that batches give the same classes as single cells and thousands of cells per second."""
+    recognizer = get_digit_recognizer()
+    cells, _ = extract_character_cells(binarize_roi(get_roi(make_frame(1280, 720))))
+    batch = np.concatenate([cells] * 100)
+    text, confidences = recognizer.classify(batch)
+    assert text == "".join(recognizer.classify(cell[None])[0] for cell in cells) * 100
+    assert len(confidences) == len(batch)
+
+    start = time.perf_counter()
+    recognizer.classify(batch)
+    characters_per_s = len(batch) / (time.perf_counter() - start)
+    print(f"Classified {characters_per_s:.0f} characters/s")
+    assert characters_per_s > 2000
+    print("PASS: Batched classification")
+
+
+def test_exported_model_matches_numpy():
+    """Test that the ONNX file written by train_digit_model gives the probabilities of the NumPy net."""
+    from train_digit_model import DigitNet, export_onnx
+
+    net = DigitNet(seed=3)
+    cells = np.random.default_rng(3).random((5, 1, *DIGIT_CELL_SIZE), dtype=np.float32)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "digits.onnx")
+        export_onnx(net, path)
+        net_cv = cv2.dnn.readNetFromONNX(path)
+        net_cv.setInput(cells)
+        probabilities = net_cv.forward()
+    assert probabilities.shape == (5, len(vidmeta.DIGIT_CLASSES))
+    assert np.allclose(probabilities, net.forward(cells), atol=1e-5)
+    print("PASS: Exported model matches")
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-s"])
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import threading
+
+import pytest
+
+import vidmeta
+from vidmeta import (
+    ENCODING_PROFILES, get_transcode_args, get_transcode_video_args, load_encode_stats, parse_encoded_frame_count,
+    record_encode_stats
+)
+
+
+def test_profiles_set_explicit_threads():
+    """Test that every profile passes an explicit thread count to the encoder."""
+    for profile in ENCODING_PROFILES:
+        args = get_transcode_video_args(profile)
+        print(f"{profile}: {' '.join(args)}")
+        assert int(args[args.index("-threads") + 1]) >= 1
+    assert get_transcode_video_args("default", threads=3)[-2:] == ["-threads", "3"]
+    print("PASS: All profiles set an explicit thread count")
+
+
+def test_preview_profile_scales_down():
+    """Test that only the preview profile scales the video and uses a lower audio bitrate."""
+    preview = get_transcode_args("preview")
+    assert "-vf" in preview and "480" in preview[preview.index("-vf") + 1]
+    assert preview[preview.index("-b:a") + 1] == "96k"
+    assert "-vf" not in get_transcode_args("archive")
+    print("PASS: Preview profile is scaled down")
+
+
+def test_unknown_profile():
+    """Test that an unknown profile name is rejected."""
+    with pytest.raises(ValueError):
+        get_transcode_args("fastest")
+    print("PASS: Unknown profile rejected")
+
+
+def test_parse_encoded_frame_count():
+    """Test that the final frame count is read from ffmpeg progress output."""
+    stderr = "frame=   12 fps=0.0 q=28.0 size=0kB\rframe=  250 fps=120 q=-1.0 Lsize=512kB\n"
+    assert parse_encoded_frame_count(stderr) == 250
+    assert parse_encoded_frame_count("no progress") is None
+    print("PASS: Frame count parsed from ffmpeg output")
+
+
+def test_record_encode_stats_concurrently(monkeypatch):
+    """Test that encode stats recorded from many threads are all kept and no temporary files remain."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        monkeypatch.setattr(vidmeta, "ENCODE_STATS_PATH", os.path.join(temp_dir, "stats", "encode_stats.json"))
+        threads = [
+            threading.Thread(target=lambda: [record_encode_stats("preview", 100, 0.5) for _ in range(20)])
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = load_encode_stats()
+        assert os.listdir(os.path.join(temp_dir, "stats")) == ["encode_stats.json"]
+    assert stats["preview"]["runs"] == 160 and stats["preview"]["frames"] == 16000
+    assert stats["preview"]["fps"] == 200.0
+    print("PASS: Concurrent encode stats kept")
+
+
+if __name__ == "__main__":
+    test_profiles_set_explicit_threads()
+    test_preview_profile_scales_down()
+    test_unknown_profile()
+    test_parse_encoded_frame_count()
+    test_record_encode_stats_concurrently(pytest.MonkeyPatch())
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import time
+
+from test_frame_sources import matches_frame, write_test_video
+from vidmeta import FrameCache
+
+
+def wait_for(condition, timeout=5.0):
+    """Wait until condition() is true or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_frame_cache_prefetches_both_directions():
+    """Test that frames on both sides of the position are prefetched and served from memory."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video_path = os.path.join(temp_dir, "test.avi")
+        write_test_video(video_path)
+
+        cache = FrameCache(video_path, scale=0.5, capacity=8, radius=3)
+        try:
+            frame = cache.get(6)
+            assert frame.shape == (120, 160, 3)
+            assert matches_frame(frame[:24, -64:], 6)
+
+            assert wait_for(lambda: all(n in cache for n in (3, 4, 5, 7, 8, 9)))
+            print("PASS: Frames around the position were prefetched")
+            assert matches_frame(cache.get(5)[:24, -64:], 5)
+
+            # Moving on evicts the frames furthest from the new position
+            cache.get(11)
+            assert wait_for(lambda: all(n in cache for n in (8, 9, 10)))
+            assert len(cache) <= 8 and 3 not in cache
+            print("PASS: Cache stays within capacity")
+        finally:
+            cache.close()
+
+
+def test_window_fits_capacity():
+    """Test that a radius too large for the capacity is clamped, so the prefetched window is not evicted."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video_path = os.path.join(temp_dir, "test.avi")
+        write_test_video(video_path)
+
+        cache = FrameCache(video_path, capacity=8, radius=4)
+        try:
+            assert cache.radius == 3
+            cache.get(6)
+            assert wait_for(lambda: all(n in cache for n in range(3, 10)))
+
+            # Once the window is cached the prefetch thread stays idle
+            stored = []
+            store = cache._store
+            cache._store = lambda frame_number, frame: (stored.append(frame_number), store(frame_number, frame))
+            time.sleep(0.3)
+            assert stored == [] and len(cache) <= cache.capacity
+            print("PASS: Window fits the capacity")
+        finally:
+            cache.close()
+
+
+if __name__ == "__main__":
+    test_frame_cache_prefetches_both_directions()
+    test_window_fits_capacity()
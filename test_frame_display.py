@@ -0,0 +1,19 @@
+import cv2
+import numpy as np
+
+from vidmeta import rgb_to_ppm
+
+
+def test_rgb_to_ppm():
+    """Test that frames wrapped in a PPM header decode back to the same pixels."""
+    rgb = np.random.default_rng(0).integers(0, 256, (48, 64, 3), dtype=np.uint8)
+    data = rgb_to_ppm(rgb)
+
+    decoded = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    # OpenCV decodes PPM as BGR
+    assert np.array_equal(decoded[:, :, ::-1], rgb)
+    print("PASS: PPM data matches the frame")
+
+
+if __name__ == "__main__":
+    test_rgb_to_ppm()
@@ -0,0 +1,206 @@
+import fractions
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+import vidmeta
+from vidmeta import (
+    FFmpegFrameSource,
+    calculate_timestamp_roi,
+    get_available_frame_sources,
+    open_frame_source,
+    plan_frame_access,
+)
+
+
+def write_test_video(path, frame_count=12, width=320, height=240, fps=25.0):
+    """Write a video whose timestamp region brightness encodes the frame number."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, (width, height))
+    roi_x, roi_y, roi_width, roi_height = calculate_timestamp_roi(width, height)
+    for i in range(frame_count):
+        frame = np.full((height, width, 3), 255, dtype=np.uint8)
+        frame[roi_y:roi_y+roi_height, roi_x:roi_x+roi_width] = 20 * i % 256
+        writer.write(frame)
+    writer.release()
+    return roi_x, roi_y, roi_width, roi_height
+
+
+def matches_frame(roi_frame, frame_number):
+    """Check that a decoded ROI has the brightness written for frame_number."""
+    return abs(roi_frame.mean() - 20 * frame_number) < 4
+
+
+@pytest.fixture
+def test_video():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video_path = os.path.join(temp_dir, "test.avi")
+        roi = write_test_video(video_path)
+        yield video_path, roi
+
+
+@pytest.mark.parametrize("backend", ["opencv", "ffmpeg", "pyav"])
+def test_frame_source_backends(backend, test_video):
+    """Test that every backend returns the same frames for sequential, stepped and random reads."""
+    if backend not in get_available_frame_sources():
+        pytest.skip(f"{backend} is not available")
+    video_path, roi = test_video
+
+    with open_frame_source(video_path, backend=backend, roi=roi, gray=True) as source:
+        assert source.frame_count == 12 and abs(source.fps - 25.0) < 0.01
+
+        frames = [(n, roi_frame.copy()) for n, roi_frame in source.frames(3, 5)]
+        print(f"{backend}: frames {[n for n, _ in frames]}, means {[round(f.mean()) for _, f in frames]}")
+        assert [n for n, _ in frames] == [3, 4, 5, 6, 7]
+        assert all(f.shape == (roi[3], roi[2]) and matches_frame(f, n) for n, f in frames)
+
+        stepped = [n for n, roi_frame in source.frames(2, 9, step=3) if matches_frame(roi_frame, n)]
+        assert stepped == [2, 5, 8]
+
+        for frame_number in (9, 1, 2, 10):
+            assert matches_frame(source.read(frame_number), frame_number)
+    print(f"PASS: {backend} frame source")
+
+
+def test_frame_source_scale_hint(test_video):
+    """Test that the downscale hint is applied after cropping."""
+    video_path, roi = test_video
+    with open_frame_source(video_path, backend="opencv", roi=roi, scale=0.5) as source:
+        frame = source.read(0)
+    assert frame.shape == (roi[3] // 2, roi[2] // 2, 3)
+    print("PASS: Frames are cropped and scaled")
+
+
+def test_auto_backend_without_ffmpeg(test_video, monkeypatch):
+    """Test that sequential reads fall back to OpenCV when ffmpeg is not installed."""
+    monkeypatch.setattr(vidmeta, "find_tool", lambda name: None)
+    monkeypatch.setattr(vidmeta.importlib.util, "find_spec", lambda name: None)
+    with open_frame_source(test_video[0], access="sequential") as source:
+        assert source.name == "opencv"
+        assert sum(1 for _ in source.frames()) == 12
+    print("PASS: Sequential reads fall back to OpenCV")
+
+
+def test_pyav_open_error_without_averror(monkeypatch):
+    """Test that an unreadable file gives None with PyAV 14 and later, which have no av.AVError."""
+    def fail_open(path):
+        raise fake_av.FFmpegError("Invalid data found when processing input")
+
+    fake_av = SimpleNamespace(FFmpegError=type("FFmpegError", (Exception,), {}), open=fail_open)
+    monkeypatch.setitem(sys.modules, "av", fake_av)
+    assert open_frame_source("broken.mp4", backend="pyav") is None
+    print("PASS: PyAV open errors handled")
+
+
+class OvershootingContainer:
+    """PyAV container of 120 frames at 25 fps whose seeks land on the keyframe after the target, as in MPEG-TS."""
+
+    def __init__(self, gop=30):
+        self.gop = gop
+        self.seek_frame = 0
+
+    def seek(self, offset, stream):
+        target = offset * stream.time_base * 25
+        self.seek_frame = min(-(-int(target) // self.gop) * self.gop, 120)
+
+    def decode(self, stream):
+        for n in range(self.seek_frame, 120):
+            yield SimpleNamespace(time=n / 25, to_ndarray=lambda format, n=n: np.full((2, 2), n, np.uint8))
+
+
+def test_pyav_seek_overshoot():
+    """Test that PyAV reads return the requested frames when a seek lands past the target."""
+    source = vidmeta.PyAVFrameSource.__new__(vidmeta.PyAVFrameSource)
+    vidmeta.FrameSource.__init__(source, "video.ts", gray=True)
+    source.fps, source._start, source._decoder, source._position = 25.0, 0.0, None, None
+    source._video = SimpleNamespace(time_base=fractions.Fraction(1, 90000))
+    source._container = OvershootingContainer()
+    assert source.read(70)[0, 0] == 70
+    assert source.read(10)[0, 0] == 10
+    assert source.read(11)[0, 0] == 11
+    assert [n for n, _ in source.frames(40, 4)] == [40, 41, 42, 43]
+    assert source.read(200) is None
+    print("PASS: PyAV seeks that overshoot are repeated further back")
+
+
+def test_ffmpeg_command_crops_before_converting():
+    """Test that the ffmpeg backend crops before converting and writes raw frames."""
+    source = FFmpegFrameSource.__new__(FFmpegFrameSource)
+    vidmeta.FrameSource.__init__(source, "in.avi", roi=(768, 0, 512, 144), gray=True)
+    source.fps = 25.0
+    command = source.build_command(250, 100, step=4)
+    print(f"Command: {' '.join(command)}")
+    filters = command[command.index("-vf") + 1]
+    assert filters.index("crop=512:144:768:0") < filters.index("format=gray")
+    assert command[command.index("-frames:v") + 1] == "25"
+    assert command[command.index("-ss") + 1] == "9.980000"
+    assert command[-1] == "pipe:1"
+    print("PASS: ffmpeg command crops before converting")
+
+
+def test_ffmpeg_command_on_old_ffmpeg(monkeypatch):
+    """Test that ffmpeg before 5.1, which has no -fps_mode, is given -vsync."""
+    source = FFmpegFrameSource.__new__(FFmpegFrameSource)
+    vidmeta.FrameSource.__init__(source, "in.avi")
+    source.fps = 25.0
+    monkeypatch.setattr(vidmeta, "get_tool_version", lambda name: "ffmpeg version 4.4.2-0ubuntu0.22.04.1")
+    command = source.build_command()
+    assert "-fps_mode" not in command and command[command.index("-vsync") + 1] == "passthrough"
+    monkeypatch.setattr(vidmeta, "get_tool_version", lambda name: "ffmpeg version 6.1.1 Copyright (c) 2000-2023")
+    assert "-fps_mode" in source.build_command()
+    print("PASS: -vsync on old ffmpeg")
+
+
+def test_ffmpeg_source_uses_average_rate(monkeypatch):
+    """Test that the ffmpeg backend reports the average frame rate, as OpenCV and PyAV do."""
+    monkeypatch.setattr(vidmeta, "find_tool", lambda name: name)
+    info = {"width": 320, "height": 240, "r_frame_rate": "25/3", "avg_frame_rate": "17/2", "nb_frames": "85"}
+    monkeypatch.setattr(vidmeta, "get_video_stream_info", lambda path: dict(info))
+    assert FFmpegFrameSource("vfr.mp4").fps == 8.5
+    info["avg_frame_rate"] = "0/0"
+    assert FFmpegFrameSource("vfr.mp4").fps == 25 / 3
+    print("PASS: Average frame rate used")
+
+
+def test_ffmpeg_failure_raises(monkeypatch):
+    """Test that an ffmpeg that exits with an error raises with its message instead of yielding no frames."""
+    source = FFmpegFrameSource.__new__(FFmpegFrameSource)
+    vidmeta.FrameSource.__init__(source, "in.avi", gray=True)
+    source.width, source.height = 16, 16
+    failing = [sys.executable, "-c", "import sys; sys.stderr.write('Unrecognized option'); sys.exit(8)"]
+    monkeypatch.setattr(source, "build_command", lambda *args: failing)
+    with pytest.raises(OSError, match="Unrecognized option"):
+        list(source.frames())
+    print("PASS: ffmpeg failure raised")
+
+
+def test_plan_frame_access():
+    """Test that dense frames are read linearly and distant ones in a new run after a seek."""
+    keyframes = list(range(0, 1000, 100))
+
+    # Consecutive and nearby frames in one GOP form a single linear run, whatever the order asked
+    assert plan_frame_access([14, 10, 12, 11, 10], keyframes) == [[10, 11, 12, 14]]
+
+    # Frame 450 is far ahead but its keyframe (400) is close, so seek there
+    assert plan_frame_access([5, 450], keyframes) == [[5], [450]]
+
+    # Frame 95 is still in the GOP being read, so read on instead of seeking
+    assert plan_frame_access([5, 95], keyframes) == [[5, 95]]
+
+    # Without keyframes, seeking is preferred once the gap exceeds the seek overhead
+    assert plan_frame_access([0, 5, 100], []) == [[0, 5], [100]]
+    print("PASS: Frame access planned by GOP layout")
+
+
+def test_read_frames_in_caller_order(test_video):
+    """Test that planned reads hand the frames back in the order they were asked for."""
+    video_path, roi = test_video
+    with open_frame_source(video_path, backend="opencv", roi=roi, gray=True) as source:
+        frames = source.read_frames([7, 2, 3, 11, 2, 40])
+    assert [matches_frame(f, n) for f, n in zip(frames[:5], [7, 2, 3, 11, 2])] == [True] * 5
+    assert frames[5] is None
+    print("PASS: Frames returned in caller order")
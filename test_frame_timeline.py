@@ -0,0 +1,89 @@
+import datetime
+import os
+import tempfile
+
+from vidmeta import FrameTimeline, parse_frame_timestamp, read_timestamps_from_file
+
+REFERENCE_TIME = datetime.datetime(2025, 6, 13, 13, 28, 42, 285000)
+
+
+def test_rows_are_formatted_like_the_overlay():
+    """Test that frame 1 shows the overlay text and later frames follow the frame rate in its layout."""
+    timeline = FrameTimeline(REFERENCE_TIME, 25.0, 100, "13/06/2025 13:28:42:285")
+    assert timeline.time_at(1) == REFERENCE_TIME
+    assert len(timeline) == 100
+    assert timeline[0] == (1, "13/06/2025 13:28:42:285")
+    assert timeline[1] == (2, "13/06/2025 132842:325")
+    assert timeline[-1] == (100, "13/06/2025 132846:245")
+    assert timeline[10:13] == [(11, "13/06/2025 132842:685"), (12, "13/06/2025 132842:725"), (13, "13/06/2025 132842:765")]
+    assert list(timeline)[50] == timeline[50]
+    try:
+        timeline[100]
+        assert False, "Expected IndexError"
+    except IndexError:
+        pass
+
+    default = FrameTimeline(REFERENCE_TIME, 25.0, 3)
+    assert list(default) == [(1, "20250613_132842.285"), (2, "20250613_132842.325"), (3, "20250613_132842.365")]
+    assert FrameTimeline(REFERENCE_TIME, 25.0, 3, "132842.285")[2] == (3, "132842.365")
+    # Time-only overlays with colons are written without milliseconds, as before
+    assert FrameTimeline(REFERENCE_TIME, 25.0, 3, "13:28:42.285")[2] == (3, "132842")
+    print("PASS: Rows formatted like the overlay")
+
+
+def test_corrections_and_inverse_lookup():
+    """Test that corrections re-anchor the clock and frame_at finds the frame of a time."""
+    jump = REFERENCE_TIME + datetime.timedelta(seconds=30)
+    timeline = FrameTimeline(REFERENCE_TIME, 25.0, 1000, corrections=[(500, jump)])
+    assert timeline.time_at(499) == REFERENCE_TIME + datetime.timedelta(seconds=498 / 25)
+    assert timeline.time_at(500) == jump
+    assert timeline.time_at(501) == jump + datetime.timedelta(milliseconds=40)
+    assert timeline.corrections == [(500, jump)]
+
+    for frame in (1, 2, 250, 499, 500, 501, 1000):
+        assert timeline.frame_at(timeline.time_at(frame)) == frame
+    # Nearest frame, clamped to the video
+    assert timeline.frame_at(REFERENCE_TIME + datetime.timedelta(milliseconds=1019)) == 26
+    assert timeline.frame_at(REFERENCE_TIME - datetime.timedelta(hours=1)) == 1
+    assert timeline.frame_at(REFERENCE_TIME + datetime.timedelta(hours=1)) == 1000
+    print("PASS: Corrections and inverse lookup")
+
+
+def test_memory_does_not_grow_with_frames():
+    """Test that a timeline of a day of video stores no per-frame data."""
+    timeline = FrameTimeline(REFERENCE_TIME, 25.0, 24 * 3600 * 25, "13/06/2025 13:28:42:285")
+    assert not hasattr(timeline, "__dict__")
+    assert len(timeline._correction_frames) == 0
+    # The date is copied from the overlay text of the first frame
+    assert timeline[-1] == (2160000, "13/06/2025 132842:245")
+    print("PASS: Memory does not grow with frames")
+
+
+def test_csv_and_binary_round_trip():
+    """Test that the CSV matches frame_times.txt and the binary form restores the timeline."""
+    timeline = FrameTimeline(REFERENCE_TIME, 29.97, 300, "13/06/2025 13:28:42:285",
+                             corrections=[(120, REFERENCE_TIME + datetime.timedelta(seconds=5))])
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_path = os.path.join(temp_dir, "frame_times.txt")
+        timeline.write_csv(csv_path)
+        with open(csv_path) as f:
+            lines = f.read().splitlines()
+        assert lines[0] == "Frame,Timestamp" and len(lines) == 301
+        assert lines[1] == "1,13/06/2025 13:28:42:285"
+        first, last = read_timestamps_from_file(csv_path)
+        assert first == REFERENCE_TIME and last == parse_frame_timestamp(timeline[-1][1])
+
+        binary_path = os.path.join(temp_dir, "timeline.bin")
+        timeline.write_binary(binary_path)
+        assert os.path.getsize(binary_path) < 100
+        restored = FrameTimeline.read_binary(binary_path)
+    assert list(restored) == list(timeline)
+    assert restored.corrections == timeline.corrections and restored.fps == 29.97
+    print("PASS: CSV and binary round trip")
+
+
+if __name__ == "__main__":
+    test_rows_are_formatted_like_the_overlay()
+    test_corrections_and_inverse_lookup()
+    test_memory_does_not_grow_with_frames()
+    test_csv_and_binary_round_trip()
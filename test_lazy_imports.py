@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+from benchmarks.import_time import HEAVY_MODULES, parse_importtime
+
+
+def test_import_does_not_load_heavy_modules():
+    """Test that importing vidmeta does not import OpenCV, NumPy, Tesseract, Tk or Pillow."""
+    code = f"import sys, vidmeta; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    print(f"Heavy modules after import: {result.stdout.strip() or 'none'}")
+    assert result.stdout.strip() == ""
+    print("PASS: Heavy modules are imported lazily")
+
+
+def test_gui_names_still_importable():
+    """Test that names moved to vidmeta_gui can still be imported from vidmeta."""
+    import vidmeta
+    import vidmeta_gui
+
+    assert vidmeta.rgb_to_ppm is vidmeta_gui.rgb_to_ppm
+    assert vidmeta.view_video_with_timestamp_overlay is vidmeta_gui.view_video_with_timestamp_overlay
+    # The stand-in is replaced by the real module on first use
+    assert vidmeta.cv2.COLOR_BGR2RGB == 4 and type(vidmeta.cv2).__name__ == "module"
+    print("PASS: GUI names are forwarded to vidmeta_gui")
+
+
+def test_parse_importtime():
+    """Test that cumulative import times are read from -X importtime output."""
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       500 |        500 |   json\n"
+        "import time:      1707 |      20767 | vidmeta\n"
+    )
+    assert parse_importtime(stderr) == {"json": 500, "vidmeta": 20767}
+    print("PASS: Import times parsed")
+
+
+if __name__ == "__main__":
+    test_import_does_not_load_heavy_modules()
+    test_gui_names_still_importable()
+    test_parse_importtime()
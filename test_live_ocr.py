@@ -0,0 +1,82 @@
+import datetime
+import os
+import tempfile
+import threading
+import time
+
+from test_frame_cache import wait_for
+from test_frame_sources import write_test_video
+from vidmeta import LiveOCR
+
+
+class FakeExtract:
+    """Stand-in for extract_timestamp_from_frame that records which frames it was asked to read."""
+
+    def __init__(self, duration=0.0):
+        self.duration = duration
+        self.calls = []
+        self.cancelled_calls = 0
+
+    def __call__(self, frame, roi_x, roi_y, roi_width, roi_height, cancelled=None, last_attempt=None):
+        # The test video encodes the frame number in the brightness of its top right corner
+        frame_number = round(frame[roi_y:roi_y+roi_height, roi_x:roi_x+roi_width].mean() / 20)
+        self.calls.append(frame_number)
+        deadline = time.monotonic() + self.duration
+        while time.monotonic() < deadline:
+            if cancelled():
+                self.cancelled_calls += 1
+                return None, None
+            time.sleep(0.005)
+        return datetime.datetime(2025, 6, 13, 13, 28, frame_number), f"frame {frame_number}"
+
+
+def test_live_ocr_debounces_scrubbing():
+    """Test that only the frame the user stops on is read."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video_path = os.path.join(temp_dir, "test.avi")
+        write_test_video(video_path)
+
+        extract = FakeExtract()
+        live_ocr = LiveOCR(video_path, delay=0.2, extract=extract)
+        try:
+            for frame_number in range(1, 6):
+                live_ocr.submit(frame_number)
+                time.sleep(0.02)
+            assert wait_for(lambda: live_ocr.result(5) is not None)
+            print(f"Frames read: {extract.calls}")
+            assert extract.calls == [5]
+            assert live_ocr.result(5)[1] == "frame 5"
+            print("PASS: Scrubbing only reads the frame that stays current")
+        finally:
+            live_ocr.close()
+
+
+def test_live_ocr_cancels_stale_jobs():
+    """Test that a running job is cancelled when another frame is selected, and that waiting is instant once read."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video_path = os.path.join(temp_dir, "test.avi")
+        write_test_video(video_path)
+
+        extract = FakeExtract(duration=0.3)
+        live_ocr = LiveOCR(video_path, delay=0.0, extract=extract)
+        try:
+            live_ocr.submit(2)
+            assert wait_for(lambda: live_ocr.busy(2) and extract.calls == [2])
+            live_ocr.submit(7)
+            result = live_ocr.wait(7, timeout=5.0)
+            assert result[0] == datetime.datetime(2025, 6, 13, 13, 28, 7)
+            assert extract.cancelled_calls == 1 and live_ocr.result(2) is None
+            print("PASS: Stale job was cancelled")
+
+            start = time.monotonic()
+            assert live_ocr.wait(7) == result
+            assert time.monotonic() - start < 0.05 and extract.calls == [2, 7]
+            print("PASS: Waiting for a frame that was already read is instant")
+        finally:
+            live_ocr.close()
+        assert not any(thread.name == "LiveOCR" for thread in threading.enumerate())
+
+
+if __name__ == "__main__":
+    test_live_ocr_debounces_scrubbing()
+    test_live_ocr_cancels_stale_jobs()
@@ -0,0 +1,145 @@
+import datetime
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+import vidmeta
+from benchmarks.synthetic_video import DEFAULT_START_TIME, format_camera_timestamp, generate_timestamp_video
+from test_digit_recognizer import get_roi, make_frame
+from vidmeta import (
+    OCR_BACKENDS, OCRBackend, OCRStrategy, TemplateBackend, calculate_timestamp_roi, create_ocr_backend,
+    get_available_ocr_backends, get_ocr_strategy, register_ocr_backend
+)
+
+
+class FixedBackend(OCRBackend):
+    """Backend that returns fixed candidates and counts the ROIs it was given."""
+
+    name = "fixed"
+    default_cost_ms = 10.0
+
+    def __init__(self, candidates=(), cost_ms=None):
+        super().__init__()
+        self.candidates = list(candidates)
+        self.calls = 0
+        self.rois = 0
+        if cost_ms is not None:
+            self.cost_ms = cost_ms
+
+    def recognize_batch(self, rois):
+        self.calls += 1
+        self.rois += len(rois)
+        return [list(self.candidates) for _ in rois]
+
+    def record_cost(self, seconds, count=1):
+        pass
+
+
+def test_registry():
+    """Test that backends are created by name and unknown names are rejected."""
+    assert {"digits", "template", "tesseract", "tesserocr"} <= set(OCR_BACKENDS)
+    assert "template" in get_available_ocr_backends()
+    backend = create_ocr_backend("tesseract", method=10, psm=6)
+    assert backend.method == "white_text" and backend.psm == 6
+    assert backend.label == "tesseract white_text" and "--psm 6" in backend.config
+    with pytest.raises(ValueError):
+        create_ocr_backend("no-such-engine")
+    with pytest.raises(ValueError):
+        create_ocr_backend("tesseract", method="no-such-method")
+    with pytest.raises(ValueError):
+        get_ocr_strategy("no-such-profile")
+
+    register_ocr_backend("fixed", FixedBackend)
+    try:
+        assert isinstance(create_ocr_backend("fixed"), FixedBackend)
+    finally:
+        del OCR_BACKENDS["fixed"]
+    print("PASS: Registry")
+
+
+def test_strategy_chains_backends():
+    """Test that steps run in order, unsure and unparseable readings fall through, and the first match wins."""
+    unsure = FixedBackend([("13/06/2025 13:28:42:285", 0.5)])
+    garbage = FixedBackend([("1306", None)])
+    relaxed_only = FixedBackend([("13/06/202513:28422:850", None)])
+    never = FixedBackend([("13/06/2025 13:28:42:999", 1.0)])
+    strategy = OCRStrategy([
+        (unsure, {"min_confidence": 0.9}),
+        garbage,
+        (relaxed_only, {"relaxed": True}),
+        never,
+    ])
+    attempt = {}
+    timestamp, text = strategy.read(np.zeros((10, 10), np.uint8), last_attempt=attempt)
+    assert timestamp == datetime.datetime(2025, 6, 13, 13, 28, 42, 285000)
+    assert attempt["backend"] == "fixed" and attempt["method"] == "fixed"
+    assert attempt["text"] == "13/06/202513:28422:850" and attempt["confidence"] is None
+    assert (unsure.calls, garbage.calls, relaxed_only.calls, never.calls) == (1, 1, 1, 0)
+
+    # Cancelled before the first step
+    assert strategy.read(np.zeros((10, 10), np.uint8), cancelled=lambda: True) == (None, None)
+    print("PASS: Strategy chains backends")
+
+
+def test_strategy_budget_and_batches():
+    """Test that a batch is read in one call per step and steps past the budget are skipped."""
+    first = FixedBackend([("no", None)], cost_ms=30.0)
+    expensive = FixedBackend([("13/06/2025 13:28:42:285", None)], cost_ms=500.0)
+    cheap = FixedBackend([("13/06/2025 13:28:42:325", None)], cost_ms=5.0)
+    strategy = OCRStrategy([first, expensive, cheap], budget_ms=100)
+    results = strategy.read_batch([np.zeros((10, 10), np.uint8)] * 5)
+    assert [text for _, text in results] == ["13/06/2025 13:28:42:325"] * 5
+    assert (first.calls, first.rois, expensive.calls, cheap.calls, cheap.rois) == (1, 5, 0, 1, 5)
+
+    # Without a budget every step may run
+    expensive.calls = 0
+    OCRStrategy([first, expensive, cheap]).read_batch([np.zeros((10, 10), np.uint8)] * 2)
+    assert expensive.calls == 1
+    print("PASS: Budget and batches")
+
+
+def test_template_backend_reads_generator_overlays():
+    """Test that template matching reads the generator's clock without a model or Tesseract."""
+    backend = TemplateBackend()
+    for width, height in ((640, 360), (1280, 720), (1920, 1080)):
+        for milliseconds in (0, 123456, 7654321):
+            timestamp = DEFAULT_START_TIME + datetime.timedelta(milliseconds=milliseconds)
+            (text, confidence), = backend.recognize(get_roi(make_frame(width, height, timestamp)))
+            assert text == format_camera_timestamp(timestamp), (width, text)
+            assert confidence > 0.7
+    assert backend.recognize(np.full((40, 200, 3), 60, np.uint8)) == []
+    print("PASS: Template backend")
+
+
+def test_fast_profile_without_tesseract(monkeypatch):
+    """Test that a profile name passed to extract_timestamp_from_frame reads the overlay without Tesseract."""
+    def no_tesseract(*args, **kwargs):
+        raise AssertionError("Tesseract must not run in the fast profile")
+
+    monkeypatch.setattr(vidmeta.pytesseract, "image_to_string", no_tesseract, raising=False)
+    timestamp = DEFAULT_START_TIME + datetime.timedelta(milliseconds=4321)
+    attempt = {}
+    result = vidmeta.extract_timestamp_from_frame(make_frame(1280, 720, timestamp),
+                                                  *calculate_timestamp_roi(1280, 720),
+                                                  last_attempt=attempt, strategy="fast")
+    assert result == (timestamp, format_camera_timestamp(timestamp))
+    assert attempt["backend"] in ("digits", "template")
+    assert "tesseract" not in repr(get_ocr_strategy("fast"))
+    print("PASS: Fast profile")
+
+
+def test_verify_with_fast_profile():
+    """Test that verify_frame_times reads a whole video in batches with the fast profile."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video_path = os.path.join(temp_dir, "video.avi")
+        generate_timestamp_video(video_path, frame_count=20, width=1280, height=720)
+        report = vidmeta.verify_frame_times(video_path, workers=2, chunk_size=8, ocr_profile="fast")
+    assert report["frames"] == 20 and not report["unreadable_frames"]
+    assert report["ok"]
+    print("PASS: Verified with the fast profile")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-s"])
@@ -0,0 +1,69 @@
+import datetime
+import os
+import tempfile
+
+import cv2
+
+from benchmarks.ocr_corpus import (check_thresholds, format_report, generate_corpus, get_strategies, load_corpus,
+                                   pareto_front, summarize_strategy)
+
+
+def test_generate_and_load_corpus():
+    """Test that synthetic images are labelled, replaced on regeneration and hand-labelled images are kept."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cv2.imwrite(os.path.join(temp_dir, "camera_1.png"), cv2.imread(os.path.join("debug_images", "original_roi.png")))
+        with open(os.path.join(temp_dir, "labels.csv"), "w") as f:
+            f.write("image,timestamp\ncamera_1.png,13/06/2025 15:11:56:257\nsynthetic_0099.png,01/01/2025 00:00:00:000\n")
+
+        written = generate_corpus(temp_dir, count=4, noise_levels=(0.0, 4.0), width=640, height=360)
+        assert written == [f"synthetic_{i:04d}.png" for i in range(4)]
+        corpus = load_corpus(temp_dir)
+        assert [os.path.basename(path) for path, _ in corpus] == ["camera_1.png"] + written
+        assert corpus[0][1] == datetime.datetime(2025, 6, 13, 15, 11, 56, 257000)
+        # Every seventh frame at 25 fps
+        assert corpus[2][1] - corpus[1][1] == datetime.timedelta(milliseconds=280)
+        assert cv2.imread(corpus[1][0]).shape[:2] == (72, 256)
+        assert not os.path.exists(os.path.join(temp_dir, "synthetic_0099.png"))
+    print("PASS: Corpus generated and loaded")
+
+
+def test_pareto_report_and_thresholds():
+    """Test the per strategy summary, the Pareto front and the regression checks."""
+    rows = [
+        summarize_strategy("cascade", [(True, 0.2, 3), (True, 0.3, 5), (False, 0.4, 14)]),
+        summarize_strategy("method 2", [(True, 0.02, 1), (False, 0.02, 1), (False, 0.03, 1)]),
+        summarize_strategy("method 7", [(True, 0.05, 1), (False, 0.04, 1), (False, 0.03, 1)]),
+    ]
+    assert rows[0]["calls_per_success"] == 11
+    assert round(rows[0]["mean_ms"]) == 300 and round(rows[0]["p95_ms"]) == 400
+    assert pareto_front(rows) == {"cascade", "method 2"}
+    for row in rows:
+        row["pareto"] = row["strategy"] in pareto_front(rows)
+    report = format_report(rows)
+    print(report)
+    assert report.splitlines()[1].startswith("* cascade") and report.splitlines()[3].startswith("  method 7")
+
+    assert check_thresholds(rows, min_accuracy=0.6, max_p95_ms=500) == []
+    assert len(check_thresholds(rows, min_accuracy=0.7, max_p95_ms=300)) == 2
+    baseline = [dict(rows[0], accuracy=1.0), dict(rows[1], mean_ms=10.0)]
+    failures = check_thresholds(rows, baseline=baseline)
+    assert any("cascade: accuracy dropped" in failure for failure in failures)
+    assert any("method 2: mean latency rose" in failure for failure in failures)
+    assert check_thresholds(rows, baseline=baseline, max_accuracy_drop=0.5, max_latency_increase=2.0) == []
+    print("PASS: Pareto front and thresholds")
+
+
+def test_strategies():
+    """Test that every preprocessing method and OCR profile is a strategy next to the full cascade."""
+    strategies = get_strategies()
+    assert strategies["cascade"] == {}
+    assert strategies["method 0"] == {"methods": [0], "relaxed": False}
+    assert strategies["relaxed"] == {"methods": [], "relaxed": True}
+    assert strategies["profile fast"] == {"strategy": "fast"}
+    print("PASS: Strategies listed")
+
+
+if __name__ == "__main__":
+    test_generate_and_load_corpus()
+    test_pareto_report_and_thresholds()
+    test_strategies()
@@ -0,0 +1,84 @@
+import json
+import os
+import tempfile
+from types import SimpleNamespace
+
+import numpy as np
+
+import vidmeta
+import vidmeta_metrics
+
+
+class FakeTesseract:
+    """Stand-in for pytesseract that returns a fixed text from the given call onwards and records the images it gets."""
+
+    def __init__(self, text, first_match_call=1):
+        self.text = text
+        self.first_match_call = first_match_call
+        self.calls = 0
+        self.images = []
+        self.pytesseract = SimpleNamespace(TesseractError=RuntimeError, tesseract_cmd="tesseract")
+
+    def image_to_string(self, image, config=None):
+        self.calls += 1
+        self.images.append(image)
+        return self.text if self.calls >= self.first_match_call else ""
+
+
+def test_ocr_metrics_per_method_and_pattern(monkeypatch):
+    """Test that attempts, the matching method and pattern, and the fallback are counted."""
+    vidmeta_metrics.reset()
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    roi = vidmeta.calculate_timestamp_roi(320, 240)
+
+    # The fourth preprocessing method (index 3) reads the timestamp
+    monkeypatch.setattr(vidmeta, "pytesseract", FakeTesseract("13/06/2025 13:28:42:285", 4))
+    extracted_time, _ = vidmeta.extract_timestamp_from_frame(frame, *roi)
+    assert extracted_time is not None
+    assert sum(vidmeta.OCR_ATTEMPTS.get(stage="preprocess", method=i, psm=7) for i in range(11)) == 4
+    assert vidmeta.OCR_TIMESTAMPS.get(stage="preprocess", method=3, psm=7, pattern="%d/%m/%Y %H:%M:%S:%f") == 1
+    assert vidmeta.OCR_LATENCY.get(stage="preprocess", method=0, psm=7)["count"] == 1
+    print("PASS: Successful method and pattern counted")
+
+    # Nothing is read, so the relaxed fallback runs all PSMs
+    monkeypatch.setattr(vidmeta, "pytesseract", FakeTesseract("", 1))
+    assert vidmeta.extract_timestamp_from_frame(frame, *roi) == (None, None)
+    assert all(vidmeta.OCR_ATTEMPTS.get(stage="relaxed", method="gray", psm=psm) == 1 for psm in (7, 6, 3))
+    assert vidmeta.OCR_FRAMES.get(outcome="preprocess") == 1 and vidmeta.OCR_FRAMES.get(outcome="not_found") == 1
+    print("PASS: Relaxed fallback and failures counted")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        prom_path = os.path.join(temp_dir, "ocr.prom")
+        json_path = os.path.join(temp_dir, "ocr.json")
+        vidmeta_metrics.export(prom_path)
+        vidmeta_metrics.export(json_path)
+        with open(prom_path) as f:
+            prom = f.read()
+        with open(json_path) as f:
+            metrics = json.load(f)
+    print(prom)
+    assert "# TYPE vidmeta_ocr_latency_seconds histogram" in prom
+    assert 'vidmeta_ocr_frames_total{outcome="not_found"} 1' in prom
+    assert 'vidmeta_ocr_latency_seconds_bucket{method="0",psm="7",stage="preprocess",le="+Inf"} 2' in prom
+    assert metrics["vidmeta_ocr_attempts_total"]["type"] == "counter"
+    print("PASS: Metrics exported as Prometheus textfile and JSON")
+    vidmeta_metrics.reset()
+
+
+def test_debug_images_only_on_request(monkeypatch):
+    """Test that the cascade only writes debug images when asked to."""
+    written = []
+    monkeypatch.setattr(vidmeta.cv2, "imwrite", lambda path, image: written.append(os.path.basename(path)))
+    monkeypatch.setattr(vidmeta, "pytesseract", FakeTesseract("13/06/2025 13:28:42:285", 2))
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    roi = vidmeta.calculate_timestamp_roi(320, 240)
+    assert vidmeta.extract_timestamp_from_frame(frame, *roi, digit_model=False)[0] is not None
+    assert written == []
+    assert vidmeta.extract_timestamp_from_frame(frame, *roi, digit_model=False, debug_images=True)[0] is not None
+    assert written == ["original_roi.png", "gray_roi.png", "preprocess_method_0.png"]
+    print("PASS: Debug images only written on request")
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-s"])
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import time
+
+from test_frame_sources import write_test_video
+from vidmeta import PlaybackEngine
+
+
+def play(engine, timeout=5.0):
+    """Poll a playback engine like the viewer does and return the frame numbers shown."""
+    shown = []
+    engine.start()
+    deadline = time.monotonic() + timeout
+    while not engine.finished and time.monotonic() < deadline:
+        due = engine.next_frame()
+        if due is not None:
+            shown.append(due[0])
+        time.sleep(0.002)
+    engine.stop()
+    return shown
+
+
+def test_playback_keeps_frame_rate():
+    """Test that frames are shown in order at the video frame rate."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video_path = os.path.join(temp_dir, "test.avi")
+        write_test_video(video_path, frame_count=12, fps=100.0)
+
+        start = time.perf_counter()
+        shown = play(PlaybackEngine(video_path, lambda n, frame: frame.shape, start_frame=2))
+        elapsed = time.perf_counter() - start
+        print(f"Shown: {shown} in {elapsed:.3f}s")
+        assert shown == sorted(shown) and shown[0] == 2 and shown[-1] == 11
+        assert elapsed >= 0.09  # 10 frames at 100 fps
+        print("PASS: Playback paced by the wall clock")
+
+
+def test_playback_drops_frames_when_rendering_is_slow():
+    """Test that slow rendering drops frames instead of slowing playback down."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video_path = os.path.join(temp_dir, "test.avi")
+        write_test_video(video_path, frame_count=12, fps=100.0)
+
+        def slow_render(frame_number, frame):
+            time.sleep(0.03)  # Three frame intervals
+            return frame_number
+
+        start = time.perf_counter()
+        engine = PlaybackEngine(video_path, slow_render)
+        shown = play(engine)
+        elapsed = time.perf_counter() - start
+        print(f"Shown: {shown}, dropped: {engine.dropped}, {elapsed:.3f}s")
+        assert engine.dropped > 0 and len(shown) < 12
+        assert elapsed < 0.3  # Rendering every frame would take at least 0.36s
+        print("PASS: Late frames are dropped")
+
+
+if __name__ == "__main__":
+    test_playback_keeps_frame_rate()
+    test_playback_drops_frames_when_rendering_is_slow()
@@ -0,0 +1,87 @@
+import threading
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from vidmeta import PREPROCESSING_METHODS, PreprocessingGraph, get_preprocessing_graph
+
+
+def make_roi(seed=0):
+    """A noisy BGR timestamp region with white text."""
+    rng = np.random.default_rng(seed)
+    roi = rng.integers(0, 120, (72, 320, 3), dtype=np.uint8)
+    cv2.putText(roi, "13/06/2025 13:28:42:285", (5, 45), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+    return roi
+
+
+def test_methods_match_separate_operations():
+    """Test that the shared steps give the same images as running every method on its own."""
+    roi = make_roi()
+    gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+    kernel = np.ones((2, 2), np.uint8)
+    expected = {
+        "gray": gray,
+        "adaptive_binary_inv": cv2.bitwise_not(
+            cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
+        ),
+        "equalized_binary_inv_120": cv2.threshold(cv2.equalizeHist(gray), 120, 255, cv2.THRESH_BINARY_INV)[1],
+        "blurred_binary_inv_120": cv2.threshold(cv2.GaussianBlur(gray, (3, 3), 0), 120, 255, cv2.THRESH_BINARY_INV)[1],
+        "binary_180_open": cv2.morphologyEx(cv2.threshold(gray, 180, 255, cv2.THRESH_BINARY)[1], cv2.MORPH_OPEN, kernel),
+        "white_text": cv2.morphologyEx(
+            cv2.threshold(cv2.GaussianBlur(cv2.equalizeHist(gray), (3, 3), 0), 190, 255, cv2.THRESH_BINARY)[1],
+            cv2.MORPH_CLOSE, kernel
+        ),
+    }
+    graph = PreprocessingGraph()
+    graph.set_roi(roi)
+    for name, image in expected.items():
+        assert np.array_equal(graph.get(name), image), name
+    assert len(PREPROCESSING_METHODS) == 11
+    print("PASS: Shared steps match the separate operations")
+
+
+def test_buffers_are_reused():
+    """Test that later ROIs of the same size are preprocessed into the same buffers without new allocations."""
+    graph = PreprocessingGraph()
+    graph.set_roi(make_roi(0))
+    first = [graph.get(name) for name in PREPROCESSING_METHODS]
+    allocated = graph.allocated_bytes()
+
+    tracemalloc.start()
+    try:
+        for seed in range(1, 21):
+            graph.set_roi(make_roi(seed))
+            tracemalloc.reset_peak()
+            results = [graph.get(name) for name in PREPROCESSING_METHODS]
+            _, peak = tracemalloc.get_traced_memory()
+            # Far below the size of a single 72x320 image
+            assert peak < 72 * 320 // 4, peak
+    finally:
+        tracemalloc.stop()
+    assert all(a is b for a, b in zip(first[1:], results[1:]))
+    assert graph.allocated_bytes() == allocated
+    # One buffer per step: gray, six shared steps (the adaptive threshold is also method 4) and
+    # the nine other methods
+    assert allocated == 16 * 72 * 320
+
+    graph.set_roi(make_roi()[:36])
+    assert graph.get("white_text").shape == (36, 320)
+    print("PASS: Buffers reused across ROIs")
+
+
+def test_graph_per_thread():
+    """Test that every thread preprocesses into its own graph."""
+    graphs = []
+    thread = threading.Thread(target=lambda: graphs.append(get_preprocessing_graph()))
+    thread.start()
+    thread.join()
+    assert get_preprocessing_graph() is get_preprocessing_graph()
+    assert graphs[0] is not get_preprocessing_graph()
+    print("PASS: One graph per thread")
+
+
+if __name__ == "__main__":
+    test_methods_match_separate_operations()
+    test_buffers_are_reused()
+    test_graph_per_thread()
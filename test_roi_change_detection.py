@@ -0,0 +1,88 @@
+import datetime
+
+import vidmeta
+from benchmarks.synthetic_video import DEFAULT_START_TIME, format_camera_timestamp
+from test_digit_recognizer import make_frame
+from test_ocr_metrics import FakeTesseract
+from vidmeta import ROIChangeDetector, calculate_timestamp_roi, parse_frame_timestamp
+
+WIDTH, HEIGHT = 1280, 720
+ROI = calculate_timestamp_roi(WIDTH, HEIGHT)
+
+
+class FakeExtract:
+    """Full OCR that knows the time drawn on every frame."""
+
+    def __init__(self):
+        self.calls = 0
+        self.times = {}
+
+    def frame(self, timestamp):
+        frame = make_frame(WIDTH, HEIGHT, timestamp)
+        self.times[frame.tobytes()] = timestamp
+        return frame
+
+    def __call__(self, frame, roi_x, roi_y, roi_width, roi_height, last_attempt=None):
+        self.calls += 1
+        text = format_camera_timestamp(self.times[frame.tobytes()])
+        last_attempt.update(method=2)
+        return parse_frame_timestamp(text), text
+
+
+def test_unchanged_roi_reuses_result():
+    """Test that a repeated or duplicated frame is not read again."""
+    extract = FakeExtract()
+    detector = ROIChangeDetector(extract)
+    frame = extract.frame(DEFAULT_START_TIME)
+    first = detector.extract(frame, *ROI)
+    assert detector.extract(frame.copy(), *ROI) == first
+    assert detector.extract(frame, *ROI) == first
+    assert extract.calls == 1
+    assert detector.stats == {"unchanged": 2, "partial": 0, "full": 1}
+    print("PASS: Unchanged ROIs reuse the result")
+
+
+def test_only_changed_digits_are_read(monkeypatch):
+    """Test that only the columns of the changed digits are read when the clock ticks."""
+    extract = FakeExtract()
+    detector = ROIChangeDetector(extract)
+    detector.extract(extract.frame(DEFAULT_START_TIME), *ROI)
+
+    # 285 becomes 325, so the last digit stays the same
+    tesseract = FakeTesseract("32")
+    monkeypatch.setattr(vidmeta, "pytesseract", tesseract)
+    next_time = DEFAULT_START_TIME + datetime.timedelta(milliseconds=40)
+    timestamp, text = detector.extract(extract.frame(next_time), *ROI)
+    assert text == "13/06/2025 13:28:42:325"
+    assert timestamp == next_time
+    assert extract.calls == 1 and len(tesseract.images) == 1
+    # Only the last characters were cropped
+    assert tesseract.images[0].shape[1] < ROI[2] // 4
+    assert detector.stats["partial"] == 1
+    print("PASS: Only changed digits read")
+
+
+def test_unexpected_partial_read_falls_back(monkeypatch):
+    """Test that a partial read that does not fit the previous text runs the full cascade."""
+    extract = FakeExtract()
+    detector = ROIChangeDetector(extract)
+    detector.extract(extract.frame(DEFAULT_START_TIME), *ROI)
+
+    monkeypatch.setattr(vidmeta, "pytesseract", FakeTesseract("325"))
+    next_time = DEFAULT_START_TIME + datetime.timedelta(milliseconds=40)
+    assert detector.extract(extract.frame(next_time), *ROI)[1] == "13/06/2025 13:28:42:325"
+    assert extract.calls == 2
+
+    # Too many changed characters: the minutes, seconds and milliseconds
+    tesseract = FakeTesseract("")
+    monkeypatch.setattr(vidmeta, "pytesseract", tesseract)
+    later = next_time + datetime.timedelta(minutes=1, seconds=7, milliseconds=123)
+    assert detector.extract(extract.frame(later), *ROI)[0] == later.replace(microsecond=448000)
+    assert extract.calls == 3 and not tesseract.images
+    assert detector.stats == {"unchanged": 0, "partial": 0, "full": 3}
+    print("PASS: Falls back to the full cascade")
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-s"])
@@ -0,0 +1,47 @@
+from vidmeta import check_frame_continuity, plan_transcode_segments
+
+
+def test_segments_split_at_keyframes():
+    """Test that chunks start on keyframes and cover every frame of the snippet exactly once."""
+    fps = 25.0
+    keyframes = [second * 2.0 for second in range(0, 60)]
+
+    segments = plan_transcode_segments(3.4, 83.4, keyframes, fps, 4)
+    print(f"Segments: {segments}")
+
+    assert len(segments) == 4
+    assert sum(frame_count for _, frame_count in segments) == round(80 * fps)
+    for seek_position, _ in segments[1:]:
+        # Seeks are half a frame before a keyframe
+        keyframe = seek_position + 0.5 / fps
+        assert any(abs(keyframe - k) < 1e-9 for k in keyframes)
+    print("PASS: Chunks are keyframe aligned and cover the whole snippet")
+
+
+def test_segments_without_keyframes():
+    """Test that a range without usable keyframes is encoded as one chunk."""
+    segments = plan_transcode_segments(3.4, 83.4, [0.0], 25.0, 4)
+    print(f"Segments: {segments}")
+    assert len(segments) == 1 and segments[0][1] == 2000
+    print("PASS: No keyframes means a single chunk")
+
+
+def test_frame_continuity_check():
+    """Test that dropped frames and wrong frame counts are reported."""
+    fps = 25.0
+    packet_times = [i / fps for i in range(100)]
+    assert check_frame_continuity(packet_times, 100, fps) is None
+
+    missing_chunk = packet_times[:40] + packet_times[50:]
+    problem = check_frame_continuity(missing_chunk, 90, fps)
+    print(f"Missing chunk: {problem}")
+    assert problem is not None and "gap" in problem
+
+    assert check_frame_continuity(packet_times, 101, fps) is not None
+    print("PASS: Gaps and frame count mismatches are detected")
+
+
+if __name__ == "__main__":
+    test_segments_split_at_keyframes()
+    test_segments_without_keyframes()
+    test_frame_continuity_check()
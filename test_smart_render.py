@@ -0,0 +1,39 @@
+from vidmeta import plan_smart_render_pieces
+
+
+def test_smart_render_pieces():
+    """Test that only the partial GOPs at the boundaries are re-encoded."""
+    fps = 25.0
+    keyframes = [float(second) for second in range(0, 20)]
+
+    # 2.36s to 7.56s: 16 frames before the keyframe at 3s, 4 whole GOPs, 14 frames after 7s
+    pieces = plan_smart_render_pieces(2.36, 7.56, keyframes, fps)
+    print(f"Pieces: {pieces}")
+
+    assert [copy for _, _, copy in pieces] == [False, True, False]
+    assert [frame_count for _, frame_count, _ in pieces] == [16, 100, 14]
+    assert sum(frame_count for _, frame_count, _ in pieces) == round((7.56 - 2.36) * fps)
+    # The copied piece seeks just past its keyframe so it does not land on the previous one
+    assert 3.0 < pieces[1][0] < 3.0 + 1 / fps
+    print("PASS: Boundary GOPs are re-encoded and the middle is copied")
+
+
+def test_smart_render_keyframe_aligned():
+    """Test that a snippet starting and ending on keyframes is copied entirely."""
+    pieces = plan_smart_render_pieces(3.0, 6.0, [float(second) for second in range(0, 20)], 25.0)
+    print(f"Pieces: {pieces}")
+
+    assert len(pieces) == 1 and pieces[0][2] and pieces[0][1] == 75
+    print("PASS: Keyframe-aligned snippet needs no re-encoding")
+
+
+def test_smart_render_without_complete_gop():
+    """Test that a snippet inside a single GOP is not smart rendered."""
+    assert plan_smart_render_pieces(3.2, 3.8, [float(second) for second in range(0, 20)], 25.0) is None
+    print("PASS: Snippets without a complete GOP fall back to transcoding")
+
+
+if __name__ == "__main__":
+    test_smart_render_pieces()
+    test_smart_render_keyframe_aligned()
+    test_smart_render_without_complete_gop()
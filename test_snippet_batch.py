@@ -0,0 +1,97 @@
+import csv
+import datetime
+import os
+import tempfile
+
+import vidmeta
+from vidmeta import build_multi_snippet_command, collect_snippet_targets, parse_frame_timestamp
+
+
+def write_frame_times(directory, rows):
+    """Write a frame_times.txt file with the given rows."""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "frame_times.txt"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Frame", "Timestamp"])
+        writer.writerows(rows)
+
+
+def test_parse_frame_timestamp():
+    """Test that both layouts written by process_video_file can be read back."""
+    expected = datetime.datetime(2025, 6, 13, 13, 28, 42, 318000)
+    for ts_str in ["20250613_132842.318", "20250613_13:28:42.318", "13/06/2025 132842:318", "13/06/2025 13:28:42:318"]:
+        parsed = parse_frame_timestamp(ts_str)
+        print(f"{ts_str} -> {parsed}")
+        assert parsed == expected
+    print("PASS: All frame timestamp layouts parse to the same time")
+
+
+def test_collect_snippet_targets():
+    """Test that targets are collected from every frame_times.txt in a tree."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        write_frame_times(os.path.join(temp_dir, "a"), [[1, "20250613_132842.318"], [2, "20250613_132842.351"]])
+        write_frame_times(os.path.join(temp_dir, "b", "c"), [[1, "20250613_140000.000"], [2, "20250613_140010.000"]])
+
+        targets = collect_snippet_targets(temp_dir, os.path.join(temp_dir, "extended.avi"))
+        targets.sort()
+        print(f"Collected targets: {targets}")
+
+        assert len(targets) == 2
+        assert targets[0][2] == os.path.join(temp_dir, "a", "extended_snippet.avi")
+        assert targets[1][1] - targets[1][0] == datetime.timedelta(seconds=10)
+        print("PASS: Targets collected from all timestamp files")
+
+
+def test_multi_snippet_command_reads_input_once():
+    """Test that all snippets are written by one command with a single input."""
+    snippets = [(10.0, 20.0, "one.avi"), (35.5, 40.0, "two.mp4")]
+    command = build_multi_snippet_command("extended.avi", snippets)
+    print(f"Command: {' '.join(command)}")
+
+    assert command.count("-i") == 1
+    assert command[command.index("-i") - 1] == "10.0"
+    assert "one.avi" in command and "two.mp4" in command
+    # The second snippet is offset from the single seek point
+    assert "25.5" in command
+    print("PASS: Snippets share a single input and seek")
+
+
+def test_copied_snippets_seek_their_own_input():
+    """Test that stream copied snippets are seeked on the input side, so they start at the preceding keyframe."""
+    snippets = [(0.4, 2.0, "one.avi"), (1.8, 4.0, "two.mp4"), (5.2, 6.8, "three.avi")]
+    command = build_multi_snippet_command("extended.avi", snippets)
+    print(f"Command: {' '.join(command)}")
+
+    # All inputs come before the first output
+    inputs = [i for i, arg in enumerate(command) if arg == "-i"]
+    assert [command[i - 1] for i in inputs] == ["0.4", "5.2"]
+    assert inputs[-1] < command.index("one.avi")
+    # The transcoded snippet is cut from the shared seek, each copied one from the input seeked to its start
+    two = command[command.index("one.avi") + 1:command.index("two.mp4")]
+    assert two[:4] == ["-ss", "1.4", "-t", "2.2"] and two[two.index("-map") + 1] == "0"
+    three = command[command.index("two.mp4") + 1:command.index("three.avi")]
+    assert "-ss" not in three and three[three.index("-map") + 1] == "1"
+    one = command[inputs[-1] + 2:command.index("one.avi")]
+    assert "-ss" not in one and one[one.index("-map") + 1] == "0"
+    print("PASS: Copied snippets seek their own input")
+
+
+def test_snippets_without_ffmpeg(monkeypatch):
+    """Test that every target fails with a message, rather than raising, when ffmpeg is not installed."""
+    monkeypatch.setattr(vidmeta, "find_tool", lambda name: None)
+    start = datetime.datetime(2025, 6, 13, 13, 28, 42)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_path = os.path.join(temp_dir, "extended.avi")
+        open(input_path, "wb").close()
+        targets = [(start, start + datetime.timedelta(seconds=5), os.path.join(temp_dir, f"{i}.avi")) for i in range(2)]
+        results = vidmeta.extract_video_snippets(input_path, targets)
+    assert [(output_path, success) for output_path, success, _ in results] == [(t[2], False) for t in targets]
+    assert all("ffmpeg not found" in error_msg for _, _, error_msg in results)
+    print("PASS: Missing ffmpeg reported per snippet")
+
+
+if __name__ == "__main__":
+    test_parse_frame_timestamp()
+    test_collect_snippet_targets()
+    test_multi_snippet_command_reads_input_once()
+    test_copied_snippets_seek_their_own_input()
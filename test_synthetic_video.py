@@ -0,0 +1,50 @@
+import datetime
+import os
+import tempfile
+
+import cv2
+
+from benchmarks.synthetic_video import format_camera_timestamp, generate_timestamp_video, overlay_clock_times
+from vidmeta import calculate_timestamp_roi
+
+
+def test_overlay_clock_times():
+    """Test that dropped frames make the clock jump and drift changes its rate."""
+    start = datetime.datetime(2025, 6, 13, 13, 28, 42, 285000)
+    times = overlay_clock_times(5, fps=25.0, start_time=start, dropped_frames=[2])
+    assert [round((t - start).total_seconds() * 1000) for t in times] == [0, 40, 120, 160, 200]
+
+    drifting = overlay_clock_times(251, fps=25.0, start_time=start, drift_ppm=1000)
+    assert drifting[-1] - start == datetime.timedelta(seconds=10.01)
+    assert format_camera_timestamp(times[2]) == "13/06/2025 13:28:42:405"
+    print("PASS: Overlay clock follows drops and drift")
+
+
+def test_generated_video_is_deterministic():
+    """Test that a generated video has the requested frames, a clock overlay and the same content every time."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = [os.path.join(temp_dir, name) for name in ("a.avi", "b.avi")]
+        for path in paths:
+            times = generate_timestamp_video(path, frame_count=10, width=320, height=240, noise=3.0)
+        assert len(times) == 10
+
+        frames = []
+        for path in paths:
+            capture = cv2.VideoCapture(path)
+            assert int(capture.get(cv2.CAP_PROP_FRAME_COUNT)) == 10
+            ok, frame = capture.read()
+            capture.release()
+            assert ok and frame.shape == (240, 320, 3)
+            frames.append(frame)
+        assert (frames[0] == frames[1]).all()
+
+        # The white clock is drawn inside the timestamp region
+        roi_x, roi_y, roi_width, roi_height = calculate_timestamp_roi(320, 240)
+        assert frames[0][roi_y:roi_y+roi_height, roi_x:roi_x+roi_width].max() > 240
+        assert frames[0][:, :roi_x].max() < 200
+        print("PASS: Generated video is deterministic and has a clock overlay")
+
+
+if __name__ == "__main__":
+    test_overlay_clock_times()
+    test_generated_video_is_deterministic()
@@ -0,0 +1,55 @@
+import os
+import tempfile
+
+import vidmeta
+from test_frame_cache import wait_for
+from test_frame_sources import write_test_video
+from vidmeta import ThumbnailStrip, get_thumbnail_cache_path, select_thumbnail_frames
+
+
+def test_select_thumbnail_frames():
+    """Test that keyframes are preferred and thinned out evenly."""
+    keyframes = list(range(0, 10000, 50))
+    frames = select_thumbnail_frames(keyframes, 10000, 25.0, max_thumbnails=40)
+    assert len(frames) == 40 and set(frames) <= set(keyframes)
+    assert frames[0] == 0 and frames[-1] > 9000
+
+    assert select_thumbnail_frames([], 1000, 25.0) == [0, 250, 500, 750]
+    print("PASS: Thumbnail frames selected")
+
+
+def test_thumbnails_cached_on_disk(monkeypatch):
+    """Test that thumbnails are generated in the background and reloaded from the sidecar file."""
+    # The MJPG test video is all keyframes when ffprobe can list them; space the thumbnails by time instead
+    monkeypatch.setattr(vidmeta.FrameSource, "keyframe_frames", lambda self: [])
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video_path = os.path.join(temp_dir, "test.avi")
+        write_test_video(video_path, frame_count=30, fps=1.0)
+
+        strip = ThumbnailStrip(video_path, thumb_width=32)
+        strip.start()
+        assert wait_for(lambda: strip.complete)
+        strip.close()
+        assert len(strip) == 3
+        assert get_thumbnail_cache_path(video_path).exists()
+
+        frame_number, thumb = strip.nearest(12)
+        assert frame_number == 10 and thumb.shape == (24, 32, 3)
+        assert strip.render(320, 24).shape == (24, 320, 3)
+
+        reloaded = ThumbnailStrip(video_path, thumb_width=32)
+        reloaded.start()
+        assert reloaded.complete and len(reloaded) == 3
+        print("PASS: Thumbnails reloaded from the cache file")
+
+        # A different thumbnail size does not use the cache
+        resized = ThumbnailStrip(video_path, thumb_width=48)
+        resized.start()
+        assert wait_for(lambda: resized.complete)
+        resized.close()
+        assert resized.nearest(0)[1].shape[1] == 48
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-s"])
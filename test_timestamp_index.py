@@ -0,0 +1,121 @@
+import datetime
+import json
+import os
+import tempfile
+
+import pytest
+
+import vidmeta
+from benchmarks.synthetic_video import generate_timestamp_video
+from vidmeta import (
+    TIMESTAMP_INDEX_VERSION,
+    _video_file_signature,
+    build_timestamp_index,
+    estimate_frame_for_time,
+    fit_clock_model,
+    get_timestamp_index_path,
+    load_timestamp_index,
+)
+
+
+def create_test_index(fps=25.0, total_frames=25 * 600, interval_seconds=10):
+    """Create an index dict for a video whose overlay clock runs exactly at the frame rate."""
+    base_time = datetime.datetime(2025, 6, 13, 13, 28, 42, 285000)
+    interval_frames = int(fps * interval_seconds)
+    frames = list(range(0, total_frames, interval_frames))
+    offsets_ms = [int(round(frame * 1000 / fps)) for frame in frames]
+    clock_model, frames, offsets_ms = fit_clock_model(frames, offsets_ms, fps)
+    return {
+        "version": TIMESTAMP_INDEX_VERSION,
+        "fps": fps,
+        "total_frames": total_frames,
+        "roi": [768, 0, 512, 144],
+        "sample_interval_frames": interval_frames,
+        "base_time": base_time.isoformat(),
+        "frames": frames,
+        "offsets_ms": offsets_ms,
+        "clock_model": clock_model,
+    }, base_time
+
+
+def test_clock_model_discards_misreads():
+    """Test that an OCR misread does not skew the fitted clock model."""
+    fps = 25.0
+    frames = list(range(0, 2500, 250))
+    offsets_ms = [frame * 40 for frame in frames]
+    # One sample read an hour off
+    offsets_ms[4] += 3600 * 1000
+
+    clock_model, kept_frames, _ = fit_clock_model(frames, offsets_ms, fps)
+    print(f"Clock model: {clock_model}")
+
+    assert 250 * 4 not in kept_frames
+    assert abs(clock_model["ms_per_frame"] - 40.0) < 0.01
+    print("PASS: Outlier sample was discarded and the model matches the frame rate")
+
+
+def test_estimate_frame_for_time():
+    """Test that lookups interpolate between samples and reject times outside the video."""
+    index, base_time = create_test_index()
+
+    target = base_time + datetime.timedelta(seconds=123.4)
+    estimate = estimate_frame_for_time(index, target)
+    print(f"Estimated frame for {target}: {estimate}")
+    assert estimate == int(round(123.4 * 25))
+
+    before = base_time - datetime.timedelta(hours=1)
+    after = base_time + datetime.timedelta(hours=1)
+    assert estimate_frame_for_time(index, before) is None
+    assert estimate_frame_for_time(index, after) is None
+    print("PASS: Index lookups interpolate and reject out-of-range times")
+
+
+def test_index_invalidated_when_file_changes():
+    """Test that a stale index is ignored once the video file changes."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video_path = os.path.join(temp_dir, "extended.avi")
+        with open(video_path, "wb") as f:
+            f.write(b"\0" * 1024)
+
+        index, _ = create_test_index()
+        index["video"] = _video_file_signature(video_path)
+        with open(get_timestamp_index_path(video_path), "w") as f:
+            json.dump(index, f)
+
+        assert load_timestamp_index(video_path) is not None
+        print("PASS: Index loads while the video is unchanged")
+
+        with open(video_path, "ab") as f:
+            f.write(b"\0" * 16)
+        assert load_timestamp_index(video_path) is None
+        print("PASS: Index is invalidated when the video changes")
+
+
+def test_interrupted_build_keeps_previous_index(monkeypatch):
+    """Test that an index build interrupted while saving leaves the previous index file intact."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video_path = os.path.join(temp_dir, "extended.avi")
+        generate_timestamp_video(video_path, frame_count=30, width=1280, height=720)
+        index = build_timestamp_index(video_path, sample_interval_seconds=0.4, ocr_profile="fast")
+        index_path = get_timestamp_index_path(video_path)
+        with open(index_path) as f:
+            saved = f.read()
+        assert json.loads(saved)["frames"] == index["frames"]
+
+        def interrupted_dump(data, f, **kwargs):
+            f.write('{"version":')
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(vidmeta.json, "dump", interrupted_dump)
+        with pytest.raises(KeyboardInterrupt):
+            build_timestamp_index(video_path, sample_interval_seconds=0.4, ocr_profile="fast")
+        with open(index_path) as f:
+            assert f.read() == saved
+        assert sorted(os.listdir(temp_dir)) == sorted(["extended.avi", index_path.name])
+    print("PASS: Interrupted build keeps the previous index")
+
+
+if __name__ == "__main__":
+    test_clock_model_discards_misreads()
+    test_estimate_frame_for_time()
+    test_index_invalidated_when_file_changes()
@@ -0,0 +1,73 @@
+import vidmeta
+from vidmeta import clear_toolchain_cache, find_tool, get_tool_path, parse_ffmpeg_capabilities, parse_tool_version
+
+
+ENCODERS_OUTPUT = """Encoders:
+ V..... = Video
+ A..... = Audio
+ ------
+ V....D libx264              libx264 H.264 / AVC / MPEG-4 AVC / MPEG-4 part 10 (codec h264)
+ A....D aac                  AAC (Advanced Audio Coding)
+"""
+
+DEMUXERS_OUTPUT = """Formats:
+ D.. = Demuxing supported
+ ---
+ D   avi             AVI (Audio Video Interleaved)
+ D   mov,mp4,m4a,3gp,3g2,mj2 QuickTime / MOV
+"""
+
+FILTERS_OUTPUT = """Filters:
+  T.. = Timeline support
+  | = Source or sink filter
+ ..C scale             V->V       Scale the input video size and/or convert the image format.
+"""
+
+
+def test_parse_ffmpeg_capabilities():
+    """Test that names are read from ffmpeg listings and legend lines are skipped."""
+    assert parse_ffmpeg_capabilities(ENCODERS_OUTPUT) == {"libx264", "aac"}
+    assert {"avi", "mov", "mp4"} <= parse_ffmpeg_capabilities(DEMUXERS_OUTPUT)
+    assert parse_ffmpeg_capabilities(FILTERS_OUTPUT) == {"scale"}
+    print("PASS: Capabilities parsed from ffmpeg listings")
+
+
+def test_parse_tool_version():
+    """Test that release numbers are read from version lines and git builds have none."""
+    assert parse_tool_version("ffmpeg version 4.2.2 Copyright (c) 2000-2019 the FFmpeg developers") == (4, 2)
+    assert parse_tool_version("ffmpeg version n5.1.4 Copyright (c) 2000-2023") == (5, 1)
+    assert parse_tool_version("ffmpeg version 7.0-essentials_build-www.gyan.dev") == (7, 0)
+    assert parse_tool_version("ffmpeg version N-109000-g1234abcd") is None
+    assert parse_tool_version(None) is None
+    print("PASS: Tool versions parsed")
+
+
+def test_tool_lookup_is_cached(monkeypatch):
+    """Test that a tool is only looked up once per process."""
+    calls = []
+
+    def fake_which(name):
+        calls.append(name)
+        return f"/opt/bin/{name}"
+
+    clear_toolchain_cache()
+    monkeypatch.setattr(vidmeta.shutil, "which", fake_which)
+    try:
+        assert find_tool("ffprobe") == "/opt/bin/ffprobe"
+        assert get_tool_path("ffprobe") == "/opt/bin/ffprobe"
+        assert calls == ["ffprobe"]
+        print("PASS: Tool path resolved once")
+    finally:
+        clear_toolchain_cache()
+
+
+def test_missing_tool_falls_back_to_name(monkeypatch):
+    """Test that a missing tool is reported as None and run by its bare name."""
+    clear_toolchain_cache()
+    monkeypatch.setattr(vidmeta.shutil, "which", lambda name: None)
+    try:
+        assert find_tool("ffmpeg") is None
+        assert get_tool_path("ffmpeg") == "ffmpeg"
+        print("PASS: Missing tool falls back to its name")
+    finally:
+        clear_toolchain_cache()
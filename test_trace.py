@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+
+import vidmeta_trace
+from vidmeta_trace import percentile, span, traced
+
+
+def test_spans_only_recorded_when_enabled():
+    """Test that tracing is a no-op until enabled and records nested spans afterwards."""
+    @traced("work")
+    def work():
+        with span("work.step", item=1):
+            pass
+
+    vidmeta_trace.reset()
+    work()
+    assert vidmeta_trace.get_events() == []
+
+    vidmeta_trace.enable()
+    try:
+        work()
+        work()
+    finally:
+        vidmeta_trace.disable()
+    names = [event[0] for event in vidmeta_trace.get_events()]
+    print(f"Recorded spans: {names}")
+    # Inner spans finish first
+    assert names == ["work.step", "work", "work.step", "work"]
+    print("PASS: Spans are only recorded while tracing is enabled")
+
+    rows = {row["name"]: row for row in vidmeta_trace.summarize()}
+    assert rows["work"]["count"] == 2 and rows["work"]["total_ms"] >= rows["work.step"]["total_ms"]
+    print(vidmeta_trace.format_summary())
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "trace.json")
+        vidmeta_trace.export_chrome_trace(path)
+        with open(path) as f:
+            trace = json.load(f)
+    complete = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert len(complete) == 4 and complete[0]["cat"] == "work" and complete[0]["args"] == {"item": "1"}
+    assert min(event["ts"] for event in complete) == 0
+    print("PASS: Chrome trace exported")
+    vidmeta_trace.reset()
+
+
+def test_percentile():
+    """Test nearest-rank percentiles."""
+    values = list(range(1, 101))
+    assert percentile(values, 0.50) == 50
+    assert percentile(values, 0.95) == 95
+    assert percentile(values, 0.99) == 99
+    assert percentile([7], 0.99) == 7 and percentile([], 0.5) is None
+    print("PASS: Percentiles use the nearest rank")
+
+
+if __name__ == "__main__":
+    test_spans_only_recorded_when_enabled()
+    test_percentile()
@@ -0,0 +1,134 @@
+import os
+import random
+import tempfile
+import time
+
+import vidmeta
+from benchmarks.synthetic_video import format_camera_timestamp, generate_timestamp_video
+from vidmeta import FrameTimeline, verify_frame_times
+
+
+def write_frame_times(monkeypatch, video_path, first_overlay):
+    """Run process_video_file headless, with OCR of the first frame returning its overlay."""
+    with monkeypatch.context() as patch:
+        patch.setattr(
+            vidmeta, "extract_timestamp_from_frame",
+            lambda frame, *roi, **kwargs: (first_overlay, format_camera_timestamp(first_overlay))
+        )
+        assert vidmeta.process_video_file(video_path, skip_extended_video=True, headless=True)
+
+
+def test_verify_reports_gaps_repeats_and_mismatches(monkeypatch):
+    """Test that the pipeline reads every frame in order and reports drops, duplicates and mismatches."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video_path = os.path.join(temp_dir, "video.avi")
+        # Camera frames 10 and 11 were dropped
+        truth = generate_timestamp_video(video_path, frame_count=40, width=320, height=240, dropped_frames=[10, 11])
+        overlay = list(truth)
+        overlay[21] = overlay[20]  # A duplicated frame
+        overlay[30] = None         # An unreadable overlay
+
+        def fake_read_chunk(chunk, roi_width, roi_height):
+            # Finish out of order, so the results have to be reassembled
+            time.sleep(random.uniform(0, 0.01))
+            assert all(roi.shape == (roi_height, roi_width) for _, roi in chunk)
+            return [(frame_number, overlay[frame_number]) for frame_number, _ in chunk]
+
+        monkeypatch.setattr(vidmeta, "_read_overlay_chunk", fake_read_chunk)
+
+        # frame_times.txt as process_video_file writes it, from the overlay of the first frame
+        write_frame_times(monkeypatch, video_path, truth[0])
+        report_path = os.path.join(temp_dir, "verification.json")
+        report = verify_frame_times(video_path, workers=3, chunk_size=4, report_path=report_path)
+        assert os.path.exists(report_path)
+
+    assert report["frames"] == 40
+    assert report["unreadable_frames"] == [31]
+    assert report["repeats"] == [{"frame": 22, "overlay": overlay[20].isoformat()}]
+    assert report["gaps"][0] == {"after_frame": 10, "frame": 11, "step_ms": 120.0, "dropped_frames": 2}
+    # The duplicate took the place of a frame, so the clock jumps after it
+    assert report["gaps"][1]["after_frame"] == 22 and report["gaps"][1]["dropped_frames"] == 1
+    assert report["mismatches"][0]["frame"] == 11 and round(report["mismatches"][0]["difference_ms"]) == 80
+    assert all(mismatch["frame"] > 10 for mismatch in report["mismatches"])
+    assert not report["ok"]
+    print("PASS: Gaps, repeats and mismatches reported")
+
+
+def test_verify_output_of_process_video_file(monkeypatch):
+    """Test that frame_times.txt written by process_video_file for a steady clock passes verification."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video_path = os.path.join(temp_dir, "video.avi")
+        truth = generate_timestamp_video(video_path, frame_count=40, width=320, height=240)
+        write_frame_times(monkeypatch, video_path, truth[0])
+        rows = list(FrameTimeline(truth[0], 25.0, 40, format_camera_timestamp(truth[0])))
+        with open(os.path.join(temp_dir, "frame_times.txt")) as f:
+            assert f.read().splitlines()[1:] == [f"{frame},{text}" for frame, text in rows]
+
+        monkeypatch.setattr(
+            vidmeta, "_read_overlay_chunk",
+            lambda chunk, roi_width, roi_height: [(frame_number, truth[frame_number]) for frame_number, _ in chunk]
+        )
+        report = verify_frame_times(video_path, workers=2, chunk_size=8)
+    assert report["frames"] == 40 and report["frame_times"] is not None
+    assert not report["mismatches"] and report["mean_offset_ms"] == 0
+    assert report["ok"]
+    print("PASS: Output of process_video_file verified")
+
+
+def test_timeline_rate_does_not_depend_on_counting_backend(monkeypatch):
+    """Test that frame_times.txt uses the random access frame rate, whatever the sequential source reports."""
+    open_source = vidmeta.open_frame_source
+
+    def open_with_other_rate(*args, access="random", **kwargs):
+        source = open_source(*args, access=access, **kwargs)
+        if source is not None and access == "sequential":
+            source.fps = 25 / 3
+        return source
+
+    monkeypatch.setattr(vidmeta, "open_frame_source", open_with_other_rate)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video_path = os.path.join(temp_dir, "video.avi")
+        truth = generate_timestamp_video(video_path, frame_count=20, width=320, height=240)
+        write_frame_times(monkeypatch, video_path, truth[0])
+        rows = list(FrameTimeline(truth[0], 25.0, 20, format_camera_timestamp(truth[0])))
+        with open(os.path.join(temp_dir, "frame_times.txt")) as f:
+            assert f.read().splitlines()[1:] == [f"{frame},{text}" for frame, text in rows]
+    print("PASS: Timeline rate independent of the counting backend")
+
+
+def test_verify_clean_video_without_frame_times(monkeypatch):
+    """Test that a video with a steady clock passes and works without frame_times.txt."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video_path = os.path.join(temp_dir, "video.avi")
+        truth = generate_timestamp_video(video_path, frame_count=30, width=320, height=240)
+        monkeypatch.setattr(
+            vidmeta, "_read_overlay_chunk",
+            lambda chunk, roi_width, roi_height: [(frame_number, truth[frame_number]) for frame_number, _ in chunk]
+        )
+        report = verify_frame_times(video_path, workers=2, chunk_size=7)
+    assert report["frames"] == 30 and report["frame_times"] is None
+    assert report["ok"] and report["mean_offset_ms"] is None
+    print("PASS: Steady clock verified")
+
+
+def test_no_decoded_frames_fail(monkeypatch):
+    """Test that a video in which no frame can be decoded fails processing and verification."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video_path = os.path.join(temp_dir, "video.avi")
+        truth = generate_timestamp_video(video_path, frame_count=10, width=320, height=240)
+        monkeypatch.setattr(vidmeta.OpenCVFrameSource, "frames", lambda self, *args, **kwargs: iter(()))
+        with monkeypatch.context() as patch:
+            patch.setattr(
+                vidmeta, "extract_timestamp_from_frame",
+                lambda frame, *roi, **kwargs: (truth[0], format_camera_timestamp(truth[0]))
+            )
+            assert not vidmeta.process_video_file(video_path, skip_extended_video=True, headless=True)
+        assert not os.path.exists(os.path.join(temp_dir, "frame_times.txt"))
+        report = verify_frame_times(video_path, workers=1)
+    assert report["frames"] == 0 and not report["ok"]
+    print("PASS: Nothing decoded is a failure")
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-s"])
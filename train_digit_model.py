@@ -0,0 +1,420 @@
+"""
+Train the digit model of vidmeta.DigitRecognizer and save it as ONNX.
+
+The training data is synthetic: random timestamps in the overlay formats vidmeta knows are
+rendered with cv2.putText in several Hershey fonts, sizes, stroke widths and contrasts, with
+noise and blur, and clock overlays are drawn with the benchmark video generator. Every image is
+cut into character cells with the same functions vidmeta uses at runtime, so the model sees
+exactly what it will be given. Images whose glyphs cannot be told apart are skipped.
+
+The network is small enough to train on the CPU with NumPy in a few minutes:
+
+    cells (N, 1, 24, 16) -> Conv 3x3 (8) -> ReLU -> MaxPool 2 -> Dense 64 -> ReLU -> Dense 14 -> Softmax
+
+It is written as an ONNX file (opset 11) that cv2.dnn.readNetFromONNX loads, so neither a deep
+learning framework nor the onnx package is needed, to train or to run it.
+
+Usage (from the repository root):
+    python train_digit_model.py [--samples 6000] [--epochs 12] [--output models/timestamp_digits.onnx]
+"""
+import argparse
+import datetime
+import os
+import struct
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.synthetic_video import draw_clock, format_camera_timestamp
+from vidmeta import (
+    DIGIT_CELL_SIZE, DIGIT_CLASSES, DIGIT_MODEL_PATH, DigitRecognizer, binarize_digit_roi, calculate_timestamp_roi,
+    extract_character_cells, find_glyph_columns
+)
+
+FONTS = (
+    cv2.FONT_HERSHEY_SIMPLEX, cv2.FONT_HERSHEY_PLAIN, cv2.FONT_HERSHEY_DUPLEX,
+    cv2.FONT_HERSHEY_COMPLEX, cv2.FONT_HERSHEY_TRIPLEX,
+)
+
+# strftime formats of the rendered timestamps; "%f" is cut to milliseconds
+TEXT_FORMATS = (
+    "%d/%m/%Y %H:%M:%S:%f", "%d/%m/%Y %H:%M:%S.%f", "%d/%m/%y %H:%M:%S.%f", "%d-%m-%y %H:%M:%S.%f",
+    "%d/%m/%y %H:%M:%S", "%H:%M:%S.%f", "%Y-%m-%d %H:%M:%S", "%d/%m/%y %H-%M-%S.%f",
+)
+
+CONV_FILTERS = 8
+HIDDEN_UNITS = 64
+
+# Resolutions of the generator frames, which decide the size of the overlay
+GENERATOR_SIZES = ((480, 270), (640, 360), (960, 540), (1280, 720), (1920, 1080))
+
+
+def random_time(rng):
+    """Return a random datetime between 2000 and 2039."""
+    return datetime.datetime(2000, 1, 1) + datetime.timedelta(
+        days=int(rng.integers(0, 40 * 365)), milliseconds=int(rng.integers(0, 24 * 3600 * 1000))
+    )
+
+
+def format_text(timestamp, fmt) -> str:
+    if "%f" not in fmt:
+        return timestamp.strftime(fmt)
+    return timestamp.strftime(fmt.replace("%f", "")) + f"{timestamp.microsecond // 1000:03d}"
+
+
+def label_cells(roi, text):
+    """
+    Cut a rendered ROI into cells and pair them with the characters of its text.
+
+    Returns:
+        Tuple of (cells, class indices), or None if the glyphs do not match the characters
+    """
+    binary = binarize_digit_roi(roi)
+    if binary is None:
+        return None
+    glyphs = find_glyph_columns(binary)
+    characters = text.replace(" ", "")
+    if len(glyphs) != len(characters):
+        return None
+    cells, spaces = extract_character_cells(binary, glyphs)
+    # Indices of the characters that follow a space
+    words = text.split(" ")
+    if spaces != [len("".join(words[:n])) for n in range(1, len(words))]:
+        return None
+    return cells, [DIGIT_CLASSES.index(char) for char in characters]
+
+
+def render_text_sample(rng):
+    """Render a random timestamp with cv2.putText and return (roi, text)."""
+    text = format_text(random_time(rng), TEXT_FORMATS[rng.integers(len(TEXT_FORMATS))])
+    font = FONTS[rng.integers(len(FONTS))]
+    thickness = int(rng.integers(1, 4))
+    scale = float(rng.uniform(0.35, 1.6))
+    (text_width, text_height), baseline = cv2.getTextSize(text, font, scale, thickness)
+    margin = int(rng.integers(4, 16))
+    height, width = text_height + baseline + 2 * margin, text_width + 2 * margin
+
+    background = int(rng.integers(0, 256))
+    foreground = int(rng.integers(0, 256))
+    while abs(foreground - background) < 80:
+        foreground = int(rng.integers(0, 256))
+    roi = np.full((height, width), background, dtype=np.float32)
+    # A gradient across the ROI, like an overlay on a lit scene
+    roi += np.linspace(0, rng.uniform(-30, 30), width, dtype=np.float32)[None, :]
+    roi = np.clip(roi, 0, 255).astype(np.uint8)
+    line_type = cv2.LINE_AA if rng.random() < 0.7 else cv2.LINE_8
+    cv2.putText(roi, text, (margin, margin + text_height), font, scale, foreground, thickness, line_type)
+    return degrade(roi, rng), text
+
+
+def render_generator_sample(rng):
+    """Draw a clock overlay with the benchmark video generator and return (roi, text)."""
+    width, height = GENERATOR_SIZES[rng.integers(len(GENERATOR_SIZES))]
+    timestamp = random_time(rng)
+    x, y, roi_width, roi_height = calculate_timestamp_roi(width, height)
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    # Stripes like the generator's background, at a random phase
+    stripes = 96 + 64 * np.sin(2 * np.pi * (np.arange(roi_width)[None, :] + np.arange(roi_height)[:, None]
+                                            + rng.integers(144)) / 144)
+    frame[y:y + roi_height, x:x + roi_width] = stripes.astype(np.uint8)[:, :, None]
+    draw_clock(frame, timestamp)
+    roi = cv2.cvtColor(frame[y:y + roi_height, x:x + roi_width], cv2.COLOR_BGR2GRAY)
+    return degrade(roi, rng), format_camera_timestamp(timestamp)
+
+
+def degrade(roi, rng):
+    """Add sensor noise, blur and JPEG compression to a rendered ROI."""
+    if rng.random() < 0.3:
+        roi = cv2.GaussianBlur(roi, (3, 3), float(rng.uniform(0.3, 0.9)))
+    if rng.random() < 0.6:
+        noise = rng.normal(0.0, rng.uniform(1.0, 8.0), roi.shape)
+        roi = np.clip(roi + noise, 0, 255).astype(np.uint8)
+    if rng.random() < 0.3:
+        ok, encoded = cv2.imencode(".jpg", roi, [cv2.IMWRITE_JPEG_QUALITY, int(rng.integers(40, 90))])
+        roi = cv2.imdecode(encoded, cv2.IMREAD_GRAYSCALE)
+    return roi
+
+
+def build_dataset(samples, seed, generator_fraction=0.3):
+    """
+    Render ROIs until `samples` of them could be cut into labelled cells.
+
+    Returns:
+        Tuple of (float32 cells of shape (N, 1, height, width) in 0-1, int64 labels, list of (roi, text))
+    """
+    rng = np.random.default_rng(seed)
+    cells, labels, rois = [], [], []
+    while len(rois) < samples:
+        render = render_generator_sample if rng.random() < generator_fraction else render_text_sample
+        roi, text = render(rng)
+        labelled = label_cells(roi, text)
+        if labelled is None:
+            continue
+        cells.append(labelled[0])
+        labels.extend(labelled[1])
+        rois.append((roi, text))
+    cells = np.concatenate(cells).astype(np.float32)[:, None] / 255.0
+    return cells, np.asarray(labels, dtype=np.int64), rois
+
+
+class DigitNet:
+    """The digit model in NumPy, with the backward pass and Adam updates needed to train it."""
+
+    def __init__(self, seed=0):
+        rng = np.random.default_rng(seed)
+        height, width = DIGIT_CELL_SIZE
+        flat = CONV_FILTERS * (height // 2) * (width // 2)
+        self.params = {
+            # Conv weights are (ky * 3 + kx, filter); dense weights are (outputs, inputs), as in ONNX Gemm with transB
+            "conv_w": rng.normal(0, np.sqrt(2 / 9), (9, CONV_FILTERS)).astype(np.float32),
+            "conv_b": np.zeros(CONV_FILTERS, dtype=np.float32),
+            "fc1_w": rng.normal(0, np.sqrt(2 / flat), (HIDDEN_UNITS, flat)).astype(np.float32),
+            "fc1_b": np.zeros(HIDDEN_UNITS, dtype=np.float32),
+            "fc2_w": rng.normal(0, np.sqrt(2 / HIDDEN_UNITS), (len(DIGIT_CLASSES), HIDDEN_UNITS)).astype(np.float32),
+            "fc2_b": np.zeros(len(DIGIT_CLASSES), dtype=np.float32),
+        }
+        self._moments = {name: (np.zeros_like(value), np.zeros_like(value)) for name, value in self.params.items()}
+        self._step = 0
+
+    def forward(self, x):
+        """Return the class probabilities of cells of shape (N, 1, height, width), keeping what backward needs."""
+        p = self.params
+        n, _, height, width = x.shape
+        patches = np.lib.stride_tricks.sliding_window_view(np.pad(x[:, 0], ((0, 0), (1, 1), (1, 1))), (3, 3), axis=(1, 2))
+        patches = patches.reshape(n * height * width, 9)
+        conv = np.maximum(patches @ p["conv_w"] + p["conv_b"], 0).reshape(n, height, width, CONV_FILTERS)
+        windows = conv.reshape(n, height // 2, 2, width // 2, 2, CONV_FILTERS)
+        pooled = windows.max(axis=(2, 4))
+        # ONNX Flatten of an NCHW tensor takes filters first
+        flat = pooled.transpose(0, 3, 1, 2).reshape(n, -1)
+        hidden = np.maximum(flat @ p["fc1_w"].T + p["fc1_b"], 0)
+        logits = hidden @ p["fc2_w"].T + p["fc2_b"]
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        self._cache = (patches, conv, windows, pooled, flat, hidden)
+        return probabilities
+
+    def backward(self, probabilities, labels):
+        """Return the gradients of the mean cross-entropy of the last forward pass."""
+        p = self.params
+        patches, conv, windows, pooled, flat, hidden = self._cache
+        n = len(labels)
+        d_logits = probabilities.copy()
+        d_logits[np.arange(n), labels] -= 1
+        d_logits /= n
+        grads = {"fc2_w": d_logits.T @ hidden, "fc2_b": d_logits.sum(axis=0)}
+        d_hidden = (d_logits @ p["fc2_w"]) * (hidden > 0)
+        grads["fc1_w"] = d_hidden.T @ flat
+        grads["fc1_b"] = d_hidden.sum(axis=0)
+        d_pooled = (d_hidden @ p["fc1_w"]).reshape(n, CONV_FILTERS, *pooled.shape[1:3]).transpose(0, 2, 3, 1)
+        # The gradient goes to the maximum of every pooling window (and is shared by ties)
+        mask = windows == pooled[:, :, None, :, None, :]
+        d_conv = (mask * d_pooled[:, :, None, :, None, :]).reshape(conv.shape) * (conv > 0)
+        d_conv = d_conv.reshape(-1, CONV_FILTERS)
+        grads["conv_w"] = patches.T @ d_conv
+        grads["conv_b"] = d_conv.sum(axis=0)
+        return grads
+
+    def update(self, grads, learning_rate, beta1=0.9, beta2=0.999, epsilon=1e-8):
+        """Apply one Adam step."""
+        self._step += 1
+        for name, grad in grads.items():
+            m, v = self._moments[name]
+            m *= beta1
+            m += (1 - beta1) * grad
+            v *= beta2
+            v += (1 - beta2) * grad * grad
+            m_hat = m / (1 - beta1 ** self._step)
+            v_hat = v / (1 - beta2 ** self._step)
+            self.params[name] -= (learning_rate * m_hat / (np.sqrt(v_hat) + epsilon)).astype(np.float32)
+
+    def predict(self, x, batch_size=4096):
+        return np.concatenate([self.forward(x[i:i + batch_size]) for i in range(0, len(x), batch_size)])
+
+
+def train(net, cells, labels, epochs, batch_size=128, learning_rate=2e-3, seed=0):
+    """Train with minibatch Adam, decaying the learning rate over the epochs."""
+    rng = np.random.default_rng(seed)
+    for epoch in range(epochs):
+        start = time.perf_counter()
+        order = rng.permutation(len(labels))
+        rate = learning_rate * 0.5 * (1 + np.cos(np.pi * epoch / epochs))
+        loss = 0.0
+        for i in range(0, len(order), batch_size):
+            batch = order[i:i + batch_size]
+            probabilities = net.forward(cells[batch])
+            loss += -np.log(probabilities[np.arange(len(batch)), labels[batch]] + 1e-9).sum()
+            net.update(net.backward(probabilities, labels[batch]), rate)
+        print(f"Epoch {epoch + 1}/{epochs}: loss {loss / len(labels):.4f} ({time.perf_counter() - start:.1f} s)")
+
+
+# Protocol buffer encoding of the few ONNX messages the model needs (see onnx/onnx.proto)
+
+def _varint(value) -> bytes:
+    value &= (1 << 64) - 1
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _int_field(number, value) -> bytes:
+    return _varint(number << 3) + _varint(value)
+
+
+def _bytes_field(number, value) -> bytes:
+    if isinstance(value, str):
+        value = value.encode()
+    return _varint(number << 3 | 2) + _varint(len(value)) + value
+
+
+def _float_field(number, value) -> bytes:
+    return _varint(number << 3 | 5) + struct.pack("<f", value)
+
+
+def _attribute(name, value) -> bytes:
+    """Encode an AttributeProto holding an int, a float or a list of ints."""
+    if isinstance(value, (list, tuple)):
+        return _bytes_field(1, name) + b"".join(_int_field(8, item) for item in value) + _int_field(20, 7)
+    if isinstance(value, float):
+        return _bytes_field(1, name) + _float_field(2, value) + _int_field(20, 1)
+    return _bytes_field(1, name) + _int_field(3, value) + _int_field(20, 2)
+
+
+def _node(op_type, inputs, outputs, **attributes) -> bytes:
+    return (
+        b"".join(_bytes_field(1, name) for name in inputs)
+        + b"".join(_bytes_field(2, name) for name in outputs)
+        + _bytes_field(3, outputs[0])
+        + _bytes_field(4, op_type)
+        + b"".join(_bytes_field(5, _attribute(name, value)) for name, value in attributes.items())
+    )
+
+
+def _tensor(name, array) -> bytes:
+    array = np.ascontiguousarray(array, dtype="<f4")
+    return (
+        b"".join(_int_field(1, dim) for dim in array.shape)
+        + _int_field(2, 1)  # FLOAT
+        + _bytes_field(8, name)
+        + _bytes_field(9, array.tobytes())
+    )
+
+
+def _value_info(name, shape) -> bytes:
+    dims = b"".join(
+        _bytes_field(1, _bytes_field(2, dim) if isinstance(dim, str) else _int_field(1, dim)) for dim in shape
+    )
+    tensor_type = _int_field(1, 1) + _bytes_field(2, dims)
+    return _bytes_field(1, name) + _bytes_field(2, _bytes_field(1, tensor_type))
+
+
+def export_onnx(net, path):
+    """Write the network as an ONNX model with input "cells" (N, 1, 24, 16) and output "probabilities" (N, 14)."""
+    p = net.params
+    initializers = {
+        "conv_w": p["conv_w"].T.reshape(CONV_FILTERS, 1, 3, 3),
+        "conv_b": p["conv_b"],
+        "fc1_w": p["fc1_w"],
+        "fc1_b": p["fc1_b"],
+        "fc2_w": p["fc2_w"],
+        "fc2_b": p["fc2_b"],
+    }
+    nodes = [
+        _node("Conv", ["cells", "conv_w", "conv_b"], ["conv"], kernel_shape=[3, 3], pads=[1, 1, 1, 1]),
+        _node("Relu", ["conv"], ["conv_relu"]),
+        _node("MaxPool", ["conv_relu"], ["pool"], kernel_shape=[2, 2], strides=[2, 2]),
+        _node("Flatten", ["pool"], ["flat"], axis=1),
+        _node("Gemm", ["flat", "fc1_w", "fc1_b"], ["fc1"], transB=1),
+        _node("Relu", ["fc1"], ["fc1_relu"]),
+        _node("Gemm", ["fc1_relu", "fc2_w", "fc2_b"], ["logits"], transB=1),
+        _node("Softmax", ["logits"], ["probabilities"], axis=1),
+    ]
+    graph = (
+        b"".join(_bytes_field(1, node) for node in nodes)
+        + _bytes_field(2, "timestamp_digits")
+        + b"".join(_bytes_field(5, _tensor(name, value)) for name, value in initializers.items())
+        + _bytes_field(11, _value_info("cells", ["N", 1, *DIGIT_CELL_SIZE]))
+        + _bytes_field(12, _value_info("probabilities", ["N", len(DIGIT_CLASSES)]))
+    )
+    model = (
+        _int_field(1, 7)  # IR version
+        + _bytes_field(2, "vidmeta")
+        + _bytes_field(6, f"classes: {DIGIT_CLASSES}")
+        + _bytes_field(7, graph)
+        + _bytes_field(8, _bytes_field(1, "") + _int_field(2, 11))
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(model)
+    print(f"Saved model ({len(model) / 1024:.0f} KiB) to {path}")
+
+
+def evaluate(model_path, rois):
+    """
+    Read ROIs with DigitRecognizer as vidmeta does.
+
+    Returns:
+        Dict with the fraction of ROIs read exactly, the character accuracy and the batched
+        classification throughput in characters per second
+    """
+    recognizer = DigitRecognizer(model_path)
+    exact = characters = correct_characters = 0
+    for roi, text in rois:
+        read, _ = recognizer.read(roi)
+        exact += read == text
+        characters += len(text)
+        correct_characters += sum(a == b for a, b in zip(read, text)) if len(read) == len(text) else 0
+
+    binaries = [binarize_digit_roi(roi) for roi, _ in rois]
+    cells = np.concatenate([extract_character_cells(binary)[0] for binary in binaries if binary is not None])
+    recognizer.classify(cells)
+    start = time.perf_counter()
+    runs = 0
+    while time.perf_counter() - start < 1.0:
+        recognizer.classify(cells)
+        runs += 1
+    return {
+        "rois": len(rois),
+        "exact": exact / len(rois),
+        "character_accuracy": correct_characters / characters,
+        "characters_per_s": runs * len(cells) / (time.perf_counter() - start),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the timestamp digit model of vidmeta.")
+    parser.add_argument("--samples", type=int, default=6000, help="Number of training ROIs")
+    parser.add_argument("--validation", type=int, default=600, help="Number of validation ROIs")
+    parser.add_argument("--epochs", type=int, default=12, help="Training epochs")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the data and the initial weights")
+    parser.add_argument("--output", default=DIGIT_MODEL_PATH, help="ONNX file to write")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    cells, labels, _ = build_dataset(args.samples, args.seed)
+    _, _, validation = build_dataset(args.validation, args.seed + 1)
+    print(f"Rendered {len(labels)} training cells and {len(validation)} validation ROIs "
+          f"in {time.perf_counter() - start:.1f} s")
+
+    net = DigitNet(args.seed)
+    train(net, cells, labels, args.epochs, seed=args.seed)
+    accuracy = np.mean(net.predict(cells).argmax(axis=1) == labels)
+    print(f"Training character accuracy: {accuracy:.4f}")
+
+    export_onnx(net, args.output)
+    results = evaluate(args.output, validation)
+    print(f"Validation: {results['exact']:.1%} of {results['rois']} ROIs read exactly, "
+          f"character accuracy {results['character_accuracy']:.2%}, "
+          f"{results['characters_per_s']:.0f} characters/s")
+
+
+if __name__ == "__main__":
+    main()
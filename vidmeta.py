@@ -1,23 +1,203 @@
+import array
+import bisect
+import collections
 import csv
 import subprocess
 import json
+import concurrent.futures
 import datetime
+import fractions
+import functools
+import hashlib
+import importlib.util
+import itertools
 import time
 import re
 import os
+import queue
+import shutil
+import struct
+import sys
+import tempfile
+import threading
 from pathlib import Path
 
-import cv2
-import numpy as np
-import tkinter as tk
-from tkinter import filedialog
-from tkinter import simpledialog
-from tkinter import messagebox
-from tkinter import ttk
-import pytesseract
+import vidmeta_metrics
+import vidmeta_trace
+from vidmeta_trace import span, traced
 
-# Set the path to the Tesseract executable
-pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+
+class _LazyModule:
+    """
+    Stand-in for a heavy module that is imported on first attribute access.
+
+    On import the module replaces the stand-in in this module's globals, so later uses cost
+    nothing extra. This keeps "import vidmeta" fast for callers that never decode or OCR a frame.
+    """
+
+    def __init__(self, name, alias=None, on_import=None):
+        self._name = name
+        self._alias = alias or name
+        self._on_import = on_import
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self._name)
+        if self._on_import is not None:
+            self._on_import(module)
+        globals()[self._alias] = module
+        return getattr(module, attr)
+
+    def __repr__(self):
+        return f"<lazy module '{self._name}'>"
+
+
+def _configure_pytesseract(module):
+    # Set the path to the Tesseract executable
+    module.pytesseract.tesseract_cmd = get_tool_path("tesseract")
+
+
+cv2 = _LazyModule("cv2")
+np = _LazyModule("numpy", "np")
+pytesseract = _LazyModule("pytesseract", on_import=_configure_pytesseract)
+
+# Names that moved to the Tk user interface in vidmeta_gui; still importable from here
+GUI_NAMES = ("select_reference_time", "rgb_to_ppm", "FrameDisplay", "view_video_with_timestamp_overlay", "main")
+
+# Default install location of the Tesseract executable on Windows
+TESSERACT_WINDOWS_PATH = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+
+# Option that makes each external tool print its version
+TOOL_VERSION_ARGS = {"ffmpeg": "-version", "ffprobe": "-version", "tesseract": "--version"}
+
+# ffmpeg listings that can be queried with get_ffmpeg_capabilities
+FFMPEG_CAPABILITY_KINDS = ("encoders", "decoders", "demuxers", "muxers", "filters")
+
+# Resolved tool paths, versions and ffmpeg capabilities, filled in once per process
+_toolchain_cache = {}
+
+
+def find_tool(name) -> str | None:
+    """
+    Return the full path of an external tool, or None if it is not installed.
+
+    The lookup is done once per process. Tesseract is looked for in its default Windows
+    install location before the PATH.
+    """
+    key = ("path", name)
+    if key not in _toolchain_cache:
+        path = None
+        if name == "tesseract" and os.path.isfile(TESSERACT_WINDOWS_PATH):
+            path = TESSERACT_WINDOWS_PATH
+        _toolchain_cache[key] = path or shutil.which(name)
+    return _toolchain_cache[key]
+
+
+def get_tool_path(name) -> str:
+    """Return the command to run an external tool: its resolved path, or the bare name if not found."""
+    return find_tool(name) or name
+
+
+def get_tool_version(name) -> str | None:
+    """
+    Return the version line printed by an external tool, or None if it cannot be run.
+
+    The tool is only launched the first time; the result is cached for the rest of the process.
+    """
+    key = ("version", name)
+    if key not in _toolchain_cache:
+        version = None
+        path = find_tool(name)
+        if path is None:
+            print(f"WARNING: {name} not found. Please ensure {name} is installed and in your system PATH.")
+        else:
+            try:
+                result = subprocess.run([path, TOOL_VERSION_ARGS[name]], capture_output=True, text=True, check=True)
+                # Older Tesseract versions print the version to stderr
+                lines = (result.stdout or result.stderr).strip().splitlines()
+                version = lines[0].strip() if lines else ""
+                print(f"Using {name}: {path} ({version})")
+            except (OSError, subprocess.SubprocessError) as e:
+                print(f"WARNING: Could not run {name} at {path}: {e}")
+        _toolchain_cache[key] = version
+    return _toolchain_cache[key]
+
+
+def parse_tool_version(version_line) -> tuple | None:
+    """
+    Parse the (major, minor) release from a get_tool_version line such as
+    "ffmpeg version 4.4.2-0ubuntu0.22.04.1 Copyright ...".
+
+    Returns None for lines without a release number, e.g. git builds ("ffmpeg version N-109000-g...").
+    """
+    match = re.search(r'version\s+n?(\d+)\.(\d+)', version_line or "")
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+def get_ffmpeg_passthrough_args() -> list:
+    """
+    Return the ffmpeg output options that pass every frame through without duplicating or dropping any.
+
+    -fps_mode replaced -vsync in ffmpeg 5.1 and older versions exit on it. Builds without a
+    release number are assumed to be recent.
+    """
+    version = parse_tool_version(get_tool_version("ffmpeg"))
+    if version is not None and version < (5, 1):
+        return ["-vsync", "passthrough"]
+    return ["-fps_mode", "passthrough"]
+
+
+def parse_ffmpeg_capabilities(output) -> set:
+    """
+    Parse the names from an ffmpeg -encoders/-decoders/-demuxers/-muxers/-filters listing.
+
+    Entries look like " V....D libx264   description"; legend lines (" V..... = Video")
+    and separators are skipped. Formats with several names ("mov,mp4,m4a") yield each name.
+    """
+    names = set()
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) < 2 or parts[1] == "=" or not re.fullmatch(r'[A-Z.|]+', parts[0]):
+            continue
+        names.update(parts[1].split(','))
+    return names
+
+
+def get_ffmpeg_capabilities(kind) -> set:
+    """
+    Return the names of the encoders, decoders, demuxers, muxers or filters of the installed ffmpeg.
+
+    Each listing is fetched once per process. An empty set is returned if ffmpeg cannot be run.
+    """
+    if kind not in FFMPEG_CAPABILITY_KINDS:
+        raise ValueError(f"Unknown ffmpeg capability '{kind}'. Expected one of: {', '.join(FFMPEG_CAPABILITY_KINDS)}")
+    key = ("capabilities", kind)
+    if key not in _toolchain_cache:
+        names = set()
+        if get_tool_version("ffmpeg") is not None:
+            try:
+                result = subprocess.run(
+                    [get_tool_path("ffmpeg"), "-hide_banner", f"-{kind}"], capture_output=True, text=True, check=True
+                )
+                names = parse_ffmpeg_capabilities(result.stdout)
+            except (OSError, subprocess.SubprocessError) as e:
+                print(f"WARNING: Could not list ffmpeg {kind}: {e}")
+        _toolchain_cache[key] = names
+    return _toolchain_cache[key]
+
+
+def ffmpeg_supports(kind, name) -> bool:
+    """Check whether the installed ffmpeg has the named encoder, decoder, demuxer, muxer or filter."""
+    return name in get_ffmpeg_capabilities(kind)
+
+
+def get_toolchain_info() -> dict:
+    """Return the path and version of every external tool, resolving any not looked up yet."""
+    return {name: {"path": find_tool(name), "version": get_tool_version(name)} for name in TOOL_VERSION_ARGS}
+
+
+def clear_toolchain_cache():
+    """Forget all resolved tools, e.g. after installing one while the program is running."""
+    _toolchain_cache.clear()
 
 
 def get_all_metadata(path: str) -> dict:
@@ -28,7 +208,7 @@ def get_all_metadata(path: str) -> dict:
 
         # Get format metadata
         format_result = subprocess.run([
-            "ffprobe",
+            get_tool_path("ffprobe"),
             "-v",
             "quiet",
             "-print_format",
@@ -40,7 +220,7 @@ def get_all_metadata(path: str) -> dict:
 
         # Get stream metadata
         stream_result = subprocess.run([
-            "ffprobe",
+            get_tool_path("ffprobe"),
             "-v",
             "quiet",
             "-print_format",
@@ -95,7 +275,7 @@ def get_creation_time(path: str) -> datetime.datetime | None:
         path = os.path.normpath(path)
 
         result = subprocess.run([
-            "ffprobe",
+            get_tool_path("ffprobe"),
             "-v",
             "quiet",
             "-print_format",
@@ -113,139 +293,537 @@ def get_creation_time(path: str) -> datetime.datetime | None:
     return None
 
 
-def select_reference_time(metadata: dict) -> datetime.datetime | None:
-    """Display metadata and let user select a reference time."""
-    # Create a new window
-    select_window = tk.Toplevel()
-    select_window.title("Select Reference Time")
-    select_window.geometry("800x600")
-
-    # Create a frame for the metadata display
-    frame = tk.Frame(select_window)
-    frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-
-    # Create a scrollbar
-    scrollbar = tk.Scrollbar(frame)
-    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-    # Create a text widget to display metadata
-    text = tk.Text(frame, wrap=tk.WORD, yscrollcommand=scrollbar.set)
-    text.pack(fill=tk.BOTH, expand=True)
-    scrollbar.config(command=text.yview)
-
-    # Insert metadata into text widget
-    text.insert(tk.END, "VIDEO METADATA:\n\n")
-
-    # Dictionary to store potential datetime values
-    datetime_values = {}
-
-    # Format metadata
-    text.insert(tk.END, "FORMAT METADATA:\n")
-    format_data = metadata.get("format", {})
-    for key, value in format_data.items():
-        if key == "tags" and isinstance(value, dict):
-            text.insert(tk.END, "  TAGS:\n")
-            for tag_key, tag_value in value.items():
-                text.insert(tk.END, f"    {tag_key}: {tag_value}\n")
-                # Check if this might be a datetime
-                dt = parse_datetime(tag_value)
-                if dt:
-                    datetime_values[f"format.tags.{tag_key}"] = dt
-        else:
-            text.insert(tk.END, f"  {key}: {value}\n")
-            # Check if this might be a datetime
-            dt = parse_datetime(str(value))
-            if dt:
-                datetime_values[f"format.{key}"] = dt
-
-    # Stream metadata
-    text.insert(tk.END, "\nSTREAM METADATA:\n")
-    for i, stream in enumerate(metadata.get("streams", [])):
-        text.insert(tk.END, f"  STREAM {i}:\n")
-        for key, value in stream.items():
-            if key == "tags" and isinstance(value, dict):
-                text.insert(tk.END, f"    TAGS:\n")
-                for tag_key, tag_value in value.items():
-                    text.insert(tk.END, f"      {tag_key}: {tag_value}\n")
-                    # Check if this might be a datetime
-                    dt = parse_datetime(tag_value)
-                    if dt:
-                        datetime_values[f"stream{i}.tags.{tag_key}"] = dt
-            else:
-                text.insert(tk.END, f"    {key}: {value}\n")
-                # Check if this might be a datetime
-                dt = parse_datetime(str(value))
-                if dt:
-                    datetime_values[f"stream{i}.{key}"] = dt
-
-    text.config(state=tk.DISABLED)  # Make text read-only
-
-    # If no datetime values found
-    if not datetime_values:
-        messagebox.showinfo("No Time Values", "No time values found in metadata. Using current time.")
-        select_window.destroy()
-        return None
+# Steps of the OCR preprocessing. Each step is (inputs, function); the function writes its
+# result into the dst buffer it is given and returns it. Shared intermediates (the equalized
+# and blurred ROI, the adaptive threshold) are separate steps, so every preprocessing method
+# that needs them uses the same result
+PREPROCESSING_STEPS = {
+    # Shared intermediates
+    "equalized": (("gray",), lambda dst, img: cv2.equalizeHist(img, dst=dst)),
+    "blurred": (("gray",), lambda dst, img: cv2.GaussianBlur(img, (3, 3), 0, dst=dst)),
+    # Equalize and blur to reduce noise
+    "equalized_blurred": (("equalized",), lambda dst, img: cv2.GaussianBlur(img, (3, 3), 0, dst=dst)),
+    "adaptive_binary": (("gray",), lambda dst, img: cv2.adaptiveThreshold(
+        img, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2, dst=dst)),
+    "binary_180": (("gray",), lambda dst, img: cv2.threshold(img, 180, 255, cv2.THRESH_BINARY, dst=dst)[1]),
+    # High threshold for white text
+    "equalized_blurred_binary_190": (("equalized_blurred",), lambda dst, img: cv2.threshold(
+        img, 190, 255, cv2.THRESH_BINARY, dst=dst)[1]),
+
+    # Binary threshold (dark text on light background)
+    "binary_150": (("gray",), lambda dst, img: cv2.threshold(img, 150, 255, cv2.THRESH_BINARY, dst=dst)[1]),
+    # Inverse binary threshold (light text on dark background) - optimized for white text
+    # Lower threshold for better white text detection
+    "binary_inv_120": (("gray",), lambda dst, img: cv2.threshold(img, 120, 255, cv2.THRESH_BINARY_INV, dst=dst)[1]),
+    # Stronger inverse threshold for white text on dark backgrounds
+    # Even lower threshold for very faint white text
+    "binary_inv_80": (("gray",), lambda dst, img: cv2.threshold(img, 80, 255, cv2.THRESH_BINARY_INV, dst=dst)[1]),
+    # Inverse adaptive threshold
+    "adaptive_binary_inv": (("adaptive_binary",), lambda dst, img: cv2.bitwise_not(img, dst=dst)),
+    # Contrast enhancement followed by inverse binary threshold (good for white text)
+    "equalized_binary_inv_120": (("equalized",), lambda dst, img: cv2.threshold(
+        img, 120, 255, cv2.THRESH_BINARY_INV, dst=dst)[1]),
+    # Blur followed by inverse threshold (helps with noisy backgrounds)
+    "blurred_binary_inv_120": (("blurred",), lambda dst, img: cv2.threshold(
+        img, 120, 255, cv2.THRESH_BINARY_INV, dst=dst)[1]),
+    # Color filtering for white text: high threshold to isolate very white pixels
+    "binary_200": (("gray",), lambda dst, img: cv2.threshold(img, 200, 255, cv2.THRESH_BINARY, dst=dst)[1]),
+    # Morphological operations to enhance white text
+    "binary_180_open": (("binary_180",), lambda dst, img: cv2.morphologyEx(
+        img, cv2.MORPH_OPEN, _morphology_kernel(), dst=dst)),
+    # Advanced white text isolation (combines multiple techniques): close small gaps in text
+    "white_text": (("equalized_blurred_binary_190",), lambda dst, img: cv2.morphologyEx(
+        img, cv2.MORPH_CLOSE, _morphology_kernel(), dst=dst)),
+}
+
+
+# Preprocessing methods extract_timestamp_from_frame tries in order, to handle various text
+# colors and backgrounds, as names of PREPROCESSING_STEPS ("gray" is the grayscale ROI itself).
+# The index is the method number used in debug image names, traces and metrics
+PREPROCESSING_METHODS = [
+    "gray",
+    "binary_150",
+    "binary_inv_120",
+    "binary_inv_80",
+    "adaptive_binary",
+    "adaptive_binary_inv",
+    "equalized_binary_inv_120",
+    "blurred_binary_inv_120",
+    "binary_200",
+    "binary_180_open",
+    "white_text",
+]
+
+_MORPHOLOGY_KERNEL = None
+
+
+def _morphology_kernel():
+    """Return the 2x2 kernel of the morphological steps, created once."""
+    global _MORPHOLOGY_KERNEL
+    if _MORPHOLOGY_KERNEL is None:
+        _MORPHOLOGY_KERNEL = np.ones((2, 2), np.uint8)
+    return _MORPHOLOGY_KERNEL
+
+
+class PreprocessingGraph:
+    """
+    Runs the preprocessing steps of one ROI at a time into reusable buffers.
+
+    set_roi() makes the grayscale ROI the "gray" input and get() computes a step and the steps
+    it depends on, each at most once per ROI. Every step writes into its own buffer, allocated
+    the first time the step runs and kept while ROIs have the same size, so a cascade over a
+    ROI allocates nothing new after the first one. Results are only valid until the next
+    set_roi(); use one graph per thread (see get_preprocessing_graph).
+    """
+
+    __slots__ = ("_shape", "_buffers", "_results")
+
+    def __init__(self):
+        self._shape = None
+        self._buffers = {}
+        self._results = {}
+
+    def _buffer(self, name):
+        buffer = self._buffers.get(name)
+        if buffer is None:
+            buffer = self._buffers[name] = np.empty(self._shape, np.uint8)
+        return buffer
+
+    def set_roi(self, roi):
+        """
+        Start preprocessing a new ROI.
+
+        Args:
+            roi: BGR or grayscale image of the timestamp region
+
+        Returns:
+            The grayscale ROI (the ROI itself if it already is grayscale)
+        """
+        shape = roi.shape[:2]
+        if shape != self._shape:
+            self._shape = shape
+            self._buffers.clear()
+        self._results.clear()
+        # Frames from a gray FrameSource already are grayscale
+        gray = roi if roi.ndim == 2 else cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY, dst=self._buffer("gray"))
+        self._results["gray"] = gray
+        return gray
+
+    def get(self, name):
+        """Return the result of a preprocessing step for the current ROI, computing it if needed."""
+        result = self._results.get(name)
+        if result is None:
+            inputs, function = PREPROCESSING_STEPS[name]
+            result = function(self._buffer(name), *(self.get(input_name) for input_name in inputs))
+            self._results[name] = result
+        return result
+
+    def allocated_bytes(self) -> int:
+        """Return the size of the buffers held by this graph."""
+        return sum(buffer.nbytes for buffer in self._buffers.values())
+
+
+_preprocessing_graphs = threading.local()
+
+
+def get_preprocessing_graph() -> PreprocessingGraph:
+    """Return the preprocessing graph of the calling thread."""
+    graph = getattr(_preprocessing_graphs, "graph", None)
+    if graph is None:
+        graph = _preprocessing_graphs.graph = PreprocessingGraph()
+    return graph
+
+
+# OCR effectiveness, exported with --metrics (see vidmeta_metrics). Stage "dnn" is the digit model
+# (method "digits", no PSM), stage "preprocess" the cascade of preprocessing methods with PSM 7 and
+# stage "relaxed" the fallback on the grayscale ROI
+OCR_ATTEMPTS = vidmeta_metrics.counter(
+    "vidmeta_ocr_attempts_total", "OCR calls by stage, preprocessing method and PSM"
+)
+OCR_LATENCY = vidmeta_metrics.histogram(
+    "vidmeta_ocr_latency_seconds", "Duration of OCR calls by stage, preprocessing method and PSM"
+)
+OCR_TESSERACT_ERRORS = vidmeta_metrics.counter(
+    "vidmeta_ocr_tesseract_errors_total", "Tesseract calls that failed, by stage"
+)
+OCR_TIMESTAMPS = vidmeta_metrics.counter(
+    "vidmeta_ocr_timestamps_total", "OCR attempts that produced a timestamp, by stage, method, PSM and matching pattern"
+)
+OCR_PARSE_FAILURES = vidmeta_metrics.counter(
+    "vidmeta_ocr_parse_failures_total", "Pattern matches that were not a valid time, by stage and pattern"
+)
+OCR_CHANGE_DETECTION = vidmeta_metrics.counter(
+    "vidmeta_ocr_change_detection_total",
+    "ROIs read by ROIChangeDetector by outcome: unchanged (earlier result reused), partial (only the "
+    "changed characters read) or full (whole cascade)"
+)
+OCR_FRAMES = vidmeta_metrics.counter(
+    "vidmeta_ocr_frames_total",
+    "Frames read by extract_timestamp_from_frame by outcome: dnn, preprocess, relaxed (needed the fallback), "
+    "not_found or cancelled"
+)
+
+
+def _record_ocr_timestamp(stage, pattern, method="gray", psm=7):
+    """Count the attempt that produced the timestamp of a frame."""
+    OCR_TIMESTAMPS.inc(stage=stage, method=method, psm=psm, pattern=pattern)
+    OCR_FRAMES.inc(outcome=stage)
+
+
+def parse_timestamp_text(text, stage="preprocess"):
+    """
+    Find a timestamp in OCR text with the patterns of the preprocessing cascade.
 
-    # Create a frame for the selection
-    select_frame = tk.Frame(select_window)
-    select_frame.pack(fill=tk.X, padx=10, pady=10)
+    Args:
+        text: Text read from a timestamp ROI, on one line
+        stage: OCR stage the text comes from, for the parse failure metric
+
+    Returns:
+        Tuple of (datetime, original format string, matching pattern format) or (None, None, None)
+    """
+    # Look for various timestamp patterns
+    patterns = [
+        # Format with 4-digit year: DD/MM/YYYY HH:MM:SS:ZZZ (specific format from issue)
+        (r'(\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}:\d{3})', '%d/%m/%Y %H:%M:%S:%f'),
+        # Format with 4-digit year: DD/MM/YYYY HH:MM:ss.SSS
+        (r'(\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}\.\d{3})', '%d/%m/%Y %H:%M:%S.%f'),
+        # Standard format: DD/MM/YY HH:MM:ss.SSS
+        (r'(\d{2}/\d{2}/\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})', '%d/%m/%y %H:%M:%S.%f'),
+        # Alternative format with different separators: DD-MM-YY HH:MM:ss.SSS
+        (r'(\d{2}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})', '%d-%m-%y %H:%M:%S.%f'),
+        # Format with no milliseconds: DD/MM/YY HH:MM:ss
+        (r'(\d{2}/\d{2}/\d{2}\s+\d{2}:\d{2}:\d{2})', '%d/%m/%y %H:%M:%S'),
+        # US format: MM/DD/YY HH:MM:ss.SSS
+        (r'(\d{2}/\d{2}/\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})', '%m/%d/%y %H:%M:%S.%f'),
+        # Format with different time separator: DD/MM/YY HH-MM-ss.SSS
+        (r'(\d{2}/\d{2}/\d{2}\s+\d{2}-\d{2}-\d{2}\.\d{3})', '%d/%m/%y %H-%M-%S.%f'),
+        # Format with just time: HH:MM:ss.SSS
+        (r'(\d{2}:\d{2}:\d{2}\.\d{3})', '%H:%M:%S.%f')
+    ]
+
+    for pattern, fmt in patterns:
+        pattern_format = fmt
+        match = re.search(pattern, text)
+        if match:
+            timestamp_str = match.group(1)
+
+            # Handle colon separator in milliseconds
+            if ':' in timestamp_str and fmt.endswith(':%f'):
+                # For the specific format with colon separator for milliseconds,
+                # we need to handle it specially since Python's datetime.strptime
+                # doesn't support colon as a separator for milliseconds
+
+                # First, check if this is the specific format we're looking for (DD/MM/YYYY HH:MM:SS:ZZZ)
+                if re.match(r'\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}:\d{3}', timestamp_str):
+                    # Extract the components manually
+                    parts = timestamp_str.split()
+                    date_part = parts[0]  # DD/MM/YYYY
+                    time_part = parts[1]  # HH:MM:SS:mmm
+
+                    # Split the date and time parts
+                    day, month, year = date_part.split('/')
+
+                    # Split the time part and handle the milliseconds
+                    time_components = time_part.split(':')
+                    hour = time_components[0]
+                    minute = time_components[1]
+                    second = time_components[2]
+                    millisecond = time_components[3]
+
+                    # Create a datetime object manually
+                    # The datetime constructor expects (year, month, day, hour, minute, second, microsecond)
+                    # Convert milliseconds to microseconds correctly
+                    microseconds = int(millisecond)
+                    if len(millisecond) == 4:
+                        # For 4-digit milliseconds, treat as 0.xxxx seconds
+                        microseconds = int(millisecond) * 100
+                    elif len(millisecond) > 4:
+                        # For longer milliseconds, truncate to 6 digits (microseconds limit)
+                        microseconds = int(millisecond[:6])
+                    else:
+                        # For 1-3 digit milliseconds, multiply by 1000 to convert to microseconds
+                        microseconds = int(millisecond) * 1000
+
+                    dt = datetime.datetime(
+                        int(year), int(month), int(day),
+                        int(hour), int(minute), int(second),
+                        microseconds
+                    )
+                    # Store the original format string
+                    original_format = f"{day}/{month}/{year} {hour}:{minute}:{second}:{millisecond}"
+                    print(f"Successfully parsed timestamp manually: {dt}")
+                    return dt, original_format, pattern_format
+
+                # If it's not the specific format, fall back to the previous approach
+                # Replace the format string to use dot instead of colon for milliseconds
+                fmt = fmt.replace(':%f', '.%f')
+                # Replace the last colon with a dot in the timestamp string
+                last_colon_index = timestamp_str.rfind(':')
+                if last_colon_index != -1 and len(timestamp_str) - last_colon_index >= 4:
+                    # Check if what follows is 3 digits (milliseconds)
+                    if timestamp_str[last_colon_index+1:last_colon_index+4].isdigit():
+                        timestamp_str = timestamp_str[:last_colon_index] + '.' + timestamp_str[last_colon_index+1:]
+
+            try:
+                # Parse the timestamp string to a datetime object
+                if fmt == '%H:%M:%S.%f':
+                    # For time-only format, use today's date
+                    time_obj = datetime.datetime.strptime(timestamp_str, fmt).time()
+                    dt = datetime.datetime.combine(datetime.datetime.today().date(), time_obj)
+                else:
+                    dt = datetime.datetime.strptime(timestamp_str, fmt)
+                print(f"Successfully parsed timestamp with format {fmt}: {dt}")
+                return dt, timestamp_str, pattern_format
+            except ValueError:
+                print(f"Failed to parse timestamp: {timestamp_str} with format {fmt}")
+                OCR_PARSE_FAILURES.inc(stage=stage, pattern=pattern_format)
+                continue
 
-    tk.Label(select_frame, text="Select reference time:").pack(side=tk.LEFT)
+    return None, None, None
 
-    # Create a variable to store the selection
-    selected_time = tk.StringVar()
 
-    # Sort datetime values by key for consistent display
-    sorted_keys = sorted(datetime_values.keys())
-    if sorted_keys:
-        selected_time.set(sorted_keys[0])  # Default selection
+def parse_relaxed_timestamp_text(text, stage="relaxed"):
+    """
+    Find a timestamp in OCR text with the relaxed patterns of the fallback on the grayscale ROI.
 
-    # Create dropdown menu
-    dropdown = tk.OptionMenu(select_frame, selected_time, *sorted_keys)
-    dropdown.pack(side=tk.LEFT, padx=5)
+    These accept the merged and concatenated fields Tesseract produces with PSM 6 and 3, and
+    timestamps with one or two digit fields or other separators.
 
-    # Create a label to display the selected datetime
-    time_label = tk.Label(select_frame, text="")
-    time_label.pack(side=tk.LEFT, padx=5)
+    Args:
+        text: Text read from a timestamp ROI, on one line
+        stage: OCR stage the text comes from, for the parse failure metric
 
-    # Function to update the time label
-    def update_time_label(*args):
-        key = selected_time.get()
-        if key in datetime_values:
-            time_label.config(text=str(datetime_values[key]))
+    Returns:
+        Tuple of (datetime, original format string, name of the matching pattern) or (None, None, None)
+    """
+    # First try to match the exact format we're seeing with PSM 6
+    exact_match = re.search(r'(\d{2}/\d{2}/\d{4})(\d{2}):(\d{5}):(\d{3})', text)
+    if exact_match:
+        try:
+            # Extract date components
+            date_str = exact_match.group(1)  # DD/MM/YYYY
+            hour = exact_match.group(2)
+            combined_minutes = exact_match.group(3)  # MMHHH - contains both minutes and milliseconds
+            final_milliseconds = exact_match.group(4)
+
+            # Split the date
+            day, month, year = date_str.split('/')
+
+            # Extract minutes and milliseconds from combined value
+            minutes = combined_minutes[:2]  # First two digits are minutes
+            seconds = combined_minutes[2:4]  # Next two digits are seconds
+            milliseconds = combined_minutes[4:] + final_milliseconds  # Combine all milliseconds
+
+            print(f"Parsed components - Date: {year}-{month}-{day}, Time: {hour}:{minutes}:{seconds}.{milliseconds}")
+
+            # Create datetime object manually
+            # Convert milliseconds to microseconds correctly
+            # If milliseconds has 4 digits (e.g., 3287), it represents 0.3287 seconds
+            # So we need to convert it to 328700 microseconds
+            microseconds = int(milliseconds)
+            if len(milliseconds) == 4:
+                # For 4-digit milliseconds, treat as 0.xxxx seconds
+                microseconds = int(milliseconds) * 100
+            elif len(milliseconds) > 4:
+                # For longer milliseconds, truncate to 6 digits (microseconds limit)
+                microseconds = int(milliseconds[:6])
+            else:
+                # For 1-3 digit milliseconds, multiply by 1000 to convert to microseconds
+                microseconds = int(milliseconds) * 1000
 
-    # Register callback
-    selected_time.trace("w", update_time_label)
-    update_time_label()  # Initial update
+            dt = datetime.datetime(
+                int(year), int(month), int(day),
+                int(hour), int(minutes), int(seconds),
+                microseconds
+            )
+            # Store the original format string
+            original_format = f"{day}/{month}/{year} {hour}:{minutes}:{seconds}.{milliseconds}"
+            print(f"Successfully parsed timestamp manually: {dt}")
+            return dt, original_format, "merged_minutes"
+        except (ValueError, IndexError) as e:
+            print(f"Failed to parse exact PSM 6 format: {e}")
+            OCR_PARSE_FAILURES.inc(stage=stage, pattern="merged_minutes")
+            # Continue to try other patterns
+
+    # If exact match failed, try the alternative PSM 6 format
+    exact_match = re.search(r'(\d{2}/\d{2}/\d{4})\s+(\d{2}:\d{2}\d{3}):(\d{3})', text)
+    if exact_match:
+        try:
+            # Extract components manually
+            date_part = exact_match.group(1)
+            time_part = exact_match.group(2)
+            milliseconds = exact_match.group(3)
+
+            # Split date components
+            day, month, year = date_part.split('/')
+
+            # Handle the case where minutes and milliseconds are combined
+            hour = time_part[:2]
+            minute = time_part[3:5]
+            second = time_part[5:7]
+
+            # Create datetime object manually
+            # Convert milliseconds to microseconds correctly
+            microseconds = int(milliseconds)
+            if len(milliseconds) == 4:
+                # For 4-digit milliseconds, treat as 0.xxxx seconds
+                microseconds = int(milliseconds) * 100
+            elif len(milliseconds) > 4:
+                # For longer milliseconds, truncate to 6 digits (microseconds limit)
+                microseconds = int(milliseconds[:6])
+            else:
+                # For 1-3 digit milliseconds, multiply by 1000 to convert to microseconds
+                microseconds = int(milliseconds) * 1000
 
-    # Variable to store the result
-    result = [None]
+            dt = datetime.datetime(
+                int(year), int(month), int(day),
+                int(hour), int(minute), int(second),
+                microseconds
+            )
+            # Store the original format string
+            original_format = f"{date_part} {hour}:{minute}:{second}:{milliseconds}"
+            print(f"Successfully parsed timestamp manually: {dt}")
+            return dt, original_format, "merged_seconds"
+        except (ValueError, IndexError) as e:
+            print(f"Failed to parse exact format: {e}")
+            OCR_PARSE_FAILURES.inc(stage=stage, pattern="merged_seconds")
+            # Continue to try other patterns
+
+    # Try to match the format where date and time are concatenated without a space (e.g., 13/06/202515:11:56:257)
+    exact_match = re.search(r'(\d{2}/\d{2}/\d{4})(\d{2}):(\d{2}):(\d{2}):(\d{3})', text)
+    if exact_match:
+        try:
+            # Extract components
+            date_str = exact_match.group(1)  # DD/MM/YYYY
+            hour = exact_match.group(2)
+            minute = exact_match.group(3)
+            second = exact_match.group(4)
+            millisecond = exact_match.group(5)
+
+            # Split the date
+            day, month, year = date_str.split('/')
+
+            print(f"Parsed components - Date: {year}-{month}-{day}, Time: {hour}:{minute}:{second}.{millisecond}")
+
+            # Create datetime object manually
+            # Convert milliseconds to microseconds correctly
+            microseconds = int(millisecond)
+            if len(millisecond) == 4:
+                # For 4-digit milliseconds, treat as 0.xxxx seconds
+                microseconds = int(millisecond) * 100
+            elif len(millisecond) > 4:
+                # For longer milliseconds, truncate to 6 digits (microseconds limit)
+                microseconds = int(millisecond[:6])
+            else:
+                # For 1-3 digit milliseconds, multiply by 1000 to convert to microseconds
+                microseconds = int(millisecond) * 1000
 
-    # Function to handle selection
-    def on_select():
-        key = selected_time.get()
-        if key in datetime_values:
-            result[0] = datetime_values[key]
-        select_window.destroy()
+            dt = datetime.datetime(
+                int(year), int(month), int(day),
+                int(hour), int(minute), int(second),
+                microseconds
+            )
+            # Store the original format string
+            original_format = f"{day}/{month}/{year} {hour}:{minute}:{second}:{millisecond}"
+            print(f"Successfully parsed timestamp manually: {dt}")
+            return dt, original_format, "concatenated"
+        except (ValueError, IndexError) as e:
+            print(f"Failed to parse concatenated format: {e}")
+            OCR_PARSE_FAILURES.inc(stage=stage, pattern="concatenated")
+            # Continue to try other patterns
+
+    # If PSM 6 formats failed, continue with existing patterns
+    # Try various relaxed patterns
+    relaxed_patterns = [
+        # Very relaxed date/time pattern
+        (r'(\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}\s+\d{1,2}:\d{1,2}:\d{1,2}[.,]\d{1,3})', None, 3),  # Highest priority
+        # Very relaxed date/time pattern with colon separator for milliseconds
+        (r'(\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}\s+\d{1,2}:\d{1,2}:\d{1,2}:\d{1,3})', None, 3),  # Highest priority
+        # Just look for sequences of digits that might be a timestamp
+        (r'(\d{2}[^\d]\d{2}[^\d]\d{2}[^\w]\d{2}[^\d]\d{2}[^\d]\d{2})', None, 2),  # Medium priority
+        # Time only with milliseconds
+        (r'(\d{1,2}:\d{1,2}:\d{1,2}[.,]\d{1,3})', None, 1),  # Low priority
+        # Time only without milliseconds
+        (r'(\d{1,2}:\d{1,2}:\d{1,2})', '%H:%M:%S', 0)  # Lowest priority
+    ]
 
-    # Function to handle cancel
-    def on_cancel():
-        select_window.destroy()
+    # Collect all matches from all patterns
+    all_matches = []
+    for pattern, fmt, priority in relaxed_patterns:
+        matches = re.findall(pattern, text)
+        for match_str in matches:
+            all_matches.append((match_str, fmt, priority))
+
+    # Sort matches by priority (highest first)
+    all_matches.sort(key=lambda x: x[2], reverse=True)
+
+    # Process matches in order of priority
+    for match_str, fmt, priority in all_matches:
+        print(f"Found potential timestamp with relaxed pattern: {match_str} (priority: {priority})")
+
+        # Try to normalize the format for parsing
+        normalized_str = match_str
+        for char in ['-', '.']:
+            normalized_str = normalized_str.replace(char, '/')
+        normalized_str = normalized_str.replace(',', '.')
+        # Also replace colon with dot for milliseconds (e.g., 13:28:42:285 -> 13:28:42.285)
+        if ':' in normalized_str:
+            # Find the last colon and replace it with a dot if it's followed by 3 digits (milliseconds)
+            last_colon_index = normalized_str.rfind(':')
+            if last_colon_index != -1 and len(normalized_str) - last_colon_index >= 4:
+                # Check if what follows is 3 digits (milliseconds)
+                if normalized_str[last_colon_index+1:last_colon_index+4].isdigit():
+                    normalized_str = normalized_str[:last_colon_index] + '.' + normalized_str[last_colon_index+1:]
+
+        # Try different date formats
+        formats_to_try = []
+        if fmt:
+            formats_to_try.append(fmt)
+        else:
+            formats_to_try = [
+                # Format with 4-digit year and colon separator for milliseconds (specific format from issue)
+                '%d/%m/%Y %H:%M:%S:%f',  # DD/MM/YYYY HH:MM:SS:ZZZ
+                # Format with 4-digit year and dot separator for milliseconds
+                '%d/%m/%Y %H:%M:%S.%f',
+                # Standard formats
+                '%d/%m/%y %H:%M:%S.%f',
+                '%m/%d/%y %H:%M:%S.%f',
+                '%d/%m/%y %H:%M:%S,%f',
+                '%m/%d/%y %H:%M:%S,%f',
+                '%H:%M:%S.%f',
+                '%H:%M:%S,%f'
+            ]
 
-    # Create buttons
-    button_frame = tk.Frame(select_window)
-    button_frame.pack(fill=tk.X, padx=10, pady=10)
+        for fmt in formats_to_try:
+            try:
+                if fmt in ['%H:%M:%S.%f', '%H:%M:%S,%f', '%H:%M:%S']:
+                    # For time-only format, use today's date
+                    time_obj = datetime.datetime.strptime(normalized_str, fmt).time()
+                    dt = datetime.datetime.combine(datetime.datetime.today().date(), time_obj)
+                else:
+                    dt = datetime.datetime.strptime(normalized_str, fmt)
+                print(f"Successfully parsed timestamp with format {fmt}: {dt}")
+                return dt, normalized_str, f"relaxed {fmt}"
+            except ValueError as ve:
+                print(f"Failed to parse with format {fmt}: {ve}")
+                continue
 
-    tk.Button(button_frame, text="Select", command=on_select).pack(side=tk.RIGHT, padx=5)
-    tk.Button(button_frame, text="Cancel", command=on_cancel).pack(side=tk.RIGHT, padx=5)
+    return None, None, None
 
-    # Wait for the window to be closed
-    select_window.wait_window()
 
-    return result[0]
+def _write_debug_image(debug_dir, filename, image, description):
+    """Save an OCR debug image to debug_dir, unless debug images are off (debug_dir is None)."""
+    if debug_dir is None:
+        return
+    path = os.path.join(debug_dir, filename)
+    with span("ocr.debug_write"):
+        cv2.imwrite(path, image)
+    print(f"Saved {description} to {path}")
 
 
-def extract_timestamp_from_frame(frame, roi_x, roi_y, roi_width, roi_height):
+@traced()
+def extract_timestamp_from_frame(frame, roi_x, roi_y, roi_width, roi_height, cancelled=None, last_attempt=None,
+                                 methods=None, relaxed=True, digit_model=True, strategy=None, debug_images=False):
     """
     Extract timestamp from the top right corner of the frame using OCR.
 
@@ -255,98 +833,99 @@ def extract_timestamp_from_frame(frame, roi_x, roi_y, roi_width, roi_height):
         roi_y: Y-coordinate of the top-left corner of the ROI
         roi_width: Width of the ROI
         roi_height: Height of the ROI
+        cancelled: Optional callable; when it returns True, OCR stops before the next attempt
+            and (None, None) is returned
+        last_attempt: Optional dict that receives the "image", "config" and "method" of every OCR attempt,
+            so after a successful call it holds the attempt the timestamp was read from
+            (the image is a buffer that is reused by the next call in the same thread); a
+            reading of the digit model has method "digits", config None and a "confidence"
+        methods: Indices into PREPROCESSING_METHODS to try, in order (default: all of them)
+        relaxed: Whether to fall back to the relaxed patterns on the grayscale ROI when no
+            preprocessing method finds a timestamp
+        digit_model: Whether to read the ROI with the digit model (see DigitRecognizer) before
+            Tesseract, when the model is installed and all methods are tried; a confident
+            reading of a complete timestamp is returned without calling Tesseract
+        strategy: OCRStrategy or name of an OCR_PROFILES profile to read the ROI with instead
+            of the cascade (see OCRStrategy.read); methods, relaxed and digit_model are then
+            ignored and no debug images are written
+        debug_images: Whether to save the ROI and every preprocessed image to the debug_images
+            folder (see Troubleshooting in the README); only for reading single frames
+            interactively, as concurrent calls overwrite the same files
 
     Returns:
         Tuple of (extracted datetime object, original format string) or (None, None) if no timestamp found
     """
-    # Verify Tesseract is properly configured
-    try:
-        tesseract_version = pytesseract.get_tesseract_version()
-        print(f"Using Tesseract version: {tesseract_version}")
-    except Exception as e:
-        print(f"WARNING: Could not verify Tesseract installation: {e}")
-        print(f"Current Tesseract path: {pytesseract.pytesseract.tesseract_cmd}")
-        print("Please ensure Tesseract is properly installed and the path is correct.")
-        # Continue anyway, as the error might be with version checking but OCR might still work
     # Extract the region of interest (ROI)
     roi = frame[roi_y:roi_y+roi_height, roi_x:roi_x+roi_width]
 
+    if strategy is not None:
+        if isinstance(strategy, str):
+            strategy = get_ocr_strategy(strategy)
+        return strategy.read(roi, cancelled=cancelled, last_attempt=last_attempt)
+
+    # Verify Tesseract is properly configured; the check only runs on the first call and
+    # OCR is attempted anyway, as the error might be with version checking
+    get_tool_version("tesseract")
+
     # Create a debug directory if it doesn't exist
-    import os
-    debug_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "debug_images")
-    os.makedirs(debug_dir, exist_ok=True)
+    debug_dir = None
+    if debug_images:
+        debug_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "debug_images")
+        os.makedirs(debug_dir, exist_ok=True)
 
     # Save the original ROI for debugging
-    original_roi_path = os.path.join(debug_dir, "original_roi.png")
-    cv2.imwrite(original_roi_path, roi)
-    print(f"Saved original ROI to {original_roi_path}")
+    _write_debug_image(debug_dir, "original_roi.png", roi, "original ROI")
 
-    # Convert to grayscale for better OCR results
-    gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+    # Convert to grayscale for better OCR results; the preprocessed images are computed from it
+    # on demand into buffers that are reused for the next ROI
+    graph = get_preprocessing_graph()
+    gray = graph.set_roi(roi)
 
     # Save the grayscale ROI for debugging
-    gray_roi_path = os.path.join(debug_dir, "gray_roi.png")
-    cv2.imwrite(gray_roi_path, gray)
-    print(f"Saved grayscale ROI to {gray_roi_path}")
-
-    # Try different preprocessing methods to handle various text colors and backgrounds
-    preprocessing_methods = [
-        # Original grayscale
-        lambda img: img,
-        # Binary threshold (dark text on light background)
-        lambda img: cv2.threshold(img, 150, 255, cv2.THRESH_BINARY)[1],
-        # Inverse binary threshold (light text on dark background) - optimized for white text
-        lambda img: cv2.threshold(img, 120, 255, cv2.THRESH_BINARY_INV)[1],  # Lower threshold for better white text detection
-        # Stronger inverse threshold for white text on dark backgrounds
-        lambda img: cv2.threshold(img, 80, 255, cv2.THRESH_BINARY_INV)[1],  # Even lower threshold for very faint white text
-        # Adaptive threshold
-        lambda img: cv2.adaptiveThreshold(img, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2),
-        # Inverse adaptive threshold
-        lambda img: cv2.bitwise_not(cv2.adaptiveThreshold(img, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)),
-        # Contrast enhancement followed by inverse binary threshold (good for white text)
-        lambda img: cv2.threshold(cv2.equalizeHist(img), 120, 255, cv2.THRESH_BINARY_INV)[1],
-        # Blur followed by inverse threshold (helps with noisy backgrounds)
-        lambda img: cv2.threshold(cv2.GaussianBlur(img, (3, 3), 0), 120, 255, cv2.THRESH_BINARY_INV)[1],
-        # Color filtering for white text (new method)
-        lambda img: cv2.threshold(img, 200, 255, cv2.THRESH_BINARY)[1],  # High threshold to isolate very white pixels
-        # Morphological operations to enhance white text
-        lambda img: cv2.morphologyEx(cv2.threshold(img, 180, 255, cv2.THRESH_BINARY)[1], cv2.MORPH_OPEN, np.ones((2,2),np.uint8)),
-        # Advanced white text isolation (combines multiple techniques)
-        lambda img: cv2.morphologyEx(
-            cv2.threshold(
-                cv2.GaussianBlur(cv2.equalizeHist(img), (3, 3), 0),  # Equalize and blur to reduce noise
-                190, 255, cv2.THRESH_BINARY)[1],  # High threshold for white text
-            cv2.MORPH_CLOSE, np.ones((2,2),np.uint8)  # Close small gaps in text
-        )
-    ]
+    _write_debug_image(debug_dir, "gray_roi.png", gray, "grayscale ROI")
 
-    # Create a debug directory if it doesn't exist
-    import os
-    debug_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "debug_images")
-    os.makedirs(debug_dir, exist_ok=True)
+    recognizer = get_digit_recognizer() if digit_model and methods is None else None
+    if recognizer is not None:
+        if cancelled is not None and cancelled():
+            OCR_FRAMES.inc(outcome="cancelled")
+            return None, None
+        dt, text, confidence = read_timestamp_with_digit_model(gray, recognizer)
+        if dt is not None:
+            if last_attempt is not None:
+                last_attempt.update(image=gray, config=None, method="digits", confidence=confidence)
+            print(f"Successfully parsed timestamp with the digit model: {dt}")
+            _record_ocr_timestamp("dnn", "digits", method="digits", psm="none")
+            return dt, text
 
     # Try each preprocessing method until we find a timestamp
-    for i, preprocess in enumerate(preprocessing_methods):
+    for i in range(len(PREPROCESSING_METHODS)) if methods is None else methods:
+        if cancelled is not None and cancelled():
+            OCR_FRAMES.inc(outcome="cancelled")
+            return None, None
         try:
             # Apply preprocessing
-            processed_img = preprocess(gray)
+            with span("ocr.preprocess", method=i):
+                processed_img = graph.get(PREPROCESSING_METHODS[i])
 
             # Save the processed image for debugging
-            debug_path = os.path.join(debug_dir, f"preprocess_method_{i}.png")
-            cv2.imwrite(debug_path, processed_img)
-            print(f"Saved debug image to {debug_path}")
+            _write_debug_image(debug_dir, f"preprocess_method_{i}.png", processed_img, "debug image")
 
             # Use pytesseract to extract text from the ROI
             try:
                 # Restrict characters to improve accuracy and remove newlines
                 # Use PSM 7 (treat as single line of text)
-                text = pytesseract.image_to_string(
-                    processed_img,
-                    config='--psm 7 --oem 3 -c tessedit_char_whitelist=0123456789:/.-'
-                )
+                config = '--psm 7 --oem 3 -c tessedit_char_whitelist=0123456789:/.-'
+                if last_attempt is not None:
+                    last_attempt.update(image=processed_img, config=config, method=i)
+                OCR_ATTEMPTS.inc(stage="preprocess", method=i, psm=7)
+                ocr_start = time.perf_counter()
+                with span("ocr.tesseract", method=i, psm=7):
+                    text = pytesseract.image_to_string(processed_img, config=config)
+                OCR_LATENCY.observe(time.perf_counter() - ocr_start, stage="preprocess", method=i, psm=7)
                 # Clean up the text
                 text = text.replace('\n', ' ').strip()
             except pytesseract.pytesseract.TesseractError as te:
+                OCR_TESSERACT_ERRORS.inc(stage="preprocess")
                 print(f"Tesseract Error: {te}")
                 print("This may indicate an issue with Tesseract installation or configuration.")
                 print(f"Current Tesseract path: {pytesseract.pytesseract.tesseract_cmd}")
@@ -356,1261 +935,3910 @@ def extract_timestamp_from_frame(frame, roi_x, roi_y, roi_width, roi_height):
             # Debug output
             print(f"Method {i} - Extracted text: {text}")
 
-            # Look for various timestamp patterns
-            patterns = [
-                # Format with 4-digit year: DD/MM/YYYY HH:MM:SS:ZZZ (specific format from issue)
-                (r'(\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}:\d{3})', '%d/%m/%Y %H:%M:%S:%f'),
-                # Format with 4-digit year: DD/MM/YYYY HH:MM:ss.SSS
-                (r'(\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}\.\d{3})', '%d/%m/%Y %H:%M:%S.%f'),
-                # Standard format: DD/MM/YY HH:MM:ss.SSS
-                (r'(\d{2}/\d{2}/\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})', '%d/%m/%y %H:%M:%S.%f'),
-                # Alternative format with different separators: DD-MM-YY HH:MM:ss.SSS
-                (r'(\d{2}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})', '%d-%m-%y %H:%M:%S.%f'),
-                # Format with no milliseconds: DD/MM/YY HH:MM:ss
-                (r'(\d{2}/\d{2}/\d{2}\s+\d{2}:\d{2}:\d{2})', '%d/%m/%y %H:%M:%S'),
-                # US format: MM/DD/YY HH:MM:ss.SSS
-                (r'(\d{2}/\d{2}/\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})', '%m/%d/%y %H:%M:%S.%f'),
-                # Format with different time separator: DD/MM/YY HH-MM-ss.SSS
-                (r'(\d{2}/\d{2}/\d{2}\s+\d{2}-\d{2}-\d{2}\.\d{3})', '%d/%m/%y %H-%M-%S.%f'),
-                # Format with just time: HH:MM:ss.SSS
-                (r'(\d{2}:\d{2}:\d{2}\.\d{3})', '%H:%M:%S.%f')
-            ]
-
-            for pattern, fmt in patterns:
-                match = re.search(pattern, text)
-                if match:
-                    timestamp_str = match.group(1)
-
-                    # Handle colon separator in milliseconds
-                    if ':' in timestamp_str and fmt.endswith(':%f'):
-                        # For the specific format with colon separator for milliseconds,
-                        # we need to handle it specially since Python's datetime.strptime
-                        # doesn't support colon as a separator for milliseconds
-
-                        # First, check if this is the specific format we're looking for (DD/MM/YYYY HH:MM:SS:ZZZ)
-                        if re.match(r'\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2}:\d{3}', timestamp_str):
-                            # Extract the components manually
-                            parts = timestamp_str.split()
-                            date_part = parts[0]  # DD/MM/YYYY
-                            time_part = parts[1]  # HH:MM:SS:mmm
-
-                            # Split the date and time parts
-                            day, month, year = date_part.split('/')
-
-                            # Split the time part and handle the milliseconds
-                            time_components = time_part.split(':')
-                            hour = time_components[0]
-                            minute = time_components[1]
-                            second = time_components[2]
-                            millisecond = time_components[3]
-
-                            # Create a datetime object manually
-                            # The datetime constructor expects (year, month, day, hour, minute, second, microsecond)
-                            # Convert milliseconds to microseconds correctly
-                            microseconds = int(millisecond)
-                            if len(millisecond) == 4:
-                                # For 4-digit milliseconds, treat as 0.xxxx seconds
-                                microseconds = int(millisecond) * 100
-                            elif len(millisecond) > 4:
-                                # For longer milliseconds, truncate to 6 digits (microseconds limit)
-                                microseconds = int(millisecond[:6])
-                            else:
-                                # For 1-3 digit milliseconds, multiply by 1000 to convert to microseconds
-                                microseconds = int(millisecond) * 1000
-
-                            dt = datetime.datetime(
-                                int(year), int(month), int(day),
-                                int(hour), int(minute), int(second),
-                                microseconds
-                            )
-                            # Store the original format string
-                            original_format = f"{day}/{month}/{year} {hour}:{minute}:{second}:{millisecond}"
-                            print(f"Successfully parsed timestamp manually: {dt}")
-                            return dt, original_format
-
-                        # If it's not the specific format, fall back to the previous approach
-                        # Replace the format string to use dot instead of colon for milliseconds
-                        fmt = fmt.replace(':%f', '.%f')
-                        # Replace the last colon with a dot in the timestamp string
-                        last_colon_index = timestamp_str.rfind(':')
-                        if last_colon_index != -1 and len(timestamp_str) - last_colon_index >= 4:
-                            # Check if what follows is 3 digits (milliseconds)
-                            if timestamp_str[last_colon_index+1:last_colon_index+4].isdigit():
-                                timestamp_str = timestamp_str[:last_colon_index] + '.' + timestamp_str[last_colon_index+1:]
-
-                    try:
-                        # Parse the timestamp string to a datetime object
-                        if fmt == '%H:%M:%S.%f':
-                            # For time-only format, use today's date
-                            time_obj = datetime.datetime.strptime(timestamp_str, fmt).time()
-                            dt = datetime.datetime.combine(datetime.datetime.today().date(), time_obj)
-                        else:
-                            dt = datetime.datetime.strptime(timestamp_str, fmt)
-                        print(f"Successfully parsed timestamp with format {fmt}: {dt}")
-                        return dt, timestamp_str
-                    except ValueError:
-                        print(f"Failed to parse timestamp: {timestamp_str} with format {fmt}")
-                        continue
+            with span("ocr.parse", method=i):
+                dt, original_format, pattern_format = parse_timestamp_text(text)
+            if dt is not None:
+                _record_ocr_timestamp("preprocess", pattern_format, method=i)
+                return dt, original_format
         except Exception as e:
             print(f"OCR error with preprocessing method: {e}")
 
+    if not relaxed:
+        OCR_FRAMES.inc(outcome="not_found")
+        return None, None
+
     # If we've tried all preprocessing methods and still haven't found a timestamp,
     # try one more time with more relaxed patterns
     try:
         # Save a debug image of the final attempt
-        debug_path = os.path.join(debug_dir, "final_attempt.png")
-        cv2.imwrite(debug_path, gray)
-        print(f"Saved final attempt image to {debug_path}")
+        _write_debug_image(debug_dir, "final_attempt.png", gray, "final attempt image")
 
         # Use the original grayscale image with different PSM modes
         for psm_mode in [7, 6, 3]:  # Try different page segmentation modes
+            if cancelled is not None and cancelled():
+                OCR_FRAMES.inc(outcome="cancelled")
+                return None, None
             try:
-                text = pytesseract.image_to_string(
-                    gray,
-                    config=f'--psm {psm_mode} --oem 3 -c tessedit_char_whitelist=0123456789:/.-'
-                )
+                config = f'--psm {psm_mode} --oem 3 -c tessedit_char_whitelist=0123456789:/.-'
+                if last_attempt is not None:
+                    last_attempt.update(image=gray, config=config, method="gray")
+                OCR_ATTEMPTS.inc(stage="relaxed", method="gray", psm=psm_mode)
+                ocr_start = time.perf_counter()
+                with span("ocr.tesseract", psm=psm_mode):
+                    text = pytesseract.image_to_string(gray, config=config)
+                OCR_LATENCY.observe(time.perf_counter() - ocr_start, stage="relaxed", method="gray", psm=psm_mode)
                 print(f"Final attempt with PSM {psm_mode} - Extracted text: {text}")
 
                 # Clean up the text
                 text = text.replace('\n', ' ').strip()
 
-                # First try to match the exact format we're seeing with PSM 6
-                exact_match = re.search(r'(\d{2}/\d{2}/\d{4})(\d{2}):(\d{5}):(\d{3})', text)
-                if exact_match:
-                    try:
-                        # Extract date components
-                        date_str = exact_match.group(1)  # DD/MM/YYYY
-                        hour = exact_match.group(2)
-                        combined_minutes = exact_match.group(3)  # MMHHH - contains both minutes and milliseconds
-                        final_milliseconds = exact_match.group(4)
-
-                        # Split the date
-                        day, month, year = date_str.split('/')
-
-                        # Extract minutes and milliseconds from combined value
-                        minutes = combined_minutes[:2]  # First two digits are minutes
-                        seconds = combined_minutes[2:4]  # Next two digits are seconds
-                        milliseconds = combined_minutes[4:] + final_milliseconds  # Combine all milliseconds
-
-                        print(f"Parsed components - Date: {year}-{month}-{day}, Time: {hour}:{minutes}:{seconds}.{milliseconds}")
-
-                        # Create datetime object manually
-                        # Convert milliseconds to microseconds correctly
-                        # If milliseconds has 4 digits (e.g., 3287), it represents 0.3287 seconds
-                        # So we need to convert it to 328700 microseconds
-                        microseconds = int(milliseconds)
-                        if len(milliseconds) == 4:
-                            # For 4-digit milliseconds, treat as 0.xxxx seconds
-                            microseconds = int(milliseconds) * 100
-                        elif len(milliseconds) > 4:
-                            # For longer milliseconds, truncate to 6 digits (microseconds limit)
-                            microseconds = int(milliseconds[:6])
-                        else:
-                            # For 1-3 digit milliseconds, multiply by 1000 to convert to microseconds
-                            microseconds = int(milliseconds) * 1000
-
-                        dt = datetime.datetime(
-                            int(year), int(month), int(day),
-                            int(hour), int(minutes), int(seconds),
-                            microseconds
-                        )
-                        # Store the original format string
-                        original_format = f"{day}/{month}/{year} {hour}:{minutes}:{seconds}.{milliseconds}"
-                        print(f"Successfully parsed timestamp manually: {dt}")
-                        return dt, original_format
-                    except (ValueError, IndexError) as e:
-                        print(f"Failed to parse exact PSM 6 format: {e}")
-                        # Continue to try other patterns
-
-                # If exact match failed, try the alternative PSM 6 format
-                exact_match = re.search(r'(\d{2}/\d{2}/\d{4})\s+(\d{2}:\d{2}\d{3}):(\d{3})', text)
-                if exact_match:
-                    try:
-                        # Extract components manually
-                        date_part = exact_match.group(1)
-                        time_part = exact_match.group(2)
-                        milliseconds = exact_match.group(3)
-
-                        # Split date components
-                        day, month, year = date_part.split('/')
-
-                        # Handle the case where minutes and milliseconds are combined
-                        hour = time_part[:2]
-                        minute = time_part[3:5]
-                        second = time_part[5:7]
-
-                        # Create datetime object manually
-                        # Convert milliseconds to microseconds correctly
-                        microseconds = int(milliseconds)
-                        if len(milliseconds) == 4:
-                            # For 4-digit milliseconds, treat as 0.xxxx seconds
-                            microseconds = int(milliseconds) * 100
-                        elif len(milliseconds) > 4:
-                            # For longer milliseconds, truncate to 6 digits (microseconds limit)
-                            microseconds = int(milliseconds[:6])
-                        else:
-                            # For 1-3 digit milliseconds, multiply by 1000 to convert to microseconds
-                            microseconds = int(milliseconds) * 1000
-
-                        dt = datetime.datetime(
-                            int(year), int(month), int(day),
-                            int(hour), int(minute), int(second),
-                            microseconds
-                        )
-                        # Store the original format string
-                        original_format = f"{date_part} {hour}:{minute}:{second}:{milliseconds}"
-                        print(f"Successfully parsed timestamp manually: {dt}")
-                        return dt, original_format
-                    except (ValueError, IndexError) as e:
-                        print(f"Failed to parse exact format: {e}")
-                        # Continue to try other patterns
-
-                # Try to match the format where date and time are concatenated without a space (e.g., 13/06/202515:11:56:257)
-                exact_match = re.search(r'(\d{2}/\d{2}/\d{4})(\d{2}):(\d{2}):(\d{2}):(\d{3})', text)
-                if exact_match:
-                    try:
-                        # Extract components
-                        date_str = exact_match.group(1)  # DD/MM/YYYY
-                        hour = exact_match.group(2)
-                        minute = exact_match.group(3)
-                        second = exact_match.group(4)
-                        millisecond = exact_match.group(5)
-
-                        # Split the date
-                        day, month, year = date_str.split('/')
-
-                        print(f"Parsed components - Date: {year}-{month}-{day}, Time: {hour}:{minute}:{second}.{millisecond}")
-
-                        # Create datetime object manually
-                        # Convert milliseconds to microseconds correctly
-                        microseconds = int(millisecond)
-                        if len(millisecond) == 4:
-                            # For 4-digit milliseconds, treat as 0.xxxx seconds
-                            microseconds = int(millisecond) * 100
-                        elif len(millisecond) > 4:
-                            # For longer milliseconds, truncate to 6 digits (microseconds limit)
-                            microseconds = int(millisecond[:6])
-                        else:
-                            # For 1-3 digit milliseconds, multiply by 1000 to convert to microseconds
-                            microseconds = int(millisecond) * 1000
-
-                        dt = datetime.datetime(
-                            int(year), int(month), int(day),
-                            int(hour), int(minute), int(second),
-                            microseconds
-                        )
-                        # Store the original format string
-                        original_format = f"{day}/{month}/{year} {hour}:{minute}:{second}:{millisecond}"
-                        print(f"Successfully parsed timestamp manually: {dt}")
-                        return dt, original_format
-                    except (ValueError, IndexError) as e:
-                        print(f"Failed to parse concatenated format: {e}")
-                        # Continue to try other patterns
-
-                # If PSM 6 formats failed, continue with existing patterns
-                # Try various relaxed patterns
-                relaxed_patterns = [
-                    # Very relaxed date/time pattern
-                    (r'(\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}\s+\d{1,2}:\d{1,2}:\d{1,2}[.,]\d{1,3})', None, 3),  # Highest priority
-                    # Very relaxed date/time pattern with colon separator for milliseconds
-                    (r'(\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}\s+\d{1,2}:\d{1,2}:\d{1,2}:\d{1,3})', None, 3),  # Highest priority
-                    # Just look for sequences of digits that might be a timestamp
-                    (r'(\d{2}[^\d]\d{2}[^\d]\d{2}[^\w]\d{2}[^\d]\d{2}[^\d]\d{2})', None, 2),  # Medium priority
-                    # Time only with milliseconds
-                    (r'(\d{1,2}:\d{1,2}:\d{1,2}[.,]\d{1,3})', None, 1),  # Low priority
-                    # Time only without milliseconds
-                    (r'(\d{1,2}:\d{1,2}:\d{1,2})', '%H:%M:%S', 0)  # Lowest priority
-                ]
-
-                # Collect all matches from all patterns
-                all_matches = []
-                for pattern, fmt, priority in relaxed_patterns:
-                    matches = re.findall(pattern, text)
-                    for match_str in matches:
-                        all_matches.append((match_str, fmt, priority))
-
-                # Sort matches by priority (highest first)
-                all_matches.sort(key=lambda x: x[2], reverse=True)
-
-                # Process matches in order of priority
-                for match_str, fmt, priority in all_matches:
-                    print(f"Found potential timestamp with relaxed pattern: {match_str} (priority: {priority})")
-
-                    # Try to normalize the format for parsing
-                    normalized_str = match_str
-                    for char in ['-', '.']:
-                        normalized_str = normalized_str.replace(char, '/')
-                    normalized_str = normalized_str.replace(',', '.')
-                    # Also replace colon with dot for milliseconds (e.g., 13:28:42:285 -> 13:28:42.285)
-                    if ':' in normalized_str:
-                        # Find the last colon and replace it with a dot if it's followed by 3 digits (milliseconds)
-                        last_colon_index = normalized_str.rfind(':')
-                        if last_colon_index != -1 and len(normalized_str) - last_colon_index >= 4:
-                            # Check if what follows is 3 digits (milliseconds)
-                            if normalized_str[last_colon_index+1:last_colon_index+4].isdigit():
-                                normalized_str = normalized_str[:last_colon_index] + '.' + normalized_str[last_colon_index+1:]
-
-                    # Try different date formats
-                    formats_to_try = []
-                    if fmt:
-                        formats_to_try.append(fmt)
-                    else:
-                        formats_to_try = [
-                            # Format with 4-digit year and colon separator for milliseconds (specific format from issue)
-                            '%d/%m/%Y %H:%M:%S:%f',  # DD/MM/YYYY HH:MM:SS:ZZZ
-                            # Format with 4-digit year and dot separator for milliseconds
-                            '%d/%m/%Y %H:%M:%S.%f',
-                            # Standard formats
-                            '%d/%m/%y %H:%M:%S.%f',
-                            '%m/%d/%y %H:%M:%S.%f',
-                            '%d/%m/%y %H:%M:%S,%f',
-                            '%m/%d/%y %H:%M:%S,%f',
-                            '%H:%M:%S.%f',
-                            '%H:%M:%S,%f'
-                        ]
-
-                    for fmt in formats_to_try:
-                        try:
-                            if fmt in ['%H:%M:%S.%f', '%H:%M:%S,%f', '%H:%M:%S']:
-                                # For time-only format, use today's date
-                                time_obj = datetime.datetime.strptime(normalized_str, fmt).time()
-                                dt = datetime.datetime.combine(datetime.datetime.today().date(), time_obj)
-                            else:
-                                dt = datetime.datetime.strptime(normalized_str, fmt)
-                            print(f"Successfully parsed timestamp with format {fmt}: {dt}")
-                            return dt, normalized_str
-                        except ValueError as ve:
-                            print(f"Failed to parse with format {fmt}: {ve}")
-                            continue
+                dt, original_format, pattern = parse_relaxed_timestamp_text(text)
+                if dt is not None:
+                    _record_ocr_timestamp("relaxed", pattern, psm=psm_mode)
+                    return dt, original_format
             except Exception as e:
                 print(f"Error parsing timestamp pattern: {e}")
                 continue
     except Exception as e:
         print(f"OCR error with relaxed pattern: {e}")
 
+    OCR_FRAMES.inc(outcome="not_found")
     return None, None
 
 
-def view_video_with_timestamp_overlay(file_path: str) -> tuple[datetime.datetime | None, str | None]:
+def ocr_confidence(image, config):
     """
-    Display video with timestamp overlay and allow user to select a reference frame.
-    The timestamp overlay is expected to be in the top right corner of the first frame.
+    Return the mean Tesseract word confidence (0-100) for an image, or None if no words were found.
 
     Args:
-        file_path: Path to the video file
-
-    Returns:
-        Tuple of (selected reference time, original format string) or (None, None) if canceled
+        image: The image the timestamp was read from
+        config: The Tesseract configuration it was read with
     """
-    # Open the video file
-    cap = cv2.VideoCapture(file_path)
-    if not cap.isOpened():
-        messagebox.showerror("Error", "Could not open video file")
+    try:
+        data = pytesseract.image_to_data(image, config=config, output_type=pytesseract.Output.DICT)
+    except pytesseract.pytesseract.TesseractError as e:
+        print(f"Tesseract Error: {e}")
         return None
+    confidences = [float(conf) for conf, text in zip(data["conf"], data["text"]) if text.strip() and float(conf) >= 0]
+    return sum(confidences) / len(confidences) if confidences else None
 
-    # Get video properties
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    if not fps or fps <= 0:
-        fps = 30.0  # Default FPS if not available
-
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    original_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    original_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-
-    # Scale video dimensions to a reasonable size while maintaining aspect ratio
-    max_display_width = 1280
-    max_display_height = 720
-
-    # Calculate scaling factor
-    width_scale = max_display_width / original_width if original_width > max_display_width else 1
-    height_scale = max_display_height / original_height if original_height > max_display_height else 1
-    scale_factor = min(width_scale, height_scale)
-
-    # Apply scaling
-    width = int(original_width * scale_factor)
-    height = int(original_height * scale_factor)
-
-    # Create a window for the video
-    video_window = tk.Toplevel()
-    video_window.title("Select Frame with Timestamp Overlay")
-
-    # Calculate window dimensions with minimum sizes to ensure controls are visible
-    window_width = max(width + 200, 800)  # Minimum width of 800 pixels
-    window_height = max(height + 250, 600)  # Minimum height of 600 pixels
-
-    # Set window size and position it in the center of the screen
-    video_window.geometry(f"{window_width}x{window_height}")
-
-    # Center the window on the screen
-    screen_width = video_window.winfo_screenwidth()
-    screen_height = video_window.winfo_screenheight()
-    x_position = (screen_width - window_width) // 2
-    y_position = (screen_height - window_height) // 2
-    video_window.geometry(f"{window_width}x{window_height}+{x_position}+{y_position}")
-
-    # Make sure the window is on top initially
-    video_window.attributes('-topmost', True)
-    video_window.update()
-    video_window.attributes('-topmost', False)
-
-    video_window.protocol("WM_DELETE_WINDOW", lambda: on_close())
-
-    # Create a canvas with scrollbar for the main container
-    canvas_container = tk.Canvas(video_window)
-    canvas_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-
-    # Add vertical scrollbar to canvas
-    scrollbar = tk.Scrollbar(video_window, orient=tk.VERTICAL, command=canvas_container.yview)
-    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-    canvas_container.configure(yscrollcommand=scrollbar.set)
-
-    # Create a main container frame to organize all elements
-    main_container = tk.Frame(canvas_container)
-
-    # Add the main container to the canvas
-    canvas_window = canvas_container.create_window((0, 0), window=main_container, anchor=tk.NW)
-
-    # Configure the canvas to resize with the window
-    def configure_canvas(event):
-        canvas_container.configure(scrollregion=canvas_container.bbox("all"))
-        canvas_container.itemconfig(canvas_window, width=event.width)
-
-    canvas_container.bind("<Configure>", configure_canvas)
-    main_container.bind("<Configure>", lambda e: canvas_container.configure(scrollregion=canvas_container.bbox("all")))
-
-    # Make sure scrolling works properly
-    def _on_mousewheel(event):
-        canvas_container.yview_scroll(int(-1*(event.delta/120)), "units")
-
-    canvas_container.bind_all("<MouseWheel>", _on_mousewheel)
-
-    # Add instruction label at the top of the container
-    instruction_label = tk.Label(
-        main_container, 
-        text="Please locate the timestamp overlay in the top right corner of the video.\n"
-             "Navigate to the frame where the timestamp is clearly visible and click 'Select as Reference'.\n"
-             "Use the Play/Pause button and arrow buttons below to navigate through the video.",
-        wraplength=width,
-        justify=tk.LEFT,
-        font=("Arial", 10, "bold"),
-        fg="blue",
-        bg="#f0f0f0",  # Light background for better visibility
-        relief=tk.GROOVE,
-        borderwidth=1,
-        padx=5,
-        pady=5
-    )
-    instruction_label.pack(fill=tk.X, padx=10, pady=10)
-
-    # Create a frame for the video display
-    video_frame = tk.Frame(main_container, width=width, height=height)
-    video_frame.pack(pady=10)
-
-    # Create a canvas for the video
-    canvas = tk.Canvas(video_frame, width=width, height=height, bg="black")
-    canvas.pack()
-
-    # Create controls frame with distinct styling to match buttons frame
-    controls_frame = tk.Frame(main_container, bg="#e0e0e0", relief=tk.RAISED, borderwidth=2)
-    controls_frame.pack(fill=tk.X, padx=10, pady=10)
-
-    # Add a label for the slider
-    slider_label = tk.Label(
-        controls_frame,
-        text="Video Position:",
-        font=("Arial", 10, "bold"),
-        bg="#e0e0e0"
-    )
-    slider_label.pack(side=tk.TOP, anchor=tk.W, padx=10, pady=5)
-
-    # Create slider for seeking
-    seek_var = tk.IntVar()
-    seek_slider = ttk.Scale(
-        controls_frame, 
-        from_=0, 
-        to=total_frames-1, 
-        orient=tk.HORIZONTAL,
-        variable=seek_var,
-        length=width
-    )
-    seek_slider.pack(fill=tk.X, padx=10, pady=10)
-
-    # Create buttons frame with distinct styling to ensure visibility
-    buttons_frame = tk.Frame(main_container, bg="#e0e0e0", relief=tk.RAISED, borderwidth=2)
-    buttons_frame.pack(fill=tk.X, padx=10, pady=10)
-
-    # Create info label for current position and timestamp with enhanced visibility
-    info_label = tk.Label(
-        buttons_frame, 
-        text="Frame: 0 / 0  |  Time: 00:00:00.000",
-        font=("Arial", 10, "bold"),
-        bg="#e0e0e0"  # Match the background of the buttons frame
-    )
-    info_label.pack(side=tk.LEFT, padx=10, pady=10)
 
-    # Variables to control playback
-    playing = False
-    current_frame = 0
-    reference_time = None
-    reference_format = None
+def binarize_roi(roi):
+    """
+    Return a timestamp region as a 0/255 image.
 
-    # Function to update the frame display
-    def update_frame(frame_number):
-        nonlocal current_frame, original_width, original_height
+    The overlay text is the brightest or the darkest part of the region, whichever is further
+    from the median level, and the threshold is halfway between the two. Unlike Otsu's
+    threshold, this keeps textured or striped backgrounds on the background side.
+    """
+    gray = roi if roi.ndim == 2 else cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+    cumulative = cv2.calcHist([gray], [0], None, [256], [0, 256]).ravel().cumsum()
+    low, median, high = np.searchsorted(cumulative, np.array([0.01, 0.5, 0.99]) * cumulative[-1])
+    level = (median + high) / 2 if high - median >= median - low else (median + low) / 2
+    return cv2.threshold(gray, level, 255, cv2.THRESH_BINARY)[1]
 
-        # Set the position to the requested frame
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-        ret, frame = cap.read()
 
-        if not ret:
-            return False
+def get_ink_mask(binary, min_area=3):
+    """
+    Return a boolean mask of the ink of a binarized ROI: whichever of black and white covers less of it.
 
-        current_frame = frame_number
-        seek_var.set(frame_number)
-
-        # Calculate timestamp for this frame
-        # Using 1970-01-01 as a base time for display purposes
-        base_time = datetime.datetime(1970, 1, 1)
-        frame_time = base_time + datetime.timedelta(seconds=frame_number / fps)
-        timestamp_str = frame_time.strftime("%Y-%m-%d %H:%M:%S.") + f"{frame_time.microsecond // 1000:03d}"
-
-        # Update info label
-        info_label.config(text=f"Frame: {frame_number+1} / {total_frames}  |  Time: {timestamp_str}")
-
-        # Add timestamp overlay to the frame
-        frame_with_overlay = frame.copy()
-
-        # Highlight the top right corner where the timestamp overlay is expected to be
-        # Only do this for the first frame to help the user locate the timestamp
-        if frame_number == 0:
-            # Calculate the region of interest (ROI) in the top right corner
-            # For white text, we need to be more precise with the ROI
-            roi_width = int(original_width * 0.4)  # Use 40% of the width for the ROI to ensure we capture the full timestamp
-            roi_height = int(original_height * 0.2)  # Use 20% of the height for the ROI to ensure we capture the full timestamp
-            roi_x = original_width - roi_width
-            roi_y = 0  # Start from the top of the frame
-
-            # Draw a rectangle around the ROI
-            cv2.rectangle(
-                frame_with_overlay,
-                (roi_x, roi_y),
-                (roi_x + roi_width, roi_y + roi_height),
-                (0, 255, 255),  # Yellow color
-                2
-            )
+    Specks of fewer than min_area pixels, which sensor noise leaves around the text, are not ink.
+    """
+    ink = binary > 0 if np.count_nonzero(binary) * 2 < binary.size else binary == 0
+    _, labels, stats, _ = cv2.connectedComponentsWithStats(ink.view(np.uint8), connectivity=8)
+    specks = stats[:, cv2.CC_STAT_AREA] < min_area
+    specks[0] = False
+    return ink & ~specks[labels] if specks.any() else ink
 
-            # Add text to indicate this is where the timestamp is expected
-            cv2.putText(
-                frame_with_overlay,
-                "Timestamp Location",
-                (roi_x, roi_y + roi_height + 30),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.8,
-                (0, 255, 255),  # Yellow color
-                2
-            )
 
-        cv2.putText(
-            frame_with_overlay,
-            f"Frame: {frame_number+1}",
-            (10, 30),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            1,
-            (0, 255, 0),
-            2
-        )
-        cv2.putText(
-            frame_with_overlay,
-            f"Time: {timestamp_str}",
-            (10, 70),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            1,
-            (0, 255, 0),
-            2
-        )
+def find_glyph_columns(binary) -> list:
+    """Return the (start, end) column ranges of the runs of columns with ink in a binarized ROI."""
+    has_ink = np.concatenate(([False], get_ink_mask(binary).any(axis=0), [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(has_ink))
+    return list(zip(edges[0::2].tolist(), edges[1::2].tolist()))
 
-        # Resize the frame to match the scaled dimensions
-        if original_width != width or original_height != height:
-            frame_with_overlay = cv2.resize(frame_with_overlay, (width, height), interpolation=cv2.INTER_AREA)
 
-        # Convert the frame to RGB (from BGR) and then to a PhotoImage
-        rgb_frame = cv2.cvtColor(frame_with_overlay, cv2.COLOR_BGR2RGB)
-        img = tk.PhotoImage(data=cv2.imencode('.ppm', rgb_frame)[1].tobytes())
+# Text lower than this many pixels is too small to cut into characters (the overlay of frames
+# smaller than about 480x270), so the digit model does not read it
+DIGIT_MIN_TEXT_HEIGHT = 12
+# Text lower than DIGIT_UPSCALE_BELOW pixels is scaled up to DIGIT_UPSCALE_TEXT_HEIGHT before it
+# is binarized, so that compression blur does not merge neighbouring characters
+DIGIT_UPSCALE_BELOW = 24
+DIGIT_UPSCALE_TEXT_HEIGHT = 48
 
-        # Keep a reference to the image to prevent garbage collection
-        canvas.image = img
-        canvas.create_image(0, 0, anchor=tk.NW, image=img)
 
-        return True
+def get_text_height(binary) -> int:
+    """Return the height in pixels of the line of text of a binarized ROI (0 if it has no ink)."""
+    rows = np.flatnonzero(get_ink_mask(binary).any(axis=1))
+    return int(rows[-1] - rows[0] + 1) if len(rows) else 0
 
-    # Function to play the video
-    def play_video():
-        nonlocal playing
-        if playing:
-            return
 
-        playing = True
-        play_button.config(text="Pause", command=pause_video)
-        play_next_frame()
+def binarize_digit_roi(roi):
+    """
+    Binarize a ROI for the digit model (see binarize_roi), scaling it up first if its text is low.
 
-    # Function to play the next frame
-    def play_next_frame():
-        nonlocal playing, current_frame
+    Returns:
+        The binarized ROI, or None if its text is lower than DIGIT_MIN_TEXT_HEIGHT
+    """
+    binary = binarize_roi(roi)
+    height = get_text_height(binary)
+    if height < DIGIT_MIN_TEXT_HEIGHT:
+        return None
+    if height < DIGIT_UPSCALE_BELOW:
+        scale = DIGIT_UPSCALE_TEXT_HEIGHT / height
+        binary = binarize_roi(cv2.resize(roi, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC))
+    return binary
 
-        if not playing:
-            return
 
-        if current_frame < total_frames - 1:
-            success = update_frame(current_frame + 1)
-            if success:
-                # Schedule the next frame update based on FPS
-                video_window.after(int(1000 / fps), play_next_frame)
-            else:
-                playing = False
-                play_button.config(text="Play", command=play_video)
-        else:
-            playing = False
-            play_button.config(text="Play", command=play_video)
-
-    # Function to pause the video
-    def pause_video():
-        nonlocal playing
-        playing = False
-        play_button.config(text="Play", command=play_video)
-
-    # Function to seek to a specific frame
-    def on_seek(event=None):
-        nonlocal current_frame
-        frame_pos = int(seek_var.get())
-        if frame_pos != current_frame:
-            update_frame(frame_pos)
-
-    # Function to step forward one frame
-    def step_forward():
-        nonlocal current_frame
-        if current_frame < total_frames - 1:
-            update_frame(current_frame + 1)
-
-    # Function to step backward one frame
-    def step_backward():
-        nonlocal current_frame
-        if current_frame > 0:
-            update_frame(current_frame - 1)
-
-    # Function to select the current frame as reference
-    def select_reference():
-        nonlocal reference_time
-
-        # Get the current frame
-        cap.set(cv2.CAP_PROP_POS_FRAMES, current_frame)
-        ret, frame = cap.read()
-        if not ret:
-            messagebox.showerror("Error", "Could not read the selected frame")
-            return None
+# Size of the character cells classified by DigitRecognizer, in pixels (height, width)
+DIGIT_CELL_SIZE = (24, 16)
 
-        try:
-            # Calculate the region of interest (ROI) in the top right corner
-            # For white text, we need to be more precise with the ROI
-            roi_width = int(original_width * 0.4)  # Use 40% of the width for the ROI to ensure we capture the full timestamp
-            roi_height = int(original_height * 0.2)  # Use 20% of the height for the ROI to ensure we capture the full timestamp
-            roi_x = original_width - roi_width
-            roi_y = 0  # Start from the top of the frame
-
-            # Create a debug visualization of the ROI
-            debug_frame = frame.copy()
-            cv2.rectangle(
-                debug_frame,
-                (roi_x, roi_y),
-                (roi_x + roi_width, roi_y + roi_height),
-                (0, 255, 0),  # Green color
-                2
-            )
-            cv2.putText(
-                debug_frame,
-                "Timestamp ROI",
-                (roi_x, roi_y - 10),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.8,
-                (0, 255, 0),  # Green color
-                2
-            )
 
-            # Save the debug visualization
-            import os
-            debug_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "debug_images")
-            os.makedirs(debug_dir, exist_ok=True)
-            debug_path = os.path.join(debug_dir, "roi_visualization.png")
-            cv2.imwrite(debug_path, debug_frame)
-            print(f"Saved ROI visualization to {debug_path}")
-
-            # Extract timestamp from the frame using OCR
-            extracted_time, original_format = extract_timestamp_from_frame(frame, roi_x, roi_y, roi_width, roi_height)
-
-            # Inform user about debug images
-            debug_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "debug_images")
-
-            if extracted_time:
-                # Use the extracted timestamp
-                reference_time = extracted_time
-                reference_format = original_format
-                messagebox.showinfo(
-                    "Reference Frame with Timestamp Selected",
-                    f"Selected frame {current_frame+1} with timestamp overlay as reference.\n"
-                    f"Successfully extracted timestamp: {reference_time.strftime('%d/%m/%y %H:%M:%S.%f')[:-3]}\n"
-                    f"This timestamp will be used as the reference time.\n\n"
-                    f"Debug images have been saved to:\n{debug_dir}"
-                )
-            else:
-                # Fallback to calculating the reference time based on the frame number
-                # Using 1970-01-01 as a base time
-                base_time = datetime.datetime(1970, 1, 1)
-                reference_time = base_time + datetime.timedelta(seconds=current_frame / fps)
-
-                messagebox.showwarning(
-                    "Timestamp Not Recognized",
-                    f"Could not recognize timestamp in the selected frame.\n"
-                    f"Please ensure the timestamp is clearly visible in the top right corner.\n"
-                    f"Format should be DD/MM/YY HH:MM:ss.SSS\n\n"
-                    f"Using generated timestamp as fallback: {reference_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}\n\n"
-                    f"Debug images have been saved to:\n{debug_dir}\n"
-                    f"Please check these images to see how the timestamp was processed."
-                )
+def extract_character_cells(binary, glyphs=None):
+    """
+    Cut the characters of a binarized ROI into cells for DigitRecognizer.
 
-        except Exception as e:
-            print(f"Error in select_reference: {e}")
-            messagebox.showerror("Error", f"An error occurred while processing the frame: {e}")
-            return None
+    Every glyph (column run with ink) is cropped over the rows of the whole line of text, so
+    a dot, a colon and a dash keep their height and position, scaled to fit DIGIT_CELL_SIZE
+    and centered, with white ink on black.
 
-        video_window.destroy()
-
-    # Function to handle window close
-    def on_close():
-        nonlocal playing
-        playing = False
-        cap.release()
-        video_window.destroy()
-
-    # Create control buttons with enhanced visibility
-    play_button = tk.Button(
-        buttons_frame, 
-        text="Play", 
-        command=play_video,
-        font=("Arial", 10, "bold"),
-        width=8,
-        height=2
-    )
-    play_button.pack(side=tk.LEFT, padx=10, pady=10)
-
-    step_back_button = tk.Button(
-        buttons_frame, 
-        text="◀", 
-        command=step_backward,
-        font=("Arial", 12, "bold"),
-        width=4,
-        height=2
-    )
-    step_back_button.pack(side=tk.LEFT, padx=10, pady=10)
-
-    step_forward_button = tk.Button(
-        buttons_frame, 
-        text="▶", 
-        command=step_forward,
-        font=("Arial", 12, "bold"),
-        width=4,
-        height=2
-    )
-    step_forward_button.pack(side=tk.LEFT, padx=10, pady=10)
-
-    select_button = tk.Button(
-        buttons_frame, 
-        text="Select Frame with Timestamp as Reference", 
-        command=select_reference,
-        bg="green",
-        fg="white",
-        font=("Arial", 10, "bold"),
-        width=30,
-        height=2
-    )
-    select_button.pack(side=tk.RIGHT, padx=10, pady=10)
+    Args:
+        binary: ROI binarized with binarize_roi
+        glyphs: Column ranges of the glyphs (default: find_glyph_columns)
 
-    # Bind slider events
-    seek_slider.bind("<ButtonRelease-1>", on_seek)
+    Returns:
+        Tuple of (uint8 array of shape (glyphs, height, width), list of the glyph indices that
+        follow a space). The array is empty if the ROI has no ink.
+    """
+    cell_height, cell_width = DIGIT_CELL_SIZE
+    glyphs = find_glyph_columns(binary) if glyphs is None else glyphs
+    cells = np.zeros((len(glyphs), cell_height, cell_width), dtype=np.uint8)
+    if not glyphs:
+        return cells, []
+    ink = get_ink_mask(binary)
+    rows = np.flatnonzero(ink.any(axis=1))
+    line = ink[rows[0]:rows[-1] + 1].astype(np.uint8) * 255
+    for n, (start, end) in enumerate(glyphs):
+        glyph = line[:, start:end]
+        scale = min(cell_height / glyph.shape[0], cell_width / glyph.shape[1])
+        width = max(1, min(cell_width, round(glyph.shape[1] * scale)))
+        height = max(1, min(cell_height, round(glyph.shape[0] * scale)))
+        top, left = (cell_height - height) // 2, (cell_width - width) // 2
+        cells[n, top:top + height, left:left + width] = cv2.resize(glyph, (width, height), interpolation=cv2.INTER_AREA)
+
+    # A gap much wider than the usual gap between two characters is a space
+    gaps = [following[0] - preceding[1] for preceding, following in zip(glyphs, glyphs[1:])]
+    space_gap = 2.5 * max(1.0, float(np.median(gaps))) if gaps else 0
+    spaces = [n + 1 for n, gap in enumerate(gaps) if gap > space_gap]
+    return cells, spaces
+
+
+# Classes of the digit model, in the order of its outputs
+DIGIT_CLASSES = "0123456789/:.-"
+# ONNX model of DigitRecognizer; trained by train_digit_model.py
+DIGIT_MODEL_PATH = os.environ.get(
+    "VIDMETA_DIGIT_MODEL", os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "timestamp_digits.onnx")
+)
+# Lowest per-character confidence at which a reading of the digit model is accepted without Tesseract
+DIGIT_MIN_CONFIDENCE = 0.9
+
+
+class DigitRecognizer:
+    """
+    Reads timestamp overlays with a small CNN that classifies one character cell at a time.
 
-    # Display the first frame
-    update_frame(0)
+    The ROI is binarized (see binarize_digit_roi) and cut into character cells (see
+    extract_character_cells), and all cells are classified in one batch with OpenCV's DNN
+    module on the CPU. ROIs whose text is too low to cut into characters are not classified. Every character
+    comes with a softmax confidence, so a caller can accept a confident reading and fall back
+    to Tesseract otherwise:
 
-    # Automatically select the first frame as reference
-    print("Automatically selecting the first frame as reference")
-    select_reference()
+        recognizer = DigitRecognizer()
+        text, confidence = recognizer.read(roi)
 
-    # No need to wait for the window since select_reference() already destroyed it
-    # Only wait if the window still exists (wasn't destroyed by select_reference)
-    try:
-        if video_window.winfo_exists():
-            video_window.wait_window()
-    except:
-        pass  # Window was already destroyed
+    The model only knows DIGIT_CLASSES. A net is not thread-safe; use get_digit_recognizer()
+    for one per thread.
+    """
 
-    # Release resources
-    cap.release()
+    __slots__ = ("model_path", "_net")
+
+    def __init__(self, model_path=DIGIT_MODEL_PATH):
+        """
+        Args:
+            model_path: ONNX model with input (N, 1, height, width) and output (N, classes)
+        """
+        self.model_path = model_path
+        with span("ocr.dnn_load"):
+            # OpenCV 5 has a new graph engine, which is slower than the classic one for a net this small
+            engine = getattr(cv2.dnn, "ENGINE_CLASSIC", None)
+            if engine is None:
+                self._net = cv2.dnn.readNetFromONNX(str(model_path))
+            else:
+                self._net = cv2.dnn.readNetFromONNX(str(model_path), engine=engine)
+        self._net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self._net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+
+    def classify(self, cells):
+        """
+        Classify character cells in one batch.
+
+        Args:
+            cells: uint8 array of shape (N, height, width), white ink on black
+
+        Returns:
+            Tuple of (string of N characters, float32 array of their N confidences)
+        """
+        if len(cells) == 0:
+            return "", np.zeros(0, dtype=np.float32)
+        blob = (np.asarray(cells, dtype=np.float32) / 255.0)[:, None]
+        with span("ocr.dnn", cells=len(cells)):
+            self._net.setInput(blob)
+            probabilities = self._net.forward().reshape(len(cells), -1)
+        best = probabilities.argmax(axis=1)
+        return "".join(DIGIT_CLASSES[n] for n in best), probabilities[np.arange(len(cells)), best]
+
+    def read(self, roi):
+        """
+        Read the text of a timestamp ROI.
+
+        Returns:
+            Tuple of (text with single spaces between words, lowest character confidence);
+            ("", 0.0) if the ROI has no characters or its text is too low to read
+        """
+        return self.read_batch([roi])[0]
+
+    def read_batch(self, rois) -> list:
+        """Read several ROIs, classifying the characters of all of them in one batch (see read)."""
+        binaries = [binarize_digit_roi(roi) for roi in rois]
+        empty = np.zeros((0, *DIGIT_CELL_SIZE), dtype=np.uint8)
+        segmented = [(empty, []) if binary is None else extract_character_cells(binary) for binary in binaries]
+        text, confidences = self.classify(np.concatenate([cells for cells, _ in segmented]))
+        results = []
+        start = 0
+        for cells, spaces in segmented:
+            end = start + len(cells)
+            if end == start:
+                results.append(("", 0.0))
+                continue
+            roi_text = text[start:end]
+            for n in reversed(spaces):
+                roi_text = roi_text[:n] + " " + roi_text[n:]
+            results.append((roi_text, float(confidences[start:end].min())))
+            start = end
+        return results
 
-    return reference_time, reference_format
 
+_digit_recognizers = threading.local()
 
-def find_matching_timestamps_in_video(video_path, target_start_time, target_end_time):
+
+def get_digit_recognizer(model_path=None):
     """
-    Scan through a video to find frames with timestamps matching the target start and end times.
+    Return this thread's DigitRecognizer, or None if the model file does not exist.
 
     Args:
-        video_path: Path to the video file to scan
-        target_start_time: Target start timestamp to find in the video
-        target_end_time: Target end timestamp to find in the video
+        model_path: ONNX model to use (default: DIGIT_MODEL_PATH)
+    """
+    model_path = DIGIT_MODEL_PATH if model_path is None else model_path
+    recognizer = getattr(_digit_recognizers, "recognizer", None)
+    if recognizer is None or recognizer.model_path != model_path:
+        if not os.path.exists(model_path):
+            return None
+        recognizer = _digit_recognizers.recognizer = DigitRecognizer(model_path)
+    return recognizer
+
+
+# Complete date and time as read by the digit model, e.g. 13/06/2025 13:28:42:285 or 13-06-25 13:28:42.285
+DIGIT_TIMESTAMP_PATTERN = re.compile(r"\d{2}([/.-])\d{2}\1\d{2}(?:\d{2})? \d{2}:\d{2}:\d{2}(?:[.:]\d{3})?")
+
+
+def read_timestamp_with_digit_model(roi, recognizer, min_confidence=DIGIT_MIN_CONFIDENCE):
+    """
+    Read the timestamp of a ROI with the digit model.
+
+    Args:
+        roi: Timestamp region (grayscale or BGR)
+        recognizer: DigitRecognizer to use
+        min_confidence: Lowest per-character confidence accepted
 
     Returns:
-        Tuple of (start_position, end_position, success) where positions are in seconds from the start of the video,
-        and success is a boolean indicating if both timestamps were found
+        Tuple of (datetime, text, confidence); the datetime and text are None if the reading is
+        not a complete timestamp or not confident enough
     """
-    print(f"Searching for matching timestamps in video: {video_path}")
-    print(f"Target start time: {target_start_time}")
-    print(f"Target end time: {target_end_time}")
+    OCR_ATTEMPTS.inc(stage="dnn", method="digits", psm="none")
+    ocr_start = time.perf_counter()
+    text, confidence = recognizer.read(roi)
+    OCR_LATENCY.observe(time.perf_counter() - ocr_start, stage="dnn", method="digits", psm="none")
+    print(f"Digit model - Extracted text: {text} (confidence {confidence:.3f})")
+    if confidence < min_confidence or not DIGIT_TIMESTAMP_PATTERN.fullmatch(text):
+        return None, None, confidence
+    try:
+        timestamp = parse_frame_timestamp(text)
+    except (ValueError, IndexError):
+        OCR_PARSE_FAILURES.inc(stage="dnn", pattern="digits")
+        return None, None, confidence
+    return timestamp, text, confidence
 
-    # Open the video
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
-        print(f"Error: Could not open video: {video_path}")
-        return 0, 0, False
 
-    # Get video properties
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    duration = total_frames / fps if fps > 0 else 0
+# Characters Tesseract may return for a timestamp
+TESSERACT_WHITELIST = "0123456789:/.-"
 
-    print(f"Video properties: {total_frames} frames, {fps} fps, duration: {duration:.2f} seconds")
 
-    # Calculate ROI for timestamp extraction
-    roi_width = int(width * 0.4)
-    roi_height = int(height * 0.2)
-    roi_x = width - roi_width
-    roi_y = 0
+class OCRBackend:
+    """
+    An OCR engine that reads the text of timestamp ROIs.
 
-    # Initialize variables
-    start_position = None
-    end_position = None
-    start_frame = None
-    end_frame = None
+    recognize returns the candidate readings of a ROI, best first, as (text, confidence)
+    tuples, where confidence is 0-1 or None for engines that do not report one.
+    recognize_batch reads several ROIs at once; backends that can do better than one call
+    per ROI override it. cost_ms is a running estimate of the time per ROI, which
+    OCRStrategy uses to stay within its budget.
 
-    # Define a time window for matching (allow small differences in timestamps)
-    time_window = datetime.timedelta(seconds=1)
+    Backends are registered in OCR_BACKENDS and created with create_ocr_backend.
+    """
 
-    # Use an adaptive sampling approach
-    # Start with a coarse sampling interval
-    initial_interval = max(1, int(fps * 30))  # Start by sampling every 30 seconds
-    min_interval = max(1, int(fps))           # Minimum interval is 1 second
+    name = None
+    # Estimate of cost_ms before the backend has been timed
+    default_cost_ms = 100.0
 
-    print(f"Starting with sampling interval: {initial_interval} frames (approx. every {initial_interval/fps:.1f} seconds)")
+    def __init__(self):
+        self.cost_ms = self.default_cost_ms
 
-    # Function to check a specific frame for timestamp
-    def check_frame_for_timestamp(frame_num):
-        nonlocal start_position, end_position, start_frame, end_frame
+    @classmethod
+    def available(cls) -> bool:
+        """Return whether the backend can be used on this machine."""
+        return True
 
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
-        ret, frame = cap.read()
-        if not ret:
-            return None
+    @property
+    def label(self) -> str:
+        """Name of the backend and its settings, as used in metrics and last_attempt."""
+        return self.name
 
-        timestamp = extract_timestamp_from_frame(frame, roi_x, roi_y, roi_width, roi_height)
-        if not timestamp:
-            return None
+    @property
+    def psm(self):
+        """Tesseract page segmentation mode, or "none" for other engines."""
+        return "none"
 
-        # Check if this timestamp is close to our targets
-        start_diff = abs((timestamp - target_start_time).total_seconds())
-        end_diff = abs((timestamp - target_end_time).total_seconds())
+    @property
+    def config(self):
+        """Tesseract configuration the backend reads with, or None for other engines."""
+        return None
 
-        # Update start position if this is closer
-        if (start_position is None or start_diff < abs((timestamp_at_frame(start_frame) - target_start_time).total_seconds())) and start_diff < time_window.total_seconds():
-            print(f"Found better start timestamp: {timestamp} at frame {frame_num}, diff: {start_diff:.3f}s")
-            start_position = frame_num / fps
-            start_frame = frame_num
+    def recognize(self, roi) -> list:
+        """Return the (text, confidence) candidates for a ROI, best first."""
+        raise NotImplementedError
 
-        # Update end position if this is closer
-        if (end_position is None or end_diff < abs((timestamp_at_frame(end_frame) - target_end_time).total_seconds())) and end_diff < time_window.total_seconds():
-            print(f"Found better end timestamp: {timestamp} at frame {frame_num}, diff: {end_diff:.3f}s")
-            end_position = frame_num / fps
-            end_frame = frame_num
+    def recognize_batch(self, rois) -> list:
+        """Return the candidates of every ROI (see recognize)."""
+        return [self.recognize(roi) for roi in rois]
 
-        return timestamp
+    def record_cost(self, seconds, count=1):
+        """Fold the time a call took for count ROIs into cost_ms."""
+        self.cost_ms += 0.2 * (1000 * seconds / max(1, count) - self.cost_ms)
 
-    # Function to get timestamp at a specific frame (or None if not available)
-    def timestamp_at_frame(frame_num):
-        if frame_num is None:
-            return None
 
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
-        ret, frame = cap.read()
-        if not ret:
-            return None
+class DigitModelBackend(OCRBackend):
+    """The digit model (see DigitRecognizer); a batch is classified in one forward pass."""
 
-        return extract_timestamp_from_frame(frame, roi_x, roi_y, roi_width, roi_height)
+    name = "digits"
+    default_cost_ms = 2.0
 
-    # First pass: Coarse search through the entire video
-    print("Starting coarse search through the entire video...")
-    frame_num = 0
-    interval = initial_interval
+    def __init__(self, model_path=None):
+        super().__init__()
+        self.model_path = model_path
 
-    # Sample frames throughout the video
-    while frame_num < total_frames:
-        timestamp = check_frame_for_timestamp(frame_num)
+    @classmethod
+    def available(cls) -> bool:
+        return os.path.exists(DIGIT_MODEL_PATH)
 
-        # If we found a timestamp, adjust our search strategy
-        if timestamp:
-            # If we're getting close to either target, reduce the interval
-            start_diff = abs((timestamp - target_start_time).total_seconds())
-            end_diff = abs((timestamp - target_end_time).total_seconds())
+    def recognize(self, roi) -> list:
+        return self.recognize_batch([roi])[0]
 
-            # Adjust interval based on how close we are to targets
-            if min(start_diff, end_diff) < 60:  # Within a minute
-                new_interval = max(min_interval, int(interval / 2))
-                if new_interval != interval:
-                    print(f"Getting closer to target, reducing interval to {new_interval} frames")
-                    interval = new_interval
+    def recognize_batch(self, rois) -> list:
+        recognizer = get_digit_recognizer(self.model_path)
+        if recognizer is None:
+            return [[] for _ in rois]
+        return [[reading] if reading[0] else [] for reading in recognizer.read_batch(rois)]
 
-        frame_num += interval
 
-    # If we haven't found both timestamps, try a more exhaustive search
-    if start_position is None or end_position is None:
-        print("Coarse search didn't find all timestamps, trying more exhaustive search...")
+class TemplateBackend(OCRBackend):
+    """
+    Template matching of character cells against glyphs rendered with cv2.putText.
 
-        # Try to estimate where the timestamps might be based on video duration
-        if total_frames > 0 and fps > 0:
-            # If we have some idea of the video's timeline, make educated guesses
-            if start_position is None:
-                # Try frames at 10%, 25%, 50%, 75% of the video
-                for percent in [0.1, 0.25, 0.5, 0.75]:
-                    frame_to_check = int(total_frames * percent)
-                    print(f"Checking frame at {percent*100}% of video: {frame_to_check}")
-                    check_frame_for_timestamp(frame_to_check)
-                    if start_position is not None:
-                        break
+    Every cell is compared with the templates of each character (in each font and stroke width)
+    by normalized correlation, and the best correlation is the confidence. It needs no model
+    and no Tesseract, but only reads overlays in fonts close to the templates.
+    """
 
-            if end_position is None:
-                # Try frames at 25%, 50%, 75%, 90% of the video
-                for percent in [0.25, 0.5, 0.75, 0.9]:
-                    frame_to_check = int(total_frames * percent)
-                    print(f"Checking frame at {percent*100}% of video: {frame_to_check}")
-                    check_frame_for_timestamp(frame_to_check)
-                    if end_position is not None:
-                        break
+    name = "template"
+    default_cost_ms = 1.0
+    TEMPLATE_THICKNESSES = (1, 2, 3)
+
+    _templates = {}
+    _templates_lock = threading.Lock()
+
+    def __init__(self, fonts=("simplex", "duplex")):
+        """
+        Args:
+            fonts: Hershey fonts to render the templates in (names of cv2.FONT_HERSHEY_* without the prefix)
+        """
+        super().__init__()
+        self.fonts = tuple(fonts)
+
+    def _get_templates(self):
+        """Return (unit-norm template matrix, class index of every row), rendering them on first use."""
+        with self._templates_lock:
+            templates = self._templates.get(self.fonts)
+            if templates is None:
+                rows, classes = [], []
+                for font_name in self.fonts:
+                    font = getattr(cv2, f"FONT_HERSHEY_{font_name.upper()}")
+                    for thickness in self.TEMPLATE_THICKNESSES:
+                        # Render all characters on one line, so the cells get the line's height
+                        image = np.zeros((96, 900), dtype=np.uint8)
+                        cv2.putText(image, " ".join(DIGIT_CLASSES), (8, 64), font, 1.5, 255, thickness, cv2.LINE_AA)
+                        cells, _ = extract_character_cells(binarize_roi(image))
+                        if len(cells) != len(DIGIT_CLASSES):
+                            continue
+                        rows.append(cells.reshape(len(cells), -1))
+                        classes.extend(range(len(DIGIT_CLASSES)))
+                templates = (self._normalize(np.concatenate(rows)), np.asarray(classes))
+                self._templates[self.fonts] = templates
+            return templates
+
+    @staticmethod
+    def _normalize(rows):
+        rows = rows.astype(np.float32)
+        rows -= rows.mean(axis=1, keepdims=True)
+        norms = np.linalg.norm(rows, axis=1, keepdims=True)
+        return rows / np.maximum(norms, 1e-6)
+
+    def recognize(self, roi) -> list:
+        binary = binarize_digit_roi(roi)
+        if binary is None:
+            return []
+        cells, spaces = extract_character_cells(binary)
+        if not len(cells):
+            return []
+        templates, classes = self._get_templates()
+        scores = self._normalize(cells.reshape(len(cells), -1)) @ templates.T
+        best = scores.argmax(axis=1)
+        text = "".join(DIGIT_CLASSES[classes[n]] for n in best)
+        for n in reversed(spaces):
+            text = text[:n] + " " + text[n:]
+        confidence = float(np.clip(scores[np.arange(len(cells)), best].min(), 0.0, 1.0))
+        return [(text, confidence)]
+
+
+class TesseractBackend(OCRBackend):
+    """One Tesseract CLI call (through pytesseract) on one preprocessed image of the ROI."""
+
+    name = "tesseract"
+    default_cost_ms = 150.0
+
+    def __init__(self, method="gray", psm=7):
+        """
+        Args:
+            method: Name or index of a PREPROCESSING_METHODS entry applied to the ROI
+            psm: Tesseract page segmentation mode
+        """
+        super().__init__()
+        self.method = PREPROCESSING_METHODS[method] if isinstance(method, int) else method
+        if self.method not in PREPROCESSING_STEPS:
+            raise ValueError(f"Unknown preprocessing method '{method}'. "
+                             f"Expected one of: {', '.join(PREPROCESSING_METHODS)}")
+        self._psm = psm
+
+    @classmethod
+    def available(cls) -> bool:
+        return find_tool("tesseract") is not None
+
+    @property
+    def label(self) -> str:
+        return f"{self.name} {self.method}"
+
+    @property
+    def psm(self):
+        return self._psm
+
+    @property
+    def config(self):
+        return f"--psm {self._psm} --oem 3 -c tessedit_char_whitelist={TESSERACT_WHITELIST}"
+
+    def _preprocess(self, roi):
+        graph = get_preprocessing_graph()
+        graph.set_roi(roi)
+        return graph.get(self.method)
+
+    def recognize(self, roi) -> list:
+        try:
+            with span("ocr.tesseract", method=self.method, psm=self._psm):
+                text = pytesseract.image_to_string(self._preprocess(roi), config=self.config)
+        except pytesseract.pytesseract.TesseractError as e:
+            OCR_TESSERACT_ERRORS.inc(stage=self.name)
+            print(f"Tesseract Error: {e}")
+            return []
+        text = text.replace('\n', ' ').strip()
+        return [(text, None)] if text else []
 
-    # Second pass: Fine-grained search around the found positions
-    if start_position is not None:
-        # Search more precisely around the start position
-        search_radius = int(fps * 5)  # Search 5 seconds around the found position
-        search_start = max(0, start_frame - search_radius)
-        search_end = min(total_frames, start_frame + search_radius)
 
-        print(f"Refining start timestamp search between frames {search_start} and {search_end}")
+class PersistentTesseractBackend(TesseractBackend):
+    """
+    Tesseract loaded once per thread through tesserocr, instead of a new process per ROI.
 
-        best_start_diff = abs((timestamp_at_frame(start_frame) - target_start_time).total_seconds())
-        best_start_pos = start_position
-        best_start_frame = start_frame
+    Starting tesseract and loading its language data is most of the cost of a CLI call on a
+    small ROI, so this is several times faster. It needs the optional tesserocr package.
+    """
 
-        for frame_num in range(search_start, search_end):
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
-            ret, frame = cap.read()
-            if not ret:
+    name = "tesserocr"
+    default_cost_ms = 30.0
+
+    def __init__(self, method="gray", psm=7):
+        super().__init__(method, psm)
+        self._local = threading.local()
+
+    @classmethod
+    def available(cls) -> bool:
+        return importlib.util.find_spec("tesserocr") is not None
+
+    def _get_api(self):
+        api = getattr(self._local, "api", None)
+        if api is None:
+            import tesserocr
+
+            api = self._local.api = tesserocr.PyTessBaseAPI(psm=self._psm)
+            api.SetVariable("tessedit_char_whitelist", TESSERACT_WHITELIST)
+        return api
+
+    def recognize(self, roi) -> list:
+        image = np.ascontiguousarray(self._preprocess(roi))
+        api = self._get_api()
+        with span("ocr.tesserocr", method=self.method, psm=self._psm):
+            api.SetImageBytes(image.tobytes(), image.shape[1], image.shape[0], 1, image.shape[1])
+            text = api.GetUTF8Text().replace('\n', ' ').strip()
+            confidence = api.MeanTextConf()
+        return [(text, confidence / 100)] if text else []
+
+
+OCR_BACKENDS = {
+    "digits": DigitModelBackend,
+    "template": TemplateBackend,
+    "tesseract": TesseractBackend,
+    "tesserocr": PersistentTesseractBackend,
+}
+
+
+def register_ocr_backend(name, backend_class):
+    """
+    Make an OCRBackend subclass available to create_ocr_backend and OCRStrategy under a name.
+
+    Args:
+        name: Name used in strategy steps and OCR_PROFILES
+        backend_class: The OCRBackend subclass
+    """
+    if not issubclass(backend_class, OCRBackend):
+        raise TypeError(f"{backend_class!r} is not an OCRBackend")
+    backend_class.name = name
+    OCR_BACKENDS[name] = backend_class
+
+
+def get_available_ocr_backends() -> list:
+    """Return the names of the OCR backends that can be used on this machine."""
+    return [name for name, backend_class in OCR_BACKENDS.items() if backend_class.available()]
+
+
+def create_ocr_backend(name, **options) -> OCRBackend:
+    """
+    Create an OCR backend by name.
+
+    Args:
+        name: One of OCR_BACKENDS ("digits", "template", "tesseract", "tesserocr")
+        **options: Arguments of the backend class, e.g. method and psm for Tesseract
+
+    Raises:
+        ValueError: If the name is not registered
+    """
+    if name not in OCR_BACKENDS:
+        raise ValueError(f"Unknown OCR backend '{name}'. Expected one of: {', '.join(OCR_BACKENDS)}")
+    return OCR_BACKENDS[name](**options)
+
+
+class OCRStrategy:
+    """
+    A chain of OCR backends tried in order until one of them reads a timestamp.
+
+    Every step is a backend with two options of its own: min_confidence, the lowest confidence
+    accepted from it (candidates without a confidence are always parsed), and relaxed, whether
+    its text is parsed with the relaxed patterns of the fallback instead of those of the
+    cascade. With a budget, a step whose estimated cost would take a ROI past budget_ms is
+    skipped; the first step always runs.
+
+        strategy = OCRStrategy([("digits", {"min_confidence": 0.9}), ("tesseract", {"method": "white_text"})],
+                               budget_ms=300)
+        timestamp, original_format = strategy.read(roi)
+
+    A strategy can be shared between threads.
+    """
+
+    def __init__(self, steps, budget_ms=None, name=None):
+        """
+        Args:
+            steps: Backends in order, each an OCRBackend, a backend name, or a tuple of
+                (backend or name, options); options other than min_confidence and relaxed are
+                passed to create_ocr_backend
+            budget_ms: Most estimated milliseconds spent on one ROI (default: no limit)
+            name: Name used as the stage in the OCR metrics (default: "strategy")
+        """
+        self.budget_ms = budget_ms
+        self.name = name or "strategy"
+        self.steps = []
+        for step in steps:
+            backend, options = step if isinstance(step, tuple) else (step, {})
+            options = dict(options)
+            min_confidence = options.pop("min_confidence", 0.0)
+            relaxed = options.pop("relaxed", False)
+            if not isinstance(backend, OCRBackend):
+                backend = create_ocr_backend(backend, **options)
+            self.steps.append((backend, min_confidence, relaxed))
+
+    def __repr__(self):
+        steps = ", ".join(backend.label for backend, _, _ in self.steps)
+        return f"OCRStrategy({self.name}: {steps}, budget_ms={self.budget_ms})"
+
+    def read(self, roi, cancelled=None, last_attempt=None):
+        """
+        Read the timestamp of a ROI.
+
+        Args:
+            roi: Timestamp region of a frame
+            cancelled: Optional callable; when it returns True, no further step is started
+            last_attempt: Optional dict that receives the "backend", "method", "text" and
+                "confidence" of the reading the timestamp was parsed from, with the ROI as
+                "image" and the Tesseract "config" (None for other backends)
+
+        Returns:
+            Tuple of (datetime, original format string) or (None, None)
+        """
+        attempts = None if last_attempt is None else [last_attempt]
+        return self.read_batch([roi], cancelled=cancelled, attempts=attempts)[0]
+
+    def read_batch(self, rois, cancelled=None, attempts=None) -> list:
+        """
+        Read the timestamps of several ROIs. Every step reads all ROIs that are still
+        unresolved and within budget in one recognize_batch call.
+
+        Args:
+            rois: Timestamp regions
+            cancelled: See read
+            attempts: Optional list with a dict per ROI (see last_attempt of read)
+
+        Returns:
+            List of (datetime, original format string) or (None, None) tuples, one per ROI
+        """
+        results = [(None, None)] * len(rois)
+        spent_ms = [0.0] * len(rois)
+        pending = list(range(len(rois)))
+        for step_number, (backend, min_confidence, relaxed) in enumerate(self.steps):
+            if not pending:
                 break
+            if cancelled is not None and cancelled():
+                OCR_FRAMES.inc(len(pending), outcome="cancelled")
+                return results
+            runnable = pending if step_number == 0 or self.budget_ms is None else [
+                n for n in pending if spent_ms[n] + backend.cost_ms <= self.budget_ms
+            ]
+            if not runnable:
+                continue
 
-            timestamp = extract_timestamp_from_frame(frame, roi_x, roi_y, roi_width, roi_height)
+            OCR_ATTEMPTS.inc(len(runnable), stage=self.name, method=backend.label, psm=backend.psm)
+            start = time.perf_counter()
+            with span("ocr.strategy_step", backend=backend.label, rois=len(runnable)):
+                candidates = backend.recognize_batch([rois[n] for n in runnable])
+            seconds = time.perf_counter() - start
+            backend.record_cost(seconds, len(runnable))
+            OCR_LATENCY.observe(seconds / len(runnable), stage=self.name, method=backend.label, psm=backend.psm)
+
+            parse = parse_relaxed_timestamp_text if relaxed else parse_timestamp_text
+            for n, roi_candidates in zip(runnable, candidates):
+                spent_ms[n] += 1000 * seconds / len(runnable)
+                for text, confidence in roi_candidates:
+                    if confidence is not None and confidence < min_confidence:
+                        continue
+                    timestamp, original_format, pattern = parse(text, stage=self.name)
+                    if timestamp is None:
+                        continue
+                    results[n] = (timestamp, original_format)
+                    _record_ocr_timestamp(self.name, pattern, method=backend.label, psm=backend.psm)
+                    if attempts is not None:
+                        attempts[n].update(backend=backend.name, method=backend.label, text=text,
+                                           confidence=confidence, image=rois[n], config=backend.config)
+                    break
+            pending = [n for n in pending if results[n][0] is None]
+        if pending:
+            OCR_FRAMES.inc(len(pending), outcome="not_found")
+        return results
+
+
+# Speed/accuracy profiles of OCRStrategy: "fast" never starts Tesseract, "balanced" tries the
+# two preprocessing methods that suit white overlays within 600 ms, and "accurate" runs the
+# whole cascade after the digit model
+OCR_PROFILES = {
+    "fast": {
+        "steps": [("digits", {"min_confidence": DIGIT_MIN_CONFIDENCE}), ("template", {"min_confidence": 0.7})],
+        "budget_ms": 50,
+    },
+    "balanced": {
+        "steps": [
+            ("digits", {"min_confidence": DIGIT_MIN_CONFIDENCE}),
+            ("tesseract", {"method": "white_text"}),
+            ("tesseract", {"method": "gray"}),
+            ("tesseract", {"method": "gray", "psm": 6, "relaxed": True}),
+        ],
+        "budget_ms": 600,
+    },
+    "accurate": {
+        "steps": [("digits", {"min_confidence": DIGIT_MIN_CONFIDENCE})]
+        + [("tesseract", {"method": method}) for method in PREPROCESSING_METHODS]
+        + [("tesseract", {"method": "gray", "psm": psm, "relaxed": True}) for psm in (7, 6, 3)],
+        "budget_ms": None,
+    },
+}
+
+_ocr_strategies = {}
+_ocr_strategies_lock = threading.Lock()
+
+
+def get_ocr_strategy(profile) -> OCRStrategy:
+    """
+    Return the shared OCRStrategy of a profile in OCR_PROFILES.
 
-            if timestamp:
-                diff = abs((timestamp - target_start_time).total_seconds())
-                if diff < best_start_diff:
-                    best_start_diff = diff
-                    best_start_pos = frame_num / fps
-                    best_start_frame = frame_num
-                    print(f"Better start match: {timestamp} at frame {frame_num}, diff: {diff:.3f}s")
+    Steps whose backend is not available on this machine are left out, and Tesseract runs in
+    process (tesserocr) when it is installed.
 
-        start_position = best_start_pos
-        start_frame = best_start_frame
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    if profile not in OCR_PROFILES:
+        raise ValueError(f"Unknown OCR profile '{profile}'. Expected one of: {', '.join(OCR_PROFILES)}")
+    with _ocr_strategies_lock:
+        strategy = _ocr_strategies.get(profile)
+        if strategy is None:
+            available = get_available_ocr_backends()
+            steps = []
+            for name, options in OCR_PROFILES[profile]["steps"]:
+                if name == "tesseract" and "tesserocr" in available:
+                    name = "tesserocr"
+                if name in available:
+                    steps.append((name, options))
+            if not steps:
+                print(f"Warning: none of the OCR backends of profile '{profile}' is available")
+            strategy = OCRStrategy(steps, budget_ms=OCR_PROFILES[profile]["budget_ms"], name=profile)
+            _ocr_strategies[profile] = strategy
+        return strategy
+
+
+class ROIChangeDetector:
+    """
+    Skips OCR of timestamp regions whose overlay has not changed.
 
-    if end_position is not None:
-        # Search more precisely around the end position
-        search_radius = int(fps * 5)  # Search 5 seconds around the found position
-        search_start = max(0, end_frame - search_radius)
-        search_end = min(total_frames, end_frame + search_radius)
+    Every ROI is binarized (see binarize_roi) and fingerprinted. A ROI with a fingerprint seen before, e.g.
+    from a paused or duplicated stream or a probe of the same frame, gets the earlier result
+    without OCR. When only some characters differ from the previous ROI (usually the last
+    digits of the clock), only the columns of those characters are read by Tesseract and
+    spliced into the previous text. This works when the previous text has exactly one glyph
+    per ink column run. Anything else runs the full extract_timestamp_from_frame cascade.
 
-        print(f"Refining end timestamp search between frames {search_start} and {search_end}")
+        detector = ROIChangeDetector()
+        for frame_number, frame in source.frames():
+            timestamp, original_format = detector.extract(frame, *roi)
 
-        best_end_diff = abs((timestamp_at_frame(end_frame) - target_end_time).total_seconds())
-        best_end_pos = end_position
-        best_end_frame = end_frame
+    Use one detector per scan of one video; it is not thread-safe.
+    """
+
+    def __init__(self, extract=None, max_partial_characters=6, cache_size=256):
+        """
+        Args:
+            extract: Full OCR function with the signature of extract_timestamp_from_frame
+            max_partial_characters: Most changed characters read without the full cascade
+            cache_size: Number of fingerprints whose results are kept
+        """
+        self._extract = extract or extract_timestamp_from_frame
+        self.max_partial_characters = max_partial_characters
+        self.cache_size = cache_size
+        self._results = {}
+        self._previous = None
+        self.stats = {"unchanged": 0, "partial": 0, "full": 0}
+
+    @staticmethod
+    def fingerprint(binary) -> bytes:
+        """Return a short hash of a binarized ROI."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.asarray(binary.shape, dtype=np.int32).tobytes())
+        digest.update(np.packbits(binary > 0).tobytes())
+        return digest.digest()
+
+    def extract(self, frame, roi_x, roi_y, roi_width, roi_height):
+        """
+        Read the timestamp of a frame, reusing earlier results where the ROI allows it.
+
+        Returns:
+            Tuple of (extracted datetime object, original format string) or (None, None)
+        """
+        roi = frame[roi_y:roi_y+roi_height, roi_x:roi_x+roi_width]
+        binary = binarize_roi(roi)
+        key = self.fingerprint(binary)
+
+        cached = self._results.get(key)
+        if cached is not None:
+            self.stats["unchanged"] += 1
+            OCR_CHANGE_DETECTION.inc(outcome="unchanged")
+            self._remember(key, binary, *cached)
+            return cached[0]
+
+        method = None
+        result = self._read_changed_characters(roi, binary)
+        if result is not None:
+            self.stats["partial"] += 1
+            OCR_CHANGE_DETECTION.inc(outcome="partial")
+            method = self._previous["method"]
+        else:
+            attempt = {}
+            result = self._extract(frame, roi_x, roi_y, roi_width, roi_height, last_attempt=attempt)
+            self.stats["full"] += 1
+            OCR_CHANGE_DETECTION.inc(outcome="full")
+            method = attempt.get("method")
+        self._remember(key, binary, result, method)
+        return result
+
+    def _remember(self, key, binary, result, method):
+        self._results.pop(key, None)
+        self._results[key] = (result, method)
+        if len(self._results) > self.cache_size:
+            # Dicts keep insertion order, so the first key is the least recently used
+            del self._results[next(iter(self._results))]
+        self._previous = {"binary": binary, "result": result, "method": method}
+
+    def _read_changed_characters(self, roi, binary):
+        """Re-read only the characters that differ from the previous ROI, or return None."""
+        previous = self._previous
+        if previous is None or previous["result"][1] is None or previous["binary"].shape != binary.shape:
+            return None
+        # Only readings of the Tesseract cascade are re-read in part; reading the whole ROI
+        # again with the digit model or the backends of a strategy is cheaper or reads it differently
+        if not (isinstance(previous["method"], int) or previous["method"] in (None, "gray")):
+            return None
+        text = previous["result"][1]
+        characters = [(i, char) for i, char in enumerate(text) if not char.isspace()]
+        current_glyphs = find_glyph_columns(binary)
+        previous_glyphs = find_glyph_columns(previous["binary"])
+        if len(current_glyphs) != len(characters) or len(previous_glyphs) != len(characters):
+            return None
+        # A changed character can be narrower or wider than before
+        glyphs = [
+            (min(current[0], before[0]), max(current[1], before[1]))
+            for current, before in zip(current_glyphs, previous_glyphs)
+        ]
+
+        changed_columns = np.flatnonzero((binary != previous["binary"]).any(axis=0))
+        changed = [
+            n for n, (start, end) in enumerate(glyphs)
+            if np.any((changed_columns >= start) & (changed_columns < end))
+        ]
+        in_glyphs = sum(np.count_nonzero((changed_columns >= start) & (changed_columns < end)) for start, end in glyphs)
+        if not changed or in_glyphs != len(changed_columns):
+            return None
+        first, last = changed[0], changed[-1]
+        if last - first + 1 > self.max_partial_characters:
+            return None
+
+        # Crop the changed characters with half of the gaps to their neighbours
+        left = glyphs[first][0] if first == 0 else (glyphs[first - 1][1] + glyphs[first][0]) // 2
+        right = glyphs[last][1] if last == len(glyphs) - 1 else (glyphs[last][1] + glyphs[last + 1][0] + 1) // 2
+        # Read the crop the way the previous text was read
+        method = previous["method"] if isinstance(previous["method"], int) else "gray"
+        graph = get_preprocessing_graph()
+        graph.set_roi(roi)
+        image = graph.get("gray" if method == "gray" else PREPROCESSING_METHODS[method])
+        # Tesseract reads characters at the image edge poorly, so pad the crop with background
+        crop = cv2.copyMakeBorder(image[:, left:right], 0, 0, 8, 8, cv2.BORDER_REPLICATE)
+
+        config = '--psm 7 --oem 3 -c tessedit_char_whitelist=0123456789:/.-'
+        OCR_ATTEMPTS.inc(stage="partial", method=method, psm=7)
+        ocr_start = time.perf_counter()
+        try:
+            with span("ocr.tesseract", partial=last - first + 1):
+                read = "".join(pytesseract.image_to_string(crop, config=config).split())
+        except pytesseract.pytesseract.TesseractError as e:
+            OCR_TESSERACT_ERRORS.inc(stage="partial")
+            print(f"Tesseract Error: {e}")
+            return None
+        OCR_LATENCY.observe(time.perf_counter() - ocr_start, stage="partial", method=method, psm=7)
+
+        expected = [char for _, char in characters[first:last + 1]]
+        if len(read) != len(expected) or any(
+            new.isdigit() != old.isdigit() or (not old.isdigit() and new != old) for new, old in zip(read, expected)
+        ):
+            return None
+        new_text = list(text)
+        for (position, _), char in zip(characters[first:last + 1], read):
+            new_text[position] = char
+        new_text = "".join(new_text)
+        try:
+            timestamp = parse_frame_timestamp(new_text)
+        except (ValueError, IndexError):
+            return None
+        print(f"Re-read {last - first + 1} changed characters: {new_text}")
+        return timestamp, new_text
+
+
+class LiveOCR:
+    """
+    Debounced background OCR of the timestamp overlay of the frame shown in the viewer.
+
+    Every submit restarts a short delay, so scrubbing through the video does not start a job per
+    frame; when the delay expires the overlay of the last submitted frame is read on a worker
+    thread with its own full resolution FrameSource. A job for a frame that is no longer current
+    is cancelled between OCR attempts. Results are kept per frame, so selecting a frame whose
+    overlay was already read is instant.
+    """
+
+    def __init__(self, video_path, delay=0.3, capacity=64, backend="auto", extract=None, ocr_profile=None):
+        """
+        Args:
+            video_path: Path to the video file
+            delay: Seconds a frame must stay current before its overlay is read
+            capacity: Maximum number of results kept
+            backend: Frame source backend (see open_frame_source)
+            extract: OCR function with the signature of extract_timestamp_from_frame
+            ocr_profile: Name of the OCR_PROFILES profile the default extract reads with
+        """
+        self.delay = delay
+        self.capacity = max(1, capacity)
+        # The viewer points the user to the debug images of the frame they select
+        self._extract = extract or functools.partial(
+            extract_timestamp_from_frame, strategy=ocr_profile, debug_images=True
+        )
+        self._source = open_frame_source(video_path, backend=backend, access="random")
+        if self._source is None:
+            raise OSError(f"Could not open video: {video_path}")
+        self._results = {}
+        self._generation = 0
+        self._pending = None
+        self._running = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._worker_loop, name="LiveOCR", daemon=True)
+        self._thread.start()
+
+    def submit(self, frame_number, delay=None):
+        """Read the overlay of a frame after the delay, cancelling any job for another frame."""
+        with self._condition:
+            self._generation += 1
+            if frame_number in self._results:
+                self._pending = None
+            else:
+                due = time.monotonic() + (self.delay if delay is None else delay)
+                self._pending = (self._generation, frame_number, due)
+            self._condition.notify_all()
+
+    def result(self, frame_number):
+        """
+        Return (extracted datetime, original format string, confidence) for a frame, or None
+        if its overlay has not been read yet. The datetime is None if no timestamp was found.
+        """
+        with self._condition:
+            return self._results.get(frame_number)
+
+    def busy(self, frame_number):
+        """Return True while the overlay of a frame is waiting to be read or being read."""
+        with self._condition:
+            return any(job is not None and job[1] == frame_number for job in (self._pending, self._running))
+
+    def wait(self, frame_number, timeout=None):
+        """Read the overlay of a frame now, unless already done, and return its result (see result)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            if frame_number not in self._results and (self._running is None or self._running[1] != frame_number):
+                self._generation += 1
+                self._pending = (self._generation, frame_number, time.monotonic())
+                self._condition.notify_all()
+            while frame_number not in self._results and not self._closed:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            return self._results.get(frame_number)
+
+    def _next_job(self):
+        """Wait until a pending job is due and take it; returns None when closed."""
+        with self._condition:
+            while not self._closed:
+                if self._pending is None:
+                    self._condition.wait()
+                    continue
+                remaining = self._pending[2] - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                self._running, self._pending = self._pending, None
+                return self._running
+            return None
+
+    def _read_overlay(self, generation, frame_number):
+        """Run OCR on a frame; returns None if the job was cancelled."""
+        def cancelled():
+            return self._closed or self._generation != generation
+
+        frame = self._source.read(frame_number)
+        if frame is None:
+            return None, None, None
+        roi_x, roi_y, roi_width, roi_height = calculate_timestamp_roi(frame.shape[1], frame.shape[0])
+        attempt = {}
+        extracted_time, original_format = self._extract(
+            frame, roi_x, roi_y, roi_width, roi_height, cancelled=cancelled, last_attempt=attempt
+        )
+        if cancelled():
+            return None
+        confidence = None
+        if extracted_time is not None and attempt.get("confidence") is not None:
+            confidence = 100 * attempt["confidence"]
+        elif extracted_time is not None and "image" in attempt:
+            confidence = ocr_confidence(attempt["image"], attempt["config"])
+        return extracted_time, original_format, confidence
+
+    def _worker_loop(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            generation, frame_number, _ = job
+            try:
+                result = self._read_overlay(generation, frame_number)
+            except Exception as e:
+                print(f"Live OCR error on frame {frame_number + 1}: {e}")
+                result = (None, None, None)
+            with self._condition:
+                self._running = None
+                if result is not None:
+                    self._results[frame_number] = result
+                    while len(self._results) > self.capacity:
+                        del self._results[next(iter(self._results))]
+                self._condition.notify_all()
+
+    def close(self):
+        """Cancel any job, stop the worker thread and release the frame source."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._source.close()
+
+
+def calculate_timestamp_roi(width, height):
+    """
+    Calculate the region of interest for the timestamp overlay in the top right corner.
+
+    Args:
+        width: Frame width in pixels
+        height: Frame height in pixels
+
+    Returns:
+        Tuple of (roi_x, roi_y, roi_width, roi_height)
+    """
+    roi_width = int(width * 0.4)  # Use 40% of the width for the ROI to ensure we capture the full timestamp
+    roi_height = int(height * 0.2)  # Use 20% of the height for the ROI to ensure we capture the full timestamp
+    roi_x = width - roi_width
+    roi_y = 0  # Start from the top of the frame
+    return roi_x, roi_y, roi_width, roi_height
+
+
+# Cost of a seek in decoded frames, on top of decoding from the keyframe to the target
+SEEK_OVERHEAD_FRAMES = 8
+
+
+def plan_frame_access(frame_numbers, keyframes=None, seek_overhead=SEEK_OVERHEAD_FRAMES):
+    """
+    Plan how to read a set of frames with as little decoding as possible.
+
+    The frames are sorted and split into runs. Each run starts with one seek and is then read
+    linearly, skipping the frames in between. A new run is only started when seeking to the
+    next frame (decoding from the keyframe before it) is cheaper than decoding forward to it,
+    so a dense scan becomes a single linear read. Without keyframes every frame is treated
+    as a keyframe.
+
+    Args:
+        frame_numbers: Frames to read, in any order and possibly repeated
+        keyframes: Sorted frame numbers of the keyframes
+        seek_overhead: Cost of a seek in decoded frames
+
+    Returns:
+        List of runs, each a sorted list of frame numbers
+    """
+    keyframes = keyframes or []
+    runs = []
+    for frame_number in sorted(set(frame_numbers)):
+        if runs:
+            position = runs[-1][-1] + 1  # Next frame decoded when reading on
+            index = bisect.bisect_right(keyframes, frame_number)
+            keyframe = keyframes[index - 1] if index else frame_number
+            forward_cost = frame_number - position
+            seek_cost = frame_number - keyframe + seek_overhead
+            # A seek back into the GOP being read never saves anything
+            if keyframe <= position or forward_cost <= seek_cost:
+                runs[-1].append(frame_number)
+                continue
+        runs.append([frame_number])
+    return runs
+
+
+class FrameSource:
+    """
+    Decoded frames of a video, independent of the decoder behind them.
+
+    A frame source offers sequential iteration (frames), random access (read) and keyframe
+    lookup (seek_keyframe). The roi, scale and gray hints are applied to every frame returned:
+    frames are cropped to roi (x, y, width, height) of the full frame, then scaled by scale and
+    converted to grayscale. Backends that can, apply the hints while decoding.
+
+    Attributes:
+        fps, frame_count, width, height: Properties of the video (width and height of the full frame)
+        output_width, output_height: Size of the frames returned
+    """
 
-        for frame_num in range(search_start, search_end):
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
-            ret, frame = cap.read()
+    name = None
+
+    def __init__(self, video_path, roi=None, scale=None, gray=False, threads=None):
+        self.video_path = video_path
+        self.roi = tuple(roi) if roi else None
+        self.scale = scale if scale and scale != 1 else None
+        self.gray = gray
+        self.threads = threads
+        self.fps = 30.0
+        self.frame_count = 0
+        self.width = 0
+        self.height = 0
+        self._keyframes = None
+
+    @property
+    def output_width(self) -> int:
+        width = self.roi[2] if self.roi else self.width
+        return max(1, int(width * self.scale)) if self.scale else width
+
+    @property
+    def output_height(self) -> int:
+        height = self.roi[3] if self.roi else self.height
+        return max(1, int(height * self.scale)) if self.scale else height
+
+    def apply_hints(self, frame):
+        """Crop, scale and convert a full decoded frame according to the hints."""
+        if self.roi:
+            roi_x, roi_y, roi_width, roi_height = self.roi
+            frame = frame[roi_y:roi_y+roi_height, roi_x:roi_x+roi_width]
+        if self.scale:
+            frame = cv2.resize(frame, (self.output_width, self.output_height), interpolation=cv2.INTER_AREA)
+        if self.gray and frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return frame
+
+    def read(self, frame_number):
+        """Return the frame with the given number, or None if it cannot be decoded."""
+        raise NotImplementedError
+
+    def frames(self, start=0, count=None, step=1):
+        """
+        Iterate over consecutive frames.
+
+        Args:
+            start: First frame to return
+            count: Number of frames to cover, starting at start (default: up to the end)
+            step: Only return every step-th frame
+
+        Yields:
+            Tuples of (frame_number, frame). The array may be reused for a later frame;
+            copy it to keep it.
+        """
+        raise NotImplementedError
+
+    def keyframe_frames(self) -> list:
+        """Return the frame numbers of the keyframes, or an empty list if they cannot be listed."""
+        if self._keyframes is None:
+            try:
+                stream_start = float(get_video_stream_info(self.video_path).get("start_time") or 0)
+                times = get_keyframe_times(self.video_path)
+            except (OSError, subprocess.SubprocessError, ValueError) as e:
+                print(f"Could not list keyframes: {e}")
+                times, stream_start = [], 0.0
+            self._keyframes = sorted({int(round((t - stream_start) * self.fps)) for t in times})
+        return self._keyframes
+
+    def seek_keyframe(self, frame_number) -> int:
+        """
+        Return the keyframe at or before frame_number.
+
+        Decoding from the returned frame needs no earlier frames. If the keyframes cannot be
+        listed, every frame is treated as a keyframe.
+        """
+        keyframes = self.keyframe_frames()
+        position = bisect.bisect_right(keyframes, frame_number)
+        return keyframes[position - 1] if position else frame_number
+
+    def read_run(self, run):
+        """
+        Read one run from plan_frame_access: seek to its first frame and read on linearly.
+
+        Yields:
+            Tuples of (frame_number, frame) for the frames in the run that could be decoded
+        """
+        wanted = set(run)
+        for frame_number, frame in self.frames(run[0], run[-1] - run[0] + 1):
+            if frame_number in wanted:
+                yield frame_number, frame
+
+    def iter_frames(self, frame_numbers):
+        """
+        Read a set of frames in the cheapest order (sorted), as planned by plan_frame_access.
+
+        Yields:
+            Tuples of (frame_number, frame) in frame order. Frames that cannot be decoded are skipped.
+        """
+        frame_numbers = list(frame_numbers)
+        # Listing keyframes is only worth it when there is more than one frame to plan
+        keyframes = self.keyframe_frames() if len(set(frame_numbers)) > 1 else []
+        for run in plan_frame_access(frame_numbers, keyframes):
+            yield from self.read_run(run)
+
+    def read_frames(self, frame_numbers):
+        """Return a list with the given frames in the order asked for, None for frames that cannot be decoded."""
+        frame_numbers = list(frame_numbers)
+        decoded = {frame_number: frame.copy() for frame_number, frame in self.iter_frames(frame_numbers)}
+        return [decoded.get(frame_number) for frame_number in frame_numbers]
+
+    def close(self):
+        """Release the decoder."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class OpenCVFrameSource(FrameSource):
+    """Frames decoded with cv2.VideoCapture; cheapest for random access to a few frames."""
+
+    name = "opencv"
+
+    def __init__(self, video_path, roi=None, scale=None, gray=False, threads=None):
+        super().__init__(video_path, roi, scale, gray, threads)
+        if threads and hasattr(cv2, "CAP_PROP_N_THREADS"):
+            self._cap = cv2.VideoCapture(video_path, cv2.CAP_ANY, [cv2.CAP_PROP_N_THREADS, threads])
+        else:
+            self._cap = cv2.VideoCapture(video_path)
+        if not self._cap.isOpened():
+            raise OSError(f"Could not open video: {video_path}")
+
+        fps = self._cap.get(cv2.CAP_PROP_FPS)
+        if fps and fps > 0:
+            self.fps = fps
+        self.frame_count = int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.width = int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self._position = 0
+
+    def read(self, frame_number):
+        if frame_number != self._position:
+            with span("frame.seek", frame=frame_number):
+                self._cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        with span("frame.decode"):
+            ret, frame = self._cap.read()
+        if not ret:
+            self._position = None
+            return None
+        self._position = frame_number + 1
+        return self.apply_hints(frame)
+
+    def frames(self, start=0, count=None, step=1):
+        # The container frame count can be wrong, so without a count read until decoding stops
+        numbers = itertools.count(start) if count is None else range(start, start + count)
+        if start != self._position:
+            with span("frame.seek", frame=start):
+                self._cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+        self._position = start
+        for frame_number in numbers:
+            if (frame_number - start) % step:
+                # Skipped frames are decoded but not converted
+                with span("frame.decode", skipped=True):
+                    grabbed = self._cap.grab()
+                if not grabbed:
+                    break
+                self._position = frame_number + 1
+                continue
+            with span("frame.decode"):
+                ret, frame = self._cap.read()
+            if not ret:
+                break
+            self._position = frame_number + 1
+            yield frame_number, self.apply_hints(frame)
+
+    def read_run(self, run):
+        # Frames between the wanted ones are only grabbed, never retrieved or converted
+        wanted = set(run)
+        if run[0] != self._position:
+            with span("frame.seek", frame=run[0]):
+                self._cap.set(cv2.CAP_PROP_POS_FRAMES, run[0])
+        for frame_number in range(run[0], run[-1] + 1):
+            if frame_number not in wanted:
+                with span("frame.decode", skipped=True):
+                    grabbed = self._cap.grab()
+                if not grabbed:
+                    break
+                self._position = frame_number + 1
+                continue
+            with span("frame.decode"):
+                ret, frame = self._cap.read()
             if not ret:
                 break
+            self._position = frame_number + 1
+            yield frame_number, self.apply_hints(frame)
+
+    def close(self):
+        self._cap.release()
+
+
+class FFmpegFrameSource(FrameSource):
+    """
+    Frames streamed from an ffmpeg process as raw video.
+
+    The hints become ffmpeg filters (crop before scale and format, so only the ROI is ever
+    scaled or converted) and fixed-size frames are read from the pipe straight into
+    preallocated NumPy buffers. Best for sequential reads; random access restarts ffmpeg
+    unless the requested frame is the next one.
+    """
+
+    name = "ffmpeg"
+
+    def __init__(self, video_path, roi=None, scale=None, gray=False, threads=None):
+        super().__init__(video_path, roi, scale, gray, threads)
+        if find_tool("ffmpeg") is None or find_tool("ffprobe") is None:
+            raise OSError("ffmpeg and ffprobe are required for the ffmpeg frame source")
+        try:
+            info = get_video_stream_info(video_path)
+        except (subprocess.SubprocessError, ValueError) as e:
+            raise OSError(f"Could not open video: {video_path} ({e})")
+        if not info.get("width"):
+            raise OSError(f"No video stream found in {video_path}")
+
+        # The average rate, as OpenCV and PyAV report it; r_frame_rate differs for variable frame rate video
+        self.fps = _parse_frame_rate(info.get("avg_frame_rate"), default=_parse_frame_rate(info.get("r_frame_rate")))
+        self.width = int(info["width"])
+        self.height = int(info["height"])
+        if str(info.get("nb_frames", "")).isdigit():
+            self.frame_count = int(info["nb_frames"])
+        elif info.get("duration") not in (None, "N/A"):
+            self.frame_count = int(round(float(info["duration"]) * self.fps))
+        self._stream = None
+        self._position = None
+
+    def build_command(self, start=0, count=None, step=1):
+        """Build the ffmpeg command that writes the requested frames to stdout as raw video."""
+        filters = []
+        if step > 1:
+            filters.append(f"select=not(mod(n\\,{step}))")
+        if self.roi:
+            roi_x, roi_y, roi_width, roi_height = self.roi
+            # exact=1 keeps the crop from being rounded to the chroma grid
+            filters.append(f"crop={roi_width}:{roi_height}:{roi_x}:{roi_y}:exact=1")
+        if self.scale:
+            filters.append(f"scale={self.output_width}:{self.output_height}:flags=area")
+        pix_fmt = "gray" if self.gray else "bgr24"
+        filters.append(f"format={pix_fmt}")
+
+        command = [get_tool_path("ffmpeg"), "-v", "error", "-nostdin"]
+        if self.threads:
+            command += ["-threads", str(self.threads)]  # Decoder threads
+        if start > 0:
+            # Seek half a frame early so rounding cannot skip the first frame
+            command += ["-ss", f"{(start - 0.5) / self.fps:.6f}"]
+        command += [
+            "-i", self.video_path,
+            "-map", "0:v:0",
+            "-vf", ",".join(filters),
+            *get_ffmpeg_passthrough_args(),  # Never duplicate or drop frames
+        ]
+        if count is not None:
+            command += ["-frames:v", str(-(-count // step))]
+        return command + ["-f", "rawvideo", "-pix_fmt", pix_fmt, "pipe:1"]
+
+    def frames(self, start=0, count=None, step=1):
+        shape = (self.output_height, self.output_width) if self.gray else (self.output_height, self.output_width, 3)
+        # Two buffers so the previous frame stays valid while the next one is read
+        buffers = [np.empty(shape, dtype=np.uint8) for _ in range(2)]
+        views = [memoryview(buffer).cast("B") for buffer in buffers]
+        frame_size = buffers[0].nbytes
+
+        # Errors go to a file rather than a pipe, so a chatty decoder cannot block the frame pipe
+        errors = tempfile.TemporaryFile()
+        process = subprocess.Popen(
+            self.build_command(start, count, step), stdout=subprocess.PIPE, stderr=errors, bufsize=frame_size
+        )
+        try:
+            i = 0
+            while count is None or i * step < count:
+                view = views[i % 2]
+                filled = 0
+                with span("frame.decode"):
+                    while filled < frame_size:
+                        read = process.stdout.readinto(view[filled:])
+                        if not read:
+                            break
+                        filled += read
+                if filled < frame_size:
+                    # The stream ended; tell a failed decode apart from the end of the video
+                    if process.wait() != 0:
+                        errors.seek(0)
+                        message = errors.read().decode(errors="replace").strip()
+                        raise OSError(f"ffmpeg could not decode {self.video_path} "
+                                      f"(exit code {process.returncode}): {message}")
+                    return
+                yield start + i * step, buffers[i % 2]
+                i += 1
+        finally:
+            process.stdout.close()
+            process.kill()
+            process.wait()
+            errors.close()
+
+    def read(self, frame_number):
+        if self._stream is None or frame_number != self._position:
+            # Restart ffmpeg at the requested frame and keep it running for the next reads
+            if self._stream is not None:
+                self._stream.close()
+            self._stream = self.frames(frame_number)
+        result = next(self._stream, None)
+        if result is None:
+            self._stream = None
+            return None
+        self._position = frame_number + 1
+        return result[1].copy()
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+
+class PyAVFrameSource(FrameSource):
+    """Frames decoded in-process with PyAV (optional dependency) using threaded decoding."""
+
+    name = "pyav"
+
+    def __init__(self, video_path, roi=None, scale=None, gray=False, threads=None):
+        super().__init__(video_path, roi, scale, gray, threads)
+        try:
+            import av
+        except ImportError:
+            raise OSError("PyAV is not installed (pip install av)")
+        # av.AVError was removed in PyAV 14 in favour of av.FFmpegError
+        av_error = getattr(av, "FFmpegError", None) or av.AVError
+        try:
+            self._container = av.open(video_path)
+        except av_error as e:
+            raise OSError(f"Could not open video: {video_path} ({e})")
+        if not self._container.streams.video:
+            self._container.close()
+            raise OSError(f"No video stream found in {video_path}")
+
+        self._video = self._container.streams.video[0]
+        self._video.thread_type = "AUTO"  # Frame and slice threading
+        if threads:
+            self._video.thread_count = threads
+        rate = self._video.average_rate or self._video.guessed_rate
+        if rate:
+            self.fps = float(rate)
+        self.width = self._video.codec_context.width
+        self.height = self._video.codec_context.height
+        time_base = self._video.time_base
+        self._start = float(self._video.start_time * time_base) if self._video.start_time is not None else 0.0
+        if self._video.frames:
+            self.frame_count = self._video.frames
+        elif self._video.duration is not None:
+            self.frame_count = int(round(float(self._video.duration * time_base) * self.fps))
+        self._decoder = None
+        self._position = None
+
+    def _frame_number(self, frame):
+        return int(round((frame.time - self._start) * self.fps))
+
+    def _decode_from(self, frame_number):
+        """
+        Seek to a keyframe before frame_number and decode up to it.
+
+        Seeks in some containers (e.g. MPEG-TS, which seeks by byte position) can land past the
+        target; then the seek is repeated further back, doubling the distance each time.
+        """
+        margin = 0.0
+        while True:
+            target = max(frame_number / self.fps + self._start - margin, self._start)
+            self._container.seek(int(target / self._video.time_base), stream=self._video)
+            decoded = self._container.decode(self._video)
+            first = next(decoded, None)
+            if first is None:
+                return
+            if self._frame_number(first) <= frame_number or target <= self._start:
+                break
+            margin = max(1.0, 2 * margin)
+        for frame in itertools.chain([first], decoded):
+            number = self._frame_number(frame)
+            if number >= frame_number:
+                yield number, frame
+
+    def _convert(self, frame):
+        return self.apply_hints(frame.to_ndarray(format="gray" if self.gray else "bgr24"))
+
+    def read(self, frame_number):
+        if self._decoder is None or frame_number != self._position:
+            with span("frame.seek", frame=frame_number):
+                self._decoder = self._decode_from(frame_number)
+        with span("frame.decode"):
+            result = next(self._decoder, None)
+        if result is None or result[0] != frame_number:
+            # The frame is missing from the stream (or its timestamp rounds to another number)
+            self._decoder = None
+            return None
+        self._position = result[0] + 1
+        return self._convert(result[1])
+
+    def frames(self, start=0, count=None, step=1):
+        if self._decoder is None or start != self._position:
+            self._decoder = self._decode_from(start)
+        for number, frame in self._decoder:
+            self._position = number + 1
+            if count is not None and number >= start + count:
+                break
+            if number >= start and (number - start) % step == 0:
+                yield number, self._convert(frame)
+
+    def close(self):
+        self._decoder = None
+        self._container.close()
+
+
+FRAME_SOURCE_BACKENDS = {
+    "opencv": OpenCVFrameSource,
+    "ffmpeg": FFmpegFrameSource,
+    "pyav": PyAVFrameSource,
+}
+
+
+def get_available_frame_sources() -> list:
+    """Return the names of the frame source backends that can be used on this machine."""
+    available = ["opencv"]
+    if find_tool("ffmpeg") and find_tool("ffprobe"):
+        available.append("ffmpeg")
+    if importlib.util.find_spec("av") is not None:
+        available.append("pyav")
+    return available
+
+
+def open_frame_source(video_path, backend="auto", access="random", roi=None, scale=None, gray=False,
+                      threads=None):
+    """
+    Open a video as a FrameSource.
+
+    With backend "auto" the backend is chosen for the workload: OpenCV for random access,
+    and for sequential reads the ffmpeg pipe (or PyAV) when available, falling back to OpenCV.
+
+    Args:
+        video_path: Path to the video file
+        backend: "auto" or one of FRAME_SOURCE_BACKENDS ("opencv", "ffmpeg", "pyav")
+        access: "random" for reads of scattered frames, "sequential" for runs of consecutive frames
+        roi: Optional (x, y, width, height) region to crop every frame to
+        scale: Optional scale factor applied after cropping
+        gray: Whether to return grayscale frames
+        threads: Number of decoder threads (default: decided by the backend)
+
+    Returns:
+        The FrameSource, or None if the video could not be opened
+    """
+    if backend == "auto":
+        candidates = ["opencv"]
+        if access == "sequential":
+            available = get_available_frame_sources()
+            candidates = [name for name in ("ffmpeg", "pyav") if name in available] + candidates
+    elif backend in FRAME_SOURCE_BACKENDS:
+        candidates = [backend]
+    else:
+        raise ValueError(f"Unknown frame source '{backend}'. Expected one of: {', '.join(FRAME_SOURCE_BACKENDS)}")
+
+    for name in candidates:
+        try:
+            return FRAME_SOURCE_BACKENDS[name](video_path, roi=roi, scale=scale, gray=gray, threads=threads)
+        except OSError as e:
+            print(f"Error: {e}")
+    return None
+
+
+def benchmark_frame_sources(video_path, frame_count=300, backends=None, **hints):
+    """
+    Measure the sequential decoding speed of each frame source backend on a video.
+
+    Args:
+        video_path: Path to the video file
+        frame_count: Number of frames to decode with each backend
+        backends: Names of the backends to compare (default: all available)
+        **hints: roi, scale, gray and threads passed to every backend
+
+    Returns:
+        Dict mapping backend name to decoded frames per second, fastest first
+    """
+    results = {}
+    for backend in backends or get_available_frame_sources():
+        source = open_frame_source(video_path, backend=backend, **hints)
+        if source is None:
+            continue
+        with source:
+            start = time.perf_counter()
+            decoded = sum(1 for _ in source.frames(0, frame_count))
+            elapsed = time.perf_counter() - start
+        if decoded and elapsed > 0:
+            results[backend] = decoded / elapsed
+            print(f"{backend:<8} {decoded:>6} frames {results[backend]:>9.1f} fps")
+    return dict(sorted(results.items(), key=lambda item: item[1], reverse=True))
+
+
+class FrameCache:
+    """
+    Bounded cache of decoded (and optionally downscaled) frames around a playback position.
+
+    A background thread prefetches the frames ahead of and behind the current position with
+    its own FrameSource, so stepping and scrubbing near the position are served from memory.
+    Cache misses are decoded immediately with a second FrameSource. When the cache is full,
+    the frames furthest from the current position are evicted first.
+
+    Frames returned by get must not be modified; copy them before drawing on them.
+    """
+
+    def __init__(self, video_path, scale=None, capacity=64, radius=24, backend="auto"):
+        """
+        Args:
+            video_path: Path to the video file
+            scale: Optional scale factor applied to every cached frame
+            capacity: Maximum number of frames kept in memory
+            radius: Number of frames prefetched on each side of the current position (at most
+                (capacity - 1) // 2)
+            backend: Frame source backend (see open_frame_source)
+        """
+        self.capacity = max(1, capacity)
+        # The window is the position and radius frames on each side; it must fit in the cache,
+        # or frames inside it are evicted and prefetched again forever
+        self.radius = min(radius, (self.capacity - 1) // 2)
+        self._source = open_frame_source(video_path, backend=backend, access="random", scale=scale)
+        self._prefetch_source = open_frame_source(video_path, backend=backend, access="random", scale=scale)
+        if self._source is None or self._prefetch_source is None:
+            raise OSError(f"Could not open video: {video_path}")
+        self.frame_count = self._source.frame_count
+        self._frames = {}
+        self._unreadable = set()
+        self._position = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._prefetch_loop, name="FrameCachePrefetch", daemon=True)
+        self._thread.start()
+
+    def __len__(self):
+        with self._condition:
+            return len(self._frames)
+
+    def __contains__(self, frame_number):
+        with self._condition:
+            return frame_number in self._frames
+
+    def _store(self, frame_number, frame):
+        """Add a frame, evicting the frames furthest from the current position if full."""
+        with self._condition:
+            self._frames[frame_number] = frame
+            while len(self._frames) > self.capacity:
+                furthest = max(self._frames, key=lambda n: abs(n - self._position))
+                del self._frames[furthest]
+
+    def set_position(self, frame_number):
+        """Move the prefetch window to a new position."""
+        with self._condition:
+            self._position = frame_number
+            self._condition.notify()
+
+    def get(self, frame_number):
+        """Return a frame from the cache, decoding it now if it is not cached, or None if it cannot be read."""
+        self.set_position(frame_number)
+        with self._condition:
+            frame = self._frames.get(frame_number)
+        if frame is None:
+            frame = self._source.read(frame_number)
+            if frame is not None:
+                self._store(frame_number, frame)
+        return frame
+
+    def _missing_frames(self):
+        """Return the position and the frames around it that are not cached yet, nearest first."""
+        with self._condition:
+            position = self._position
+            ahead = range(position + 1, min(position + self.radius + 1, self.frame_count))
+            behind = range(max(position - self.radius, 0), position)
+            return position, [n for n in (*ahead, *behind) if n not in self._frames and n not in self._unreadable]
+
+    def _prefetch(self, frames, position):
+        """Decode and cache frames; returns False if the position moved on before they were all read."""
+        decoded = set()
+        for frame_number, frame in self._prefetch_source.iter_frames(frames):
+            self._store(frame_number, frame.copy())
+            decoded.add(frame_number)
+            with self._condition:
+                # Abandon the rest of the window once the position has moved on
+                if self._closed or abs(self._position - position) > self.radius // 2:
+                    return False
+        # Do not keep retrying frames the decoder could not produce
+        with self._condition:
+            self._unreadable.update(set(frames) - decoded)
+        return True
+
+    def _prefetch_loop(self):
+        while True:
+            with self._condition:
+                if self._closed:
+                    return
+            position, missing = self._missing_frames()
+            if not missing:
+                with self._condition:
+                    if not self._closed and self._position == position:
+                        self._condition.wait()
+                continue
+            # Frames ahead are read first; frames behind are read linearly from their keyframe
+            ahead = [n for n in missing if n > position]
+            behind = [n for n in missing if n < position]
+            if self._prefetch(ahead, position):
+                self._prefetch(behind, position)
+
+    def close(self):
+        """Stop the prefetch thread and release both frame sources."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self._source.close()
+        self._prefetch_source.close()
+
+
+class PlaybackEngine:
+    """
+    Real-time playback: frames are decoded and rendered on a worker thread and handed to the
+    UI thread through a bounded queue, paced by the wall clock.
+
+    The worker skips rendering frames that are already late, and next_frame drops queued
+    frames whose successor is also due, so playback keeps the true frame rate when decoding
+    or drawing falls behind instead of slowing down.
+    """
+
+    _END = object()
+
+    def __init__(self, video_path, render, start_frame=0, fps=None, scale=None, queue_size=4, backend="auto"):
+        """
+        Args:
+            video_path: Path to the video file
+            render: Function (frame_number, frame) -> rendered frame, called on the worker thread
+            start_frame: First frame to play
+            fps: Playback frame rate (default: the frame rate of the video)
+            scale: Optional scale factor applied while decoding
+            queue_size: Maximum number of rendered frames waiting for the UI thread
+            backend: Frame source backend (see open_frame_source)
+        """
+        self._source = open_frame_source(video_path, backend=backend, access="sequential", scale=scale)
+        if self._source is None:
+            raise OSError(f"Could not open video: {video_path}")
+        self.render = render
+        self.start_frame = start_frame
+        self.fps = fps or self._source.fps
+        self.dropped = 0
+        self.finished = False
+        self._queue = queue.Queue(maxsize=max(1, queue_size))
+        self._pending = None
+        self._stopped = threading.Event()
+        self._start_time = None
+        self._thread = threading.Thread(target=self._decode_loop, name="PlaybackDecode", daemon=True)
+
+    def start(self):
+        """Start the clock and the worker thread."""
+        self._start_time = time.perf_counter()
+        self._thread.start()
+
+    def due_time(self, frame_number) -> float:
+        """Return the wall-clock time (time.perf_counter) at which a frame should be shown."""
+        return self._start_time + (frame_number - self.start_frame) / self.fps
+
+    def _decode_loop(self):
+        try:
+            for frame_number, frame in self._source.frames(self.start_frame):
+                if self._stopped.is_set():
+                    return
+                # A frame that is late already will be dropped, so do not spend time rendering it
+                if time.perf_counter() > self.due_time(frame_number) + 1 / self.fps:
+                    self.dropped += 1
+                    continue
+                item = (frame_number, self.render(frame_number, frame))
+                while not self._stopped.is_set():
+                    try:
+                        self._queue.put(item, timeout=0.05)
+                        break
+                    except queue.Full:
+                        continue
+        finally:
+            self._source.close()
+            while not self._stopped.is_set():
+                try:
+                    self._queue.put(self._END, timeout=0.05)
+                    break
+                except queue.Full:
+                    continue
+
+    def next_frame(self):
+        """
+        Return the newest frame that is due, as (frame_number, rendered), or None if none is due yet.
+
+        Call this regularly from the UI thread. Due frames that are overtaken by a later due
+        frame are dropped. Sets finished once the last frame has been returned.
+        """
+        now = time.perf_counter()
+        due = None
+        while True:
+            if self._pending is None:
+                try:
+                    self._pending = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if self._pending is self._END:
+                self._pending = None
+                self.finished = True
+                break
+            if self.due_time(self._pending[0]) > now:
+                break
+            if due is not None:
+                self.dropped += 1
+            due, self._pending = self._pending, None
+        return due
+
+    def stop(self):
+        """Stop playback and the worker thread."""
+        self._stopped.set()
+        if self._start_time is None:
+            self._source.close()
+        elif self._thread.is_alive():
+            self._thread.join()
+
+
+# Version of the on-disk thumbnail cache; bump when the layout changes
+THUMBNAIL_CACHE_VERSION = 1
+THUMBNAIL_CACHE_SUFFIX = ".thumbs.npz"
+
+
+def get_thumbnail_cache_path(video_path) -> Path:
+    """Return the path of the sidecar thumbnail cache for a video file."""
+    video_path = Path(video_path)
+    return video_path.with_name(video_path.name + THUMBNAIL_CACHE_SUFFIX)
+
+
+def select_thumbnail_frames(keyframes, frame_count, fps, max_thumbnails=240, interval_seconds=10.0):
+    """
+    Choose the frames to make thumbnails of.
+
+    Keyframes are used when they are known, since they decode without any other frame;
+    otherwise frames are spaced interval_seconds apart. At most max_thumbnails frames are
+    chosen, spread evenly over the candidates.
+
+    Returns:
+        Sorted list of frame numbers
+    """
+    candidates = [k for k in keyframes if 0 <= k < frame_count] if keyframes else []
+    if not candidates:
+        step = max(1, int(round(fps * interval_seconds)))
+        candidates = list(range(0, frame_count, step))
+    if len(candidates) > max_thumbnails:
+        candidates = [candidates[i * len(candidates) // max_thumbnails] for i in range(max_thumbnails)]
+    return candidates
+
+
+class ThumbnailStrip:
+    """
+    Small keyframe thumbnails of a whole video, generated lazily in the background.
+
+    Thumbnails are generated coarse to fine (every 16th first, then the ones in between), so
+    the whole timeline is covered quickly, and are saved to a sidecar file next to the video
+    once complete. The cache is invalidated when the video changes.
+    """
+
+    def __init__(self, video_path, thumb_width=96, max_thumbnails=240, backend="auto"):
+        self.video_path = video_path
+        self.thumb_width = thumb_width
+        self.max_thumbnails = max_thumbnails
+        self.backend = backend
+        self.frame_count = 0
+        self.complete = False
+        self._thumbs = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Load the thumbnails from the cache file, or start generating them in the background."""
+        if self._load():
+            return
+        self._thread = threading.Thread(target=self._generate, name="ThumbnailStrip", daemon=True)
+        self._thread.start()
+
+    def _load(self) -> bool:
+        path = get_thumbnail_cache_path(self.video_path)
+        if not path.exists():
+            return False
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                signature = _video_file_signature(self.video_path)
+                if (int(data["version"]) != THUMBNAIL_CACHE_VERSION
+                        or int(data["size"]) != signature["size"]
+                        or int(data["mtime_ns"]) != signature["mtime_ns"]
+                        or int(data["thumb_width"]) != self.thumb_width):
+                    print(f"Thumbnail cache is out of date: {path}")
+                    return False
+                self.frame_count = int(data["frame_count"])
+                self._thumbs = dict(zip(data["frames"].tolist(), data["thumbs"]))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not load thumbnail cache: {e}")
+            return False
+        self.complete = True
+        print(f"Loaded {len(self._thumbs)} thumbnails from {path}")
+        return True
+
+    def _save(self):
+        path = get_thumbnail_cache_path(self.video_path)
+        frames = sorted(self._thumbs)
+        if not frames:
+            return
+        signature = _video_file_signature(self.video_path)
+        try:
+            with open(path, "wb") as f:
+                np.savez(
+                    f,
+                    version=THUMBNAIL_CACHE_VERSION,
+                    size=signature["size"],
+                    mtime_ns=signature["mtime_ns"],
+                    thumb_width=self.thumb_width,
+                    frame_count=self.frame_count,
+                    frames=np.array(frames, dtype=np.int64),
+                    thumbs=np.stack([self._thumbs[n] for n in frames]),
+                )
+            print(f"Saved {len(frames)} thumbnails to {path}")
+        except OSError as e:
+            # The thumbnails are only a cache
+            print(f"Could not save thumbnail cache: {e}")
+
+    def _generate(self):
+        source = open_frame_source(self.video_path, backend=self.backend, access="random")
+        if source is None:
+            return
+        with source:
+            self.frame_count = source.frame_count
+            source.scale = min(1.0, self.thumb_width / source.width) if source.width else None
+            frames = select_thumbnail_frames(
+                source.keyframe_frames(), source.frame_count, source.fps, self.max_thumbnails
+            )
+            for stride in (16, 8, 4, 2, 1):
+                todo = [n for i, n in enumerate(frames) if i % stride == 0 and n not in self._thumbs]
+                for frame_number, thumb in source.iter_frames(todo):
+                    if self._stopped.is_set():
+                        return
+                    with self._lock:
+                        self._thumbs[frame_number] = thumb.copy()
+        self.complete = True
+        self._save()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._thumbs)
+
+    def nearest(self, frame_number):
+        """Return (thumbnail_frame_number, thumbnail) for the thumbnail closest to a frame, or None."""
+        with self._lock:
+            if not self._thumbs:
+                return None
+            nearest_frame = min(self._thumbs, key=lambda n: abs(n - frame_number))
+            return nearest_frame, self._thumbs[nearest_frame]
+
+    def render(self, width, height, frame_count=None):
+        """
+        Draw the strip as one BGR image: the timeline is split into slots of about one
+        thumbnail width and each slot shows the thumbnail nearest to its position.
+        """
+        strip = np.zeros((height, width, 3), dtype=np.uint8)
+        frame_count = frame_count or self.frame_count
+        with self._lock:
+            frames = sorted(self._thumbs)
+            if not frames or not frame_count:
+                return strip
+            slot_count = max(1, width // max(1, int(self.thumb_width * height / self._thumbs[frames[0]].shape[0])))
+            for slot in range(slot_count):
+                x0 = slot * width // slot_count
+                x1 = (slot + 1) * width // slot_count
+                position = (slot + 0.5) * frame_count / slot_count
+                index = bisect.bisect_left(frames, position)
+                candidates = frames[max(0, index - 1):index + 1]
+                nearest_frame = min(candidates, key=lambda n: abs(n - position))
+                strip[:, x0:x1] = cv2.resize(self._thumbs[nearest_frame], (x1 - x0, height), interpolation=cv2.INTER_AREA)
+        return strip
+
+    def close(self):
+        """Stop generating thumbnails."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+# Version of the sidecar timestamp index format; bump when the layout changes
+TIMESTAMP_INDEX_VERSION = 1
+TIMESTAMP_INDEX_SUFFIX = ".tsindex.json"
+
+
+def get_timestamp_index_path(video_path) -> Path:
+    """Return the path of the sidecar timestamp index for a video file."""
+    video_path = Path(video_path)
+    return video_path.with_name(video_path.name + TIMESTAMP_INDEX_SUFFIX)
+
+
+def _video_file_signature(video_path) -> dict:
+    """Return the size and modification time used to detect changes to a video file."""
+    stat = os.stat(video_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def fit_clock_model(frames, offsets_ms, fps):
+    """
+    Fit a linear clock model (overlay time as a function of frame number) to index samples.
+
+    Samples whose residual is far from the fit are treated as OCR misreads and discarded,
+    after which the model is fitted again on the remaining samples.
+
+    Args:
+        frames: List of frame numbers
+        offsets_ms: List of overlay times in milliseconds relative to the index base time
+        fps: Frames per second reported by the container
+
+    Returns:
+        Tuple of (clock_model, kept_frames, kept_offsets_ms) where clock_model is a dict with
+        ms_per_frame, offset_ms and max_residual_ms
+    """
+    nominal_ms_per_frame = 1000.0 / fps if fps > 0 else 1000.0 / 30.0
+
+    def fit(xs, ys):
+        if len(xs) < 2:
+            # A single sample only gives us the offset; assume the nominal frame rate
+            return nominal_ms_per_frame, ys[0] - nominal_ms_per_frame * xs[0]
+        slope, intercept = np.polyfit(np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64), 1)
+        return float(slope), float(intercept)
+
+    slope, intercept = fit(frames, offsets_ms)
+
+    if len(frames) >= 3:
+        residuals = [abs(y - (slope * x + intercept)) for x, y in zip(frames, offsets_ms)]
+        median_residual = sorted(residuals)[len(residuals) // 2]
+        # Anything further than a couple of seconds (or well outside the typical spread) is a misread
+        limit = max(2000.0, 3 * median_residual)
+        kept = [(x, y) for (x, y), r in zip(zip(frames, offsets_ms), residuals) if r <= limit]
+        if len(kept) >= 2 and len(kept) < len(frames):
+            print(f"Discarding {len(frames) - len(kept)} outlier index samples")
+            frames = [x for x, _ in kept]
+            offsets_ms = [y for _, y in kept]
+            slope, intercept = fit(frames, offsets_ms)
+
+    max_residual = max((abs(y - (slope * x + intercept)) for x, y in zip(frames, offsets_ms)), default=0.0)
+    clock_model = {
+        "ms_per_frame": slope,
+        "offset_ms": intercept,
+        "max_residual_ms": max_residual,
+    }
+    return clock_model, frames, offsets_ms
+
+
+@traced("index.build")
+def build_timestamp_index(video_path, sample_interval_seconds=10.0, ocr_profile=None):
+    """
+    Build a sparse timestamp index for a video and save it next to the video file.
+
+    The overlay timestamp is read with OCR at regular intervals through the video and a linear
+    clock model is fitted to the samples. The index is stored as a compact JSON sidecar file
+    together with the size and modification time of the video so it can be invalidated when
+    the video changes.
+
+    Args:
+        video_path: Path to the video file to index
+        sample_interval_seconds: Interval between OCR samples in seconds
+        ocr_profile: OCR_PROFILES profile the samples are read with (default: the full cascade)
+
+    Returns:
+        The index as a dict, or None if no timestamps could be read from the video
+    """
+    print(f"Building timestamp index for video: {video_path}")
+
+    source = open_frame_source(video_path, access="random")
+    if source is None:
+        return None
+
+    fps = source.fps
+    total_frames = source.frame_count
+    roi_x, roi_y, roi_width, roi_height = calculate_timestamp_roi(source.width, source.height)
+
+    sample_interval_frames = max(1, int(round(fps * sample_interval_seconds)))
+    sample_frames = list(range(0, total_frames, sample_interval_frames))
+    # Always include the last frame so lookups near the end do not need extrapolation
+    if total_frames > 0 and sample_frames[-1] != total_frames - 1:
+        sample_frames.append(total_frames - 1)
+
+    frames = []
+    times = []
+    # Let the planner decide per sample whether to seek or decode forward
+    for frame_num, frame in source.iter_frames(sample_frames):
+        timestamp, _ = extract_timestamp_from_frame(frame, roi_x, roi_y, roi_width, roi_height,
+                                                    strategy=ocr_profile)
+        if timestamp:
+            frames.append(frame_num)
+            times.append(timestamp)
+
+    source.close()
+
+    if not frames:
+        print("Could not read any timestamps while building the index")
+        return None
+
+    base_time = times[0]
+    offsets_ms = [int(round((t - base_time).total_seconds() * 1000)) for t in times]
+    clock_model, frames, offsets_ms = fit_clock_model(frames, offsets_ms, fps)
+
+    index = {
+        "version": TIMESTAMP_INDEX_VERSION,
+        "video": _video_file_signature(video_path),
+        "fps": fps,
+        "total_frames": total_frames,
+        "roi": [roi_x, roi_y, roi_width, roi_height],
+        "sample_interval_frames": sample_interval_frames,
+        "base_time": base_time.isoformat(),
+        "frames": frames,
+        "offsets_ms": offsets_ms,
+        "clock_model": clock_model,
+    }
+
+    # The index is written to a temporary file and replaced atomically, so an interrupted
+    # build never leaves a truncated index behind
+    index_path = get_timestamp_index_path(video_path)
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=index_path.parent, prefix=index_path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(index, f, separators=(",", ":"))
+            os.replace(temp_path, index_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        print(f"Saved timestamp index with {len(frames)} samples to {index_path}")
+    except OSError as e:
+        # The index is only a cache; we can still use it for this run
+        print(f"Could not save timestamp index: {e}")
+
+    return index
+
+
+def load_timestamp_index(video_path):
+    """
+    Load the sidecar timestamp index for a video if it exists and is still valid.
+
+    Args:
+        video_path: Path to the video file
+
+    Returns:
+        The index as a dict, or None if there is no index or the video has changed since it was built
+    """
+    index_path = get_timestamp_index_path(video_path)
+    if not index_path.exists():
+        return None
+
+    try:
+        with open(index_path, "r") as f:
+            index = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Could not read timestamp index {index_path}: {e}")
+        return None
+
+    if index.get("version") != TIMESTAMP_INDEX_VERSION:
+        print("Timestamp index was built by a different version; rebuilding")
+        return None
+
+    try:
+        if index.get("video") != _video_file_signature(video_path):
+            print("Video file has changed since the timestamp index was built; rebuilding")
+            return None
+    except OSError:
+        return None
+
+    return index
+
+
+def get_timestamp_index(video_path, rebuild=False, sample_interval_seconds=10.0, ocr_profile=None):
+    """
+    Return the timestamp index for a video, building it if it is missing or stale.
+
+    Args:
+        video_path: Path to the video file
+        rebuild: Whether to ignore any existing index and build a new one
+        sample_interval_seconds: Interval between OCR samples when building the index
+        ocr_profile: OCR_PROFILES profile used when building the index (see build_timestamp_index)
+
+    Returns:
+        The index as a dict, or None if it could not be built
+    """
+    if not rebuild:
+        index = load_timestamp_index(video_path)
+        if index is not None:
+            print(f"Using cached timestamp index for {video_path}")
+            return index
+    return build_timestamp_index(video_path, sample_interval_seconds, ocr_profile=ocr_profile)
+
+
+def estimate_frame_for_time(index, target_time):
+    """
+    Estimate the frame number showing a given overlay time using a timestamp index.
+
+    The estimate interpolates between the two index samples around the target time. Near the
+    ends of the index the fitted clock model is used to extrapolate by at most one sample interval.
+
+    Args:
+        index: Timestamp index as returned by get_timestamp_index
+        target_time: Overlay time to look up as a datetime object
+
+    Returns:
+        Estimated frame number, or None if the time is outside the indexed video
+    """
+    frames = index["frames"]
+    offsets_ms = index["offsets_ms"]
+    if not frames:
+        return None
+
+    base_time = datetime.datetime.fromisoformat(index["base_time"])
+    target_ms = (target_time - base_time).total_seconds() * 1000
+    ms_per_frame = index["clock_model"]["ms_per_frame"] or (1000.0 / index["fps"])
+
+    # Samples are in frame order; the overlay clock is assumed to be monotonic
+    pos = bisect.bisect_left(offsets_ms, target_ms)
+    if 0 < pos < len(offsets_ms):
+        left_frame, left_ms = frames[pos - 1], offsets_ms[pos - 1]
+        right_frame, right_ms = frames[pos], offsets_ms[pos]
+        if right_ms == left_ms:
+            estimate = left_frame
+        else:
+            ratio = (target_ms - left_ms) / (right_ms - left_ms)
+            estimate = left_frame + ratio * (right_frame - left_frame)
+    else:
+        anchor = 0 if pos == 0 else len(frames) - 1
+        estimate = frames[anchor] + (target_ms - offsets_ms[anchor]) / ms_per_frame
+        max_distance = index["sample_interval_frames"]
+        if abs(estimate - frames[anchor]) > max_distance:
+            return None
+
+    total_frames = index["total_frames"]
+    return int(min(max(round(estimate), 0), max(total_frames - 1, 0)))
+
+
+@traced("index.refine")
+def refine_frame_for_time(source, index, target_time, estimated_frame, max_iterations=4, ocr_profile=None):
+    """
+    Refine an estimated frame number by reading the overlay around it.
+
+    Each iteration reads the overlay at the current frame and moves by the remaining time
+    difference converted to frames, which normally converges in one or two reads.
+
+    Args:
+        source: Open FrameSource for the video (full frames)
+        index: Timestamp index for the video
+        target_time: Overlay time to find as a datetime object
+        estimated_frame: Initial frame estimate from estimate_frame_for_time
+        max_iterations: Maximum number of frames to read
+        ocr_profile: OCR_PROFILES profile the overlays are read with (default: the full cascade)
+
+    Returns:
+        Tuple of (frame_number, difference_in_seconds) for the closest frame found,
+        or (None, None) if no timestamp could be read near the estimate
+    """
+    roi_x, roi_y, roi_width, roi_height = index["roi"]
+    total_frames = index["total_frames"]
+    ms_per_frame = index["clock_model"]["ms_per_frame"] or (1000.0 / index["fps"])
+
+    best_frame = None
+    best_diff = None
+    visited = set()
+    frame_num = estimated_frame
+
+    for _ in range(max_iterations):
+        if frame_num in visited:
+            break
+        visited.add(frame_num)
+
+        frame = source.read(frame_num)
+        if frame is None:
+            break
+        timestamp, _ = extract_timestamp_from_frame(frame, roi_x, roi_y, roi_width, roi_height,
+                                                    strategy=ocr_profile)
+        if not timestamp:
+            # Unreadable overlay; nudge forward one frame and try again
+            frame_num = min(frame_num + 1, total_frames - 1)
+            continue
+
+        diff = (target_time - timestamp).total_seconds()
+        if best_diff is None or abs(diff) < abs(best_diff):
+            best_frame, best_diff = frame_num, diff
+
+        step = int(round(diff * 1000 / ms_per_frame))
+        if step == 0:
+            break
+        frame_num = int(min(max(frame_num + step, 0), total_frames - 1))
+
+    if best_frame is None:
+        return None, None
+    return best_frame, abs(best_diff)
+
+
+@traced("index.lookup")
+def find_matching_timestamps_with_index(video_path, target_start_time, target_end_time, time_window=1.0,
+                                        ocr_profile=None):
+    """
+    Find the start and end positions of a time range using the sidecar timestamp index.
+
+    Args:
+        video_path: Path to the video file to search
+        target_start_time: Target start timestamp to find in the video
+        target_end_time: Target end timestamp to find in the video
+        time_window: Maximum allowed difference in seconds between a target and the matched frame
+        ocr_profile: OCR_PROFILES profile the overlays are read with (default: the full cascade)
+
+    Returns:
+        Tuple of (start_frame, end_frame, fps) or (None, None, None) if the index could not resolve both
+    """
+    index = get_timestamp_index(video_path, ocr_profile=ocr_profile)
+    if index is None:
+        return None, None, None
+
+    start_estimate = estimate_frame_for_time(index, target_start_time)
+    end_estimate = estimate_frame_for_time(index, target_end_time)
+    if start_estimate is None or end_estimate is None:
+        print("Target times are outside the range covered by the timestamp index")
+        return None, None, None
+
+    source = open_frame_source(video_path, access="random")
+    if source is None:
+        return None, None, None
+
+    start_frame, start_diff = refine_frame_for_time(source, index, target_start_time, start_estimate,
+                                                    ocr_profile=ocr_profile)
+    end_frame, end_diff = refine_frame_for_time(source, index, target_end_time, end_estimate,
+                                                ocr_profile=ocr_profile)
+    source.close()
+
+    if start_frame is None or end_frame is None:
+        return None, None, None
+    if start_diff > time_window or end_diff > time_window:
+        print(f"Index lookup did not converge (start diff: {start_diff:.3f}s, end diff: {end_diff:.3f}s)")
+        return None, None, None
+
+    print(f"Index lookup found start frame {start_frame} (diff: {start_diff:.3f}s) "
+          f"and end frame {end_frame} (diff: {end_diff:.3f}s)")
+    return start_frame, end_frame, index["fps"]
+
+
+@traced()
+def find_matching_timestamps_in_video(video_path, target_start_time, target_end_time, use_index=True,
+                                      ocr_profile=None):
+    """
+    Scan through a video to find frames with timestamps matching the target start and end times.
+
+    When use_index is True, the sidecar timestamp index is used first (and built if needed), so
+    repeated lookups in the same video only need a few OCR reads. The full adaptive scan is used
+    as a fallback when the index cannot resolve both times.
+
+    Args:
+        video_path: Path to the video file to scan
+        target_start_time: Target start timestamp to find in the video
+        target_end_time: Target end timestamp to find in the video
+        use_index: Whether to use the sidecar timestamp index
+        ocr_profile: Name of the OCR_PROFILES speed/accuracy profile the overlays are read with
+            (default: the full extract_timestamp_from_frame cascade)
+
+    Returns:
+        Tuple of (start_position, end_position, success) where positions are in seconds from the start of the video,
+        and success is a boolean indicating if both timestamps were found
+    """
+    print(f"Searching for matching timestamps in video: {video_path}")
+    print(f"Target start time: {target_start_time}")
+    print(f"Target end time: {target_end_time}")
+
+    if use_index:
+        start_frame, end_frame, fps = find_matching_timestamps_with_index(
+            video_path, target_start_time, target_end_time, ocr_profile=ocr_profile
+        )
+        if start_frame is not None and end_frame is not None and start_frame < end_frame:
+            start_position = start_frame / fps
+            end_position = end_frame / fps
+            print(f"Final start position: {start_position:.3f}s")
+            print(f"Final end position: {end_position:.3f}s")
+            print(f"Snippet duration: {end_position - start_position:.3f}s")
+            return start_position, end_position, True
+        print("Timestamp index could not resolve the targets; falling back to a full scan")
+
+    # Open the video
+    source = open_frame_source(video_path, access="random")
+    if source is None:
+        return 0, 0, False
+
+    # Get video properties
+    fps = source.fps
+    total_frames = source.frame_count
+    width = source.width
+    height = source.height
+    duration = total_frames / fps if fps > 0 else 0
+
+    print(f"Video properties: {total_frames} frames, {fps} fps, duration: {duration:.2f} seconds")
+
+    # Calculate ROI for timestamp extraction
+    roi_x, roi_y, roi_width, roi_height = calculate_timestamp_roi(width, height)
+
+    # Consecutive frames and repeated probes of a frame mostly show the same overlay, so only
+    # ROIs that changed are read with the full OCR cascade
+    detector = ROIChangeDetector(extract=functools.partial(extract_timestamp_from_frame, strategy=ocr_profile))
+
+    # Initialize variables
+    start_position = None
+    end_position = None
+    start_frame = None
+    end_frame = None
+
+    # Define a time window for matching (allow small differences in timestamps)
+    time_window = datetime.timedelta(seconds=1)
+
+    # Use an adaptive sampling approach
+    # Start with a coarse sampling interval
+    initial_interval = max(1, int(fps * 30))  # Start by sampling every 30 seconds
+    min_interval = max(1, int(fps))           # Minimum interval is 1 second
+
+    print(f"Starting with sampling interval: {initial_interval} frames (approx. every {initial_interval/fps:.1f} seconds)")
+
+    # Function to check a specific frame for timestamp
+    def check_frame_for_timestamp(frame_num):
+        nonlocal start_position, end_position, start_frame, end_frame
+
+        frame = source.read(frame_num)
+        if frame is None:
+            return None
+
+        timestamp, _ = detector.extract(frame, roi_x, roi_y, roi_width, roi_height)
+        if not timestamp:
+            return None
+
+        # Check if this timestamp is close to our targets
+        start_diff = abs((timestamp - target_start_time).total_seconds())
+        end_diff = abs((timestamp - target_end_time).total_seconds())
+
+        # Update start position if this is closer
+        if (start_position is None or start_diff < abs((timestamp_at_frame(start_frame) - target_start_time).total_seconds())) and start_diff < time_window.total_seconds():
+            print(f"Found better start timestamp: {timestamp} at frame {frame_num}, diff: {start_diff:.3f}s")
+            start_position = frame_num / fps
+            start_frame = frame_num
+
+        # Update end position if this is closer
+        if (end_position is None or end_diff < abs((timestamp_at_frame(end_frame) - target_end_time).total_seconds())) and end_diff < time_window.total_seconds():
+            print(f"Found better end timestamp: {timestamp} at frame {frame_num}, diff: {end_diff:.3f}s")
+            end_position = frame_num / fps
+            end_frame = frame_num
+
+        return timestamp
+
+    # Function to get timestamp at a specific frame (or None if not available)
+    def timestamp_at_frame(frame_num):
+        if frame_num is None:
+            return None
+
+        frame = source.read(frame_num)
+        if frame is None:
+            return None
+
+        timestamp, _ = detector.extract(frame, roi_x, roi_y, roi_width, roi_height)
+        return timestamp
+
+    # First pass: Coarse search through the entire video
+    print("Starting coarse search through the entire video...")
+    frame_num = 0
+    interval = initial_interval
+
+    # Sample frames throughout the video
+    while frame_num < total_frames:
+        timestamp = check_frame_for_timestamp(frame_num)
+
+        # If we found a timestamp, adjust our search strategy
+        if timestamp:
+            # If we're getting close to either target, reduce the interval
+            start_diff = abs((timestamp - target_start_time).total_seconds())
+            end_diff = abs((timestamp - target_end_time).total_seconds())
+
+            # Adjust interval based on how close we are to targets
+            if min(start_diff, end_diff) < 60:  # Within a minute
+                new_interval = max(min_interval, int(interval / 2))
+                if new_interval != interval:
+                    print(f"Getting closer to target, reducing interval to {new_interval} frames")
+                    interval = new_interval
+
+        frame_num += interval
+
+    # If we haven't found both timestamps, try a more exhaustive search
+    if start_position is None or end_position is None:
+        print("Coarse search didn't find all timestamps, trying more exhaustive search...")
+
+        # Try to estimate where the timestamps might be based on video duration
+        if total_frames > 0 and fps > 0:
+            # If we have some idea of the video's timeline, make educated guesses
+            if start_position is None:
+                # Try frames at 10%, 25%, 50%, 75% of the video
+                for percent in [0.1, 0.25, 0.5, 0.75]:
+                    frame_to_check = int(total_frames * percent)
+                    print(f"Checking frame at {percent*100}% of video: {frame_to_check}")
+                    check_frame_for_timestamp(frame_to_check)
+                    if start_position is not None:
+                        break
+
+            if end_position is None:
+                # Try frames at 25%, 50%, 75%, 90% of the video
+                for percent in [0.25, 0.5, 0.75, 0.9]:
+                    frame_to_check = int(total_frames * percent)
+                    print(f"Checking frame at {percent*100}% of video: {frame_to_check}")
+                    check_frame_for_timestamp(frame_to_check)
+                    if end_position is not None:
+                        break
+
+    # Second pass: Fine-grained search around the found positions, reading consecutive frames
+    # from a source that only decodes the timestamp region
+    roi_source = open_frame_source(
+        video_path, access="sequential", roi=(roi_x, roi_y, roi_width, roi_height), gray=True
+    )
+    if roi_source is None:
+        print("Could not reopen the video to refine the timestamp search")
+        source.close()
+        return 0, 0, False
+
+    if start_position is not None:
+        # Search more precisely around the start position
+        search_radius = int(fps * 5)  # Search 5 seconds around the found position
+        search_start = max(0, start_frame - search_radius)
+        search_end = min(total_frames, start_frame + search_radius)
+
+        print(f"Refining start timestamp search between frames {search_start} and {search_end}")
+
+        best_start_diff = abs((timestamp_at_frame(start_frame) - target_start_time).total_seconds())
+        best_start_pos = start_position
+        best_start_frame = start_frame
+
+        # Stream only the timestamp region of the consecutive frames
+        for frame_num, roi_frame in roi_source.frames(search_start, search_end - search_start):
+            timestamp, _ = detector.extract(roi_frame, 0, 0, roi_width, roi_height)
+
+            if timestamp:
+                diff = abs((timestamp - target_start_time).total_seconds())
+                if diff < best_start_diff:
+                    best_start_diff = diff
+                    best_start_pos = frame_num / fps
+                    best_start_frame = frame_num
+                    print(f"Better start match: {timestamp} at frame {frame_num}, diff: {diff:.3f}s")
+
+        start_position = best_start_pos
+        start_frame = best_start_frame
+
+    if end_position is not None:
+        # Search more precisely around the end position
+        search_radius = int(fps * 5)  # Search 5 seconds around the found position
+        search_start = max(0, end_frame - search_radius)
+        search_end = min(total_frames, end_frame + search_radius)
+
+        print(f"Refining end timestamp search between frames {search_start} and {search_end}")
+
+        best_end_diff = abs((timestamp_at_frame(end_frame) - target_end_time).total_seconds())
+        best_end_pos = end_position
+        best_end_frame = end_frame
+
+        # Stream only the timestamp region of the consecutive frames
+        for frame_num, roi_frame in roi_source.frames(search_start, search_end - search_start):
+            timestamp, _ = detector.extract(roi_frame, 0, 0, roi_width, roi_height)
+
+            if timestamp:
+                diff = abs((timestamp - target_end_time).total_seconds())
+                if diff < best_end_diff:
+                    best_end_diff = diff
+                    best_end_pos = frame_num / fps
+                    best_end_frame = frame_num
+                    print(f"Better end match: {timestamp} at frame {frame_num}, diff: {diff:.3f}s")
+
+        end_position = best_end_pos
+        end_frame = best_end_frame
+
+    roi_source.close()
+    source.close()
+    print(f"OCR change detection: {detector.stats['unchanged']} unchanged, "
+          f"{detector.stats['partial']} partially read, {detector.stats['full']} fully read ROIs")
+
+    # If we couldn't find both timestamps, return failure
+    if start_position is None or end_position is None:
+        print("Could not find matching timestamps in the video")
+        return 0, 0, False
+
+    # Ensure start position is before end position
+    if start_position >= end_position:
+        print(f"Warning: Found start position ({start_position:.3f}s) is after or equal to end position ({end_position:.3f}s)")
+        print("This may indicate an issue with timestamp extraction or matching")
+
+        # If the positions are very close or reversed, try to adjust them
+        if abs(end_position - start_position) < 1.0:  # Less than 1 second difference
+            print("Positions are very close, adding a minimum duration")
+            end_position = start_position + 5.0  # Add 5 seconds minimum duration
+        elif start_position > end_position:
+            print("Swapping start and end positions")
+            start_position, end_position = end_position, start_position
+
+    print(f"Final start position: {start_position:.3f}s")
+    print(f"Final end position: {end_position:.3f}s")
+    print(f"Snippet duration: {end_position - start_position:.3f}s")
+
+    return start_position, end_position, True
+
+
+@traced()
+def extract_video_snippet(input_video_path, output_video_path, start_time, end_time, reference_time=None,
+                          cut_mode="auto", encoding_profile="default", ocr_profile=None):
+    """
+    Extract a snippet from a video using start and end timestamps.
+
+    This function uses FFmpeg to extract a portion of a video file based on the provided
+    timestamps. For MKV files, it uses transcoding with H.264 video and AAC audio codecs.
+    For other file types, it first attempts to copy the streams directly, and if that fails,
+    it falls back to transcoding. The cut_mode argument overrides this choice: "copy" and
+    "transcode" force one method, and "smart" re-encodes only the partial GOPs at the
+    boundaries and stream-copies everything in between (see extract_video_snippet_smart), and
+    "segmented" transcodes keyframe-aligned chunks in parallel (see extract_video_snippet_segmented).
+
+    Args:
+        input_video_path: Path to the input video file
+        output_video_path: Path to save the output video snippet
+        start_time: Start timestamp as datetime object
+        end_time: End timestamp as datetime object
+        reference_time: Reference timestamp from the extended video (optional)
+                       If provided, it will be used to calculate the offset
+        cut_mode: One of CUT_MODES ("auto", "copy", "transcode", "smart" or "segmented")
+        encoding_profile: Name of the ENCODING_PROFILES entry used when transcoding
+                          ("default", "preview" or "archive")
+        ocr_profile: Name of the OCR_PROFILES entry the overlays are read with when searching
+                     for the timestamps ("fast", "balanced" or "accurate"; default: the full cascade)
+
+    Returns:
+        Tuple of (success, error_message) where success is a boolean indicating if the operation
+        was successful, and error_message is a string containing any error details (or None if successful)
+    """
+    try:
+        if cut_mode not in CUT_MODES:
+            error_msg = f"Error: Unknown cut mode '{cut_mode}'. Expected one of: {', '.join(CUT_MODES)}"
+            print(error_msg)
+            return False, error_msg
+        if encoding_profile not in ENCODING_PROFILES:
+            error_msg = (f"Error: Unknown encoding profile '{encoding_profile}'. "
+                         f"Expected one of: {', '.join(ENCODING_PROFILES)}")
+            print(error_msg)
+            return False, error_msg
+        if ocr_profile is not None and ocr_profile not in OCR_PROFILES:
+            error_msg = (f"Error: Unknown OCR profile '{ocr_profile}'. "
+                         f"Expected one of: {', '.join(OCR_PROFILES)}")
+            print(error_msg)
+            return False, error_msg
+
+        # Verify that end_time is after start_time
+        if end_time <= start_time:
+            error_msg = "Error: End time must be after start time"
+            print(error_msg)
+            return False, error_msg
+
+        # Calculate the duration of the snippet
+        duration = (end_time - start_time).total_seconds()
+
+        # Search for matching timestamps in the extended video
+        start_position, end_position, timestamps_found = find_matching_timestamps_in_video(
+            input_video_path, start_time, end_time, ocr_profile=ocr_profile
+        )
+
+        if timestamps_found:
+            # Use the found positions
+            start_time_str = f"{start_position}"
+            duration = end_position - start_position
+            print(f"Using found positions: start={start_time_str}, duration={duration}")
+        else:
+            # Fall back to the previous method
+            print("Falling back to reference time method")
+            # If reference_time is provided, calculate the offset from the start of the video
+            if reference_time:
+                # Get the creation time of the input video
+                source = open_frame_source(input_video_path, access="random")
+                if source is None:
+                    error_msg = f"Error: Could not open input video: {input_video_path}"
+                    print(error_msg)
+                    return False, error_msg
+
+                # Get the first frame to extract timestamp
+                first_frame = source.read(0)
+                if first_frame is None:
+                    error_msg = "Error: Could not read the first frame of the input video"
+                    print(error_msg)
+                    source.close()
+                    return False, error_msg
+
+                # Get dimensions
+                width = source.width
+                height = source.height
+
+                # Calculate ROI for timestamp extraction
+                roi_x, roi_y, roi_width, roi_height = calculate_timestamp_roi(width, height)
+
+                # Extract timestamp from the first frame
+                extended_timestamp, _ = extract_timestamp_from_frame(first_frame, roi_x, roi_y, roi_width, roi_height,
+                                                                     strategy=ocr_profile)
+                source.close()
+
+                if extended_timestamp:
+                    print(f"Extended video timestamp: {extended_timestamp}")
+                    print(f"Start timestamp: {start_time}")
+
+                    # Calculate time offset between the timestamps
+                    time_offset = (start_time - extended_timestamp).total_seconds()
+                    print(f"Time offset: {time_offset} seconds")
+
+                    # If time_offset is negative, we need to start from the beginning of the video
+                    if time_offset < 0:
+                        # Use the absolute offset as the start position
+                        start_time_str = f"{abs(time_offset)}"
+                    else:
+                        # Start from the specified offset
+                        start_time_str = f"{time_offset}"
+
+                    print(f"Using start position: {start_time_str} seconds")
+                else:
+                    print("Could not extract timestamp from extended video. Using start_time directly.")
+                    # Format the start time for ffmpeg (HH:MM:SS.mmm)
+                    start_time_str = start_time.strftime("%H:%M:%S.") + f"{start_time.microsecond // 1000:03d}"
+            else:
+                # Format the start time for ffmpeg (HH:MM:SS.mmm)
+                start_time_str = start_time.strftime("%H:%M:%S.") + f"{start_time.microsecond // 1000:03d}"
+
+        if cut_mode in SEPARATE_PASS_CUT_MODES:
+            return SEPARATE_PASS_CUT_MODES[cut_mode](
+                input_video_path, output_video_path, ffmpeg_time_to_seconds(start_time_str), duration,
+                encoding_profile=encoding_profile
+            )
+        return run_snippet_ffmpeg(
+            input_video_path, output_video_path, start_time_str, duration,
+            transcode=CUT_MODE_TRANSCODE[cut_mode], encoding_profile=encoding_profile
+        )
+
+    except Exception as e:
+        error_msg = f"Error extracting video snippet: {e}"
+        print(error_msg)
+        return False, error_msg
+
+
+# Ways extract_video_snippet can cut a snippet, and whether each one forces transcoding
+# (None lets the file extensions decide, as before)
+CUT_MODES = ("auto", "copy", "transcode", "smart", "segmented")
+CUT_MODE_TRANSCODE = {"auto": None, "copy": False, "transcode": True}
+
+# Encoders (and quality options) used by smart render to re-encode the boundary GOPs of each source codec
+SMART_RENDER_ENCODERS = {
+    "h264": ("libx264", ["-preset", "medium", "-crf", "18"]),
+    "hevc": ("libx265", ["-preset", "medium", "-crf", "20"]),
+    "mpeg4": ("mpeg4", ["-q:v", "2"]),
+    "mpeg2video": ("mpeg2video", ["-q:v", "2"]),
+}
+
+
+def snippet_needs_transcoding(input_video_path, output_video_path) -> bool:
+    """Return True if a snippet must be transcoded rather than stream copied (MKV/MOV input or MP4/MOV output)."""
+    input_ext = os.path.splitext(input_video_path)[1].lower()
+    output_ext = os.path.splitext(output_video_path)[1].lower()
+    return input_ext in ('.mkv', '.mov') or output_ext in ('.mp4', '.mov')
+
+
+# Named encoding profiles for transcoded snippets:
+#   preset/crf     - libx264 speed and quality settings
+#   audio_bitrate  - AAC bitrate
+#   max_height     - downscale taller videos to this height (None keeps the source size)
+#   threads        - encoder threads (None means one per CPU core)
+ENCODING_PROFILES = {
+    "default": {"preset": "medium", "crf": 23, "audio_bitrate": "192k", "max_height": None, "threads": None},
+    "preview": {"preset": "ultrafast", "crf": 28, "audio_bitrate": "96k", "max_height": 480, "threads": 4},
+    "archive": {"preset": "slow", "crf": 26, "audio_bitrate": "128k", "max_height": None, "threads": None},
+}
+
+
+def get_user_cache_dir() -> str:
+    """Return the per-user cache directory of vidmeta (%LOCALAPPDATA%, $XDG_CACHE_HOME or ~/.cache)."""
+    base = os.environ.get("LOCALAPPDATA") if os.name == "nt" else os.environ.get("XDG_CACHE_HOME")
+    return os.path.join(base or os.path.join(os.path.expanduser("~"), ".cache"), "vidmeta")
+
+
+# Achieved encode speed per profile, persisted in the user cache directory (or the file set by
+# the VIDMETA_ENCODE_STATS environment variable)
+ENCODE_STATS_PATH = os.environ.get("VIDMETA_ENCODE_STATS") or os.path.join(get_user_cache_dir(), "encode_stats.json")
+_encode_stats_lock = threading.Lock()
+
+
+def get_encoding_profile(profile):
+    """
+    Look up an encoding profile by name.
+
+    Raises:
+        ValueError: If the profile does not exist
+    """
+    if profile not in ENCODING_PROFILES:
+        raise ValueError(f"Unknown encoding profile '{profile}'. Expected one of: {', '.join(ENCODING_PROFILES)}")
+    return ENCODING_PROFILES[profile]
+
+
+def get_profile_threads(profile, threads=None) -> int:
+    """Return the explicit encoder thread count for a profile, optionally overridden by threads."""
+    if threads is not None:
+        return threads
+    return get_encoding_profile(profile)["threads"] or os.cpu_count() or 1
+
+
+def get_transcode_video_args(profile="default", threads=None):
+    """Return the ffmpeg video encoding options used when transcoding a snippet with a profile."""
+    settings = get_encoding_profile(profile)
+    args = [
+        "-c:v", "libx264",  # Use H.264 for video
+        "-preset", settings["preset"], # Trade encoding speed for file size
+        "-crf", str(settings["crf"]),  # Constant Rate Factor (lower is better quality)
+        "-pix_fmt", "yuv420p", # Widely compatible pixel format
+    ]
+    if settings["max_height"]:
+        # Only ever scale down; -2 keeps the width even for yuv420p
+        args += ["-vf", f"scale=-2:'min({settings['max_height']},ih)'"]
+    args += ["-threads", str(get_profile_threads(profile, threads))]
+    return args
+
+
+def get_transcode_args(profile="default"):
+    """Return the ffmpeg output options used when transcoding a snippet with a profile."""
+    settings = get_encoding_profile(profile)
+    return [
+        *get_transcode_video_args(profile),
+        "-c:a", "aac",      # Use AAC for audio
+        "-strict", "experimental",
+        "-b:a", settings["audio_bitrate"],  # Audio bitrate
+        "-movflags", "+faststart", # Optimize for web streaming
+        "-map", "0",        # Include all streams from input
+        "-avoid_negative_ts", "1", # Handle potential timestamp issues
+    ]
+
+
+def parse_encoded_frame_count(stderr):
+    """Return the last frame count reported in ffmpeg's progress output, or None."""
+    matches = re.findall(r'frame=\s*(\d+)', stderr or "")
+    return int(matches[-1]) if matches else None
+
+
+def load_encode_stats() -> dict:
+    """Load the recorded encode speed per profile."""
+    try:
+        with open(ENCODE_STATS_PATH, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def record_encode_stats(profile, frames, seconds):
+    """
+    Record the achieved encode speed for a profile.
+
+    Totals per profile are kept in ENCODE_STATS_PATH so the average speed of each profile
+    can be compared across runs. Updates from threads of one process are serialized, and the
+    file is replaced atomically, so concurrent runs can at worst lose an update but never
+    leave a half-written file.
+
+    Args:
+        profile: Name of the encoding profile
+        frames: Number of frames encoded
+        seconds: Wall-clock time the encode took
+    """
+    if not frames or seconds <= 0:
+        return
+    print(f"Encoded {frames} frames in {seconds:.2f}s ({frames / seconds:.1f} fps) with profile '{profile}'")
+
+    with _encode_stats_lock:
+        stats = load_encode_stats()
+        entry = stats.setdefault(profile, {"runs": 0, "frames": 0, "seconds": 0.0})
+        entry["runs"] += 1
+        entry["frames"] += frames
+        entry["seconds"] += seconds
+        entry["fps"] = entry["frames"] / entry["seconds"]
+        entry["last_fps"] = frames / seconds
+        temp_path = None
+        try:
+            directory = os.path.dirname(os.path.abspath(ENCODE_STATS_PATH))
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(stats, f, indent=2)
+            os.replace(temp_path, ENCODE_STATS_PATH)
+        except OSError as e:
+            if temp_path is not None and os.path.exists(temp_path):
+                os.unlink(temp_path)
+            print(f"Could not save encode stats: {e}")
+
+
+def print_encode_stats():
+    """Print the average encode speed recorded for each profile."""
+    stats = load_encode_stats()
+    if not stats:
+        print("No encode stats recorded yet.")
+        return
+    print(f"{'Profile':<10} {'Runs':>6} {'Frames':>10} {'Avg fps':>9} {'Last fps':>9}")
+    for profile, entry in sorted(stats.items()):
+        print(f"{profile:<10} {entry['runs']:>6} {entry['frames']:>10} {entry['fps']:>9.1f} {entry['last_fps']:>9.1f}")
+
+
+def get_copy_args(input_index=0):
+    """Return the ffmpeg output options used when stream copying a snippet from the given input."""
+    return [
+        "-c", "copy",       # Copy the codec to avoid re-encoding for non-MKV files
+        "-map", str(input_index),  # Include all streams from input
+        "-avoid_negative_ts", "1", # Handle potential timestamp issues
+    ]
+
+
+def run_snippet_ffmpeg(input_video_path, output_video_path, start_time_str, duration, transcode=None,
+                       encoding_profile="default"):
+    """
+    Run FFmpeg to cut a single snippet from a video.
+
+    For MKV/MOV inputs and MP4/MOV outputs the snippet is transcoded with H.264 video and AAC
+    audio. Otherwise the streams are copied, falling back to transcoding if copying fails.
+
+    Args:
+        input_video_path: Path to the input video file
+        output_video_path: Path to save the output video snippet
+        start_time_str: Start position for ffmpeg's -ss option (seconds or HH:MM:SS.mmm)
+        duration: Duration of the snippet in seconds
+        transcode: True to always transcode, False to always try stream copying first,
+                   or None to decide from the file extensions
+        encoding_profile: Name of the ENCODING_PROFILES entry used when transcoding
+
+    Returns:
+        Tuple of (success, error_message)
+    """
+    # Normalize file paths for Windows
+    input_video_path = os.path.normpath(input_video_path)
+    output_video_path = os.path.normpath(output_video_path)
+
+    # Check if ffmpeg is available (resolved once per process)
+    if find_tool("ffmpeg") is None:
+        error_msg = "Error: ffmpeg not found. Please ensure ffmpeg is installed and in your system PATH."
+        print(error_msg)
+        return False, error_msg
+
+    # Check if the input file exists
+    if not os.path.exists(input_video_path):
+        error_msg = f"Error: Input file not found: {input_video_path}"
+        print(error_msg)
+        return False, error_msg
+
+    # Check if the output directory exists
+    output_dir = os.path.dirname(output_video_path)
+    if output_dir and not os.path.exists(output_dir):
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+        except OSError as ose:
+            error_msg = f"Error creating output directory: {ose}"
+            print(error_msg)
+            return False, error_msg
+
+    # For better accuracy, use the -ss option before -i for seeking
+    # This is more accurate for frame-accurate seeking
+    # Use ffmpeg to extract the snippet
+    # For MKV/MOV files or when output is MP4, we'll use transcoding to ensure compatibility
+    if transcode is None:
+        transcode = snippet_needs_transcoding(input_video_path, output_video_path)
+    command = [
+        get_tool_path("ffmpeg"),
+        "-ss", start_time_str,  # Put -ss before -i for more accurate seeking
+        "-i", input_video_path,
+        "-t", str(duration),
+        *(get_transcode_args(encoding_profile) if transcode else get_copy_args()),
+        "-y",               # Overwrite output file if it exists
+        output_video_path
+    ]
+
+    print(f"Executing command: {' '.join(command)}")
+    encode_start = time.perf_counter()
+    with span("ffmpeg.run", transcode=transcode):
+        result = subprocess.run(command, capture_output=True, text=True)
+    if transcode and result.returncode == 0:
+        record_encode_stats(
+            encoding_profile, parse_encoded_frame_count(result.stderr), time.perf_counter() - encode_start
+        )
+
+    if result.returncode != 0:
+        error_msg = f"Error extracting video snippet: {result.stderr}"
+        print(error_msg)
+        # If the first attempt failed and we tried to copy streams, try again with transcoding
+        if not transcode:
+            print("Attempting to extract with transcoding instead of stream copying...")
+            transcode_command = [
+                get_tool_path("ffmpeg"),
+                "-ss", start_time_str,  # Put -ss before -i for more accurate seeking
+                "-i", input_video_path,
+                "-t", str(duration),
+                *get_transcode_args(encoding_profile),
+                "-y",               # Overwrite output file if it exists
+                output_video_path
+            ]
+            print(f"Executing command: {' '.join(transcode_command)}")
+            encode_start = time.perf_counter()
+            with span("ffmpeg.run", transcode=True):
+                result = subprocess.run(transcode_command, capture_output=True, text=True)
+            if result.returncode == 0:
+                record_encode_stats(
+                    encoding_profile, parse_encoded_frame_count(result.stderr), time.perf_counter() - encode_start
+                )
+
+            if result.returncode != 0:
+                error_msg = f"Error extracting video snippet with transcoding: {result.stderr}"
+                print(error_msg)
+                return False, error_msg
+            else:
+                print(f"Successfully extracted video snippet with transcoding to {output_video_path}")
+                return True, None
+        return False, error_msg
+
+    print(f"Successfully extracted video snippet to {output_video_path}")
+    return True, None
+
+
+def run_ffmpeg_command(command):
+    """Print and run an ffmpeg/ffprobe command, returning the completed process."""
+    print(f"Executing command: {' '.join(command)}")
+    with span(f"{os.path.basename(command[0]).split('.')[0]}.run"):
+        return subprocess.run(command, capture_output=True, text=True)
+
+
+def ffmpeg_time_to_seconds(time_str) -> float:
+    """Convert an ffmpeg time string (seconds or [HH:]MM:SS.mmm) to seconds."""
+    seconds = 0.0
+    for part in str(time_str).split(':'):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def _parse_frame_rate(rate_str, default=30.0) -> float:
+    """Parse an ffprobe frame rate such as '25/1' or '30000/1001'."""
+    try:
+        rate = float(fractions.Fraction(rate_str))
+    except (TypeError, ValueError, ZeroDivisionError):
+        return default
+    return rate if rate > 0 else default
+
+
+@traced("ffprobe.stream_info")
+def get_video_stream_info(path) -> dict:
+    """
+    Get the codec details of the first video stream using ffprobe.
+
+    Args:
+        path: Path to the video file
+
+    Returns:
+        Dict with codec_name, pix_fmt, width, height, r_frame_rate, avg_frame_rate, nb_frames,
+        duration and the container start_time
+    """
+    result = subprocess.run([
+        get_tool_path("ffprobe"),
+        "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries",
+        "stream=codec_name,pix_fmt,width,height,r_frame_rate,avg_frame_rate,nb_frames,duration:format=start_time",
+        "-print_format", "json",
+        path,
+    ], capture_output=True, text=True, check=True)
+    data = json.loads(result.stdout)
+    streams = data.get("streams", [])
+    info = dict(streams[0]) if streams else {}
+    info["start_time"] = data.get("format", {}).get("start_time")
+    return info
+
+
+@traced("ffprobe.keyframes")
+def get_keyframe_times(path, start=None, end=None) -> list:
+    """
+    List the presentation times of the keyframes in the first video stream.
+
+    Only packet headers are read with ffprobe, so no frames are decoded.
+
+    Args:
+        path: Path to the video file
+        start: Optional start of the range to list, in seconds of stream time
+        end: Optional end of the range to list, in seconds of stream time
+
+    Returns:
+        Sorted list of keyframe times in seconds of stream time
+    """
+    command = [
+        get_tool_path("ffprobe"),
+        "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags",
+        "-print_format", "csv=p=0",
+    ]
+    if start is not None or end is not None:
+        # ffprobe starts reading at the keyframe before start, so that keyframe is listed too
+        command += ["-read_intervals", f"{'' if start is None else start}%{'' if end is None else end}"]
+    command.append(path)
+
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    keyframes = []
+    for line in result.stdout.splitlines():
+        pts_time, _, flags = line.partition(',')
+        if 'K' in flags and pts_time not in ('', 'N/A'):
+            keyframes.append(float(pts_time))
+    return sorted(keyframes)
+
+
+def get_snippet_audio_args(output_video_path):
+    """Return the audio options for cutting audio straight from the source into an output container."""
+    output_ext = os.path.splitext(output_video_path)[1].lower()
+    if output_ext in ('.mp4', '.mov'):
+        return ["-c:a", "aac", "-b:a", "192k", "-movflags", "+faststart"]
+    return ["-c:a", "copy"]
+
+
+def concat_video_segments(segment_paths, input_video_path, output_video_path, start_position, duration, work_dir):
+    """
+    Join video segments losslessly with the concat demuxer and add the source audio.
+
+    Args:
+        segment_paths: Ordered list of video-only segment files with matching codec parameters
+        input_video_path: Source video the audio is cut from
+        output_video_path: Path to save the joined video
+        start_position: Start of the snippet in the source, in seconds
+        duration: Duration of the snippet in seconds
+        work_dir: Directory for the concat list file
+
+    Returns:
+        Tuple of (success, error_message)
+    """
+    list_path = os.path.join(work_dir, "segments.txt")
+    with open(list_path, "w") as f:
+        for segment_path in segment_paths:
+            # The concat demuxer needs single quotes escaped
+            escaped = segment_path.replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+    command = [
+        get_tool_path("ffmpeg"),
+        "-f", "concat",
+        "-safe", "0",
+        "-i", list_path,
+        "-ss", f"{start_position}",
+        "-t", f"{duration}",
+        "-i", input_video_path,
+        "-map", "0:v:0",
+        "-map", "1:a?",     # Audio is optional
+        "-c:v", "copy",
+        *get_snippet_audio_args(output_video_path),
+        "-avoid_negative_ts", "1",
+        "-y",
+        output_video_path,
+    ]
+    result = run_ffmpeg_command(command)
+    if result.returncode != 0:
+        error_msg = f"Error joining video segments: {result.stderr}"
+        print(error_msg)
+        return False, error_msg
+    return True, None
+
+
+def plan_smart_render_pieces(start_position, end_position, keyframes, fps):
+    """
+    Split a snippet into re-encoded boundary pieces and a stream-copied middle.
+
+    Re-encoded pieces seek half a frame early so their first frame is kept; the copied piece
+    seeks half a frame late so it lands on its own keyframe rather than the one before.
+
+    Args:
+        start_position: Start of the snippet in seconds
+        end_position: End of the snippet in seconds
+        keyframes: Keyframe times in seconds
+        fps: Frame rate of the video
+
+    Returns:
+        List of (seek_position, frame_count, copy) tuples in order, or None if the range
+        does not contain a complete GOP
+    """
+    # Half a frame of tolerance so keyframes on the boundaries count as inside the range
+    tolerance = 0.5 / fps
+    inner_keyframes = [k for k in keyframes if start_position - tolerance <= k <= end_position + tolerance]
+    if len(inner_keyframes) < 2:
+        return None
+
+    copy_start, copy_end = inner_keyframes[0], inner_keyframes[-1]
+    pieces = []
+    head_frames = int(round((copy_start - start_position) * fps))
+    if head_frames > 0:
+        pieces.append((max(start_position - tolerance, 0.0), head_frames, False))
+    pieces.append((copy_start + tolerance, int(round((copy_end - copy_start) * fps)), True))
+    tail_frames = int(round((end_position - copy_end) * fps))
+    if tail_frames > 0:
+        pieces.append((copy_end - tolerance, tail_frames, False))
+    return pieces
+
+
+@traced()
+def extract_video_snippet_smart(input_video_path, output_video_path, start_position, duration,
+                                encoding_profile="default"):
+    """
+    Extract a frame-accurate snippet by re-encoding only the partial GOPs at its boundaries.
+
+    The snippet is split at the first and last keyframes inside the range. The complete GOPs
+    between them are stream copied, while the partial GOPs before the first keyframe and after
+    the last keyframe are re-encoded with an encoder matching the source codec. The pieces are
+    written as MPEG-TS, which keeps the codec parameter sets in-band, joined with the concat
+    demuxer, and the audio is cut from the source in the same final pass.
+
+    Falls back to a full transcode when the source codec has no matching encoder or the range
+    does not contain a complete GOP.
+
+    The boundary pieces must match the source, so only the thread count of the encoding
+    profile is used for them; the full profile applies to the transcode fallback.
+
+    Args:
+        input_video_path: Path to the input video file
+        output_video_path: Path to save the output video snippet
+        start_position: Start of the snippet in seconds from the start of the video
+        duration: Duration of the snippet in seconds
+        encoding_profile: Name of the ENCODING_PROFILES entry
+
+    Returns:
+        Tuple of (success, error_message)
+    """
+    input_video_path = os.path.normpath(input_video_path)
+    output_video_path = os.path.normpath(output_video_path)
+    end_position = start_position + duration
+
+    try:
+        info = get_video_stream_info(input_video_path)
+        stream_start = float(info.get("start_time") or 0)
+        keyframes = [
+            keyframe - stream_start
+            for keyframe in get_keyframe_times(
+                input_video_path, stream_start + start_position, stream_start + end_position
+            )
+        ]
+    except FileNotFoundError:
+        error_msg = "Error: ffprobe not found. Please ensure ffmpeg is installed and in your system PATH."
+        print(error_msg)
+        return False, error_msg
+    except (subprocess.SubprocessError, ValueError) as e:
+        error_msg = f"Error reading keyframes: {e}"
+        print(error_msg)
+        return False, error_msg
+
+    encoder = SMART_RENDER_ENCODERS.get(info.get("codec_name"))
+    if encoder is not None and not ffmpeg_supports("encoders", encoder[0]):
+        encoder = None
+    if encoder is None:
+        print(f"Smart render is not supported for codec {info.get('codec_name')}; transcoding the whole snippet")
+        return run_snippet_ffmpeg(input_video_path, output_video_path, f"{start_position}", duration,
+                                  transcode=True, encoding_profile=encoding_profile)
+
+    fps = _parse_frame_rate(info.get("r_frame_rate"))
+    pieces = plan_smart_render_pieces(start_position, end_position, keyframes, fps)
+    if pieces is None:
+        print("Snippet does not contain a complete GOP; transcoding the whole snippet")
+        return run_snippet_ffmpeg(input_video_path, output_video_path, f"{start_position}", duration,
+                                  transcode=True, encoding_profile=encoding_profile)
+
+    encoder_name, quality_args = encoder
+    encode_args = ["-c:v", encoder_name, *quality_args]
+    if info.get("pix_fmt"):
+        encode_args += ["-pix_fmt", info["pix_fmt"]]
+    encode_args += ["-threads", str(get_profile_threads(encoding_profile))]
+
+    encoded_frames = sum(frame_count for _, frame_count, copy in pieces if not copy)
+    copied_frames = sum(frame_count for _, frame_count, copy in pieces if copy)
+    print(f"Smart render: re-encoding {encoded_frames} boundary frames, copying {copied_frames} frames")
+
+    output_dir = os.path.dirname(output_video_path) or None
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix="vidmeta_smart_", dir=output_dir) as work_dir:
+        segment_paths = []
+        for i, (seek_position, frame_count, copy) in enumerate(pieces):
+            segment_path = os.path.join(work_dir, f"piece_{i}.ts")
+            command = [
+                get_tool_path("ffmpeg"),
+                "-ss", f"{seek_position}",
+                "-i", input_video_path,
+                "-map", "0:v:0",
+                "-frames:v", str(frame_count),
+                *(["-c:v", "copy"] if copy else encode_args),
+                "-f", "mpegts",
+                "-y",
+                segment_path,
+            ]
+            result = run_ffmpeg_command(command)
+            if result.returncode != 0:
+                error_msg = f"Error writing smart render piece {i}: {result.stderr}"
+                print(error_msg)
+                return False, error_msg
+            segment_paths.append(segment_path)
+
+        success, error_msg = concat_video_segments(
+            segment_paths, input_video_path, output_video_path, start_position, duration, work_dir
+        )
+
+    if success:
+        print(f"Successfully extracted video snippet with smart render to {output_video_path}")
+    return success, error_msg
+
+
+def plan_transcode_segments(start_position, end_position, keyframes, fps, segment_count):
+    """
+    Split a snippet at keyframes into chunks of roughly equal length for parallel transcoding.
+
+    Chunks start on keyframes (except the first, which starts at the snippet start) so each
+    encoder only decodes from its own keyframe. Seeks are half a frame early so the first
+    frame of each chunk is kept.
+
+    Args:
+        start_position: Start of the snippet in seconds
+        end_position: End of the snippet in seconds
+        keyframes: Keyframe times in seconds
+        fps: Frame rate of the video
+        segment_count: Maximum number of chunks
+
+    Returns:
+        List of (seek_position, frame_count) tuples in order
+    """
+    tolerance = 0.5 / fps
+    frame_duration = 1.0 / fps
+    boundaries = [start_position]
+    candidates = [k for k in keyframes if start_position + frame_duration <= k <= end_position - frame_duration]
+    for i in range(1, segment_count):
+        ideal = start_position + i * (end_position - start_position) / segment_count
+        usable = [k for k in candidates if k > boundaries[-1] + tolerance]
+        if not usable:
+            break
+        boundaries.append(min(usable, key=lambda k: abs(k - ideal)))
+    boundaries.append(end_position)
+
+    segments = []
+    for segment_start, segment_end in zip(boundaries, boundaries[1:]):
+        frame_count = int(round((segment_end - segment_start) * fps))
+        if frame_count > 0:
+            segments.append((max(segment_start - tolerance, 0.0), frame_count))
+    return segments
+
+
+@traced("ffprobe.packets")
+def probe_video_packets(path):
+    """
+    List the presentation times of all video packets in a file using ffprobe.
+
+    Args:
+        path: Path to the video file
+
+    Returns:
+        Sorted list of packet times in seconds
+    """
+    result = subprocess.run([
+        get_tool_path("ffprobe"),
+        "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time",
+        "-print_format", "csv=p=0",
+        path,
+    ], capture_output=True, text=True, check=True)
+    return sorted(float(line) for line in result.stdout.split() if line not in ('', 'N/A'))
+
+
+def check_frame_continuity(packet_times, expected_frames, fps):
+    """
+    Check that a video has the expected number of frames and no gaps in its timeline.
+
+    Args:
+        packet_times: Sorted video packet times in seconds
+        expected_frames: Number of frames the video should contain
+        fps: Frame rate of the video
+
+    Returns:
+        Error message, or None if the video is continuous
+    """
+    if len(packet_times) != expected_frames:
+        return f"expected {expected_frames} frames, found {len(packet_times)}"
+    if not packet_times:
+        return None
+
+    frame_duration = 1.0 / fps
+    for previous, current in zip(packet_times, packet_times[1:]):
+        if current - previous > 1.5 * frame_duration:
+            return f"gap of {current - previous:.3f}s at {previous:.3f}s"
+
+    duration = packet_times[-1] - packet_times[0] + frame_duration
+    expected_duration = expected_frames * frame_duration
+    if abs(duration - expected_duration) > frame_duration:
+        return f"expected duration {expected_duration:.3f}s, found {duration:.3f}s"
+    return None
+
+
+@traced()
+def extract_video_snippet_segmented(input_video_path, output_video_path, start_position, duration,
+                                    encoding_profile="default", segment_count=None, threads_per_segment=2,
+                                    min_segment_seconds=10.0):
+    """
+    Transcode a snippet as several chunks in parallel and join them losslessly.
+
+    The range is split at keyframes into chunks that are encoded by separate ffmpeg processes
+    at the same time, each limited to threads_per_segment threads. The chunks are joined with
+    the concat demuxer, the audio is cut from the source in the same pass, and the result is
+    checked for the expected frame count and a continuous timeline.
+
+    Args:
+        input_video_path: Path to the input video file
+        output_video_path: Path to save the output video snippet
+        start_position: Start of the snippet in seconds from the start of the video
+        duration: Duration of the snippet in seconds
+        encoding_profile: Name of the ENCODING_PROFILES entry; its thread count is replaced
+                          by threads_per_segment
+        segment_count: Number of chunks (default: one per threads_per_segment CPU cores)
+        threads_per_segment: Encoder threads for each chunk
+        min_segment_seconds: Minimum chunk length; shorter snippets use fewer chunks
+
+    Returns:
+        Tuple of (success, error_message)
+    """
+    input_video_path = os.path.normpath(input_video_path)
+    output_video_path = os.path.normpath(output_video_path)
+    end_position = start_position + duration
+
+    if segment_count is None:
+        segment_count = max(1, (os.cpu_count() or 1) // threads_per_segment)
+    segment_count = max(1, min(segment_count, int(duration // min_segment_seconds)))
+    if segment_count == 1:
+        print("Snippet is too short to split; transcoding it in one piece")
+        return run_snippet_ffmpeg(input_video_path, output_video_path, f"{start_position}", duration,
+                                  transcode=True, encoding_profile=encoding_profile)
+
+    try:
+        info = get_video_stream_info(input_video_path)
+        stream_start = float(info.get("start_time") or 0)
+        keyframes = [
+            keyframe - stream_start
+            for keyframe in get_keyframe_times(
+                input_video_path, stream_start + start_position, stream_start + end_position
+            )
+        ]
+    except FileNotFoundError:
+        error_msg = "Error: ffprobe not found. Please ensure ffmpeg is installed and in your system PATH."
+        print(error_msg)
+        return False, error_msg
+    except (subprocess.SubprocessError, ValueError) as e:
+        error_msg = f"Error reading keyframes: {e}"
+        print(error_msg)
+        return False, error_msg
+
+    fps = _parse_frame_rate(info.get("r_frame_rate"))
+    segments = plan_transcode_segments(start_position, end_position, keyframes, fps, segment_count)
+    print(f"Segmented transcode: {len(segments)} chunks with {threads_per_segment} threads each")
+
+    output_dir = os.path.dirname(output_video_path) or None
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix="vidmeta_segments_", dir=output_dir) as work_dir:
+        def encode_segment(i, seek_position, frame_count):
+            segment_path = os.path.join(work_dir, f"segment_{i}.ts")
+            command = [
+                get_tool_path("ffmpeg"),
+                "-threads", str(threads_per_segment),  # Decoder threads
+                "-ss", f"{seek_position}",
+                "-i", input_video_path,
+                "-map", "0:v:0",
+                "-frames:v", str(frame_count),
+                *get_transcode_video_args(encoding_profile, threads=threads_per_segment),
+                "-f", "mpegts",
+                "-y",
+                segment_path,
+            ]
+            return segment_path, run_ffmpeg_command(command)
+
+        # Each chunk is its own ffmpeg process; the pool threads only wait for them
+        encode_start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(segments)) as pool:
+            futures = [
+                pool.submit(encode_segment, i, seek_position, frame_count)
+                for i, (seek_position, frame_count) in enumerate(segments)
+            ]
+            results = [future.result() for future in futures]
+        encode_seconds = time.perf_counter() - encode_start
+
+        for i, (_, result) in enumerate(results):
+            if result.returncode != 0:
+                error_msg = f"Error transcoding chunk {i}: {result.stderr}"
+                print(error_msg)
+                return False, error_msg
+
+        success, error_msg = concat_video_segments(
+            [segment_path for segment_path, _ in results],
+            input_video_path, output_video_path, start_position, duration, work_dir
+        )
+    if not success:
+        return False, error_msg
+
+    expected_frames = sum(frame_count for _, frame_count in segments)
+    try:
+        problem = check_frame_continuity(probe_video_packets(output_video_path), expected_frames, fps)
+    except (OSError, subprocess.SubprocessError, ValueError) as e:
+        problem = f"could not verify output: {e}"
+    if problem:
+        error_msg = f"Error: Joined snippet failed verification: {problem}"
+        print(error_msg)
+        return False, error_msg
+
+    record_encode_stats(encoding_profile, expected_frames, encode_seconds)
+    print(f"Successfully extracted video snippet with segmented transcoding to {output_video_path}")
+    return True, None
+
 
-            timestamp = extract_timestamp_from_frame(frame, roi_x, roi_y, roi_width, roi_height)
+# Cut modes that cut each snippet in its own set of ffmpeg runs, by function
+SEPARATE_PASS_CUT_MODES = {
+    "smart": extract_video_snippet_smart,
+    "segmented": extract_video_snippet_segmented,
+}
 
-            if timestamp:
-                diff = abs((timestamp - target_end_time).total_seconds())
-                if diff < best_end_diff:
-                    best_end_diff = diff
-                    best_end_pos = frame_num / fps
-                    best_end_frame = frame_num
-                    print(f"Better end match: {timestamp} at frame {frame_num}, diff: {diff:.3f}s")
 
-        end_position = best_end_pos
-        end_frame = best_end_frame
+def resolve_snippet_boundaries(input_video_path, targets, time_window=1.0):
+    """
+    Resolve the start and end positions of many snippets in one extended video.
 
-    cap.release()
+    The timestamp index is loaded (or built) once and a single capture is shared by all
+    refinement reads, which are done in order of position through the file.
 
-    # If we couldn't find both timestamps, return failure
-    if start_position is None or end_position is None:
-        print("Could not find matching timestamps in the video")
-        return 0, 0, False
+    Args:
+        input_video_path: Path to the extended video file
+        targets: List of (start_time, end_time, output_path) tuples
+        time_window: Maximum allowed difference in seconds between a target and the matched frame
 
-    # Ensure start position is before end position
-    if start_position >= end_position:
-        print(f"Warning: Found start position ({start_position:.3f}s) is after or equal to end position ({end_position:.3f}s)")
-        print("This may indicate an issue with timestamp extraction or matching")
+    Returns:
+        List with a (start_position, end_position) tuple in seconds for each target,
+        or None for targets that could not be resolved
+    """
+    boundaries = [None] * len(targets)
+
+    index = get_timestamp_index(input_video_path)
+    if index is None:
+        return boundaries
+
+    source = open_frame_source(input_video_path, access="random")
+    if source is None:
+        return boundaries
+
+    fps = index["fps"]
+    for i in sorted(range(len(targets)), key=lambda i: targets[i][0]):
+        start_time, end_time, output_path = targets[i]
+        positions = []
+        for target_time in (start_time, end_time):
+            estimate = estimate_frame_for_time(index, target_time)
+            if estimate is None:
+                break
+            frame_num, diff = refine_frame_for_time(source, index, target_time, estimate)
+            if frame_num is None or diff > time_window:
+                break
+            positions.append(frame_num / fps)
 
-        # If the positions are very close or reversed, try to adjust them
-        if abs(end_position - start_position) < 1.0:  # Less than 1 second difference
-            print("Positions are very close, adding a minimum duration")
-            end_position = start_position + 5.0  # Add 5 seconds minimum duration
-        elif start_position > end_position:
-            print("Swapping start and end positions")
-            start_position, end_position = end_position, start_position
+        if len(positions) == 2 and positions[0] < positions[1]:
+            boundaries[i] = (positions[0], positions[1])
+            print(f"Resolved {output_path}: start={positions[0]:.3f}s, end={positions[1]:.3f}s")
+        else:
+            print(f"Could not resolve {output_path} from the timestamp index")
 
-    print(f"Final start position: {start_position:.3f}s")
-    print(f"Final end position: {end_position:.3f}s")
-    print(f"Snippet duration: {end_position - start_position:.3f}s")
+    source.close()
+    return boundaries
 
-    return start_position, end_position, True
 
-def extract_video_snippet(input_video_path, output_video_path, start_time, end_time, reference_time=None):
+def build_multi_snippet_command(input_video_path, snippets, transcode=None, encoding_profile="default"):
     """
-    Extract a snippet from a video using start and end timestamps.
+    Build a single ffmpeg command that writes several snippets from one input.
 
-    This function uses FFmpeg to extract a portion of a video file based on the provided
-    timestamps. For MKV files, it uses transcoding with H.264 video and AAC audio codecs.
-    For other file types, it first attempts to copy the streams directly, and if that fails,
-    it falls back to transcoding.
+    The input is seeked once to the earliest start and each transcoded output selects its own
+    range relative to that point, so the input is read in a single forward pass. Stream copied
+    outputs cannot be cut that way: copying keeps whole GOPs, so everything before the next
+    keyframe would be dropped. Each of them gets its own input seeked to its start instead,
+    which starts at the preceding keyframe as run_snippet_ffmpeg does.
 
     Args:
         input_video_path: Path to the input video file
-        output_video_path: Path to save the output video snippet
-        start_time: Start timestamp as datetime object
-        end_time: End timestamp as datetime object
-        reference_time: Reference timestamp from the extended video (optional)
-                       If provided, it will be used to calculate the offset
+        snippets: List of (start_position, end_position, output_path) tuples sorted by start
+        transcode: True to transcode every output, False to stream copy, or None to decide
+                   from the file extensions of each output
+        encoding_profile: Name of the ENCODING_PROFILES entry used for transcoded outputs
 
     Returns:
-        Tuple of (success, error_message) where success is a boolean indicating if the operation
-        was successful, and error_message is a string containing any error details (or None if successful)
+        The ffmpeg command as a list of arguments
     """
-    try:
-        # Verify that end_time is after start_time
-        if end_time <= start_time:
-            error_msg = "Error: End time must be after start time"
-            print(error_msg)
-            return False, error_msg
+    pass_start = snippets[0][0]
+    inputs = [
+        "-ss", f"{pass_start}",  # Seek once to the earliest snippet
+        "-i", input_video_path,
+    ]
+    outputs = []
+    for start_position, end_position, output_path in snippets:
+        output_transcode = transcode
+        if output_transcode is None:
+            output_transcode = snippet_needs_transcoding(input_video_path, output_path)
+        if output_transcode:
+            outputs += [
+                "-ss", f"{start_position - pass_start}",  # Offset from the seek point
+                "-t", f"{end_position - start_position}",
+                *get_transcode_args(encoding_profile),
+                output_path,
+            ]
+            continue
+        input_index = 0
+        if start_position != pass_start:
+            input_index = inputs.count("-i")
+            inputs += ["-ss", f"{start_position}", "-i", input_video_path]
+        outputs += [
+            "-t", f"{end_position - start_position}",
+            *get_copy_args(input_index),
+            output_path,
+        ]
+    return [
+        get_tool_path("ffmpeg"),
+        "-y",               # Overwrite output files if they exist
+        *inputs,
+        *outputs,
+    ]
 
-        # Calculate the duration of the snippet
-        duration = (end_time - start_time).total_seconds()
 
-        # Search for matching timestamps in the extended video
-        start_position, end_position, timestamps_found = find_matching_timestamps_in_video(
-            input_video_path, start_time, end_time
-        )
+@traced()
+def extract_video_snippets(input_video_path, targets, max_outputs_per_pass=16, cut_mode="auto",
+                           encoding_profile="default"):
+    """
+    Extract many snippets from one extended video.
 
-        if timestamps_found:
-            # Use the found positions
-            start_time_str = f"{start_position}"
-            duration = end_position - start_position
-            print(f"Using found positions: start={start_time_str}, duration={duration}")
-        else:
-            # Fall back to the previous method
-            print("Falling back to reference time method")
-            # If reference_time is provided, calculate the offset from the start of the video
-            if reference_time:
-                # Get the creation time of the input video
-                cap = cv2.VideoCapture(input_video_path)
-                if not cap.isOpened():
-                    error_msg = f"Error: Could not open input video: {input_video_path}"
-                    print(error_msg)
-                    return False, error_msg
+    Boundaries for all targets are resolved from one shared timestamp index. The snippets are
+    then written by a single ffmpeg invocation with one output per snippet (split into passes
+    of at most max_outputs_per_pass outputs to bound the command line and encoder count).
+    If a pass fails, its snippets are cut one at a time in order of position instead.
+    Targets the index cannot resolve fall back to extract_video_snippet. In "smart" and
+    "segmented" cut modes each snippet is cut separately, since its pieces cannot share one
+    invocation.
 
-                # Get the first frame to extract timestamp
-                ret, first_frame = cap.read()
-                if not ret:
-                    error_msg = "Error: Could not read the first frame of the input video"
-                    print(error_msg)
-                    cap.release()
-                    return False, error_msg
+    Args:
+        input_video_path: Path to the extended video file
+        targets: List of (start_time, end_time, output_path) tuples with datetime start and end times
+        max_outputs_per_pass: Maximum number of outputs written by one ffmpeg invocation
+        cut_mode: One of CUT_MODES ("auto", "copy", "transcode", "smart" or "segmented")
+        encoding_profile: Name of the ENCODING_PROFILES entry used when transcoding
 
-                # Get dimensions
-                width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    Returns:
+        List of (output_path, success, error_message) tuples in the same order as targets
+    """
+    results = [None] * len(targets)
 
-                # Calculate ROI for timestamp extraction
-                roi_width = int(width * 0.4)
-                roi_height = int(height * 0.2)
-                roi_x = width - roi_width
-                roi_y = 0
+    if cut_mode not in CUT_MODES:
+        error_msg = f"Error: Unknown cut mode '{cut_mode}'. Expected one of: {', '.join(CUT_MODES)}"
+        print(error_msg)
+        return [(output_path, False, error_msg) for _, _, output_path in targets]
+    if encoding_profile not in ENCODING_PROFILES:
+        error_msg = (f"Error: Unknown encoding profile '{encoding_profile}'. "
+                     f"Expected one of: {', '.join(ENCODING_PROFILES)}")
+        print(error_msg)
+        return [(output_path, False, error_msg) for _, _, output_path in targets]
 
-                # Extract timestamp from the first frame
-                extended_timestamp = extract_timestamp_from_frame(first_frame, roi_x, roi_y, roi_width, roi_height)
-                cap.release()
+    # Check if ffmpeg is available (resolved once per process)
+    if find_tool("ffmpeg") is None:
+        error_msg = "Error: ffmpeg not found. Please ensure ffmpeg is installed and in your system PATH."
+        print(error_msg)
+        return [(output_path, False, error_msg) for _, _, output_path in targets]
 
-                if extended_timestamp:
-                    print(f"Extended video timestamp: {extended_timestamp}")
-                    print(f"Start timestamp: {start_time}")
+    input_video_path = os.path.normpath(input_video_path)
+    if not os.path.exists(input_video_path):
+        error_msg = f"Error: Input file not found: {input_video_path}"
+        print(error_msg)
+        return [(output_path, False, error_msg) for _, _, output_path in targets]
 
-                    # Calculate time offset between the timestamps
-                    time_offset = (start_time - extended_timestamp).total_seconds()
-                    print(f"Time offset: {time_offset} seconds")
+    for i, (start_time, end_time, output_path) in enumerate(targets):
+        if end_time <= start_time:
+            results[i] = (output_path, False, "Error: End time must be after start time")
+
+    pending = [i for i in range(len(targets)) if results[i] is None]
+    boundaries = resolve_snippet_boundaries(input_video_path, [targets[i] for i in pending])
+
+    resolved = []
+    for i, bounds in zip(pending, boundaries):
+        start_time, end_time, output_path = targets[i]
+        if bounds is None:
+            # Fall back to a separate search for this snippet
+            success, error_msg = extract_video_snippet(
+                input_video_path, output_path, start_time, end_time,
+                cut_mode=cut_mode, encoding_profile=encoding_profile
+            )
+            results[i] = (output_path, success, error_msg)
+            continue
+        output_path = os.path.normpath(output_path)
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        resolved.append((bounds[0], bounds[1], output_path, i))
+
+    resolved.sort()
+    if cut_mode in SEPARATE_PASS_CUT_MODES:
+        for start_position, end_position, output_path, i in resolved:
+            success, error_msg = SEPARATE_PASS_CUT_MODES[cut_mode](
+                input_video_path, output_path, start_position, end_position - start_position,
+                encoding_profile=encoding_profile
+            )
+            results[i] = (output_path, success, error_msg)
+        return results
+
+    transcode = CUT_MODE_TRANSCODE[cut_mode]
+    fps = None
+    for pass_start in range(0, len(resolved), max_outputs_per_pass):
+        batch = resolved[pass_start:pass_start + max_outputs_per_pass]
+        command = build_multi_snippet_command(
+            input_video_path, [(s, e, o) for s, e, o, _ in batch],
+            transcode=transcode, encoding_profile=encoding_profile
+        )
 
-                    # If time_offset is negative, we need to start from the beginning of the video
-                    if time_offset < 0:
-                        # Use the absolute offset as the start position
-                        start_time_str = f"{abs(time_offset)}"
-                    else:
-                        # Start from the specified offset
-                        start_time_str = f"{time_offset}"
+        print(f"Executing command: {' '.join(command)}")
+        encode_start = time.perf_counter()
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode == 0:
+            transcoded = [
+                (s, e) for s, e, o, _ in batch
+                if (transcode if transcode is not None else snippet_needs_transcoding(input_video_path, o))
+            ]
+            encode_seconds = time.perf_counter() - encode_start
+            if transcoded and fps is None:
+                # Only the frame rate is needed, so do not load (or rebuild) the timestamp index
+                source = open_frame_source(input_video_path, access="random")
+                if source is not None:
+                    with source:
+                        fps = source.fps
+            if transcoded and fps:
+                # ffmpeg only reports progress for the first output, so estimate from the durations
+                record_encode_stats(
+                    encoding_profile, int(round(sum(e - s for s, e in transcoded) * fps)), encode_seconds
+                )
+            for _, _, output_path, i in batch:
+                print(f"Successfully extracted video snippet to {output_path}")
+                results[i] = (output_path, True, None)
+            continue
+
+        print(f"Error extracting snippets in a single pass: {result.stderr}")
+        print("Cutting the snippets one at a time instead...")
+        for start_position, end_position, output_path, i in batch:
+            success, error_msg = run_snippet_ffmpeg(
+                input_video_path, output_path, f"{start_position}", end_position - start_position,
+                transcode=transcode, encoding_profile=encoding_profile
+            )
+            results[i] = (output_path, success, error_msg)
 
-                    print(f"Using start position: {start_time_str} seconds")
-                else:
-                    print("Could not extract timestamp from extended video. Using start_time directly.")
-                    # Format the start time for ffmpeg (HH:MM:SS.mmm)
-                    start_time_str = start_time.strftime("%H:%M:%S.") + f"{start_time.microsecond // 1000:03d}"
-            else:
-                # Format the start time for ffmpeg (HH:MM:SS.mmm)
-                start_time_str = start_time.strftime("%H:%M:%S.") + f"{start_time.microsecond // 1000:03d}"
+    return results
 
-        # Normalize file paths for Windows
-        input_video_path = os.path.normpath(input_video_path)
-        output_video_path = os.path.normpath(output_video_path)
 
-        # Check if ffmpeg is available
-        try:
-            subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True, check=True)
-        except FileNotFoundError:
-            error_msg = "Error: ffmpeg not found. Please ensure ffmpeg is installed and in your system PATH."
-            print(error_msg)
-            return False, error_msg
-        except subprocess.SubprocessError as se:
-            error_msg = f"Error checking ffmpeg: {se}"
-            print(error_msg)
-            return False, error_msg
+def collect_snippet_targets(directory, extended_video_path, filename="frame_times.txt"):
+    """
+    Collect snippet targets from all frame_times.txt files in a directory tree.
 
-        # Check if the input file exists
-        if not os.path.exists(input_video_path):
-            error_msg = f"Error: Input file not found: {input_video_path}"
-            print(error_msg)
-            return False, error_msg
+    Each snippet is saved as [extended_filename]_snippet.[extension] next to the frame_times.txt
+    file it was resolved from.
 
-        # Check if the output directory exists
-        output_dir = os.path.dirname(output_video_path)
-        if output_dir and not os.path.exists(output_dir):
-            try:
-                os.makedirs(output_dir, exist_ok=True)
-            except OSError as ose:
-                error_msg = f"Error creating output directory: {ose}"
-                print(error_msg)
-                return False, error_msg
+    Args:
+        directory: The parent directory to search in
+        extended_video_path: Path to the extended video the snippets are cut from
+        filename: Name of the timestamp files to search for
 
-        # Check if the input file is an MKV file or other format that might need special handling
-        is_mkv = input_video_path.lower().endswith('.mkv')
-        is_mov = input_video_path.lower().endswith('.mov')
-        output_ext = os.path.splitext(output_video_path)[1].lower()
+    Returns:
+        List of (start_time, end_time, output_path) tuples
+    """
+    extended_path = Path(extended_video_path)
+    targets = []
 
-        # For better accuracy, use the -ss option before -i for seeking
-        # This is more accurate for frame-accurate seeking
-        # Use ffmpeg to extract the snippet
-        # For MKV/MOV files or when output is MP4, we'll use transcoding to ensure compatibility
-        if is_mkv or is_mov or output_ext == '.mp4' or output_ext == '.mov':
-            command = [
-                "ffmpeg",
-                "-ss", start_time_str,  # Put -ss before -i for more accurate seeking
-                "-i", input_video_path,
-                "-t", str(duration),
-                "-c:v", "libx264",  # Use H.264 for video
-                "-preset", "medium", # Balance between quality and encoding speed
-                "-crf", "23",       # Constant Rate Factor (23 is default, lower is better quality)
-                "-c:a", "aac",      # Use AAC for audio
-                "-strict", "experimental",
-                "-b:a", "192k",     # Audio bitrate
-                "-pix_fmt", "yuv420p", # Widely compatible pixel format
-                "-movflags", "+faststart", # Optimize for web streaming
-                "-map", "0",        # Include all streams from input
-                "-avoid_negative_ts", "1", # Handle potential timestamp issues
-                "-y",               # Overwrite output file if it exists
-                output_video_path
-            ]
-        else:
-            command = [
-                "ffmpeg",
-                "-ss", start_time_str,  # Put -ss before -i for more accurate seeking
-                "-i", input_video_path,
-                "-t", str(duration),
-                "-c", "copy",       # Copy the codec to avoid re-encoding for non-MKV files
-                "-map", "0",        # Include all streams from input
-                "-avoid_negative_ts", "1", # Handle potential timestamp issues
-                "-y",               # Overwrite output file if it exists
-                output_video_path
-            ]
+    for root, dirs, files in os.walk(directory):
+        if filename not in files:
+            continue
+        first_timestamp, last_timestamp = read_timestamps_from_file(os.path.join(root, filename))
+        if first_timestamp is None or last_timestamp is None:
+            print(f"Skipping {root}: could not read timestamps")
+            continue
+        output_path = Path(root) / f"{extended_path.stem}_snippet{extended_path.suffix}"
+        targets.append((first_timestamp, last_timestamp, str(output_path)))
 
-        print(f"Executing command: {' '.join(command)}")
-        result = subprocess.run(command, capture_output=True, text=True)
+    return targets
 
-        if result.returncode != 0:
-            error_msg = f"Error extracting video snippet: {result.stderr}"
-            print(error_msg)
-            # If the first attempt failed and we tried to copy streams, try again with transcoding
-            if not is_mkv and not is_mov and "-c copy" in " ".join(command):
-                print("Attempting to extract with transcoding instead of stream copying...")
-                transcode_command = [
-                    "ffmpeg",
-                    "-ss", start_time_str,  # Put -ss before -i for more accurate seeking
-                    "-i", input_video_path,
-                    "-t", str(duration),
-                    "-c:v", "libx264",  # Use H.264 for video
-                    "-preset", "medium", # Balance between quality and encoding speed
-                    "-crf", "23",       # Constant Rate Factor (23 is default, lower is better quality)
-                    "-c:a", "aac",      # Use AAC for audio
-                    "-strict", "experimental",
-                    "-b:a", "192k",     # Audio bitrate
-                    "-pix_fmt", "yuv420p", # Widely compatible pixel format
-                    "-movflags", "+faststart", # Optimize for web streaming
-                    "-map", "0",        # Include all streams from input
-                    "-avoid_negative_ts", "1", # Handle potential timestamp issues
-                    "-y",               # Overwrite output file if it exists
-                    output_video_path
-                ]
-                print(f"Executing command: {' '.join(transcode_command)}")
-                result = subprocess.run(transcode_command, capture_output=True, text=True)
 
-                if result.returncode != 0:
-                    error_msg = f"Error extracting video snippet with transcoding: {result.stderr}"
-                    print(error_msg)
-                    return False, error_msg
-                else:
-                    print(f"Successfully extracted video snippet with transcoding to {output_video_path}")
-                    return True, None
-            return False, error_msg
+def parse_frame_timestamp(ts_str):
+    """
+    Parse a timestamp string as written to frame_times.txt.
 
-        print(f"Successfully extracted video snippet to {output_video_path}")
-        return True, None
+    Two layouts are written by process_video_file: the default YYYYmmdd_HHMMSS.LLL format and
+    the original overlay format (e.g. DD/MM/YYYY HHMMSS:LLL). Colons inside the time part are
+    accepted in both.
+
+    Args:
+        ts_str: Timestamp string from the Timestamp column
+
+    Returns:
+        datetime object
+
+    Raises:
+        ValueError: If the string is not in a recognized format
+        IndexError: If the string is truncated
+    """
+    ts_str = ts_str.strip()
+    if '_' in ts_str:
+        # Split into date and time parts
+        date_part, time_part = ts_str.split('_')
+
+        # Parse date (YYYYmmdd)
+        year = int(date_part[:4])
+        month = int(date_part[4:6])
+        day = int(date_part[6:8])
+    else:
+        date_part, time_part = ts_str.split()
+
+        # Parse date (DD/MM/YYYY, DD/MM/YY or with '-' separators)
+        day, month, year = (int(part) for part in re.split(r'[/.-]', date_part))
+        if year < 100:
+            year += 2000
+
+    # Parse time (HHMMSS.LLL, HH:MM:SS.LLL or HHMMSS:LLL)
+    match = re.match(r'(\d{2}):?(\d{2}):?(\d{2})(?:[.:,](\d+))?$', time_part)
+    if not match:
+        raise ValueError(f"Unrecognized time format: {time_part}")
+    hour, minute, second = (int(group) for group in match.groups()[:3])
+
+    # Convert milliseconds to microseconds correctly
+    millisecond_str = match.group(4) or "0"
+    microseconds = int(millisecond_str)
+    if len(millisecond_str) == 4:
+        # For 4-digit milliseconds, treat as 0.xxxx seconds
+        microseconds = int(millisecond_str) * 100
+    elif len(millisecond_str) > 4:
+        # For longer milliseconds, truncate to 6 digits (microseconds limit)
+        microseconds = int(millisecond_str[:6])
+    else:
+        # For 1-3 digit milliseconds, multiply by 1000 to convert to microseconds
+        microseconds = int(millisecond_str) * 1000
+
+    return datetime.datetime(
+        year, month, day,
+        hour, minute, second,
+        microseconds
+    )
 
-    except Exception as e:
-        error_msg = f"Error extracting video snippet: {e}"
-        print(error_msg)
-        return False, error_msg
 
 def read_timestamps_from_file(file_path):
     """
@@ -1646,43 +4874,10 @@ def read_timestamps_from_file(file_path):
 
             last_frame, last_timestamp_str = last_row
 
-            # Parse the timestamps (format: YYYYmmdd_HH:MM:SS.LLL)
+            # Parse the timestamps (format: YYYYmmdd_HHMMSS.LLL or the original overlay format)
             try:
-                def parse_timestamp(ts_str):
-                    # Split into date and time parts
-                    date_part, time_part = ts_str.split('_')
-
-                    # Parse date (YYYYmmdd)
-                    year = int(date_part[:4])
-                    month = int(date_part[4:6])
-                    day = int(date_part[6:8])
-
-                    # Parse time (HH:MM:SS.LLL)
-                    hour = int(time_part[:2])
-                    minute = int(time_part[3:5])
-                    second = int(time_part[6:8])
-
-                    # Convert milliseconds to microseconds correctly
-                    millisecond_str = time_part[9:]
-                    microseconds = int(millisecond_str)
-                    if len(millisecond_str) == 4:
-                        # For 4-digit milliseconds, treat as 0.xxxx seconds
-                        microseconds = int(millisecond_str) * 100
-                    elif len(millisecond_str) > 4:
-                        # For longer milliseconds, truncate to 6 digits (microseconds limit)
-                        microseconds = int(millisecond_str[:6])
-                    else:
-                        # For 1-3 digit milliseconds, multiply by 1000 to convert to microseconds
-                        microseconds = int(millisecond_str) * 1000
-
-                    return datetime.datetime(
-                        year, month, day,
-                        hour, minute, second,
-                        microseconds
-                    )
-
-                first_timestamp = parse_timestamp(first_timestamp_str)
-                last_timestamp = parse_timestamp(last_timestamp_str)
+                first_timestamp = parse_frame_timestamp(first_timestamp_str)
+                last_timestamp = parse_frame_timestamp(last_timestamp_str)
 
                 return first_timestamp, last_timestamp
 
@@ -1696,7 +4891,254 @@ def read_timestamps_from_file(file_path):
         print(f"Error reading timestamps file: {e}")
         return None, None
 
-def process_video_file(file_path, root=None, skip_extended_video=False) -> bool:
+
+@traced("process.reference")
+def read_reference_timestamp(file_path, frame_number=0) -> tuple[datetime.datetime | None, str | None]:
+    """
+    Read the timestamp overlay of a frame without showing the video.
+
+    Args:
+        file_path: Path to the video file
+        frame_number: Frame to read the overlay of
+
+    Returns:
+        Tuple of (extracted datetime object, original format string) or (None, None) if no timestamp found
+    """
+    source = open_frame_source(file_path, access="random")
+    if source is None:
+        print(f"Could not open video: {file_path}")
+        return None, None
+    with source:
+        frame = source.read(frame_number)
+    if frame is None:
+        print(f"Could not read frame {frame_number + 1} of {file_path}")
+        return None, None
+    return extract_timestamp_from_frame(frame, *calculate_timestamp_roi(frame.shape[1], frame.shape[0]))
+
+
+class FrameTimeline:
+    """
+    Timestamps of the frames of a video, computed on demand.
+
+    Frame n (counted from 1, as in frame_times.txt) is at reference_time + (n - 1) / fps, so
+    frame 1 is the frame the reference time was read from. Frames are formatted like that
+    overlay, and frame 1 shows the overlay text itself. Corrections re-anchor the clock from a frame on, e.g. after dropped frames.
+    Only the parameters and the corrections are stored, so memory does not grow with the
+    number of frames. Rows are (frame, timestamp string) tuples:
+
+        timeline = FrameTimeline(reference_time, 25.0, 90000, "13/06/2025 13:28:42:285")
+        timeline[0]                # (1, "13/06/2025 13:28:42:285")
+        timeline.frame_at(when)    # frame number nearest to a datetime
+        timeline.write_csv("frame_times.txt")
+    """
+
+    __slots__ = ("reference_time", "fps", "frame_count", "original_format", "_style", "_date_part",
+                 "_correction_frames", "_correction_offsets_us")
+
+    BINARY_MAGIC = b"VMFT"
+    # Version 1 stored the time of frame 0, one interval before the first frame
+    BINARY_VERSION = 2
+    _HEADER = struct.Struct("<4sHdqI")
+
+    def __init__(self, reference_time, fps, frame_count, original_format=None, corrections=()):
+        """
+        Args:
+            reference_time: Time of frame 1, the first frame
+            fps: Frame rate of the video
+            frame_count: Number of frames
+            original_format: Overlay text the reference time was read from, or None to use the
+                default YYYYmmdd_HHMMSS.LLL format
+            corrections: (frame, datetime) pairs; see add_correction
+        """
+        self.reference_time = reference_time
+        self.fps = fps
+        self.frame_count = frame_count
+        self.original_format = original_format
+        self._style, self._date_part = self._parse_format(original_format)
+        self._correction_frames = array.array("q")
+        self._correction_offsets_us = array.array("q")
+        for frame, timestamp in corrections:
+            self.add_correction(frame, timestamp)
+
+    @staticmethod
+    def _parse_format(original_format):
+        # Decide once how timestamps are formatted, instead of for every frame
+        if not original_format:
+            return "default", None
+        parts = original_format.split()
+        if ":" in original_format:
+            if len(parts) <= 1:  # Only time part
+                return "time", None
+            if len(parts[1].split(":")) >= 4:  # Format with milliseconds as HH:MM:SS:mmm
+                return "colon_milliseconds", parts[0]
+            return "no_milliseconds", parts[0]
+        if len(parts) > 1:  # Format with dots (e.g., HH:MM:SS.mmm)
+            return "dot_milliseconds", parts[0]
+        return "time_dot_milliseconds", None
+
+    def add_correction(self, frame, timestamp):
+        """
+        Set the time of a frame; later frames follow at 1 / fps intervals until the next correction.
+
+        Args:
+            frame: Frame number (from 1)
+            timestamp: datetime of that frame
+        """
+        offset_us = (timestamp - self.reference_time) // datetime.timedelta(microseconds=1)
+        position = bisect.bisect_left(self._correction_frames, frame)
+        if position < len(self._correction_frames) and self._correction_frames[position] == frame:
+            self._correction_offsets_us[position] = offset_us
+        else:
+            self._correction_frames.insert(position, frame)
+            self._correction_offsets_us.insert(position, offset_us)
+
+    @property
+    def corrections(self) -> list:
+        """The corrections as (frame, datetime) pairs in frame order."""
+        return [
+            (frame, self.reference_time + datetime.timedelta(microseconds=offset_us))
+            for frame, offset_us in zip(self._correction_frames, self._correction_offsets_us)
+        ]
+
+    def _anchor(self, frame):
+        # The correction in effect at a frame, or frame 1 at the reference time
+        position = bisect.bisect_right(self._correction_frames, frame) - 1
+        if position < 0:
+            return 1, self.reference_time
+        return (self._correction_frames[position],
+                self.reference_time + datetime.timedelta(microseconds=self._correction_offsets_us[position]))
+
+    def time_at(self, frame) -> datetime.datetime:
+        """Return the time of a frame (from 1)."""
+        anchor_frame, anchor_time = self._anchor(frame)
+        return anchor_time + datetime.timedelta(seconds=(frame - anchor_frame) / self.fps)
+
+    def format_time(self, frame) -> str:
+        """Return the timestamp string of a frame (from 1) as written to frame_times.txt."""
+        if self.original_format and frame == 1:  # For the first frame, use the exact extracted format
+            return self.original_format
+        ts = self.time_at(frame)
+        style = self._style
+        if style == "default":
+            return ts.strftime("%Y%m%d_%H%M%S.") + f"{ts.microsecond // 1000:03d}"
+        if style == "colon_milliseconds":
+            return f"{self._date_part} {ts.strftime('%H%M%S')}:{ts.microsecond // 1000:03d}"
+        if style == "no_milliseconds":
+            return f"{self._date_part} {ts.strftime('%H%M%S')}"
+        if style == "time":
+            return ts.strftime("%H%M%S")
+        if style == "dot_milliseconds":
+            return f"{self._date_part} {ts.strftime('%H%M%S')}.{ts.microsecond // 1000:03d}"
+        return f"{ts.strftime('%H%M%S')}.{ts.microsecond // 1000:03d}"
+
+    def frame_at(self, timestamp) -> int | None:
+        """
+        Return the frame whose time is nearest to a datetime.
+
+        Returns:
+            Frame number (from 1), or None if the timeline has no frames
+        """
+        if self.frame_count < 1:
+            return None
+        # Segments start at frame 1 and at every correction; the last one starting at or
+        # before the time holds the frame
+        starts = [(1, self._anchor(1))] + [
+            (frame, (frame, anchor_time)) for frame, anchor_time in self.corrections if frame > 1
+        ]
+        position = 0
+        for i, (start_frame, _) in enumerate(starts):
+            if self.time_at(start_frame) <= timestamp:
+                position = i
+        start_frame, (anchor_frame, anchor_time) = starts[position]
+        end_frame = starts[position + 1][0] - 1 if position + 1 < len(starts) else self.frame_count
+        frame = anchor_frame + round((timestamp - anchor_time).total_seconds() * self.fps)
+        return max(start_frame, min(end_frame, self.frame_count, frame))
+
+    def __len__(self):
+        return self.frame_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [(i + 1, self.format_time(i + 1)) for i in range(self.frame_count)[index]]
+        if index < 0:
+            index += self.frame_count
+        if not 0 <= index < self.frame_count:
+            raise IndexError("frame timeline index out of range")
+        return index + 1, self.format_time(index + 1)
+
+    def __iter__(self):
+        for frame in range(1, self.frame_count + 1):
+            yield frame, self.format_time(frame)
+
+    def __repr__(self):
+        return (f"FrameTimeline({self.reference_time!r}, {self.fps!r}, {self.frame_count!r}, "
+                f"{self.original_format!r}, corrections={len(self._correction_frames)})")
+
+    def write_csv(self, path):
+        """Write the Frame,Timestamp rows to a CSV file, formatting them while writing."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Frame", "Timestamp"])
+            writer.writerows(self)
+
+    def write_binary(self, path):
+        """
+        Save the timeline in a compact binary form: the parameters and corrections, not the rows.
+
+        Layout (little-endian): magic, version, fps, frame count, number of corrections, the
+        reference time and original format as length-prefixed UTF-8, then the correction
+        frames and offsets from the reference time in microseconds as int64 arrays.
+        """
+        frames = array.array("q", self._correction_frames)
+        offsets = array.array("q", self._correction_offsets_us)
+        if sys.byteorder == "big":
+            frames.byteswap()
+            offsets.byteswap()
+        with open(path, "wb") as f:
+            f.write(self._HEADER.pack(self.BINARY_MAGIC, self.BINARY_VERSION, self.fps, self.frame_count, len(frames)))
+            for text in (self.reference_time.isoformat(), self.original_format or ""):
+                encoded = text.encode("utf-8")
+                f.write(struct.pack("<H", len(encoded)) + encoded)
+            f.write(frames.tobytes())
+            f.write(offsets.tobytes())
+
+    @classmethod
+    def read_binary(cls, path):
+        """
+        Load a timeline saved with write_binary.
+
+        Raises:
+            ValueError: If the file is not a frame timeline or was written by another version
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, fps, frame_count, correction_count = cls._HEADER.unpack_from(data)
+        if magic != cls.BINARY_MAGIC:
+            raise ValueError(f"Not a frame timeline file: {path}")
+        if version != cls.BINARY_VERSION:
+            raise ValueError(f"Unsupported frame timeline version {version}: {path}")
+        offset = cls._HEADER.size
+        texts = []
+        for _ in range(2):
+            (length,) = struct.unpack_from("<H", data, offset)
+            texts.append(data[offset + 2:offset + 2 + length].decode("utf-8"))
+            offset += 2 + length
+        arrays = []
+        for _ in range(2):
+            values = array.array("q")
+            values.frombytes(data[offset:offset + 8 * correction_count])
+            if sys.byteorder == "big":
+                values.byteswap()
+            arrays.append(values)
+            offset += 8 * correction_count
+
+        timeline = cls(datetime.datetime.fromisoformat(texts[0]), fps, frame_count, texts[1] or None)
+        timeline._correction_frames, timeline._correction_offsets_us = arrays
+        return timeline
+
+
+@traced()
+def process_video_file(file_path, root=None, skip_extended_video=False, headless=False) -> bool:
     """
     Process a single video file to extract timestamps and save them to a frame_times.txt file.
 
@@ -1704,21 +5146,27 @@ def process_video_file(file_path, root=None, skip_extended_video=False) -> bool:
         file_path: Path to the video file to process
         root: Tkinter root window (if None, a new one will be created)
         skip_extended_video: Whether to skip the extended video processing
+        headless: Read the reference time from the first frame instead of showing the video
 
     Returns:
         bool: True if processing was successful, False otherwise
     """
     print(f"Processing video file: {file_path}")
 
-    cap = cv2.VideoCapture(file_path)
-    if not cap.isOpened():
+    # The timeline's frame rate comes from a random access source (OpenCV), as in verify_frame_times,
+    # so it does not depend on which backend counts the frames
+    probe = open_frame_source(file_path, access="random")
+    if probe is None:
         print(f"Could not open video: {file_path}")
         return False
+    with probe:
+        fps = probe.fps
 
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    if not fps or fps <= 0:
-        print("Invalid FPS detected; defaulting to 30.")
-        fps = 30.0
+    # Every frame is decoded to count them, so only decode the smallest useful region
+    source = open_frame_source(file_path, access="sequential", roi=(0, 0, 16, 16), gray=True)
+    if source is None:
+        print(f"Could not open video: {file_path}")
+        return False
 
     # Automatically select "Yes" for the reference time method
     reference_method = True
@@ -1728,8 +5176,16 @@ def process_video_file(file_path, root=None, skip_extended_video=False) -> bool:
     creation = None
     original_format = None
 
-    if reference_method is True:  # Yes - View video
+    if headless:
+        # Read the timestamp overlay of the first frame, as the viewer does when it opens
+        reference_time, reference_format = read_reference_timestamp(file_path)
+        if reference_time:
+            creation = reference_time
+            original_format = reference_format
+
+    elif reference_method is True:  # Yes - View video
         # Let user view video and select a reference frame
+        from vidmeta_gui import view_video_with_timestamp_overlay
         reference_time, reference_format = view_video_with_timestamp_overlay(file_path)
         if reference_time:
             # Use the full extracted timestamp (including date) as the reference time
@@ -1741,55 +5197,30 @@ def process_video_file(file_path, root=None, skip_extended_video=False) -> bool:
         metadata = get_all_metadata(file_path)
 
         # Let user select reference time from metadata
+        from vidmeta_gui import select_reference_time
         creation = select_reference_time(metadata)
 
     # If no time selected or canceled, fall back to creation_time or current time
     if creation is None:
         creation = get_creation_time(file_path) or datetime.datetime.now()
 
-    rows = []
-    frame = 0
-    while True:
-        ret, _ = cap.read()
-        if not ret:
-            break
-        frame += 1
-        ts = creation + datetime.timedelta(seconds=frame / fps)
-        # Format the timestamp using the original format if available, otherwise use the default format
-        if original_format and frame == 1:  # For the first frame, use the exact extracted format
-            timestamp_str = original_format
-        elif original_format:  # For subsequent frames, use the same format but update the time
-            # Extract the time components from the timestamp
-            if ":" in original_format:  # Format with colons (e.g., HH:MM:SS:mmm)
-                parts = original_format.split()
-                if len(parts) > 1:  # Has date and time parts
-                    date_part = parts[0]
-                    time_parts = parts[1].split(":")
-                    if len(time_parts) >= 4:  # Format with milliseconds as HH:MM:SS:mmm
-                        timestamp_str = f"{date_part} {ts.strftime('%H%M%S')}:{ts.microsecond // 1000:03d}"
-                    else:  # Format without milliseconds
-                        timestamp_str = f"{date_part} {ts.strftime('%H%M%S')}"
-                else:  # Only time part
-                    timestamp_str = ts.strftime("%H%M%S")
-            else:  # Format with dots (e.g., HH:MM:SS.mmm)
-                parts = original_format.split()
-                if len(parts) > 1:  # Has date and time parts
-                    date_part = parts[0]
-                    timestamp_str = f"{date_part} {ts.strftime('%H%M%S')}.{ts.microsecond // 1000:03d}"
-                else:  # Only time part
-                    timestamp_str = f"{ts.strftime('%H%M%S')}.{ts.microsecond // 1000:03d}"
-        else:  # No original format available, use the default format
-            timestamp_str = ts.strftime("%Y%m%d_%H%M%S.") + f"{ts.microsecond // 1000:03d}"
-        rows.append([frame, timestamp_str])
-
-    cap.release()
+    # Only the frames are counted; their timestamps are formatted while the chart is written
+    try:
+        frame_count = sum(1 for _ in source.frames())
+    except OSError as e:
+        print(f"Error: {e}")
+        return False
+    finally:
+        source.close()
+    if frame_count == 0:
+        print(f"No frames could be decoded from {file_path}")
+        return False
+    timeline = FrameTimeline(creation, fps, frame_count, original_format)
 
     file_path_obj = Path(file_path)
     output_path = file_path_obj.parent / "frame_times.txt"
-    with open(output_path, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Frame", "Timestamp"])
-        writer.writerows(rows)
+    with span("process.write_csv"):
+        timeline.write_csv(output_path)
 
     print(f"Saved timestamp chart to {output_path}")
 
@@ -1805,6 +5236,195 @@ def process_video_file(file_path, root=None, skip_extended_video=False) -> bool:
 
     return True
 
+
+def _read_overlay_chunk(chunk, roi_width, roi_height, ocr_profile=None):
+    """
+    OCR a run of consecutive ROIs; one change detector per run lets it reuse earlier reads.
+    With an OCR profile the run is read as one batch by its strategy instead.
+    """
+    if ocr_profile is not None:
+        results = get_ocr_strategy(ocr_profile).read_batch([roi for _, roi in chunk])
+        return [(frame_number, timestamp) for (frame_number, _), (timestamp, _) in zip(chunk, results)]
+    detector = ROIChangeDetector()
+    return [(frame_number, detector.extract(roi, 0, 0, roi_width, roi_height)[0]) for frame_number, roi in chunk]
+
+
+def _iter_overlay_times(source, roi_width, roi_height, workers, chunk_size, ocr_profile=None):
+    """
+    Read the overlay of every frame of a source in a thread pool, in frame order.
+
+    Decoding stays on the calling thread; runs of chunk_size ROIs are read by the workers
+    (Tesseract runs as a separate process, so threads read in parallel). At most two runs
+    per worker are in flight, which bounds memory however long the video is.
+
+    Yields:
+        Tuples of (frame_number, datetime or None)
+    """
+    pending = collections.deque()
+    read_chunk = _read_overlay_chunk if ocr_profile is None else functools.partial(
+        _read_overlay_chunk, ocr_profile=ocr_profile
+    )
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="verify-ocr") as executor:
+        chunk = []
+        for frame_number, roi in source.frames():
+            with span("verify.crop"):
+                chunk.append((frame_number, roi.copy()))
+            if len(chunk) < chunk_size:
+                continue
+            pending.append(executor.submit(read_chunk, chunk, roi_width, roi_height))
+            chunk = []
+            # Reassemble in order, waiting for the oldest run when the pool is full
+            while len(pending) >= 2 * workers or (pending and pending[0].done()):
+                yield from pending.popleft().result()
+        if chunk:
+            pending.append(executor.submit(read_chunk, chunk, roi_width, roi_height))
+        while pending:
+            yield from pending.popleft().result()
+
+
+@traced("verify.frame_times")
+def verify_frame_times(video_path, frame_times_path=None, workers=None, chunk_size=32, tolerance_ms=None,
+                       report_path=None, ocr_profile=None) -> dict:
+    """
+    Read the timestamp overlay of every frame and check it against frame_times.txt.
+
+    Frames are decoded in one stream, cropped to the timestamp region while decoding and read
+    by a pool of OCR workers, then checked in frame order. Three kinds of problems are reported:
+
+    - mismatches: the frame_times.txt timestamp differs from the overlay by more than the tolerance
+    - gaps: the overlay advances by more than the frame interval, so frames were dropped
+      (or the clock jumped back)
+    - repeats: the overlay shows the same time as the previous frame, so the frame is a duplicate
+
+    Args:
+        video_path: Path to the video file
+        frame_times_path: frame_times.txt to check (default: the one next to the video); if it
+            does not exist only gaps and repeats are reported
+        workers: Number of OCR worker threads (default: one per CPU)
+        chunk_size: Number of consecutive frames handed to a worker at a time
+        tolerance_ms: Largest accepted difference between the overlay and frame_times.txt
+            (default: half a frame interval)
+        report_path: Optional JSON file to save the report to
+        ocr_profile: Name of the OCR_PROFILES speed/accuracy profile the overlays are read with
+            (default: the full extract_timestamp_from_frame cascade with change detection)
+
+    Returns:
+        The report as a dict, or None if the video cannot be opened
+    """
+    frame_times_path = Path(frame_times_path) if frame_times_path else Path(video_path).parent / "frame_times.txt"
+    probe = open_frame_source(video_path, access="random")
+    if probe is None:
+        print(f"Could not open video: {video_path}")
+        return None
+    with probe:
+        fps, width, height = probe.fps, probe.width, probe.height
+    roi_x, roi_y, roi_width, roi_height = calculate_timestamp_roi(width, height)
+    source = open_frame_source(
+        video_path, access="sequential", roi=(roi_x, roi_y, roi_width, roi_height), gray=True
+    )
+    if source is None:
+        print(f"Could not open video: {video_path}")
+        return None
+
+    workers = workers or os.cpu_count() or 1
+    interval_ms = 1000.0 / fps
+    tolerance_ms = interval_ms / 2 if tolerance_ms is None else tolerance_ms
+    report = {
+        "video": str(video_path),
+        "frame_times": str(frame_times_path) if frame_times_path.exists() else None,
+        "fps": fps,
+        "tolerance_ms": tolerance_ms,
+        "frames": 0,
+        "unreadable_frames": [],
+        "mismatches": [],
+        "gaps": [],
+        "repeats": [],
+    }
+    print(f"Verifying the timestamp overlay of every frame of {video_path} with {workers} OCR workers")
+
+    expected_rows = None
+    expected_file = None
+    if frame_times_path.exists():
+        expected_file = open(frame_times_path, newline="")
+        expected_rows = csv.reader(expected_file)
+        next(expected_rows, None)  # Skip header row
+
+    start = time.perf_counter()
+    previous = None
+    offset_sum_ms = 0.0
+    offset_count = 0
+    try:
+        for frame_number, timestamp in _iter_overlay_times(source, roi_width, roi_height, workers, chunk_size,
+                                                           ocr_profile=ocr_profile):
+            report["frames"] += 1
+            expected_row = next(expected_rows, None) if expected_rows is not None else None
+            if timestamp is None:
+                report["unreadable_frames"].append(frame_number + 1)
+                continue
+
+            # frame_times.txt counts frames from 1
+            if expected_row is not None:
+                try:
+                    expected = parse_frame_timestamp(expected_row[1])
+                except (ValueError, IndexError):
+                    expected = None
+                difference_ms = (timestamp - expected).total_seconds() * 1000 if expected else None
+                if difference_ms is not None:
+                    offset_sum_ms += difference_ms
+                    offset_count += 1
+                if difference_ms is None or abs(difference_ms) > tolerance_ms:
+                    report["mismatches"].append({
+                        "frame": frame_number + 1,
+                        "expected": expected_row[1] if len(expected_row) > 1 else None,
+                        "overlay": timestamp.isoformat(),
+                        "difference_ms": difference_ms,
+                    })
+
+            if previous is not None:
+                previous_frame, previous_time = previous
+                step_ms = (timestamp - previous_time).total_seconds() * 1000
+                expected_step_ms = (frame_number - previous_frame) * interval_ms
+                if step_ms == 0:
+                    report["repeats"].append({"frame": frame_number + 1, "overlay": timestamp.isoformat()})
+                elif step_ms < 0 or step_ms > expected_step_ms + interval_ms / 2:
+                    report["gaps"].append({
+                        "after_frame": previous_frame + 1,
+                        "frame": frame_number + 1,
+                        "step_ms": step_ms,
+                        "dropped_frames": round(step_ms / interval_ms) - (frame_number - previous_frame),
+                    })
+            previous = (frame_number, timestamp)
+    finally:
+        source.close()
+        if expected_file is not None:
+            expected_file.close()
+
+    seconds = time.perf_counter() - start
+    report["seconds"] = seconds
+    # A constant offset means the reference frame is off, rather than the frame rate
+    report["mean_offset_ms"] = offset_sum_ms / offset_count if offset_count else None
+    report["frames_per_s"] = report["frames"] / seconds if seconds > 0 else None
+    report["realtime_factor"] = report["frames_per_s"] / fps if report["frames_per_s"] and fps else None
+    # A video in which no frame was decoded has verified nothing
+    report["ok"] = report["frames"] > 0 and not (
+        report["mismatches"] or report["gaps"] or report["repeats"] or report["unreadable_frames"]
+    )
+
+    print(f"Verified {report['frames']} frames in {seconds:.1f} s "
+          f"({report['frames_per_s'] or 0:.1f} frames/s, {report['realtime_factor'] or 0:.2f}x real time)")
+    print(f"Unreadable: {len(report['unreadable_frames'])}, mismatches: {len(report['mismatches'])}, "
+          f"gaps: {len(report['gaps'])} ({sum(max(0, gap['dropped_frames']) for gap in report['gaps'])} dropped frames), "
+          f"repeats: {len(report['repeats'])}")
+    if report["mean_offset_ms"] is not None:
+        print(f"Mean difference between the overlay and {frame_times_path.name}: {report['mean_offset_ms']:.1f} ms")
+
+    if report_path:
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved verification report to {report_path}")
+    return report
+
+
 def find_video_files(directory, filename="video.avi"):
     """
     Find all video files with the specified filename in the directory and its subdirectories.
@@ -1829,27 +5449,30 @@ def find_video_files(directory, filename="video.avi"):
 
     return video_files
 
-def main(skip_extended_video=False) -> None:
-    root = tk.Tk()
-    root.withdraw()
 
-    # Ask user to select a directory instead of a file
-    directory_path = filedialog.askdirectory(
-        title="Select Parent Directory containing video.avi files"
-    )
+def process_directory(directory_path, root=None, skip_extended_video=False, extended_video_path=None,
+                      cut_mode="auto", encoding_profile="default", headless=False) -> tuple[int, int]:
+    """
+    Process every video.avi file in a directory tree and cut their snippets from an extended video.
 
-    if not directory_path:
-        print("No directory selected.")
-        root.destroy()
-        return
+    Args:
+        directory_path: The parent directory to search in
+        root: Tkinter root window passed on to process_video_file
+        skip_extended_video: Whether to skip the extended video processing
+        extended_video_path: Extended video to cut a snippet from for every processed video
+        cut_mode: How snippets are cut (see extract_video_snippet)
+        encoding_profile: Encoding profile for transcoded snippets
+        headless: Read reference times from the first frames instead of showing the videos
 
+    Returns:
+        Tuple of (number of files processed successfully, number of files that failed)
+    """
     # Find all video.avi files in the directory and its subdirectories
     video_files = find_video_files(directory_path)
 
     if not video_files:
         print(f"No video.avi files found in {directory_path} or its subdirectories.")
-        root.destroy()
-        return
+        return 0, 0
 
     print(f"Found {len(video_files)} video.avi files to process.")
 
@@ -1860,7 +5483,7 @@ def main(skip_extended_video=False) -> None:
     for i, video_path in enumerate(video_files):
         print(f"\nProcessing file {i+1}/{len(video_files)}: {video_path}")
         try:
-            success = process_video_file(video_path, root, skip_extended_video)
+            success = process_video_file(video_path, root, skip_extended_video, headless=headless)
             if success:
                 successful_count += 1
             else:
@@ -1870,8 +5493,26 @@ def main(skip_extended_video=False) -> None:
             failed_count += 1
 
     print(f"\nProcessing complete. Successfully processed {successful_count} files. Failed to process {failed_count} files.")
-    # Ensure the application terminates properly
-    root.destroy()
+
+    # Cut the snippets for every processed video from the extended video in one batch
+    if extended_video_path and not skip_extended_video:
+        targets = collect_snippet_targets(directory_path, extended_video_path)
+        print(f"\nExtracting {len(targets)} snippets from extended video: {extended_video_path}")
+        results = extract_video_snippets(
+            extended_video_path, targets, cut_mode=cut_mode, encoding_profile=encoding_profile
+        )
+        extracted_count = sum(1 for _, success, _ in results if success)
+        print(f"Extracted {extracted_count} of {len(targets)} snippets.")
+
+    return successful_count, failed_count
+
+
+def __getattr__(name):
+    # The Tk user interface is only imported when one of its names is used
+    if name in GUI_NAMES:
+        import vidmeta_gui
+        return getattr(vidmeta_gui, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
@@ -1881,9 +5522,50 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Process video metadata and optionally extract snippets.')
     parser.add_argument('--skip-extended-video', action='store_true', 
                         help='Skip the extended video processing portion')
+    parser.add_argument('--extended-video',
+                        help='Extended video to cut snippets from for every processed video')
+    parser.add_argument('--cut-mode', choices=CUT_MODES, default='auto',
+                        help='How snippets are cut: auto (by file type), copy, transcode, smart '
+                             '(re-encode only the boundary GOPs) or segmented (parallel transcode)')
+    parser.add_argument('--encoding-profile', choices=list(ENCODING_PROFILES), default='default',
+                        help='Encoding profile for transcoded snippets: default, preview (fast, scaled '
+                             'down) or archive (slow, small)')
+    parser.add_argument('--show-encode-stats', action='store_true',
+                        help='Print the recorded encode speed of each profile and exit')
+    parser.add_argument('--directory',
+                        help='Parent directory containing video.avi files (asked for if not given)')
+    parser.add_argument('--headless', action='store_true',
+                        help='Run without a display: read each reference time from the first frame '
+                             'instead of showing the video (requires --directory)')
+    parser.add_argument('--trace', metavar='FILE',
+                        help='Record how long each stage takes, save it as a Chrome trace JSON file '
+                             '(open it in chrome://tracing or ui.perfetto.dev) and print a summary')
+    parser.add_argument('--metrics', metavar='FILE',
+                        help='Save OCR metrics per preprocessing method, PSM and pattern after the run, '
+                             'as a Prometheus textfile if FILE ends in .prom and as JSON otherwise')
 
     # Parse arguments
     args = parser.parse_args()
 
-    # Call main with the parsed arguments
-    main(skip_extended_video=args.skip_extended_video)
+    if args.trace:
+        vidmeta_trace.enable()
+
+    if args.show_encode_stats:
+        print_encode_stats()
+    elif args.headless:
+        if not args.directory:
+            parser.error("--headless requires --directory")
+        process_directory(args.directory, skip_extended_video=args.skip_extended_video,
+                          extended_video_path=args.extended_video, cut_mode=args.cut_mode,
+                          encoding_profile=args.encoding_profile, headless=True)
+    else:
+        # Call main with the parsed arguments
+        from vidmeta_gui import main
+        main(skip_extended_video=args.skip_extended_video, extended_video_path=args.extended_video,
+             cut_mode=args.cut_mode, encoding_profile=args.encoding_profile, directory_path=args.directory)
+
+    if args.trace:
+        vidmeta_trace.export_chrome_trace(args.trace)
+        vidmeta_trace.print_summary()
+    if args.metrics:
+        vidmeta_metrics.export(args.metrics)
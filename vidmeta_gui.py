@@ -0,0 +1,813 @@
+"""
+Tk user interface of VidMeta: the video viewer for selecting a reference frame, the metadata
+time picker and the directory dialog.
+
+The processing itself is done by vidmeta, which does not import tkinter, so it can be used
+(and imported quickly) on machines without a display.
+"""
+import datetime
+import tkinter as tk
+from tkinter import filedialog
+from tkinter import messagebox
+from tkinter import ttk
+
+import cv2
+import numpy as np
+
+try:
+    from PIL import Image, ImageTk
+except ImportError:  # Pillow is optional; without it frames are handed to Tk as PPM data
+    Image = ImageTk = None
+
+from vidmeta import (
+    FrameCache,
+    LiveOCR,
+    PlaybackEngine,
+    ThumbnailStrip,
+    calculate_timestamp_roi,
+    open_frame_source,
+    parse_datetime,
+    process_directory,
+)
+
+
+def select_reference_time(metadata: dict) -> datetime.datetime | None:
+    """Display metadata and let user select a reference time."""
+    # Create a new window
+    select_window = tk.Toplevel()
+    select_window.title("Select Reference Time")
+    select_window.geometry("800x600")
+
+    # Create a frame for the metadata display
+    frame = tk.Frame(select_window)
+    frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    # Create a scrollbar
+    scrollbar = tk.Scrollbar(frame)
+    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    # Create a text widget to display metadata
+    text = tk.Text(frame, wrap=tk.WORD, yscrollcommand=scrollbar.set)
+    text.pack(fill=tk.BOTH, expand=True)
+    scrollbar.config(command=text.yview)
+
+    # Insert metadata into text widget
+    text.insert(tk.END, "VIDEO METADATA:\n\n")
+
+    # Dictionary to store potential datetime values
+    datetime_values = {}
+
+    # Format metadata
+    text.insert(tk.END, "FORMAT METADATA:\n")
+    format_data = metadata.get("format", {})
+    for key, value in format_data.items():
+        if key == "tags" and isinstance(value, dict):
+            text.insert(tk.END, "  TAGS:\n")
+            for tag_key, tag_value in value.items():
+                text.insert(tk.END, f"    {tag_key}: {tag_value}\n")
+                # Check if this might be a datetime
+                dt = parse_datetime(tag_value)
+                if dt:
+                    datetime_values[f"format.tags.{tag_key}"] = dt
+        else:
+            text.insert(tk.END, f"  {key}: {value}\n")
+            # Check if this might be a datetime
+            dt = parse_datetime(str(value))
+            if dt:
+                datetime_values[f"format.{key}"] = dt
+
+    # Stream metadata
+    text.insert(tk.END, "\nSTREAM METADATA:\n")
+    for i, stream in enumerate(metadata.get("streams", [])):
+        text.insert(tk.END, f"  STREAM {i}:\n")
+        for key, value in stream.items():
+            if key == "tags" and isinstance(value, dict):
+                text.insert(tk.END, f"    TAGS:\n")
+                for tag_key, tag_value in value.items():
+                    text.insert(tk.END, f"      {tag_key}: {tag_value}\n")
+                    # Check if this might be a datetime
+                    dt = parse_datetime(tag_value)
+                    if dt:
+                        datetime_values[f"stream{i}.tags.{tag_key}"] = dt
+            else:
+                text.insert(tk.END, f"    {key}: {value}\n")
+                # Check if this might be a datetime
+                dt = parse_datetime(str(value))
+                if dt:
+                    datetime_values[f"stream{i}.{key}"] = dt
+
+    text.config(state=tk.DISABLED)  # Make text read-only
+
+    # If no datetime values found
+    if not datetime_values:
+        messagebox.showinfo("No Time Values", "No time values found in metadata. Using current time.")
+        select_window.destroy()
+        return None
+
+    # Create a frame for the selection
+    select_frame = tk.Frame(select_window)
+    select_frame.pack(fill=tk.X, padx=10, pady=10)
+
+    tk.Label(select_frame, text="Select reference time:").pack(side=tk.LEFT)
+
+    # Create a variable to store the selection
+    selected_time = tk.StringVar()
+
+    # Sort datetime values by key for consistent display
+    sorted_keys = sorted(datetime_values.keys())
+    if sorted_keys:
+        selected_time.set(sorted_keys[0])  # Default selection
+
+    # Create dropdown menu
+    dropdown = tk.OptionMenu(select_frame, selected_time, *sorted_keys)
+    dropdown.pack(side=tk.LEFT, padx=5)
+
+    # Create a label to display the selected datetime
+    time_label = tk.Label(select_frame, text="")
+    time_label.pack(side=tk.LEFT, padx=5)
+
+    # Function to update the time label
+    def update_time_label(*args):
+        key = selected_time.get()
+        if key in datetime_values:
+            time_label.config(text=str(datetime_values[key]))
+
+    # Register callback
+    selected_time.trace("w", update_time_label)
+    update_time_label()  # Initial update
+
+    # Variable to store the result
+    result = [None]
+
+    # Function to handle selection
+    def on_select():
+        key = selected_time.get()
+        if key in datetime_values:
+            result[0] = datetime_values[key]
+        select_window.destroy()
+
+    # Function to handle cancel
+    def on_cancel():
+        select_window.destroy()
+
+    # Create buttons
+    button_frame = tk.Frame(select_window)
+    button_frame.pack(fill=tk.X, padx=10, pady=10)
+
+    tk.Button(button_frame, text="Select", command=on_select).pack(side=tk.RIGHT, padx=5)
+    tk.Button(button_frame, text="Cancel", command=on_cancel).pack(side=tk.RIGHT, padx=5)
+
+    # Wait for the window to be closed
+    select_window.wait_window()
+
+    return result[0]
+
+
+def rgb_to_ppm(rgb_frame) -> bytes:
+    """Wrap a contiguous RGB frame in a binary PPM header, without going through an image encoder."""
+    height, width = rgb_frame.shape[:2]
+    return f"P6\n{width} {height}\n255\n".encode("ascii") + rgb_frame.tobytes()
+
+
+class FrameDisplay:
+    """
+    Display surface for video frames on a Tk canvas.
+
+    One PhotoImage and one canvas item are created up front and updated in place for every
+    frame, so no canvas items or images accumulate. With Pillow the RGB pixels are pasted
+    straight into the PhotoImage; without it they are passed as PPM data.
+
+    prepare may be called on any thread; show must be called on the Tk thread.
+    """
+
+    def __init__(self, canvas, width, height):
+        self.width = width
+        self.height = height
+        if ImageTk is not None:
+            self._photo = ImageTk.PhotoImage("RGB", (width, height))
+        else:
+            self._photo = tk.PhotoImage(width=width, height=height)
+        self._item = canvas.create_image(0, 0, anchor=tk.NW, image=self._photo)
+        # Keep a reference to the image to prevent garbage collection
+        canvas.image = self._photo
+
+    def prepare(self, rgb_frame):
+        """Convert an RGB frame of the display size into what show expects."""
+        rgb_frame = np.ascontiguousarray(rgb_frame)
+        if Image is not None:
+            return Image.fromarray(rgb_frame, "RGB")
+        return rgb_to_ppm(rgb_frame)
+
+    def show(self, prepared):
+        """Replace the displayed frame with a frame from prepare."""
+        if ImageTk is not None:
+            self._photo.paste(prepared)
+        else:
+            self._photo.configure(data=prepared)
+
+
+def view_video_with_timestamp_overlay(file_path: str,
+                                      ocr_profile: str | None = None) -> tuple[datetime.datetime | None, str | None]:
+    """
+    Display video with timestamp overlay and allow user to select a reference frame.
+    The timestamp overlay is expected to be in the top right corner of the first frame.
+
+    Args:
+        file_path: Path to the video file
+        ocr_profile: Name of the OCR_PROFILES profile the shown frame's overlay is read with
+            (default: the full OCR cascade); "fast" gives results while scrubbing
+
+    Returns:
+        Tuple of (selected reference time, original format string) or (None, None) if canceled
+    """
+    # Open the video file
+    source = open_frame_source(file_path, access="random")
+    if source is None:
+        messagebox.showerror("Error", "Could not open video file")
+        return None, None
+
+    # Get video properties
+    fps = source.fps
+    total_frames = source.frame_count
+    original_width = source.width
+    original_height = source.height
+
+    # Scale video dimensions to a reasonable size while maintaining aspect ratio
+    max_display_width = 1280
+    max_display_height = 720
+
+    # Calculate scaling factor
+    width_scale = max_display_width / original_width if original_width > max_display_width else 1
+    height_scale = max_display_height / original_height if original_height > max_display_height else 1
+    scale_factor = min(width_scale, height_scale)
+
+    # Apply scaling
+    width = int(original_width * scale_factor)
+    height = int(original_height * scale_factor)
+
+    # Frames are decoded and downscaled ahead of time around the current position, so stepping
+    # and scrubbing are served from memory. OCR still reads full frames from source.
+    frame_cache = FrameCache(file_path, scale=scale_factor if scale_factor < 1 else None)
+
+    # The overlay of the shown frame is read in the background once the frame stays current
+    # for a moment, so the result is known before the frame is selected
+    live_ocr = LiveOCR(file_path, ocr_profile=ocr_profile)
+
+    # Keyframe thumbnails for the timeline under the video, loaded from the sidecar cache or
+    # generated in the background
+    strip_height = 60
+    thumbnails = ThumbnailStrip(file_path)
+    thumbnails.start()
+
+    # Create a window for the video
+    video_window = tk.Toplevel()
+    video_window.title("Select Frame with Timestamp Overlay")
+
+    # Calculate window dimensions with minimum sizes to ensure controls are visible
+    window_width = max(width + 200, 800)  # Minimum width of 800 pixels
+    window_height = max(height + strip_height + 250, 600)  # Minimum height of 600 pixels
+
+    # Set window size and position it in the center of the screen
+    video_window.geometry(f"{window_width}x{window_height}")
+
+    # Center the window on the screen
+    screen_width = video_window.winfo_screenwidth()
+    screen_height = video_window.winfo_screenheight()
+    x_position = (screen_width - window_width) // 2
+    y_position = (screen_height - window_height) // 2
+    video_window.geometry(f"{window_width}x{window_height}+{x_position}+{y_position}")
+
+    # Make sure the window is on top initially
+    video_window.attributes('-topmost', True)
+    video_window.update()
+    video_window.attributes('-topmost', False)
+
+    video_window.protocol("WM_DELETE_WINDOW", lambda: on_close())
+
+    # Create a canvas with scrollbar for the main container
+    canvas_container = tk.Canvas(video_window)
+    canvas_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    # Add vertical scrollbar to canvas
+    scrollbar = tk.Scrollbar(video_window, orient=tk.VERTICAL, command=canvas_container.yview)
+    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    canvas_container.configure(yscrollcommand=scrollbar.set)
+
+    # Create a main container frame to organize all elements
+    main_container = tk.Frame(canvas_container)
+
+    # Add the main container to the canvas
+    canvas_window = canvas_container.create_window((0, 0), window=main_container, anchor=tk.NW)
+
+    # Configure the canvas to resize with the window
+    def configure_canvas(event):
+        canvas_container.configure(scrollregion=canvas_container.bbox("all"))
+        canvas_container.itemconfig(canvas_window, width=event.width)
+
+    canvas_container.bind("<Configure>", configure_canvas)
+    main_container.bind("<Configure>", lambda e: canvas_container.configure(scrollregion=canvas_container.bbox("all")))
+
+    # Make sure scrolling works properly
+    def _on_mousewheel(event):
+        canvas_container.yview_scroll(int(-1*(event.delta/120)), "units")
+
+    canvas_container.bind_all("<MouseWheel>", _on_mousewheel)
+
+    # Add instruction label at the top of the container
+    instruction_label = tk.Label(
+        main_container, 
+        text="Please locate the timestamp overlay in the top right corner of the video.\n"
+             "Navigate to the frame where the timestamp is clearly visible and click 'Select as Reference'.\n"
+             "Use the Play/Pause button and arrow buttons below to navigate through the video.",
+        wraplength=width,
+        justify=tk.LEFT,
+        font=("Arial", 10, "bold"),
+        fg="blue",
+        bg="#f0f0f0",  # Light background for better visibility
+        relief=tk.GROOVE,
+        borderwidth=1,
+        padx=5,
+        pady=5
+    )
+    instruction_label.pack(fill=tk.X, padx=10, pady=10)
+
+    # Create a frame for the video display
+    video_frame = tk.Frame(main_container, width=width, height=height)
+    video_frame.pack(pady=10)
+
+    # Create a canvas for the video
+    canvas = tk.Canvas(video_frame, width=width, height=height, bg="black")
+    canvas.pack()
+    display = FrameDisplay(canvas, width, height)
+
+    # Create a canvas for the thumbnail timeline; hover to preview, click to jump
+    strip_canvas = tk.Canvas(video_frame, width=width, height=strip_height, bg="black", cursor="hand2")
+    strip_canvas.pack(pady=(5, 0))
+    strip_display = FrameDisplay(strip_canvas, width, strip_height)
+
+    # Create controls frame with distinct styling to match buttons frame
+    controls_frame = tk.Frame(main_container, bg="#e0e0e0", relief=tk.RAISED, borderwidth=2)
+    controls_frame.pack(fill=tk.X, padx=10, pady=10)
+
+    # Add a label for the slider
+    slider_label = tk.Label(
+        controls_frame,
+        text="Video Position:",
+        font=("Arial", 10, "bold"),
+        bg="#e0e0e0"
+    )
+    slider_label.pack(side=tk.TOP, anchor=tk.W, padx=10, pady=5)
+
+    # Create slider for seeking
+    seek_var = tk.IntVar()
+    seek_slider = ttk.Scale(
+        controls_frame, 
+        from_=0, 
+        to=total_frames-1, 
+        orient=tk.HORIZONTAL,
+        variable=seek_var,
+        length=width
+    )
+    seek_slider.pack(fill=tk.X, padx=10, pady=10)
+
+    # Create buttons frame with distinct styling to ensure visibility
+    buttons_frame = tk.Frame(main_container, bg="#e0e0e0", relief=tk.RAISED, borderwidth=2)
+    buttons_frame.pack(fill=tk.X, padx=10, pady=10)
+
+    # Create info label for current position and timestamp with enhanced visibility
+    info_label = tk.Label(
+        buttons_frame, 
+        text="Frame: 0 / 0  |  Time: 00:00:00.000",
+        font=("Arial", 10, "bold"),
+        bg="#e0e0e0"  # Match the background of the buttons frame
+    )
+    info_label.pack(side=tk.LEFT, padx=10, pady=10)
+
+    # Create label for the live OCR readout of the current frame
+    ocr_label = tk.Label(
+        main_container,
+        text="Timestamp overlay: -",
+        font=("Arial", 10, "bold"),
+        anchor=tk.W
+    )
+    ocr_label.pack(fill=tk.X, padx=10)
+
+    # Variables to control playback
+    playing = False
+    current_frame = 0
+    reference_time = None
+    reference_format = None
+
+    # Function to draw the overlay on a frame and convert it for display. It only uses OpenCV,
+    # so the playback engine can run it on its worker thread
+    def render_frame(frame_number, frame):
+        # Calculate timestamp for this frame
+        # Using 1970-01-01 as a base time for display purposes
+        base_time = datetime.datetime(1970, 1, 1)
+        frame_time = base_time + datetime.timedelta(seconds=frame_number / fps)
+        timestamp_str = frame_time.strftime("%Y-%m-%d %H:%M:%S.") + f"{frame_time.microsecond // 1000:03d}"
+
+        # Add timestamp overlay to a copy of the frame, which is shared with the cache
+        frame_with_overlay = frame.copy()
+
+        # Highlight the top right corner where the timestamp overlay is expected to be
+        # Only do this for the first frame to help the user locate the timestamp
+        if frame_number == 0:
+            # Calculate the region of interest (ROI) in the top right corner of the displayed frame
+            roi_x, roi_y, roi_width, roi_height = calculate_timestamp_roi(
+                frame_with_overlay.shape[1], frame_with_overlay.shape[0]
+            )
+
+            # Draw a rectangle around the ROI
+            cv2.rectangle(
+                frame_with_overlay,
+                (roi_x, roi_y),
+                (roi_x + roi_width, roi_y + roi_height),
+                (0, 255, 255),  # Yellow color
+                2
+            )
+
+            # Add text to indicate this is where the timestamp is expected
+            cv2.putText(
+                frame_with_overlay,
+                "Timestamp Location",
+                (roi_x, roi_y + roi_height + 30),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.8,
+                (0, 255, 255),  # Yellow color
+                2
+            )
+
+        cv2.putText(
+            frame_with_overlay,
+            f"Frame: {frame_number+1}",
+            (10, 30),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1,
+            (0, 255, 0),
+            2
+        )
+        cv2.putText(
+            frame_with_overlay,
+            f"Time: {timestamp_str}",
+            (10, 70),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1,
+            (0, 255, 0),
+            2
+        )
+
+        # Resize the frame to match the scaled dimensions (cached frames normally already are)
+        if frame_with_overlay.shape[1] != width or frame_with_overlay.shape[0] != height:
+            frame_with_overlay = cv2.resize(frame_with_overlay, (width, height), interpolation=cv2.INTER_AREA)
+
+        # Convert the frame to RGB (from BGR) for the display
+        rgb_frame = cv2.cvtColor(frame_with_overlay, cv2.COLOR_BGR2RGB)
+        return timestamp_str, display.prepare(rgb_frame)
+
+    # Function to show a rendered frame (must run on the Tk thread)
+    def show_frame(frame_number, rendered):
+        nonlocal current_frame
+
+        timestamp_str, image = rendered
+        current_frame = frame_number
+        seek_var.set(frame_number)
+
+        # Update info label
+        info_label.config(text=f"Frame: {frame_number+1} / {total_frames}  |  Time: {timestamp_str}")
+
+        # Update the image in place
+        display.show(image)
+
+        # Read the overlay of the new frame once it stays current
+        live_ocr.submit(frame_number)
+
+    # Function to update the frame display
+    def update_frame(frame_number):
+        # Get the requested (display sized) frame from the cache
+        frame = frame_cache.get(frame_number)
+        if frame is None:
+            return False
+
+        show_frame(frame_number, render_frame(frame_number, frame))
+        return True
+
+    # Playback decodes and renders on a worker thread; the Tk thread only shows the frames
+    # when they are due, so playback keeps the real frame rate and drops frames if it must
+    playback = None
+
+    # Function to play the video
+    def play_video():
+        nonlocal playing, playback
+        if playing or current_frame >= total_frames - 1:
+            return
+
+        try:
+            playback = PlaybackEngine(
+                file_path, render_frame, start_frame=current_frame + 1, fps=fps,
+                scale=scale_factor if scale_factor < 1 else None
+            )
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not start playback: {e}")
+            return
+        playing = True
+        play_button.config(text="Pause", command=pause_video)
+        playback.start()
+        play_next_frame()
+
+    # Function to show the next due frame
+    def play_next_frame():
+        if not playing:
+            return
+
+        due = playback.next_frame()
+        if due is not None:
+            show_frame(*due)
+        if playback.finished:
+            pause_video()
+        else:
+            # Poll often enough to show each frame close to its due time
+            video_window.after(max(1, int(250 / fps)), play_next_frame)
+
+    # Function to pause the video
+    def pause_video():
+        nonlocal playing, playback
+        playing = False
+        if playback is not None:
+            playback.stop()
+            if playback.dropped:
+                print(f"Playback dropped {playback.dropped} frames to keep up with {fps:.2f} fps")
+            playback = None
+        play_button.config(text="Play", command=play_video)
+        # Continue prefetching around the frame playback stopped at
+        frame_cache.set_position(current_frame)
+
+    # Function to redraw the thumbnail timeline until all thumbnails are available
+    def refresh_strip():
+        strip = cv2.cvtColor(thumbnails.render(width, strip_height, total_frames), cv2.COLOR_BGR2RGB)
+        strip_display.show(strip_display.prepare(strip))
+        if not thumbnails.complete:
+            video_window.after(500, refresh_strip)
+
+    # Function to show the thumbnail nearest to a position on the timeline
+    def preview_strip_position(x):
+        frame_number = min(max(int(x * total_frames / width), 0), total_frames - 1)
+        nearest = thumbnails.nearest(frame_number)
+        if nearest is not None:
+            thumb_frame, thumb = nearest
+            preview = cv2.resize(thumb, (width, height), interpolation=cv2.INTER_LINEAR)
+            display.show(display.prepare(cv2.cvtColor(preview, cv2.COLOR_BGR2RGB)))
+            info_label.config(text=f"Preview: frame {thumb_frame+1} / {total_frames}")
+        return frame_number
+
+    def on_strip_hover(event):
+        if not playing:
+            preview_strip_position(event.x)
+
+    def on_strip_leave(event):
+        # Put the current frame back after previewing
+        if not playing:
+            update_frame(current_frame)
+
+    def on_strip_click(event):
+        if playing:
+            pause_video()
+        frame_number = preview_strip_position(event.x)
+        # Let Tk draw the preview before the full resolution frame is decoded
+        video_window.after(1, lambda: update_frame(frame_number))
+
+    # Function to show the live OCR result of the current frame
+    def refresh_ocr_label():
+        if not video_window.winfo_exists():
+            return
+        result = live_ocr.result(current_frame)
+        if result is None:
+            text = "Timestamp overlay: reading..." if live_ocr.busy(current_frame) else "Timestamp overlay: -"
+        elif result[0] is None:
+            text = "Timestamp overlay: not recognized"
+        else:
+            extracted_time, _, confidence = result
+            text = f"Timestamp overlay: {extracted_time.strftime('%d/%m/%y %H:%M:%S.%f')[:-3]}"
+            if confidence is not None:
+                text += f"  (confidence {confidence:.0f}%)"
+        ocr_label.config(text=text)
+        video_window.after(100, refresh_ocr_label)
+
+    strip_canvas.bind("<Motion>", on_strip_hover)
+    strip_canvas.bind("<Leave>", on_strip_leave)
+    strip_canvas.bind("<Button-1>", on_strip_click)
+
+    # Function to seek to a specific frame
+    def on_seek(event=None):
+        nonlocal current_frame
+        if playing:
+            pause_video()
+        frame_pos = int(seek_var.get())
+        if frame_pos != current_frame:
+            update_frame(frame_pos)
+
+    # Function to step forward one frame
+    def step_forward():
+        nonlocal current_frame
+        if playing:
+            pause_video()
+        if current_frame < total_frames - 1:
+            update_frame(current_frame + 1)
+
+    # Function to step backward one frame
+    def step_backward():
+        nonlocal current_frame
+        if playing:
+            pause_video()
+        if current_frame > 0:
+            update_frame(current_frame - 1)
+
+    # Function to select the current frame as reference
+    def select_reference():
+        nonlocal reference_time
+        if playing:
+            pause_video()
+
+        # Get the current frame
+        frame = source.read(current_frame)
+        if frame is None:
+            messagebox.showerror("Error", "Could not read the selected frame")
+            return None
+
+        try:
+            # Calculate the region of interest (ROI) in the top right corner
+            # For white text, we need to be more precise with the ROI
+            roi_width = int(original_width * 0.4)  # Use 40% of the width for the ROI to ensure we capture the full timestamp
+            roi_height = int(original_height * 0.2)  # Use 20% of the height for the ROI to ensure we capture the full timestamp
+            roi_x = original_width - roi_width
+            roi_y = 0  # Start from the top of the frame
+
+            # Create a debug visualization of the ROI
+            debug_frame = frame.copy()
+            cv2.rectangle(
+                debug_frame,
+                (roi_x, roi_y),
+                (roi_x + roi_width, roi_y + roi_height),
+                (0, 255, 0),  # Green color
+                2
+            )
+            cv2.putText(
+                debug_frame,
+                "Timestamp ROI",
+                (roi_x, roi_y - 10),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.8,
+                (0, 255, 0),  # Green color
+                2
+            )
+
+            # Save the debug visualization
+            import os
+            debug_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "debug_images")
+            os.makedirs(debug_dir, exist_ok=True)
+            debug_path = os.path.join(debug_dir, "roi_visualization.png")
+            cv2.imwrite(debug_path, debug_frame)
+            print(f"Saved ROI visualization to {debug_path}")
+
+            # Use the live OCR result, which is normally ready; otherwise read the overlay now
+            extracted_time, original_format, _ = live_ocr.wait(current_frame) or (None, None, None)
+
+            # Inform user about debug images
+            debug_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "debug_images")
+
+            if extracted_time:
+                # Use the extracted timestamp
+                reference_time = extracted_time
+                reference_format = original_format
+                messagebox.showinfo(
+                    "Reference Frame with Timestamp Selected",
+                    f"Selected frame {current_frame+1} with timestamp overlay as reference.\n"
+                    f"Successfully extracted timestamp: {reference_time.strftime('%d/%m/%y %H:%M:%S.%f')[:-3]}\n"
+                    f"This timestamp will be used as the reference time.\n\n"
+                    f"Debug images have been saved to:\n{debug_dir}"
+                )
+            else:
+                # Fallback to calculating the reference time based on the frame number
+                # Using 1970-01-01 as a base time
+                base_time = datetime.datetime(1970, 1, 1)
+                reference_time = base_time + datetime.timedelta(seconds=current_frame / fps)
+
+                messagebox.showwarning(
+                    "Timestamp Not Recognized",
+                    f"Could not recognize timestamp in the selected frame.\n"
+                    f"Please ensure the timestamp is clearly visible in the top right corner.\n"
+                    f"Format should be DD/MM/YY HH:MM:ss.SSS\n\n"
+                    f"Using generated timestamp as fallback: {reference_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}\n\n"
+                    f"Debug images have been saved to:\n{debug_dir}\n"
+                    f"Please check these images to see how the timestamp was processed."
+                )
+
+        except Exception as e:
+            print(f"Error in select_reference: {e}")
+            messagebox.showerror("Error", f"An error occurred while processing the frame: {e}")
+            return None
+
+        video_window.destroy()
+
+    # Function to handle window close
+    def on_close():
+        if playing:
+            pause_video()
+        live_ocr.close()
+        thumbnails.close()
+        frame_cache.close()
+        source.close()
+        video_window.destroy()
+
+    # Create control buttons with enhanced visibility
+    play_button = tk.Button(
+        buttons_frame, 
+        text="Play", 
+        command=play_video,
+        font=("Arial", 10, "bold"),
+        width=8,
+        height=2
+    )
+    play_button.pack(side=tk.LEFT, padx=10, pady=10)
+
+    step_back_button = tk.Button(
+        buttons_frame, 
+        text="◀", 
+        command=step_backward,
+        font=("Arial", 12, "bold"),
+        width=4,
+        height=2
+    )
+    step_back_button.pack(side=tk.LEFT, padx=10, pady=10)
+
+    step_forward_button = tk.Button(
+        buttons_frame, 
+        text="▶", 
+        command=step_forward,
+        font=("Arial", 12, "bold"),
+        width=4,
+        height=2
+    )
+    step_forward_button.pack(side=tk.LEFT, padx=10, pady=10)
+
+    select_button = tk.Button(
+        buttons_frame, 
+        text="Select Frame with Timestamp as Reference", 
+        command=select_reference,
+        bg="green",
+        fg="white",
+        font=("Arial", 10, "bold"),
+        width=30,
+        height=2
+    )
+    select_button.pack(side=tk.RIGHT, padx=10, pady=10)
+
+    # Bind slider events
+    seek_slider.bind("<ButtonRelease-1>", on_seek)
+
+    # Display the first frame
+    update_frame(0)
+    refresh_strip()
+    refresh_ocr_label()
+
+    # Automatically select the first frame as reference
+    print("Automatically selecting the first frame as reference")
+    select_reference()
+
+    # No need to wait for the window since select_reference() already destroyed it
+    # Only wait if the window still exists (wasn't destroyed by select_reference)
+    try:
+        if video_window.winfo_exists():
+            video_window.wait_window()
+    except:
+        pass  # Window was already destroyed
+
+    # Release resources
+    live_ocr.close()
+    thumbnails.close()
+    frame_cache.close()
+    source.close()
+
+    return reference_time, reference_format
+
+
+def main(skip_extended_video=False, extended_video_path=None, cut_mode="auto",
+         encoding_profile="default", directory_path=None) -> None:
+    root = tk.Tk()
+    root.withdraw()
+
+    # Ask user to select a directory instead of a file
+    if not directory_path:
+        directory_path = filedialog.askdirectory(
+            title="Select Parent Directory containing video.avi files"
+        )
+
+    if not directory_path:
+        print("No directory selected.")
+        root.destroy()
+        return
+
+    process_directory(directory_path, root, skip_extended_video, extended_video_path, cut_mode, encoding_profile)
+
+    # Ensure the application terminates properly
+    root.destroy()
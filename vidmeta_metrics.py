@@ -0,0 +1,170 @@
+"""
+Counters and histograms describing how well OCR works, exported after a run.
+
+vidmeta records every OCR attempt here: which preprocessing method and Tesseract page
+segmentation mode (PSM) were used, how long Tesseract took, whether the text parsed, which
+timestamp pattern matched and whether the relaxed fallback was needed. Recording is cheap
+compared to a Tesseract call, so it is always on. After a run the metrics can be saved as JSON
+or as a Prometheus textfile (for the node_exporter textfile collector):
+
+    vidmeta_metrics.export("ocr_metrics.prom")
+"""
+import json
+import os
+import tempfile
+import threading
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_lock = threading.Lock()
+_metrics = {}
+
+
+def _label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class Counter:
+    """A count per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.values = {}
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with _lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels):
+        with _lock:
+            return self.values.get(_label_key(labels), 0)
+
+    def to_dict(self):
+        return [{"labels": dict(key), "value": value} for key, value in self.values.items()]
+
+    def prometheus_lines(self):
+        return [f"{self.name}{_format_labels(key)} {value}" for key, value in self.values.items()]
+
+
+class Histogram:
+    """Observation counts per bucket, with their sum, per label combination."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.values = {}
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with _lock:
+            series = self.values.setdefault(key, {"buckets": [0] * len(self.buckets), "count": 0, "sum": 0.0})
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["buckets"][i] += 1
+            series["count"] += 1
+            series["sum"] += value
+
+    def get(self, **labels):
+        with _lock:
+            return self.values.get(_label_key(labels))
+
+    def to_dict(self):
+        return [
+            {"labels": dict(key), "count": series["count"], "sum": series["sum"],
+             "buckets": dict(zip(map(str, self.buckets), series["buckets"]))}
+            for key, series in self.values.items()
+        ]
+
+    def prometheus_lines(self):
+        lines = []
+        for key, series in self.values.items():
+            # Prometheus buckets are cumulative, which is how they are counted
+            for bound, count in zip(self.buckets, series["buckets"]):
+                lines.append(f"{self.name}_bucket{_format_labels(key + (('le', repr(bound)),))} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(key + (('le', '+Inf'),))} {series['count']}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {series['sum']}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+
+def _format_labels(key):
+    if not key:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")) for name, value in key
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _register(metric_class, name, help_text, *args):
+    with _lock:
+        if name not in _metrics:
+            _metrics[name] = metric_class(name, help_text, *args)
+        return _metrics[name]
+
+
+def counter(name, help_text) -> Counter:
+    """Return the counter with this name, creating it on first use."""
+    return _register(Counter, name, help_text)
+
+
+def histogram(name, help_text, buckets=LATENCY_BUCKETS) -> Histogram:
+    """Return the histogram with this name, creating it on first use."""
+    return _register(Histogram, name, help_text, buckets)
+
+
+def reset():
+    """Clear the values of all metrics (the metrics themselves stay registered)."""
+    with _lock:
+        for metric in _metrics.values():
+            metric.values.clear()
+
+
+def to_dict() -> dict:
+    """Return all metrics with their values."""
+    with _lock:
+        return {
+            name: {"type": metric.kind, "help": metric.help, "values": metric.to_dict()}
+            for name, metric in sorted(_metrics.items())
+        }
+
+
+def format_prometheus() -> str:
+    """Return all metrics in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        for name, metric in sorted(_metrics.items()):
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.prometheus_lines())
+    return "\n".join(lines) + "\n"
+
+
+def export(path):
+    """
+    Save all metrics: as a Prometheus textfile if the path ends in .prom, otherwise as JSON.
+
+    The file is replaced atomically, so a collector never reads a half-written file.
+    """
+    if str(path).endswith(".prom"):
+        content = format_prometheus()
+    else:
+        content = json.dumps(to_dict(), indent=2)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    print(f"Saved OCR metrics to {path}")
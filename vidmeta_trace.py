@@ -0,0 +1,185 @@
+"""
+Lightweight tracing of where the time goes in a vidmeta run.
+
+Stages are wrapped in spans:
+
+    with span("ocr.tesseract", method=3):
+        ...
+
+or whole functions with the @traced decorator. Tracing is off by default; span() then returns
+a shared do-nothing context manager, so the instrumentation costs one function call. After
+enable(), every finished span is recorded with its thread, and the recording can be exported
+as Chrome trace JSON (open it in chrome://tracing or https://ui.perfetto.dev) or summarized per
+stage with counts and p50/p95/p99 durations.
+"""
+import contextlib
+import functools
+import json
+import math
+import os
+import threading
+import time
+
+_enabled = False
+_events = []
+_lock = threading.Lock()
+_NULL_SPAN = contextlib.nullcontext()
+
+
+def enable():
+    """Start recording spans."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Stop recording spans; spans recorded so far are kept."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    """Forget all recorded spans."""
+    with _lock:
+        _events.clear()
+
+
+class _Span:
+    __slots__ = ("name", "args", "start_ns")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        with _lock:
+            _events.append((self.name, self.start_ns, end_ns - self.start_ns, threading.get_ident(), self.args))
+        return False
+
+
+def span(name, **args):
+    """
+    Return a context manager that records the time spent in a stage.
+
+    Args:
+        name: Stage name; the part before the first dot is used as the trace category
+        **args: Values shown with the span in the trace viewer
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def traced(name=None):
+    """Decorator that records every call of a function as a span (named after the function by default)."""
+    def decorator(function):
+        span_name = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with _Span(span_name, {}):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_events() -> list:
+    """Return the recorded spans as (name, start_ns, duration_ns, thread_id, args) tuples."""
+    with _lock:
+        return list(_events)
+
+
+def export_chrome_trace(path):
+    """
+    Write the recorded spans as Chrome trace JSON.
+
+    Args:
+        path: Output file, e.g. "vidmeta_trace.json"
+    """
+    events = get_events()
+    origin = min((start for _, start, _, _, _ in events), default=0)
+    pid = os.getpid()
+    thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+    trace_events = [
+        {
+            "name": name,
+            "cat": name.split(".", 1)[0],
+            "ph": "X",
+            "ts": (start - origin) / 1000,
+            "dur": duration / 1000,
+            "pid": pid,
+            "tid": thread_id,
+            "args": {key: str(value) for key, value in args.items()},
+        }
+        for name, start, duration, thread_id, args in events
+    ]
+    trace_events.extend(
+        {"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id, "args": {"name": thread_names[thread_id]}}
+        for thread_id in {event[3] for event in events} if thread_id in thread_names
+    )
+    with open(path, "w") as f:
+        json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+    print(f"Saved trace with {len(events)} spans to {path}")
+
+
+def percentile(sorted_values, fraction):
+    """Return the nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+def summarize() -> list:
+    """
+    Summarize the recorded spans per stage.
+
+    Returns:
+        List of dicts with name, count, total_ms, p50_ms, p95_ms and p99_ms, by total time descending
+    """
+    durations = {}
+    for name, _, duration, _, _ in get_events():
+        durations.setdefault(name, []).append(duration / 1e6)
+    rows = []
+    for name, values in durations.items():
+        values.sort()
+        rows.append({
+            "name": name,
+            "count": len(values),
+            "total_ms": sum(values),
+            "p50_ms": percentile(values, 0.50),
+            "p95_ms": percentile(values, 0.95),
+            "p99_ms": percentile(values, 0.99),
+        })
+    rows.sort(key=lambda row: row["total_ms"], reverse=True)
+    return rows
+
+
+def format_summary(rows=None) -> str:
+    """Format the per-stage summary as a text table."""
+    rows = summarize() if rows is None else rows
+    width = max([len("Stage")] + [len(row["name"]) for row in rows])
+    lines = [f"{'Stage':<{width}}  {'Count':>7}  {'Total ms':>10}  {'p50 ms':>9}  {'p95 ms':>9}  {'p99 ms':>9}"]
+    for row in rows:
+        lines.append(
+            f"{row['name']:<{width}}  {row['count']:>7}  {row['total_ms']:>10.1f}  "
+            f"{row['p50_ms']:>9.2f}  {row['p95_ms']:>9.2f}  {row['p99_ms']:>9.2f}"
+        )
+    return "\n".join(lines)
+
+
+def print_summary():
+    """Print the per-stage summary table."""
+    print(format_summary())